@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -35,7 +36,7 @@ def upgrade() -> None:
         sa.Column('check_in_date', sa.Date(), nullable=False),
         sa.Column('check_out_date', sa.Date(), nullable=False),
         sa.Column('reservation_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('status', reservation_status_type, nullable=False, server_default='PENDING'),
+        sa.Column('status', sa.dialects.postgresql.ENUM(name=reservation_status_enum_name, create_type=False), nullable=False, server_default='PENDING'),
         sa.Column('total_price', sa.Numeric(precision=10, scale=2), nullable=True),
         sa.Column('notes', sa.String(), nullable=True),
         # sa.Column('booked_by_user_id', sa.Integer(), nullable=True), # If adding later
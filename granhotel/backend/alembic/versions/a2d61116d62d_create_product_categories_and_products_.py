@@ -38,8 +38,8 @@ def upgrade() -> None:
         sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
         sa.Column('sku', sa.String(length=50), nullable=True),
         sa.Column('image_url', sa.String(length=2048), nullable=True),
-        sa.Column('is_active', sa.Boolean(), server_default=sa.true_(), nullable=False),
-        sa.Column('taxable', sa.Boolean(), server_default=sa.true_(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column('taxable', sa.Boolean(), server_default=sa.true(), nullable=False),
         sa.Column('category_id', sa.Integer(), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
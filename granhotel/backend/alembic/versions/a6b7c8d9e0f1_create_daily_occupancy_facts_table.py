@@ -0,0 +1,40 @@
+# granhotel/backend/alembic/versions/a6b7c8d9e0f1_create_daily_occupancy_facts_table.py
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a6b7c8d9e0f1'
+down_revision = 'f5a6b7c8d9e0' # Previous migration (room rates)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_occupancy_facts',
+        sa.Column('stay_date', sa.Date(), nullable=False),
+        sa.Column('room_nights_sold', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('room_revenue', sa.Numeric(precision=12, scale=2), server_default='0.00', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('stay_date', name=op.f('pk_daily_occupancy_facts'))
+    )
+
+    # Backfill from existing reservations. Same split as analytics_service: every night gets
+    # round(total / nights, 2) and the last night absorbs the rounding remainder.
+    op.execute("""
+        INSERT INTO daily_occupancy_facts (stay_date, room_nights_sold, room_revenue)
+        SELECT night::date,
+               count(*),
+               sum(CASE WHEN night::date = r.check_out_date - 1
+                        THEN coalesce(r.total_price, 0) - round(coalesce(r.total_price, 0) / (r.check_out_date - r.check_in_date), 2) * (r.check_out_date - r.check_in_date - 1)
+                        ELSE round(coalesce(r.total_price, 0) / (r.check_out_date - r.check_in_date), 2)
+                   END)
+        FROM reservations r
+        CROSS JOIN LATERAL generate_series(r.check_in_date, r.check_out_date - 1, interval '1 day') AS night
+        WHERE r.status IN ('CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT')
+          AND r.check_out_date > r.check_in_date
+        GROUP BY night::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_occupancy_facts')
@@ -0,0 +1,26 @@
+# granhotel/backend/alembic/versions/b7c8d9e0f1a2_add_reservation_composite_indexes.py
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b7c8d9e0f1a2'
+down_revision = 'a6b7c8d9e0f1' # Previous migration (daily occupancy facts)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Overlap predicate of is_room_available / get_reservations_for_room_date_range / search_available_rooms.
+    # The GiST index behind excl_reservations_room_id_stay already covers daterange && lookups.
+    op.create_index('ix_reservations_room_id_status_stay', 'reservations', ['room_id', 'status', 'check_in_date', 'check_out_date'], unique=False)
+    # get_reservations orders by check_in_date desc, id desc, optionally filtered by guest or status
+    op.create_index('ix_reservations_check_in_date_id', 'reservations', [sa.text('check_in_date DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_reservations_guest_id_check_in_date', 'reservations', ['guest_id', sa.text('check_in_date DESC')], unique=False)
+    op.create_index('ix_reservations_status_check_in_date', 'reservations', ['status', sa.text('check_in_date DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_status_check_in_date', table_name='reservations')
+    op.drop_index('ix_reservations_guest_id_check_in_date', table_name='reservations')
+    op.drop_index('ix_reservations_check_in_date_id', table_name='reservations')
+    op.drop_index('ix_reservations_room_id_status_stay', table_name='reservations')
@@ -28,7 +28,7 @@ def upgrade() -> None:
         sa.Column('id', sa.Integer(), nullable=False),
         sa.Column('sale_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('cashier_user_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('guest_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('guest_id', sa.Integer(), nullable=True),
         sa.Column('total_amount_before_tax', sa.Numeric(precision=10, scale=2), nullable=False),
         sa.Column('tax_amount', sa.Numeric(precision=10, scale=2), nullable=False),
         sa.Column('total_amount_after_tax', sa.Numeric(precision=10, scale=2), nullable=False),
@@ -43,7 +43,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
 
         sa.ForeignKeyConstraint(['cashier_user_id'], ['users.id'], name=op.f('fk_pos_sales_cashier_user_id_users')),
-        sa.ForeignKeyConstraint(['guest_id'], ['guests.id'], name=op.f('fk_pos_sales_guest_id_guests')),
         sa.ForeignKeyConstraint(['voided_by_user_id'], ['users.id'], name=op.f('fk_pos_sales_voided_by_user_id_users')),
         sa.PrimaryKeyConstraint('id', name=op.f('pk_pos_sales'))
     )
@@ -0,0 +1,54 @@
+# granhotel/backend/alembic/versions/c8d9e0f1a2b3_create_night_audit_runs.py
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c8d9e0f1a2b3'
+down_revision = 'b7c8d9e0f1a2' # Previous migration (reservation composite indexes)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('folio_transactions', sa.Column('business_date', sa.Date(), nullable=True))
+    # One night-audit room charge per reservation and night; lets the audit insert with ON CONFLICT DO NOTHING
+    op.create_index(
+        'uq_folio_transactions_room_charge_night', 'folio_transactions', ['related_reservation_id', 'business_date'],
+        unique=True, postgresql_where=sa.text("transaction_type = 'ROOM_CHARGE' AND business_date IS NOT NULL")
+    )
+    # The audit looks up each in-house reservation's open folio
+    op.create_index('ix_guest_folios_reservation_id_status', 'guest_folios', ['reservation_id', 'status'], unique=False)
+
+    night_audit_status_enum = postgresql.ENUM('RUNNING', 'COMPLETED', 'FAILED', name='night_audit_status_enum', create_type=False)
+    night_audit_status_enum.create(op.get_bind(), checkfirst=True)
+    op.create_table('night_audit_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('business_date', sa.Date(), nullable=False),
+        sa.Column('status', night_audit_status_enum, nullable=False),
+        sa.Column('last_reservation_id', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('reservations_processed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('folios_created', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('charges_posted', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_charged', sa.Numeric(precision=12, scale=2), server_default='0.00', nullable=False),
+        sa.Column('chunks_processed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('duration_seconds', sa.Numeric(precision=10, scale=3), server_default='0', nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['started_by_user_id'], ['users.id'], name=op.f('fk_night_audit_runs_started_by_user_id_users')),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_night_audit_runs')),
+        sa.UniqueConstraint('business_date', name=op.f('uq_night_audit_runs_business_date'))
+    )
+    op.create_index(op.f('ix_night_audit_runs_id'), 'night_audit_runs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_night_audit_runs_id'), table_name='night_audit_runs')
+    op.drop_table('night_audit_runs')
+    postgresql.ENUM(name='night_audit_status_enum').drop(op.get_bind(), checkfirst=True)
+    op.drop_index('ix_guest_folios_reservation_id_status', table_name='guest_folios')
+    op.drop_index('uq_folio_transactions_room_charge_night', table_name='folio_transactions')
+    op.drop_column('folio_transactions', 'business_date')
@@ -26,7 +26,7 @@ def upgrade() -> None:
 
     op.create_table('guest_folios',
         sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('guest_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('guest_id', sa.Integer(), nullable=False),
         sa.Column('reservation_id', sa.Integer(), nullable=True),
         sa.Column('status', pg_folio_status_enum, server_default='OPEN', nullable=False),
         sa.Column('total_charges', sa.Numeric(precision=12, scale=2), server_default='0.00', nullable=False),
@@ -36,7 +36,6 @@ def upgrade() -> None:
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
 
-        sa.ForeignKeyConstraint(['guest_id'], ['guests.id'], name=op.f('fk_guest_folios_guest_id_guests')),
         sa.ForeignKeyConstraint(['reservation_id'], ['reservations.id'], name=op.f('fk_guest_folios_reservation_id_reservations')),
         sa.PrimaryKeyConstraint('id', name=op.f('pk_guest_folios'))
     )
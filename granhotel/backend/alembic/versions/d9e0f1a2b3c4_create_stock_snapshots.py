@@ -0,0 +1,32 @@
+# granhotel/backend/alembic/versions/d9e0f1a2b3c4_create_stock_snapshots.py
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd9e0f1a2b3c4'
+down_revision = 'c8d9e0f1a2b3' # Previous migration (night audit runs)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stock at a date sums one product's movements over a date range
+    op.create_index('ix_stock_movements_product_id_movement_date', 'stock_movements', ['product_id', 'movement_date'], unique=False)
+
+    op.create_table('stock_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('quantity_on_hand', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name=op.f('fk_stock_snapshots_product_id_products')),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_stock_snapshots')),
+        sa.UniqueConstraint('product_id', 'snapshot_date', name='uq_stock_snapshots_product_id_snapshot_date')
+    )
+    op.create_index(op.f('ix_stock_snapshots_id'), 'stock_snapshots', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_stock_snapshots_id'), table_name='stock_snapshots')
+    op.drop_table('stock_snapshots')
+    op.drop_index('ix_stock_movements_product_id_movement_date', table_name='stock_movements')
@@ -0,0 +1,20 @@
+# granhotel/backend/alembic/versions/e0f1a2b3c4d5_add_housekeeping_task_lookup_index.py
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e0f1a2b3c4d5'
+down_revision = 'd9e0f1a2b3c4' # Previous migration (stock snapshots)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The daily task generator skips rooms that already have the task for the date
+    op.create_index(
+        'ix_housekeeping_logs_scheduled_date_room_id_task_type', 'housekeeping_logs',
+        ['scheduled_date', 'room_id', 'task_type'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_housekeeping_logs_scheduled_date_room_id_task_type', table_name='housekeeping_logs')
@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql
 from sqlalchemy.dialects import postgresql # For UUID type
 
 
@@ -35,8 +36,8 @@ def upgrade() -> None:
         sa.Column('hashed_password', sa.String(), nullable=False),
         sa.Column('first_name', sa.String(), nullable=True),
         sa.Column('last_name', sa.String(), nullable=True),
-        sa.Column('is_active', sa.Boolean(), server_default=sa.true_(), nullable=False),
-        sa.Column('role', user_role_type, server_default='RECEPTIONIST', nullable=False),
+        sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column('role', sa.dialects.postgresql.ENUM(name=user_role_enum_name, create_type=False), server_default='RECEPTIONIST', nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False), # Model handles onupdate
         sa.PrimaryKeyConstraint('id')
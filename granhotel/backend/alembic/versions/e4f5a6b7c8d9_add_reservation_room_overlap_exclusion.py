@@ -0,0 +1,24 @@
+# granhotel/backend/alembic/versions/e4f5a6b7c8d9_add_reservation_room_overlap_exclusion.py
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e4f5a6b7c8d9'
+down_revision = 'd3e4f5a6b7c8' # Previous migration (billing)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # btree_gist provides the GiST operator class for the integer equality part of the constraint
+    pass
+    # Fails if the table already holds overlapping CONFIRMED/CHECKED_IN stays; resolve those first.
+    op.execute(
+        "ALTER TABLE reservations ADD CONSTRAINT excl_reservations_room_id_stay "
+        "EXCLUDE USING gist (int4range(room_id, room_id, '[]') WITH &&, daterange(check_in_date, check_out_date) WITH &&) "
+        "WHERE (status IN ('CONFIRMED', 'CHECKED_IN'))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE reservations DROP CONSTRAINT IF EXISTS excl_reservations_room_id_stay")
+    # The btree_gist extension is left installed; other objects may depend on it.
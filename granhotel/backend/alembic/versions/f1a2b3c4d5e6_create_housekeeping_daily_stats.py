@@ -0,0 +1,42 @@
+# granhotel/backend/alembic/versions/f1a2b3c4d5e6_create_housekeeping_daily_stats.py
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = 'e0f1a2b3c4d5' # Previous migration (housekeeping task lookup index)
+branch_labels = None
+depends_on = None
+
+# The task type enum was created with housekeeping_logs
+pg_hk_task_type_enum = postgresql.ENUM(name='hk_task_type_enum', create_type=False)
+
+
+def upgrade() -> None:
+    # The stats refresh finds the days to recompute from the logs changed since its last run
+    op.create_index('ix_housekeeping_logs_updated_at', 'housekeeping_logs', ['updated_at'], unique=False)
+    op.create_index('ix_housekeeping_logs_completed_at', 'housekeeping_logs', ['completed_at'], unique=False)
+
+    op.create_table('housekeeping_daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('stat_date', sa.Date(), nullable=False),
+        sa.Column('task_type', pg_hk_task_type_enum, nullable=False),
+        sa.Column('housekeeper_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('floor', sa.Integer(), nullable=True),
+        sa.Column('task_count', sa.Integer(), nullable=False),
+        sa.Column('duration_seconds', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['housekeeper_user_id'], ['users.id'], name=op.f('fk_housekeeping_daily_stats_housekeeper_user_id_users')),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_housekeeping_daily_stats'))
+    )
+    op.create_index(op.f('ix_housekeeping_daily_stats_id'), 'housekeeping_daily_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_housekeeping_daily_stats_stat_date'), 'housekeeping_daily_stats', ['stat_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_housekeeping_daily_stats_stat_date'), table_name='housekeeping_daily_stats')
+    op.drop_index(op.f('ix_housekeeping_daily_stats_id'), table_name='housekeeping_daily_stats')
+    op.drop_table('housekeeping_daily_stats')
+    op.drop_index('ix_housekeeping_logs_completed_at', table_name='housekeeping_logs')
+    op.drop_index('ix_housekeeping_logs_updated_at', table_name='housekeeping_logs')
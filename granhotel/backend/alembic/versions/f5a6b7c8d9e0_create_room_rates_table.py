@@ -0,0 +1,37 @@
+# granhotel/backend/alembic/versions/f5a6b7c8d9e0_create_room_rates_table.py
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f5a6b7c8d9e0'
+down_revision = 'e4f5a6b7c8d9' # Previous migration (reservation overlap exclusion)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('room_rates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('room_type', sa.String(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=True),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('day_of_week', sa.Integer(), nullable=True),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('priority', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('is_active', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+
+        sa.CheckConstraint('day_of_week BETWEEN 0 AND 6', name=op.f('ck_room_rates_day_of_week')),
+        sa.CheckConstraint('end_date IS NULL OR start_date IS NULL OR end_date >= start_date', name=op.f('ck_room_rates_date_range')),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_room_rates'))
+    )
+    op.create_index(op.f('ix_room_rates_id'), 'room_rates', ['id'], unique=False)
+    op.create_index(op.f('ix_room_rates_room_type'), 'room_rates', ['room_type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_room_rates_room_type'), table_name='room_rates')
+    op.drop_index(op.f('ix_room_rates_id'), table_name='room_rates')
+    op.drop_table('room_rates')
@@ -1,6 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Callable
 import uuid # For converting user_id string from token to UUID
 
 from app.core.security import decode_token # Use access token secret
@@ -8,7 +10,7 @@ from app.core.config import settings # For JWT_SECRET_KEY and API_V1_STR
 from app.schemas.token import TokenPayload
 from app import models # For User model
 from app.services import user_service # To get user from DB
-from app.db.session import get_db # Session dependency
+from app.db.session import get_db, get_async_db, get_session_factory # Session dependencies
 
 # OAuth2PasswordBearer points to the tokenUrl, which is the login endpoint
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -19,7 +21,7 @@ def get_current_user_from_token(
 ) -> models.User:
     '''
     Dependency to get current user from JWT token.
-    Validates token, decodes it, retrieves user from DB.
+    Validates token, decodes it, retrieves the user (from the short-lived auth cache when possible).
     '''
     token_payload = decode_token(token=token, secret_key=settings.SECRET_KEY) # Use access token secret
     if not token_payload or not token_payload.user_id:
@@ -38,7 +40,7 @@ def get_current_user_from_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = user_service.get_user(db, user_id=user_uuid)
+    user = user_service.get_user_for_auth(db, user_id=user_uuid)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, # Changed from 404 for consistency: token valid, user gone
@@ -78,3 +80,33 @@ def require_manager_or_admin_user(
             detail="The user doesn't have enough privileges (Manager or Admin required)"
         )
     return current_user
+
+def require_manager_or_admin_user_for_stream(
+    token: str = Depends(oauth2_scheme),
+    session_factory: Callable = Depends(get_session_factory)
+) -> models.User:
+    '''
+    require_manager_or_admin_user for streaming endpoints. The user is looked up in a session of its own,
+    closed before the handler runs: get_db's session is only released once the response body ends,
+    so it would hold a pooled connection (idle in transaction) for the whole stream.
+    '''
+    db = session_factory()
+    try:
+        current_user = get_current_user_from_token(token=token, db=db)
+    finally:
+        db.close()
+    return require_manager_or_admin_user(get_current_active_user(current_user))
+
+# For `async def` endpoints on get_async_db: the user is read through the request's AsyncSession
+# (FastAPI hands the endpoint the same one), so no sync session or threadpool worker is involved.
+async def get_current_active_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    current_user = await db.run_sync(lambda session: get_current_user_from_token(token=token, db=session))
+    return get_current_active_user(current_user)
+
+async def require_manager_or_admin_user_async(
+    current_user: models.User = Depends(get_current_active_user_async)
+) -> models.User:
+    return require_manager_or_admin_user(current_user)
@@ -1,10 +1,12 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints import (
-    auth, users, rooms, guests, reservations,
+    auth, users, rooms, guests, reservations, room_rates,
     product_categories, products,
     suppliers, inventory_stock, purchase_orders,
     housekeeping,
-    pos, billing # Add billing
+    pos, billing, # Add billing
+    reports, exports,
+    monitoring
 )
 
 api_router = APIRouter()
@@ -17,11 +19,14 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(rooms.router, prefix="/rooms", tags=["Rooms"])
 api_router.include_router(guests.router, prefix="/guests", tags=["Guests"])
 api_router.include_router(reservations.router, prefix="/reservations", tags=["Reservations"])
+api_router.include_router(room_rates.router, prefix="/room-rates", tags=["Room Rates"])
 api_router.include_router(housekeeping.router, prefix="/housekeeping", tags=["Housekeeping"])
 
 # Financial and Sales services
 api_router.include_router(billing.router, prefix="/billing", tags=["Billing & Folios"])
 api_router.include_router(pos.router, prefix="/pos", tags=["Point of Sale"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(exports.router, prefix="/exports", tags=["Exports"])
 
 # Product & Inventory services
 api_router.include_router(product_categories.router, prefix="/product-categories", tags=["Product Categories"])
@@ -29,3 +34,6 @@ api_router.include_router(products.router, prefix="/products", tags=["Products"]
 api_router.include_router(suppliers.router, prefix="/suppliers", tags=["Suppliers"])
 api_router.include_router(inventory_stock.router, prefix="/inventory-stock", tags=["Inventory Stock Management"])
 api_router.include_router(purchase_orders.router, prefix="/purchase-orders", tags=["Purchase Orders"])
+
+# Internal operational endpoints
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["Monitoring"])
@@ -12,15 +12,17 @@ from app.db import session as db_session # For get_db dependency
 router = APIRouter()
 
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), # Use OAuth2 form for username/password
     db: Session = Depends(db_session.get_db)
 ) -> Any:
     '''
     OAuth2 compatible token login, get an access token for future requests.
     Username is the email.
+    Async so that a burst of logins waits on the bounded password hashing pool without
+    holding request threads; answers 503 when that pool is saturated.
     '''
-    user = services.user_service.authenticate_user(
+    user = await services.user_service.authenticate_user_async(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
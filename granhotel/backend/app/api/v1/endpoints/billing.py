@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import date
@@ -7,8 +8,10 @@ import uuid
 from app import schemas, models, services
 from app.api import deps
 from app.db import session as db_session
+from app.services import aio
 from app.models.billing import FolioStatus, FolioTransactionType
 from app.models.user import UserRole
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -19,9 +22,11 @@ GUEST_NOT_FOUND = "Guest not found." # Added for consistency
 def read_folios_for_guest_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     guest_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     current_user: models.User = Depends(deps.get_current_active_user)
 ) -> Any:
     '''
@@ -36,16 +41,41 @@ def read_folios_for_guest_api(
     if not guest:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=GUEST_NOT_FOUND)
 
-    folios = services.billing_service.get_folios_for_guest(db, guest_id=guest_id, skip=skip, limit=limit)
+    folios = services.billing_service.get_folios_for_guest(db, guest_id=guest_id, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, folios, services.billing_service.FOLIO_LIST_ORDER, limit)
     return folios
 
-@router.post("/folios/guest/{guest_id}/get-or-create", response_model=schemas.billing.GuestFolio)
-def get_or_create_folio_for_guest_api(
+@router.get("/folios/guest/{guest_id}/summaries", response_model=List[schemas.billing.GuestFolioSummary])
+def read_folio_summaries_for_guest_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     guest_id: uuid.UUID,
-    reservation_id: Optional[int] = Body(None, embed=True),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    Folio headers and balances of a guest, without their transactions.
+    Accessible by Receptionist, Manager, Admin.
+    '''
+    if current_user.role not in [UserRole.RECEPTIONIST, UserRole.MANAGER, UserRole.ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions to view guest folios.")
+
+    folios = services.billing_service.get_folio_summaries(db, guest_id=guest_id, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, folios, services.billing_service.FOLIO_LIST_ORDER, limit)
+    return folios
+
+# Opening a folio, reading it and posting to it are async (get_async_db, app.services.aio):
+# their queries are awaited on the event loop instead of holding a threadpool worker.
+@router.post("/folios/guest/{guest_id}/get-or-create", response_model=schemas.billing.GuestFolio)
+async def get_or_create_folio_for_guest_api(
+    *,
+    db: AsyncSession = Depends(db_session.get_async_db),
+    guest_id: uuid.UUID,
+    reservation_id: Optional[int] = Body(None, embed=True),
+    current_user: models.User = Depends(deps.get_current_active_user_async)
 ) -> Any:
     '''
     Get an open folio for a guest (and optionally reservation), or create one if none exists.
@@ -58,18 +88,58 @@ def get_or_create_folio_for_guest_api(
     # and creator_user_id is not strictly needed by service if not auditing folio creation directly.
     # If auditing who initiated this get-or-create action, it could be passed.
     # The service's create_folio part doesn't use creator_user_id.
-    folio = services.billing_service.get_or_create_folio_for_guest(
+    folio = await aio.billing_service.get_or_create_folio_for_guest(
         db, guest_id=guest_id, reservation_id=reservation_id
     )
     return folio
 
 
-@router.get("/folios/{folio_id}", response_model=schemas.billing.GuestFolio)
-def read_folio_details_api(
+# Declared before /folios/{folio_id} routes
+@router.get("/folios/summaries", response_model=List[schemas.billing.GuestFolioSummary])
+def read_folio_summaries_api(
     *,
     db: Session = Depends(db_session.get_db),
-    folio_id: int,
+    response: Response,
+    folio_status: Optional[FolioStatus] = Query(FolioStatus.OPEN, alias="status", description="Folio status (default OPEN: in-house guests)"),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    Folio headers and balances with guest name and room number (front-desk dashboard), one row per
+    folio and no transactions. Accessible by Receptionist, Manager, Admin.
+    '''
+    if current_user.role not in [UserRole.RECEPTIONIST, UserRole.MANAGER, UserRole.ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions to view guest folios.")
+
+    folios = services.billing_service.get_folio_summaries(db, folio_status=folio_status, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, folios, services.billing_service.FOLIO_LIST_ORDER, limit)
+    return folios
+
+
+@router.post("/folios/reconcile", response_model=schemas.billing.FolioReconciliationReport)
+def reconcile_folio_totals_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    folio_status: Optional[FolioStatus] = Query(None, alias="status", description="Only check folios in this status (default: all)"),
+    fix: bool = Query(False, description="Reset drifted totals from the transaction ledger"),
+    current_user: models.User = Depends(deps.require_admin_user)
+) -> Any:
+    '''
+    Verify the stored folio totals (maintained incrementally on every posting) against the sums of
+    the folio transactions and report any drift. Meant to run periodically (e.g. nightly from cron).
+    Requires Admin role.
+    '''
+    return services.billing_service.reconcile_folio_totals(db, folio_status=folio_status, fix=fix)
+
+
+@router.get("/folios/{folio_id}", response_model=schemas.billing.GuestFolio)
+async def read_folio_details_api(
+    *,
+    db: AsyncSession = Depends(db_session.get_async_db),
+    folio_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async)
 ) -> Any:
     '''
     Retrieve detailed information for a specific guest folio, including all transactions.
@@ -79,7 +149,7 @@ def read_folio_details_api(
     if current_user.role not in [UserRole.RECEPTIONIST, UserRole.MANAGER, UserRole.ADMIN]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions to view folio details.")
 
-    folio = services.billing_service.get_folio_details(db, folio_id=folio_id)
+    folio = await aio.billing_service.get_folio_details(db, folio_id=folio_id)
     if not folio:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=FOLIO_NOT_FOUND)
 
@@ -92,13 +162,60 @@ def read_folio_details_api(
     return folio
 
 
-@router.post("/folios/{folio_id}/transactions", response_model=schemas.billing.GuestFolio, status_code=status.HTTP_201_CREATED)
-def add_transaction_to_folio_api(
+@router.get("/folios/{folio_id}/summary", response_model=schemas.billing.GuestFolioSummary)
+def read_folio_summary_api(
     *,
     db: Session = Depends(db_session.get_db),
     folio_id: int,
-    transaction_in: schemas.billing.FolioTransactionCreate,
     current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    Header and balance of a folio without its transactions (one query however long the stay).
+    Accessible by Receptionist, Manager, Admin.
+    '''
+    if current_user.role not in [UserRole.RECEPTIONIST, UserRole.MANAGER, UserRole.ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions to view guest folios.")
+
+    folio = services.billing_service.get_folio_summary(db, folio_id=folio_id)
+    if not folio:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=FOLIO_NOT_FOUND)
+    return folio
+
+
+@router.get("/folios/{folio_id}/transactions", response_model=List[schemas.billing.FolioTransactionLine])
+def read_folio_transactions_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    response: Response,
+    folio_id: int,
+    transaction_type: Optional[FolioTransactionType] = Query(None, description="Filter by transaction type"),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    One page of a folio's transactions in posting order. Accessible by Receptionist, Manager, Admin.
+    '''
+    if current_user.role not in [UserRole.RECEPTIONIST, UserRole.MANAGER, UserRole.ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions to view guest folios.")
+
+    if not services.billing_service.get_folio_summary(db, folio_id=folio_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=FOLIO_NOT_FOUND)
+    transactions = services.billing_service.get_folio_transactions(
+        db, folio_id=folio_id, transaction_type=transaction_type, skip=skip, limit=limit, cursor=cursor
+    )
+    pagination.set_next_cursor_header(response, transactions, services.billing_service.FOLIO_TRANSACTION_LIST_ORDER, limit)
+    return transactions
+
+
+@router.post("/folios/{folio_id}/transactions", response_model=schemas.billing.GuestFolio, status_code=status.HTTP_201_CREATED)
+async def add_transaction_to_folio_api(
+    *,
+    db: AsyncSession = Depends(db_session.get_async_db),
+    folio_id: int,
+    transaction_in: schemas.billing.FolioTransactionCreate,
+    current_user: models.User = Depends(deps.get_current_active_user_async)
 ) -> Any:
     '''
     Add a financial transaction (charge or payment) to a guest folio.
@@ -108,7 +225,7 @@ def add_transaction_to_folio_api(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions to post transactions.")
 
     # Service layer handles all validations (folio open, amounts, related entities)
-    updated_folio = services.billing_service.add_transaction_to_folio(
+    updated_folio = await aio.billing_service.add_transaction_to_folio(
         db, folio_id=folio_id, transaction_in=transaction_in, created_by_user_id=current_user.id
     )
     return updated_folio
@@ -135,3 +252,46 @@ def update_folio_status_api(
     if not updated_folio:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=FOLIO_NOT_FOUND)
     return updated_folio
+
+
+@router.post("/night-audit", response_model=schemas.billing.NightAuditRun)
+def run_night_audit_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    business_date: Optional[date] = Body(None, embed=True),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Run the night audit for a business date (default today): post the night's room charge for every
+    in-house reservation into its open folio. Calling it again resumes an interrupted or failed run;
+    a completed date answers 409. Requires Manager or Admin role.
+    '''
+    return services.night_audit_service.run_night_audit(
+        db, business_date=business_date or date.today(), started_by_user_id=current_user.id
+    )
+
+
+@router.get("/night-audit", response_model=List[schemas.billing.NightAuditRun])
+def read_night_audit_runs_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    skip: int = 0,
+    limit: int = 30,
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''Most recent night audit runs first. Requires Manager or Admin role.'''
+    return services.night_audit_service.get_night_audit_runs(db, skip=skip, limit=limit)
+
+
+@router.get("/night-audit/{business_date}", response_model=schemas.billing.NightAuditRun)
+def read_night_audit_run_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    business_date: date,
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''Progress, counters and timings of the night audit of a business date. Requires Manager or Admin role.'''
+    run = services.night_audit_service.get_night_audit_run(db, business_date=business_date)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No night audit run for {business_date}.")
+    return run
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Any, Callable, Optional
+from datetime import date
+import uuid
+
+from app import models, services
+from app.api import deps
+from app.db import session as db_session
+from app.models.billing import FolioTransactionType
+from app.models.inventory import StockMovementType
+from app.models.pos import POSSaleStatus, PaymentMethod
+
+router = APIRouter()
+
+FORMAT_QUERY = Query("csv", alias="format", description="csv, or parquet (needs the optional 'pyarrow' package)")
+
+
+def _export_response(session_factory: Callable, build_export: Callable, export_format: str, filename: str, **filters: Any) -> StreamingResponse:
+    services.export_service.check_export_format(export_format) # Before the 200 status line is sent
+    return StreamingResponse(
+        services.export_service.stream_export(session_factory, build_export, export_format=export_format, **filters),
+        media_type=services.export_service.EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+
+@router.get("/folio-transactions")
+def export_folio_transactions(
+    *,
+    session_factory: Callable = Depends(db_session.get_session_factory),
+    export_format: str = FORMAT_QUERY,
+    date_from: Optional[date] = Query(None, description="First transaction date, inclusive (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Last transaction date, inclusive (YYYY-MM-DD)"),
+    transaction_type: Optional[FolioTransactionType] = Query(None),
+    folio_id: Optional[int] = Query(None),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user_for_stream)
+) -> Any:
+    '''
+    Stream folio transactions as CSV or Parquet, in transaction date order. Requires Manager or Admin role.
+    '''
+    return _export_response(
+        session_factory, services.export_service.folio_transactions_export, export_format, "folio_transactions",
+        date_from=date_from, date_to=date_to, transaction_type=transaction_type, folio_id=folio_id
+    )
+
+
+@router.get("/pos-sales")
+def export_pos_sales(
+    *,
+    session_factory: Callable = Depends(db_session.get_session_factory),
+    export_format: str = FORMAT_QUERY,
+    date_from: Optional[date] = Query(None, description="First sale date, inclusive (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Last sale date, inclusive (YYYY-MM-DD)"),
+    sale_status: Optional[POSSaleStatus] = Query(None, alias="status"),
+    payment_method: Optional[PaymentMethod] = Query(None),
+    cashier_user_id: Optional[uuid.UUID] = Query(None),
+    guest_id: Optional[uuid.UUID] = Query(None),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user_for_stream)
+) -> Any:
+    '''
+    Stream POS sales (headers, without their items) as CSV or Parquet, in sale date order. Requires Manager or Admin role.
+    '''
+    return _export_response(
+        session_factory, services.export_service.pos_sales_export, export_format, "pos_sales",
+        date_from=date_from, date_to=date_to, sale_status=sale_status, payment_method=payment_method,
+        cashier_user_id=cashier_user_id, guest_id=guest_id
+    )
+
+
+@router.get("/stock-movements")
+def export_stock_movements(
+    *,
+    session_factory: Callable = Depends(db_session.get_session_factory),
+    export_format: str = FORMAT_QUERY,
+    date_from: Optional[date] = Query(None, description="First movement date, inclusive (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Last movement date, inclusive (YYYY-MM-DD)"),
+    movement_type: Optional[StockMovementType] = Query(None),
+    product_id: Optional[int] = Query(None),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user_for_stream)
+) -> Any:
+    '''
+    Stream stock movements as CSV or Parquet, in movement date order. Requires Manager or Admin role.
+    '''
+    return _export_response(
+        session_factory, services.export_service.stock_movements_export, export_format, "stock_movements",
+        date_from=date_from, date_to=date_to, movement_type=movement_type, product_id=product_id
+    )
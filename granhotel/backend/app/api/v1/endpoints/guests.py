@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 
@@ -6,6 +6,7 @@ from app import schemas
 from app import services # Will use app.services.guest_service
 from app.db import session as db_session # Corrected import for get_db
 from app.models.guest import DocumentType as GuestDocumentTypeModel # For query param enum
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -28,8 +29,10 @@ def create_new_guest( # Renamed to avoid conflict if importing *
 def read_all_guests( # Renamed
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     first_name: Optional[str] = Query(None, description="Filter by first name (case-insensitive partial match)"),
     last_name: Optional[str] = Query(None, description="Filter by last name (case-insensitive partial match)"),
     document_number: Optional[str] = Query(None, description="Filter by exact document number"),
@@ -41,11 +44,12 @@ def read_all_guests( # Renamed
     Supports pagination.
     '''
     guests = services.guest_service.get_guests(
-        db, skip=skip, limit=limit,
+        db, skip=skip, limit=limit, cursor=cursor,
         first_name=first_name, last_name=last_name,
         document_number=document_number, email=email,
         is_blacklisted=is_blacklisted
     )
+    pagination.set_next_cursor_header(response, guests, services.guest_service.GUEST_LIST_ORDER, limit)
     return guests
 
 @router.get("/{guest_id}", response_model=schemas.Guest)
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Any, Optional
-from datetime import date
+from typing import List, Any, Callable, Optional
+from datetime import date, timedelta
 import uuid
 
 from app import schemas, models, services
@@ -9,6 +10,7 @@ from app.api import deps
 from app.db import session as db_session
 from app.models.housekeeping import HousekeepingStatus, HousekeepingTaskType
 from app.models.user import UserRole
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -28,12 +30,117 @@ def create_new_housekeeping_log_api(
     )
     return new_log
 
+@router.post("/logs/generate", response_model=schemas.housekeeping.HousekeepingTaskGenerationResult)
+def generate_daily_housekeeping_tasks_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    scheduled_date: Optional[date] = Query(None, description="Day to generate the tasks for (default: today)"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Create the day's FULL_CLEAN (departures) and STAY_OVER_CLEAN (stay-overs) tasks for every occupied room.
+    Safe to run again: tasks that already exist are not duplicated.
+    Requires Manager or Admin role.
+    '''
+    return services.housekeeping_service.generate_daily_tasks(
+        db, scheduled_date=scheduled_date or date.today(), creator_user_id=current_user.id
+    )
+
+@router.post("/logs/auto-assign", response_model=schemas.housekeeping.HousekeepingAutoAssignResult)
+def auto_assign_housekeeping_tasks_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    scheduled_date: Optional[date] = Query(None, description="Day whose unassigned tasks are assigned (default: today)"),
+    dry_run: bool = Query(False, description="Only compute and return the plan"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Spread the day's unassigned pending tasks over the active housekeepers, balancing their workload
+    and keeping each one's rooms on as few floors as possible.
+    Requires Manager or Admin role.
+    '''
+    return services.housekeeping_service.auto_assign_tasks(
+        db, scheduled_date=scheduled_date or date.today(), updater_user_id=current_user.id, dry_run=dry_run
+    )
+
+@router.post("/logs/sync", response_model=schemas.housekeeping.HousekeepingStatusSyncResult)
+def sync_housekeeping_status_changes_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    sync_in: schemas.housekeeping.HousekeepingStatusSyncRequest,
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    Replay the timestamped status changes a tablet recorded while offline, in one transaction.
+    Returns the new state of the changed tasks only, and the changes that were rejected: conflicts
+    (changed on the server since, with its current state), tasks not found, or changes the user may not make.
+    Housekeepers can update their own tasks. Managers/Admins can update any.
+    '''
+    return services.housekeeping_service.sync_status_changes(db, sync_in=sync_in, user=current_user)
+
+@router.get("/stats", response_model=schemas.housekeeping.HousekeepingStatsReport)
+def read_housekeeping_stats_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    date_from: Optional[date] = Query(None, description="First completion day (default: 29 days before date_to)"),
+    date_to: Optional[date] = Query(None, description="Last completion day (default: today)"),
+    group_by: schemas.housekeeping.HousekeepingStatsGroupBy = Query(schemas.housekeeping.HousekeepingStatsGroupBy.TASK_TYPE),
+    task_type: Optional[HousekeepingTaskType] = Query(None, description="Filter by task type"),
+    housekeeper_user_id: Optional[uuid.UUID] = Query(None, description="Filter by housekeeper User ID"),
+    floor: Optional[int] = Query(None, description="Filter by room floor"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Clean time statistics (average, median, 90th percentile) of the completed tasks per task type,
+    housekeeper or floor, from the daily stats as of their last refresh.
+    Requires Manager or Admin role.
+    '''
+    date_to = date_to or date.today()
+    return services.housekeeping_stats_service.get_housekeeping_stats(
+        db, date_from=date_from or date_to - timedelta(days=29), date_to=date_to, group_by=group_by,
+        task_type=task_type, housekeeper_user_id=housekeeper_user_id, floor=floor
+    )
+
+@router.post("/stats/refresh", response_model=schemas.housekeeping.HousekeepingStatsRefreshResult)
+def refresh_housekeeping_stats_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    full: bool = Query(False, description="Rebuild every day instead of only the days changed since the last refresh"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Recompute the daily stats of the days whose tasks changed since the last refresh (meant to be
+    scheduled, e.g. every few minutes). Requires Manager or Admin role.
+    '''
+    return services.housekeeping_stats_service.refresh_housekeeping_stats(db, full=full)
+
+@router.get("/board/stream")
+async def stream_housekeeping_board_api(
+    *,
+    request: Request,
+    session_factory: Callable = Depends(db_session.get_session_factory),
+    scheduled_date: Optional[date] = Query(None, description="Day shown on the board (default: today)"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user_for_stream)
+) -> Any:
+    '''
+    Live supervisor board as Server-Sent Events: a `snapshot` event with the day's tasks, then a `task`
+    event whenever one of them is created, re-statused, (re)assigned or edited. Replaces polling the list.
+    Requires Manager or Admin role.
+    '''
+    return StreamingResponse(
+        services.housekeeping_board_service.stream_board(session_factory, scheduled_date or date.today(), request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"} # No proxy buffering of the events
+    )
+
 @router.get("/logs/", response_model=List[schemas.housekeeping.HousekeepingLog])
 def read_all_housekeeping_logs_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     room_id: Optional[int] = Query(None, description="Filter by Room ID"),
     assigned_to_user_id: Optional[uuid.UUID] = Query(None, description="Filter by assigned staff User ID"),
     status: Optional[HousekeepingStatus] = Query(None, description="Filter by task status"),
@@ -47,17 +154,20 @@ def read_all_housekeeping_logs_api(
     Requires Manager or Admin role.
     '''
     logs = services.housekeeping_service.get_housekeeping_logs(
-        db, skip=skip, limit=limit, room_id=room_id, assigned_to_user_id=assigned_to_user_id,
+        db, skip=skip, limit=limit, cursor=cursor, room_id=room_id, assigned_to_user_id=assigned_to_user_id,
         status=status, task_type=task_type, scheduled_date_from=scheduled_date_from, scheduled_date_to=scheduled_date_to
     )
+    pagination.set_next_cursor_header(response, logs, services.housekeeping_service.HOUSEKEEPING_LOG_LIST_ORDER, limit)
     return logs
 
 @router.get("/logs/staff/me", response_model=List[schemas.housekeeping.HousekeepingLog])
 def read_my_assigned_housekeeping_logs_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     status: Optional[HousekeepingStatus] = Query(None, description="Filter by task status"),
     scheduled_date_from: Optional[date] = Query(None, description="Filter by scheduled date (from)"),
     scheduled_date_to: Optional[date] = Query(None, description="Filter by scheduled date (to)"),
@@ -70,19 +180,22 @@ def read_my_assigned_housekeeping_logs_api(
          raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User does not have a role with housekeeping task access.")
 
     logs = services.housekeeping_service.get_housekeeping_logs(
-        db, skip=skip, limit=limit, assigned_to_user_id=current_user.id,
+        db, skip=skip, limit=limit, cursor=cursor, assigned_to_user_id=current_user.id,
         status=status, task_type=None,
         scheduled_date_from=scheduled_date_from, scheduled_date_to=scheduled_date_to
     )
+    pagination.set_next_cursor_header(response, logs, services.housekeeping_service.HOUSEKEEPING_LOG_LIST_ORDER, limit)
     return logs
 
 @router.get("/logs/room/{room_id}", response_model=List[schemas.housekeeping.HousekeepingLog])
 def read_room_housekeeping_logs_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     room_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     status: Optional[HousekeepingStatus] = Query(None, description="Filter by task status"),
     task_type: Optional[HousekeepingTaskType] = Query(None, description="Filter by task type"),
     scheduled_date_from: Optional[date] = Query(None, description="Filter by scheduled date (from)"),
@@ -91,10 +204,11 @@ def read_room_housekeeping_logs_api(
 ) -> Any:
     '''Retrieve housekeeping logs for a specific room. Requires Manager or Admin.'''
     logs = services.housekeeping_service.get_housekeeping_logs(
-        db, skip=skip, limit=limit, room_id=room_id,
+        db, skip=skip, limit=limit, cursor=cursor, room_id=room_id,
         status=status, task_type=task_type,
         scheduled_date_from=scheduled_date_from, scheduled_date_to=scheduled_date_to
     )
+    pagination.set_next_cursor_header(response, logs, services.housekeeping_service.HOUSEKEEPING_LOG_LIST_ORDER, limit)
     return logs
 
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import date
@@ -7,6 +7,7 @@ from app import schemas, models, services
 from app.api import deps
 from app.db import session as db_session
 from app.models.inventory import StockMovementType
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -98,23 +99,28 @@ def set_product_low_stock_threshold_api(
 def get_low_stock_items_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     current_user: models.User = Depends(deps.get_current_active_user)
 ) -> Any:
     '''
     Get a list of all inventory items that are currently at or below their low stock threshold.
     '''
-    low_stock_items = services.inventory_service.get_low_stock_items(db, skip=skip, limit=limit)
+    low_stock_items = services.inventory_service.get_low_stock_items(db, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, low_stock_items, services.inventory_service.LOW_STOCK_LIST_ORDER, limit)
     return low_stock_items
 
 @router.get("/products/{product_id}/history", response_model=List[schemas.inventory.StockMovement])
 def get_product_stock_movement_history_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     product_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     date_from: Optional[date] = Query(None, description="Filter history from this date (YYYY-MM-DD)"),
     date_to: Optional[date] = Query(None, description="Filter history up to this date (YYYY-MM-DD)"),
     movement_type: Optional[StockMovementType] = Query(None, description="Filter by a specific movement type"),
@@ -128,6 +134,36 @@ def get_product_stock_movement_history_api(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product with ID {product_id} not found.")
 
     history = services.inventory_service.get_stock_movement_history(
-        db, product_id=product_id, skip=skip, limit=limit, date_from=date_from, date_to=date_to, movement_type=movement_type
+        db, product_id=product_id, skip=skip, limit=limit, cursor=cursor, date_from=date_from, date_to=date_to, movement_type=movement_type
     )
+    pagination.set_next_cursor_header(response, history, services.inventory_service.STOCK_MOVEMENT_LIST_ORDER, limit)
     return history
+
+
+@router.post("/snapshots", response_model=schemas.inventory.StockSnapshotRunResult)
+def take_stock_snapshots_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    snapshot_date: Optional[date] = Query(None, description="Day to snapshot, must have ended (default: yesterday, UTC)"),
+    start_date: Optional[date] = Query(None, description="Backfill every day from this date up to snapshot_date"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Write end-of-day stock snapshots, normally once a day from a scheduler. Requires Manager or Admin role.
+    '''
+    return services.inventory_service.take_stock_snapshots(db, snapshot_date=snapshot_date, start_date=start_date)
+
+@router.get("/valuation", response_model=schemas.inventory.StockValuationReport)
+def get_stock_valuation_api(
+    *,
+    db: Session = Depends(db_session.get_db),
+    as_of_date: date = Query(..., description="Value the stock at the end of this day (YYYY-MM-DD, UTC)"),
+    category_id: Optional[int] = Query(None, description="Only products of this category"),
+    include_zero: bool = Query(False, description="Also list products with no stock on that day"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Point-in-time stock per product with its cost and retail value, e.g. for month-end inventory valuation.
+    Requires Manager or Admin role.
+    '''
+    return services.inventory_service.get_stock_valuation(db, as_of_date=as_of_date, category_id=category_id, include_zero=include_zero)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends
+from typing import Any, List
+import os
+
+from app import schemas, models
+from app.api import deps
+from app.db import session as db_session
+from app.core.cache import caches
+from app.core.password_hashing import password_hasher
+from app.db.pool import get_pool_statistics
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=schemas.DBPoolReport)
+def read_db_pool_statistics(
+    current_user: models.User = Depends(deps.require_admin_user)
+) -> Any:
+    '''
+    Live connection pool state and counters (checkouts, timeouts, checkout wait histogram) of the
+    worker process that serves this request. Use it to size DB_POOL_SIZE/DB_MAX_OVERFLOW against the
+    uvicorn worker count. Requires Admin role.
+    '''
+    return {
+        "pid": os.getpid(),
+        "pools": get_pool_statistics({"sync": db_session.engine, "async": db_session.async_engine.sync_engine})
+    }
+
+@router.get("/caches", response_model=List[schemas.CacheStatistics])
+def read_cache_statistics(
+    current_user: models.User = Depends(deps.require_admin_user)
+) -> Any:
+    '''Hit/miss counters of the application caches (e.g. the auth user cache) in this worker process. Requires Admin role.'''
+    return [cache.stats() for cache in caches.values()]
+
+@router.get("/password-hashing", response_model=schemas.PasswordHashingStatistics)
+def read_password_hashing_statistics(
+    current_user: models.User = Depends(deps.require_admin_user)
+) -> Any:
+    '''Queue depth, throughput and rejections of the password hashing pool in this worker process. Requires Admin role.'''
+    return password_hasher.stats()
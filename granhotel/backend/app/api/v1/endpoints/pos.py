@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any, Optional
 from datetime import date
 import uuid
@@ -7,17 +7,22 @@ import uuid
 from app import schemas, models, services
 from app.api import deps
 from app.db import session as db_session
+from app.services import aio
 from app.models.pos import POSSaleStatus, PaymentMethod
 from app.models.user import UserRole
+from app.utils import pagination
 
 router = APIRouter()
 
+# The sale endpoints are async (get_async_db, app.services.aio): their queries are awaited on the
+# event loop instead of holding a threadpool worker.
+
 @router.post("/sales/", response_model=schemas.pos.POSSale, status_code=status.HTTP_201_CREATED)
-def create_new_pos_sale_api(
+async def create_new_pos_sale_api(
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     sale_in: schemas.pos.POSSaleCreate,
-    current_user: models.User = Depends(deps.get_current_active_user)
+    current_user: models.User = Depends(deps.get_current_active_user_async)
 ) -> Any:
     '''
     Create a new Point of Sale transaction.
@@ -30,48 +35,51 @@ def create_new_pos_sale_api(
             detail="User does not have permission to create POS sales."
         )
 
-    new_sale = services.pos_service.create_pos_sale(
-        db=db, sale_in=sale_in, cashier_user_id=current_user.id
+    new_sale = await aio.pos_service.create_pos_sale(
+        db, sale_in=sale_in, cashier_user_id=current_user.id
     )
     return new_sale
 
 @router.get("/sales/", response_model=List[schemas.pos.POSSale])
-def read_all_pos_sales_api(
+async def read_all_pos_sales_api(
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     cashier_user_id: Optional[uuid.UUID] = Query(None, description="Filter by Cashier (User ID)"),
     guest_id: Optional[uuid.UUID] = Query(None, description="Filter by Guest ID"),
     status: Optional[POSSaleStatus] = Query(None, description="Filter by sale status"),
     payment_method: Optional[PaymentMethod] = Query(None, description="Filter by payment method"),
     date_from: Optional[date] = Query(None, description="Filter sales on or after this date (YYYY-MM-DD)"),
     date_to: Optional[date] = Query(None, description="Filter sales on or before this date (YYYY-MM-DD)"),
-    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+    current_user: models.User = Depends(deps.require_manager_or_admin_user_async)
 ) -> Any:
     '''
     Retrieve all Point of Sale transactions with optional filters.
     Requires Manager or Admin role.
     '''
-    sales = services.pos_service.get_pos_sales(
-        db, skip=skip, limit=limit, cashier_user_id=cashier_user_id, guest_id=guest_id,
+    sales = await aio.pos_service.get_pos_sales(
+        db, skip=skip, limit=limit, cursor=cursor, cashier_user_id=cashier_user_id, guest_id=guest_id,
         status=status, payment_method=payment_method, date_from=date_from, date_to=date_to
     )
+    pagination.set_next_cursor_header(response, sales, services.pos_service.POS_SALE_LIST_ORDER, limit)
     return sales
 
 @router.get("/sales/{sale_id}", response_model=schemas.pos.POSSale)
-def read_single_pos_sale_api(
+async def read_single_pos_sale_api(
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     sale_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user)
+    current_user: models.User = Depends(deps.get_current_active_user_async)
 ) -> Any:
     '''
     Retrieve a specific Point of Sale transaction by its ID.
     Includes items, products, cashier, and guest details.
     Receptionist can only view their own sales unless they are also Manager/Admin.
     '''
-    sale = services.pos_service.get_pos_sale(db, sale_id=sale_id)
+    sale = await aio.pos_service.get_pos_sale(db, sale_id=sale_id)
     if not sale:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="POS Sale not found")
 
@@ -82,12 +90,12 @@ def read_single_pos_sale_api(
     return sale
 
 @router.post("/sales/{sale_id}/void", response_model=schemas.pos.POSSale)
-def void_pos_sale_api(
+async def void_pos_sale_api(
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     sale_id: int,
     void_in: schemas.pos.POSSaleVoid,
-    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+    current_user: models.User = Depends(deps.require_manager_or_admin_user_async)
 ) -> Any:
     '''
     Void a Point of Sale transaction. Requires Manager or Admin role.
@@ -95,7 +103,7 @@ def void_pos_sale_api(
     Note: This does NOT automatically re-adjust stock.
     '''
     # Service layer handles if sale exists and if it can be voided.
-    voided_sale = services.pos_service.void_pos_sale(
+    voided_sale = await aio.pos_service.void_pos_sale(
         db, sale_id=sale_id, reason=void_in.void_reason, voiding_user_id=current_user.id
     )
     if not voided_sale: # Should be caught by service, but as a safeguard if service returns None for not found
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app import schemas, models, services
 from app.api import deps # For authentication/authorization
 from app.db import session as db_session
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -24,12 +25,15 @@ def create_new_product_category(
 def read_all_product_categories(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     current_user: models.User = Depends(deps.get_current_active_user) # Open to any active user
 ) -> Any:
     '''Retrieve all product categories.'''
-    categories = services.product_service.get_all_product_categories(db=db, skip=skip, limit=limit)
+    categories = services.product_service.get_all_product_categories(db=db, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, categories, services.product_service.PRODUCT_CATEGORY_LIST_ORDER, limit)
     return categories
 
 @router.get("/{category_id}", response_model=schemas.ProductCategory)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any, Dict # Added Dict
 from decimal import Decimal # Added Decimal
@@ -6,6 +6,7 @@ from decimal import Decimal # Added Decimal
 from app import schemas, models, services
 from app.api import deps
 from app.db import session as db_session
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -25,8 +26,10 @@ def create_new_product(
 def read_all_products(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
     name: Optional[str] = Query(None, description="Filter by product name (case-insensitive partial match)"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
@@ -35,10 +38,33 @@ def read_all_products(
 ) -> Any:
     '''Retrieve all products with optional filters.'''
     products = services.product_service.get_products(
-        db, skip=skip, limit=limit, category_id=category_id, name=name, is_active=is_active, taxable=taxable
+        db, skip=skip, limit=limit, cursor=cursor, category_id=category_id, name=name, is_active=is_active, taxable=taxable
     )
+    pagination.set_next_cursor_header(response, products, services.product_service.PRODUCT_LIST_ORDER, limit)
     return products
 
+# Declared before /{product_id} so "catalog" is not parsed as a product ID
+@router.get("/catalog", response_model=schemas.ProductCatalog, responses={304: {"description": "Catalog unchanged since the given ETag"}})
+def read_product_catalog(
+    *,
+    db: Session = Depends(db_session.get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    The full active menu (categories and products with tax-inclusive unit prices) for POS terminals,
+    served from the catalog cache. Send the last ETag as If-None-Match: while the catalog is
+    unchanged the answer is an empty 304, so terminals download the menu only after it changes.
+    '''
+    snapshot = services.product_service.get_product_catalog(db)
+    etag = f'"{snapshot.version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"} # Clients may keep it but must revalidate
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return services.product_service.product_catalog_payload(snapshot)
+
 @router.get("/{product_id}", response_model=schemas.Product)
 def read_single_product(
     *,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import date
@@ -7,6 +7,7 @@ from app import schemas, models, services
 from app.api import deps
 from app.db import session as db_session
 from app.models.inventory import PurchaseOrderStatus
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -29,8 +30,10 @@ def create_new_purchase_order_api(
 def read_all_purchase_orders_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     supplier_id: Optional[int] = Query(None, description="Filter by Supplier ID"),
     status: Optional[PurchaseOrderStatus] = Query(None, description="Filter by PO status"),
     order_date_from: Optional[date] = Query(None, description="Filter POs on or after this order date"),
@@ -41,9 +44,10 @@ def read_all_purchase_orders_api(
     Retrieve all purchase orders with optional filters and pagination.
     '''
     purchase_orders = services.purchase_order_service.get_all_purchase_orders(
-        db, skip=skip, limit=limit, supplier_id=supplier_id, status=status,
+        db, skip=skip, limit=limit, cursor=cursor, supplier_id=supplier_id, status=status,
         order_date_from=order_date_from, order_date_to=order_date_to
     )
+    pagination.set_next_cursor_header(response, purchase_orders, services.purchase_order_service.PURCHASE_ORDER_LIST_ORDER, limit)
     return purchase_orders
 
 @router.get("/{po_id}", response_model=schemas.inventory.PurchaseOrder)
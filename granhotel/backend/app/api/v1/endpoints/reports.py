@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+from datetime import date
+
+from app import schemas, models, services
+from app.api import deps
+from app.db import session as db_session
+
+router = APIRouter()
+
+@router.get("/occupancy", response_model=schemas.OccupancyReport)
+def read_occupancy_report(
+    *,
+    db: Session = Depends(db_session.get_db),
+    start_date: date = Query(..., description="First stay date of the report (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Last stay date of the report, inclusive (YYYY-MM-DD)"),
+    granularity: schemas.ReportGranularity = Query(schemas.ReportGranularity.DAY, description="Group by day, week or month"),
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Occupancy %, ADR and RevPAR per period, read from the pre-aggregated daily occupancy facts.
+    Requires Manager or Admin role.
+    '''
+    return services.analytics_service.get_occupancy_report(db, start_date=start_date, end_date=end_date, granularity=granularity)
+
+@router.post("/occupancy/rebuild", response_model=schemas.OccupancyFactsRebuildResult)
+def rebuild_occupancy_facts(
+    *,
+    db: Session = Depends(db_session.get_db),
+    start_date: Optional[date] = Query(None, description="First stay date to rebuild (default: all)"),
+    end_date: Optional[date] = Query(None, description="Last stay date to rebuild, inclusive (default: all)"),
+    current_user: models.User = Depends(deps.require_admin_user)
+) -> Any:
+    '''
+    Recompute the daily occupancy facts from the reservations table, e.g. after a manual data fix.
+    Requires Admin role.
+    '''
+    days_written = services.analytics_service.rebuild_daily_occupancy_facts(db, start_date=start_date, end_date=end_date)
+    return {"days_written": days_written}
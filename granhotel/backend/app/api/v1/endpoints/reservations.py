@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 from datetime import date
@@ -6,14 +7,18 @@ from datetime import date
 from app import schemas
 from app import services # Will use app.services.reservation_service
 from app.db import session as db_session
+from app.services import aio
 from app.models.reservation import ReservationStatus # For query param enum
+from app.utils import pagination
 
 router = APIRouter()
 
+# The booking, listing and status endpoints are async (get_async_db, app.services.aio): their queries
+# are awaited on the event loop instead of holding a threadpool worker.
 @router.post("/", response_model=schemas.Reservation, status_code=status.HTTP_201_CREATED)
-def create_new_reservation_api( # Renamed to avoid conflict
+async def create_new_reservation_api( # Renamed to avoid conflict
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     reservation_in: schemas.ReservationCreate,
 ) -> Any:
     '''
@@ -21,15 +26,30 @@ def create_new_reservation_api( # Renamed to avoid conflict
     - Checks guest validity, room availability, and calculates price.
     '''
     # Service layer (create_reservation) handles HTTPExceptions for business logic errors
-    reservation = services.reservation_service.create_reservation(db=db, reservation_in=reservation_in)
+    reservation = await aio.reservation_service.create_reservation(db, reservation_in=reservation_in)
     return reservation
 
-@router.get("/", response_model=List[schemas.Reservation])
-def read_all_reservations_api( # Renamed
+@router.post("/batch", response_model=schemas.ReservationBatchResult)
+def create_reservations_batch_api(
     *,
     db: Session = Depends(db_session.get_db),
+    batch_in: schemas.ReservationBatchCreate,
+) -> Any:
+    '''
+    Import a batch of reservations (group blocks, OTA/channel-manager feeds) in one transaction.
+    Each row is reported as `created`, `conflict` (room not available) or `invalid` (unknown/blacklisted guest, unknown room);
+    failed rows do not prevent the valid ones from being created.
+    '''
+    return services.reservation_service.create_reservations_batch(db=db, reservations_in=batch_in.reservations)
+
+@router.get("/", response_model=List[schemas.Reservation])
+async def read_all_reservations_api( # Renamed
+    *,
+    db: AsyncSession = Depends(db_session.get_async_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     guest_id: Optional[int] = Query(None, description="Filter by Guest ID"),
     room_id: Optional[int] = Query(None, description="Filter by Room ID"),
     status: Optional[ReservationStatus] = Query(None, description="Filter by reservation status"),
@@ -41,24 +61,48 @@ def read_all_reservations_api( # Renamed
     Supports pagination. Dates `date_from` and `date_to` define a period;
     reservations active within any part of this period are returned.
     '''
-    reservations = services.reservation_service.get_reservations(
-        db, skip=skip, limit=limit,
+    reservations = await aio.reservation_service.get_reservations(
+        db, skip=skip, limit=limit, cursor=cursor,
         guest_id=guest_id, room_id=room_id, status=status,
         date_from=date_from, date_to=date_to
     )
+    pagination.set_next_cursor_header(response, reservations, services.reservation_service.RESERVATION_LIST_ORDER, limit)
     return reservations
 
+@router.get("/availability", response_model=List[schemas.Room])
+async def search_room_availability_api(
+    *,
+    db: AsyncSession = Depends(db_session.get_async_db),
+    check_in_date: date = Query(..., description="Check-in date (YYYY-MM-DD)"),
+    check_out_date: date = Query(..., description="Check-out date (YYYY-MM-DD), exclusive"),
+    room_type: Optional[str] = Query(None, description="Filter by room type"),
+    floor: Optional[int] = Query(None, description="Filter by floor"),
+    building: Optional[str] = Query(None, description="Filter by building"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum nightly price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum nightly price"),
+) -> Any:
+    '''
+    Search all rooms that are free for the given check-in/check-out window.
+    Answered with a single set-based query, so it is cheap enough to call on every date picker change.
+    '''
+    rooms = await aio.reservation_service.search_available_rooms(
+        db, check_in_date=check_in_date, check_out_date=check_out_date,
+        room_type=room_type, floor=floor, building=building,
+        min_price=min_price, max_price=max_price
+    )
+    return rooms
+
 @router.get("/{reservation_id}", response_model=schemas.Reservation)
-def read_single_reservation_api( # Renamed
+async def read_single_reservation_api( # Renamed
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     reservation_id: int,
 ) -> Any:
     '''
     Retrieve a specific reservation by its ID.
     Includes guest and room details.
     '''
-    reservation = services.reservation_service.get_reservation(db, reservation_id=reservation_id)
+    reservation = await aio.reservation_service.get_reservation(db, reservation_id=reservation_id)
     if not reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     return reservation
@@ -83,9 +127,9 @@ def update_existing_reservation_api( # Renamed
     return updated_reservation
 
 @router.patch("/{reservation_id}/status", response_model=schemas.Reservation)
-def update_reservation_status_api(
+async def update_reservation_status_api(
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     reservation_id: int,
     new_status: ReservationStatus = Query(..., description="The new status for the reservation"),
 ) -> Any:
@@ -93,23 +137,23 @@ def update_reservation_status_api(
     Update the status of a specific reservation.
     (e.g., PENDING -> CONFIRMED, CONFIRMED -> CHECKED_IN)
     '''
-    updated_reservation = services.reservation_service.update_reservation_status(
-        db=db, reservation_id=reservation_id, new_status=new_status
+    updated_reservation = await aio.reservation_service.update_reservation_status(
+        db, reservation_id=reservation_id, new_status=new_status
     )
     if not updated_reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found for status update")
     return updated_reservation
 
 @router.post("/{reservation_id}/cancel", response_model=schemas.Reservation) # Using POST for cancellation as it's a significant state change
-def cancel_existing_reservation_api( # Renamed
+async def cancel_existing_reservation_api( # Renamed
     *,
-    db: Session = Depends(db_session.get_db),
+    db: AsyncSession = Depends(db_session.get_async_db),
     reservation_id: int,
 ) -> Any:
     '''
     Cancel a reservation. Sets status to CANCELLED.
     '''
-    cancelled_reservation = services.reservation_service.cancel_reservation(db=db, reservation_id=reservation_id)
+    cancelled_reservation = await aio.reservation_service.cancel_reservation(db, reservation_id=reservation_id)
     if not cancelled_reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found for cancellation")
     return cancelled_reservation
@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional, Any
+from datetime import date
+
+from app import schemas, models, services
+from app.api import deps
+from app.db import session as db_session
+from app.utils import pagination
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.RoomRate, status_code=status.HTTP_201_CREATED)
+def create_new_room_rate(
+    *,
+    db: Session = Depends(db_session.get_db),
+    rate_in: schemas.RoomRateCreate,
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Create a seasonal and/or day-of-week rate for a room type. Requires Manager or Admin role.
+    Rate writes reach the pricing cache of every worker once committed, through the event relay. A worker
+    with `PRICING_CACHE_RELAY_ENABLED=false` keeps quoting cached rates for up to `PRICING_CACHE_TTL_SECONDS`.
+    '''
+    return services.pricing_service.create_room_rate(db=db, rate_in=rate_in)
+
+@router.get("/", response_model=List[schemas.RoomRate])
+def read_all_room_rates(
+    *,
+    db: Session = Depends(db_session.get_db),
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
+    room_type: Optional[str] = Query(None, description="Filter by room type"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''Retrieve rate plan entries, highest priority first within each room type.'''
+    rates = services.pricing_service.get_room_rates(db, skip=skip, limit=limit, cursor=cursor, room_type=room_type, is_active=is_active)
+    pagination.set_next_cursor_header(response, rates, services.pricing_service.ROOM_RATE_LIST_ORDER, limit)
+    return rates
+
+@router.get("/quote", response_model=List[schemas.RoomStayQuote])
+def quote_room_stays(
+    *,
+    db: Session = Depends(db_session.get_db),
+    check_in_date: date = Query(..., description="Check-in date (YYYY-MM-DD)"),
+    max_nights: int = Query(30, ge=1, le=90, description="Quote stays of 1..max_nights nights"),
+    room_type: Optional[str] = Query(None, description="Only quote rooms of this type"),
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''
+    Price grid for the availability view: for each room, the total of every stay length from 1 to
+    `max_nights` nights starting on `check_in_date`. Served from the cached rate calendar, which rate
+    writes invalidate in every worker (see the rate write endpoints).
+    '''
+    query = db.query(models.Room)
+    if room_type:
+        query = query.filter(models.Room.type == room_type)
+    rooms = query.order_by(models.Room.room_number).all()
+    return services.pricing_service.quote_stay_lengths(db, rooms=rooms, check_in_date=check_in_date, max_nights=max_nights)
+
+@router.get("/{rate_id}", response_model=schemas.RoomRate)
+def read_single_room_rate(
+    *,
+    db: Session = Depends(db_session.get_db),
+    rate_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Any:
+    '''Retrieve a specific rate by ID.'''
+    rate = services.pricing_service.get_room_rate(db, rate_id=rate_id)
+    if not rate:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room rate not found")
+    return rate
+
+@router.put("/{rate_id}", response_model=schemas.RoomRate)
+def update_existing_room_rate(
+    *,
+    db: Session = Depends(db_session.get_db),
+    rate_id: int,
+    rate_in: schemas.RoomRateUpdate,
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Update a rate. Requires Manager or Admin role.
+    Rate writes reach the pricing cache of every worker once committed, through the event relay. A worker
+    with `PRICING_CACHE_RELAY_ENABLED=false` keeps quoting cached rates for up to `PRICING_CACHE_TTL_SECONDS`.
+    '''
+    rate_db_obj = services.pricing_service.get_room_rate(db, rate_id=rate_id)
+    if not rate_db_obj:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room rate not found for update")
+    return services.pricing_service.update_room_rate(db=db, rate_db_obj=rate_db_obj, rate_in=rate_in)
+
+@router.delete("/{rate_id}", response_model=schemas.RoomRate)
+def delete_existing_room_rate(
+    *,
+    db: Session = Depends(db_session.get_db),
+    rate_id: int,
+    current_user: models.User = Depends(deps.require_manager_or_admin_user)
+) -> Any:
+    '''
+    Delete a rate. Requires Manager or Admin role. Prefer `is_active=false` to keep history.
+    Rate writes reach the pricing cache of every worker once committed, through the event relay. A worker
+    with `PRICING_CACHE_RELAY_ENABLED=false` keeps quoting cached rates for up to `PRICING_CACHE_TTL_SECONDS`.
+    '''
+    rate = services.pricing_service.delete_room_rate(db, rate_id=rate_id)
+    if not rate:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room rate not found for deletion")
+    return rate
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 # Corrected relative imports assuming 'backend' is the root for PYTHONPATH
 from app import schemas
 from app import models
 from app.db import session as db_session
 from app.services import room_service
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -27,11 +28,14 @@ def create_room(
 
 @router.get("/", response_model=List[schemas.Room])
 def read_rooms(
+    response: Response,
     db: Session = Depends(db_session.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
 ) -> List[models.Room]: # Added type hint for return
-    rooms = room_service.get_rooms(db, skip=skip, limit=limit)
+    rooms = room_service.get_rooms(db, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, rooms, room_service.ROOM_LIST_ORDER, limit)
     return rooms
 
 @router.get("/{room_id}", response_model=schemas.Room)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app import schemas, models, services
 from app.api import deps # For authentication/authorization
 from app.db import session as db_session
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -26,14 +27,17 @@ def create_new_supplier_api(
 def read_all_suppliers_api(
     *,
     db: Session = Depends(db_session.get_db),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     current_user: models.User = Depends(deps.get_current_active_user) # Any active user can view suppliers
 ) -> Any:
     '''
     Retrieve all suppliers.
     '''
-    suppliers = services.supplier_service.get_all_suppliers(db=db, skip=skip, limit=limit)
+    suppliers = services.supplier_service.get_all_suppliers(db=db, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor_header(response, suppliers, services.supplier_service.SUPPLIER_LIST_ORDER, limit)
     return suppliers
 
 @router.get("/{supplier_id}", response_model=schemas.inventory.Supplier)
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 import uuid
 
 from app import schemas, models, services
 from app.api import deps # Import dependencies
 from app.db import session as db_session # For get_db, though deps handle it
 from app.models.user import UserRole # For Query parameter type hint
+from app.utils import pagination
 
 router = APIRouter()
 
@@ -35,15 +36,18 @@ def read_current_user_me_api(
 
 @router.get("/", response_model=List[schemas.User]) # Moved before /me and /{user_id} to avoid path conflicts if path parameters were less specific
 def list_all_users_api(
+    response: Response,
     db: Session = Depends(db_session.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: the X-Next-Cursor header of the previous page (replaces skip)"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"), # Added Optional
     role: Optional[UserRole] = Query(None, description="Filter by user role"), # Added Optional
     current_admin: models.User = Depends(deps.require_admin_user)
 ):
     '''List all users. (Admin access) With optional filters for active status and role.'''
-    users = services.user_service.get_users(db, skip=skip, limit=limit, is_active=is_active, role=role)
+    users = services.user_service.get_users(db, skip=skip, limit=limit, cursor=cursor, is_active=is_active, role=role)
+    pagination.set_next_cursor_header(response, users, services.user_service.USER_LIST_ORDER, limit)
     return users
 
 @router.get("/{user_id}", response_model=schemas.User)
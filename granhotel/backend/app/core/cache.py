@@ -0,0 +1,179 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+try: # Optional dependency: only needed when CACHE_REDIS_URL is set
+    import redis
+except ImportError: # pragma: no cover
+    redis = None
+
+
+class TTLCache:
+    '''
+    Thread-safe in-process LRU cache whose entries expire `ttl_seconds` after they were stored.
+    Each worker process has its own copy, so a delete only reaches the process that makes it;
+    other processes see the change once their entry expires.
+
+    A value read from the database while the row is being changed may already be stale when it
+    is stored. To avoid caching it, take generation(key) before the read and store with
+    set_if_unchanged(): the store is refused if the key was deleted in between.
+    '''
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict() # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._clock = 0 # Bumped by every delete
+        self._deleted_at: "OrderedDict[Hashable, int]" = OrderedDict() # key -> clock of its last delete, the latest max_entries keys
+        self._forgotten_deletes_at = 0 # Clock of the latest delete dropped from _deleted_at; applies to every other key
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return # Caching disabled
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False) # Evict the least recently used entry
+
+    def generation(self, key: Hashable) -> int:
+        '''Token for set_if_unchanged, taken before reading the value to cache.'''
+        with self._lock:
+            return self._clock
+
+    def set_if_unchanged(self, key: Hashable, value: Any, generation: int) -> bool:
+        '''set(), unless the key was deleted since generation(key) returned `generation`.'''
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return False
+        with self._lock:
+            if self._deleted_at.get(key, self._forgotten_deletes_at) > generation:
+                return False
+            self._store(key, value)
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._clock += 1
+            self._deleted_at[key] = self._clock
+            self._deleted_at.move_to_end(key)
+            while len(self._deleted_at) > max(self.max_entries, 1):
+                _, self._forgotten_deletes_at = self._deleted_at.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._clock += 1
+            self._deleted_at.clear()
+            self._forgotten_deletes_at = self._clock
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"name": self.name, "backend": "memory", "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class RedisTTLCache(TTLCache):
+    '''
+    The same interface backed by a Redis-compatible server shared by all worker processes, so a
+    delete is seen everywhere at once. Values are pickled: point it only at a trusted, local server.
+    Generations are per-key counters that delete increments. set_if_unchanged compares and stores
+    in one server-side script.
+    '''
+
+    # Counters outlive any value's TTL by far; one that expires only makes a pending store be refused
+    GENERATION_TTL_SECONDS = 86400
+
+    _SET_IF_UNCHANGED_SCRIPT = """
+        if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then return 0 end
+        redis.call('SET', KEYS[2], ARGV[2], 'PX', ARGV[3])
+        return 1
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, client: Any, max_entries: int = 1024):
+        super().__init__(name, ttl_seconds, max_entries)
+        self._client = client
+
+    def _key(self, key: Hashable) -> str:
+        return f"granhotel:{self.name}:{key}"
+
+    def _generation_key(self, key: Hashable) -> str:
+        return f"granhotel-generation:{self.name}:{key}" # Outside _key("*"), so clear() keeps the counters
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raw = self._client.get(self._key(key))
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._client.set(self._key(key), pickle.dumps(value), px=int(self.ttl_seconds * 1000))
+
+    def generation(self, key: Hashable) -> int:
+        return int(self._client.get(self._generation_key(key)) or 0)
+
+    def set_if_unchanged(self, key: Hashable, value: Any, generation: int) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        return bool(self._client.eval(
+            self._SET_IF_UNCHANGED_SCRIPT, 2, self._generation_key(key), self._key(key),
+            str(generation), pickle.dumps(value), int(self.ttl_seconds * 1000)
+        ))
+
+    def delete(self, key: Hashable) -> None:
+        pipeline = self._client.pipeline()
+        pipeline.incr(self._generation_key(key))
+        pipeline.expire(self._generation_key(key), self.GENERATION_TTL_SECONDS)
+        pipeline.delete(self._key(key))
+        pipeline.execute()
+
+    def clear(self) -> None:
+        for redis_key in self._client.scan_iter(match=self._key("*")):
+            self._client.delete(redis_key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"name": self.name, "backend": "redis", "entries": None, "hits": self.hits, "misses": self.misses}
+
+
+# Every cache built by build_cache, by name (for the monitoring endpoint)
+caches: Dict[str, TTLCache] = {}
+
+
+def build_cache(name: str, ttl_seconds: float, max_entries: int = 1024) -> TTLCache:
+    '''An in-process TTLCache, or a RedisTTLCache when CACHE_REDIS_URL is configured.'''
+    if settings.CACHE_REDIS_URL:
+        if redis is None:
+            raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' package is not installed.")
+        cache: TTLCache = RedisTTLCache(name, ttl_seconds, redis.Redis.from_url(settings.CACHE_REDIS_URL), max_entries)
+    else:
+        cache = TTLCache(name, ttl_seconds, max_entries)
+    caches[name] = cache
+    return cache
@@ -6,6 +6,20 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Gran Hotel API"
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://user:password@db/granhoteldb")
+    # URL of the asyncio engine (asyncpg). Empty = DATABASE_URL with its driver switched to asyncpg
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+
+    # Connection pool, per engine and per worker process (each uvicorn worker has its own pools)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    # Replace connections older than this (-1 = never), e.g. below a proxy/firewall idle cutoff
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    # Liveness check on checkout: "always" (one extra round trip per checkout), "idle" (only for
+    # connections idle longer than DB_POOL_PRE_PING_IDLE_SECONDS) or "never"
+    DB_POOL_PRE_PING: str = os.getenv("DB_POOL_PRE_PING", "idle")
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = float(os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", "60"))
 
     # Localization and Timezone
     DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "es_PE")
@@ -28,6 +42,73 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+    # Password hashing: bcrypt cost factor (hashes with another cost are rehashed on the next login),
+    # and the dedicated pool that runs bcrypt off the request threads. At most
+    # PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE operations are accepted at once; beyond that
+    # requests fail fast with 503. PASSWORD_HASH_EXECUTOR is "thread" (bcrypt releases the GIL) or "process".
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+
+    # Authenticated requests reuse the token's user for this long instead of reading it from the DB
+    # (0 disables the cache). Also the longest a role change/deactivation can lag on other workers
+    # when the cache is in-process.
+    AUTH_USER_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30"))
+    AUTH_USER_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "4096"))
+
+    # Shared caches: a Redis-compatible server (e.g. redis://localhost:6379/0) used instead of
+    # per-process memory, so invalidations reach every worker immediately. Requires the `redis` package.
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "")
+
+    # Reservations
+    # Max age of the per-process room availability bitmap before it is rebuilt from the DB (0 = never expire)
+    AVAILABILITY_INDEX_TTL_SECONDS: int = int(os.getenv("AVAILABILITY_INDEX_TTL_SECONDS", "300"))
+    # Build the availability bitmap when the app starts instead of on the first availability check
+    AVAILABILITY_INDEX_WARM_ON_STARTUP: bool = os.getenv("AVAILABILITY_INDEX_WARM_ON_STARTUP", "true").lower() == "true"
+    # Retries for a booking transaction aborted by a deadlock or serialization failure, and the base backoff between them
+    BOOKING_MAX_RETRIES: int = int(os.getenv("BOOKING_MAX_RETRIES", "3"))
+    BOOKING_RETRY_BACKOFF_SECONDS: float = float(os.getenv("BOOKING_RETRY_BACKOFF_SECONDS", "0.05"))
+
+    # Pricing
+    # Max age of the per-process rate cache before rates are reloaded (0 = never expire). With the relay
+    # enabled, rate changes reach every worker at once and this only bounds changes made outside the API
+    PRICING_CACHE_TTL_SECONDS: int = int(os.getenv("PRICING_CACHE_TTL_SECONDS", "300"))
+    # LISTEN for rate changes made by other worker processes (shares the event relay connection)
+    PRICING_CACHE_RELAY_ENABLED: bool = os.getenv("PRICING_CACHE_RELAY_ENABLED", "true").lower() == "true"
+    # Window of the precomputed nightly price calendar around today; stays outside it are priced night by night
+    PRICING_CALENDAR_PAST_DAYS: int = int(os.getenv("PRICING_CALENDAR_PAST_DAYS", "365"))
+    PRICING_CALENDAR_FUTURE_DAYS: int = int(os.getenv("PRICING_CALENDAR_FUTURE_DAYS", "730"))
+
+    # Exports
+    # Rows fetched per round trip from the server-side cursor, and per CSV chunk / Parquet row group
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+    # Night audit
+    # In-house reservations posted per transaction; each chunk commits with the run's progress
+    NIGHT_AUDIT_CHUNK_SIZE: int = int(os.getenv("NIGHT_AUDIT_CHUNK_SIZE", "500"))
+    # A RUNNING audit whose last chunk committed longer ago than this is considered dead and may be resumed
+    NIGHT_AUDIT_STALE_RUN_SECONDS: int = int(os.getenv("NIGHT_AUDIT_STALE_RUN_SECONDS", "600"))
+
+    # Products
+    # Max age of the cached product catalog (snapshot and price lookups) before it is rebuilt (0 disables the cache).
+    # Product/category writes evict it at once; other workers follow within this time unless CACHE_REDIS_URL is set.
+    PRODUCT_CATALOG_CACHE_TTL_SECONDS: float = float(os.getenv("PRODUCT_CATALOG_CACHE_TTL_SECONDS", "300"))
+
+    # Housekeeping
+    # Task durations for auto-assignment are the median of the tasks completed in this many past days
+    HOUSEKEEPING_DURATION_LOOKBACK_DAYS: int = int(os.getenv("HOUSEKEEPING_DURATION_LOOKBACK_DAYS", "90"))
+    # Minutes added to a housekeeper's workload for each extra floor, and each extra building, in their round
+    HOUSEKEEPING_FLOOR_CHANGE_MINUTES: float = float(os.getenv("HOUSEKEEPING_FLOOR_CHANGE_MINUTES", "5"))
+    HOUSEKEEPING_BUILDING_CHANGE_MINUTES: float = float(os.getenv("HOUSEKEEPING_BUILDING_CHANGE_MINUTES", "15"))
+    # Live board streams: seconds between keep-alive comments, and events a slow client may fall behind
+    # before it is sent a fresh snapshot instead
+    HOUSEKEEPING_BOARD_HEARTBEAT_SECONDS: float = float(os.getenv("HOUSEKEEPING_BOARD_HEARTBEAT_SECONDS", "15"))
+    HOUSEKEEPING_BOARD_MAX_QUEUE: int = int(os.getenv("HOUSEKEEPING_BOARD_MAX_QUEUE", "1000"))
+    # LISTEN for board changes made by other worker processes (one connection per process, opened at startup)
+    HOUSEKEEPING_BOARD_RELAY_ENABLED: bool = os.getenv("HOUSEKEEPING_BOARD_RELAY_ENABLED", "true").lower() == "true"
+    # Most status changes a tablet may replay in one sync request
+    HOUSEKEEPING_SYNC_MAX_CHANGES: int = int(os.getenv("HOUSEKEEPING_SYNC_MAX_CHANGES", "500"))
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Tags the NOTIFY payloads sent by this process, so the relay does not deliver them a second time
+PROCESS_TOKEN = uuid.uuid4().hex
+
+_PENDING_KEY = "pending_broadcasts" # Session.info key: (broadcaster, event) pairs to send on commit
+
+
+class Subscription:
+    '''One listener's queue of events, read on its own event loop.'''
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        '''The next event, or None when nothing arrived within timeout seconds.'''
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroadcaster:
+    '''
+    Fans events out to the asyncio subscribers of this worker process; publish() is thread-safe, so sync
+    endpoints may call it. Events published with publish_after_commit are sent to the other worker processes
+    through a Postgres NOTIFY on `channel` in the same transaction (see NotifyRelay), so they are only seen
+    once committed. A subscriber that falls max_queue events behind gets {"type": "resync"} instead.
+    Callbacks added with add_callback are called synchronously with every event, on the publishing thread.
+    '''
+
+    def __init__(self, name: str, channel: str, max_queue: int = 1000):
+        self.name = name
+        self.channel = channel
+        self.max_queue = max(max_queue, 1)
+        self._subscribers: Set[Subscription] = set()
+        self._callbacks: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self.published = 0
+        self.resyncs = 0
+
+    def subscribe(self) -> Subscription:
+        '''Must be called from the event loop the subscriber reads on.'''
+        subscription = Subscription(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def add_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        '''For in-process state that must follow the events, such as a cache to invalidate. Must be thread-safe.'''
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def publish(self, event_data: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            callbacks = list(self._callbacks)
+            self.published += 1
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription, event_data)
+            except RuntimeError: # Its loop is closed: the subscriber is gone
+                self.unsubscribe(subscription)
+        for callback in callbacks:
+            try:
+                callback(event_data)
+            except Exception:
+                logger.exception("Event callback of %s failed", self.name)
+
+    def _offer(self, subscription: Subscription, event_data: Dict[str, Any]) -> None:
+        try:
+            subscription.queue.put_nowait(event_data)
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event: drop the backlog and ask it to reload
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait({"type": "resync"})
+            with self._lock:
+                self.resyncs += 1
+
+    def publish_after_commit(self, db: Session, event_data: Dict[str, Any]) -> None:
+        '''Publish once db's transaction commits (everywhere), or never if it rolls back.'''
+        db.info.setdefault(_PENDING_KEY, []).append((self, event_data))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"name": self.name, "subscribers": len(self._subscribers), "published_total": self.published, "resyncs_total": self.resyncs}
+
+
+# Sends the queued events of all broadcasters in one statement
+_NOTIFY_SQL = text("SELECT pg_notify(n.channel, n.payload) FROM unnest(CAST(:channels AS text[]), CAST(:payloads AS text[])) AS n(channel, payload)")
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_pending_broadcasts(session: Session) -> None:
+    # Registered for every Session, but only a session holding events queued by publish_after_commit
+    # (session.info[_PENDING_KEY]) does any work: other commits cost no extra round trip.
+    # NOTIFY is transactional: the other processes receive it only if this commit succeeds.
+    pending = session.info.get(_PENDING_KEY)
+    if not pending:
+        return
+    session.execute(_NOTIFY_SQL, {
+        "channels": [broadcaster.channel for broadcaster, _ in pending],
+        "payloads": [json.dumps({"origin": PROCESS_TOKEN, "event": event_data}, default=str) for _, event_data in pending]
+    })
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_broadcasts(session: Session) -> None:
+    for broadcaster, event_data in session.info.pop(_PENDING_KEY, ()):
+        broadcaster.publish(json.loads(json.dumps(event_data, default=str))) # Same JSON form as the relayed events
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_broadcasts(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class NotifyRelay:
+    '''
+    Delivers the events other worker processes publish_after_commit to this process's subscribers: a daemon
+    thread LISTENs on the broadcasters' channels over one dedicated connection (outside the pool) and
+    reconnects if it drops. One connection per process, however many subscribers there are.
+    Receiving notifications is driver specific: the engine must use psycopg2 or psycopg (3.2+), and
+    ensure_started raises for any other driver rather than leave the relay silently deaf.
+    '''
+
+    SUPPORTED_DRIVERS = ("psycopg2", "psycopg")
+
+    def __init__(self, engine: Engine, broadcasters: List[EventBroadcaster], reconnect_seconds: float = 5.0):
+        self.engine = engine
+        self.broadcasters = {broadcaster.channel: broadcaster for broadcaster in broadcasters}
+        self.reconnect_seconds = reconnect_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_broadcaster(self, broadcaster: EventBroadcaster) -> None:
+        '''Also relay `broadcaster`'s channel; call before ensure_started.'''
+        self.broadcasters[broadcaster.channel] = broadcaster
+
+    def ensure_started(self) -> None:
+        if self.engine.dialect.driver not in self.SUPPORTED_DRIVERS:
+            raise RuntimeError(
+                f"The event relay cannot LISTEN through the '{self.engine.dialect.driver}' driver "
+                f"(supported: {', '.join(self.SUPPORTED_DRIVERS)}); disable it or change the database URL."
+            )
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="notify-relay", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Event relay lost its LISTEN connection; reconnecting in %ss", self.reconnect_seconds)
+                self._stopping.wait(self.reconnect_seconds)
+
+    def _listen(self) -> None:
+        pooled = self.engine.raw_connection()
+        connection = pooled.driver_connection # Taken before detaching, which drops the pool's reference to it
+        pooled.detach() # Held for the life of the process: not the pool's to hand out or recycle
+        try:
+            connection.autocommit = True
+            cursor = connection.cursor()
+            for channel in self.broadcasters:
+                cursor.execute(f'LISTEN "{channel}"')
+            while not self._stopping.is_set():
+                for channel, payload in self._wait_for_notifications(connection, timeout=1.0):
+                    self._deliver(channel, payload)
+        finally:
+            connection.close()
+
+    def _wait_for_notifications(self, connection: Any, timeout: float) -> List[Tuple[str, str]]:
+        '''(channel, payload) of the notifications received within timeout seconds.'''
+        if self.engine.dialect.driver == "psycopg":
+            return [(notify.channel, notify.payload) for notify in connection.notifies(timeout=timeout)]
+        # psycopg2
+        if select.select([connection], [], [], timeout) == ([], [], []):
+            return []
+        connection.poll()
+        notifications = [(notify.channel, notify.payload) for notify in connection.notifies]
+        connection.notifies.clear()
+        return notifications
+
+    def _deliver(self, channel: str, payload: str) -> None:
+        broadcaster = self.broadcasters.get(channel)
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring a malformed event on channel %s", channel)
+            return
+        if broadcaster is not None and message.get("origin") != PROCESS_TOKEN: # Our own were delivered on commit
+            broadcaster.publish(message["event"])
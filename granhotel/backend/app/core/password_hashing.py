@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_and_update_password
+
+PASSWORD_HASH_EXECUTORS = ("thread", "process")
+
+
+class PasswordHashingPool:
+    '''
+    Runs bcrypt on a dedicated, bounded pool so a login storm cannot occupy every request thread
+    or core: at most `workers` hashes run at once and `max_queue` more may wait. Anything beyond
+    that is refused with 503 straight away instead of queueing behind the storm.
+    '''
+
+    def __init__(self, workers: int, max_queue: int, executor_kind: str = "thread"):
+        if executor_kind not in PASSWORD_HASH_EXECUTORS:
+            raise ValueError(f"PASSWORD_HASH_EXECUTOR must be one of {', '.join(PASSWORD_HASH_EXECUTORS)}, got {executor_kind!r}")
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self.executor_kind = executor_kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self.pending = 0 # Submitted and not finished: running + queued
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_seconds_sum = 0.0
+        self.latency_seconds_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        # Created on first use: worker processes are not forked at import time
+        with self._lock:
+            if self._executor is None:
+                executor_class = ProcessPoolExecutor if self.executor_kind == "process" else ThreadPoolExecutor
+                self._executor = executor_class(max_workers=self.workers)
+            return self._executor
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent password operations, please retry shortly.",
+                headers={"Retry-After": "1"}
+            )
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self.pending += 1
+            self.peak_queued = max(self.peak_queued, self.pending - self.workers)
+
+        def done(_: Future) -> None:
+            latency = time.perf_counter() - submitted_at
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self.latency_seconds_sum += latency
+                self.latency_seconds_max = max(self.latency_seconds_max, latency)
+            self._slots.release()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return future
+
+    # Blocking variants, for sync code: the caller waits, but the CPU work stays bounded by the pool
+    def hash(self, password: str) -> str:
+        return self._submit(hash_password, password).result()
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return self._submit(verify_and_update_password, plain_password, hashed_password).result()
+
+    # Awaitable variants, for async code: no thread is held while bcrypt runs
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(self._submit(verify_and_update_password, plain_password, hashed_password))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "executor": self.executor_kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": min(self.pending, self.workers),
+                "queued": max(self.pending - self.workers, 0),
+                "peak_queued": self.peak_queued,
+                "completed_total": self.completed,
+                "rejected_total": self.rejected,
+                "latency_seconds_sum": round(self.latency_seconds_sum, 6),
+                "latency_seconds_max": round(self.latency_seconds_max, 6),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR
+)
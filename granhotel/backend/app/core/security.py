@@ -1,13 +1,19 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any # Updated Any to Dict for data_to_encode
+from typing import Optional, Dict, Any, Tuple # Updated Any to Dict for data_to_encode
 from jose import jwt, JWTError
 from pydantic import ValidationError
 
 from app.core.config import settings
 from app.schemas.token import TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max pinned to the configured cost, so hashes made with another cost report needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
 
 ALGORITHM = settings.ALGORITHM
 # Access Token
@@ -24,6 +30,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    '''(valid, new_hash): new_hash is set when the password is valid but its hash uses outdated parameters.'''
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# The three functions above run bcrypt in the calling thread; request handlers use
+# app.core.password_hashing.password_hasher, which runs them on a bounded worker pool.
+
 def create_access_token(data_to_encode: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     '''
     Creates a new access token.
@@ -0,0 +1,174 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+# Upper bounds (seconds) of the checkout wait histogram buckets; a final +Inf bucket is implied
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    '''Counters and a checkout wait-time histogram for one engine's pool (per worker process).'''
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.timeouts = 0
+            self.invalidations = 0
+            self.pre_ping_failures = 0
+            self.wait_bucket_counts = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+            self.wait_count = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_bucket_counts[bisect.bisect_left(WAIT_TIME_BUCKETS, seconds)] += 1
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Optional[QueuePool] = None) -> Dict[str, Any]:
+        with self._lock:
+            cumulative, buckets = 0, []
+            for bound, count in zip(list(WAIT_TIME_BUCKETS) + [None], self.wait_bucket_counts):
+                cumulative += count
+                buckets.append({"le": bound, "count": cumulative}) # Cumulative, Prometheus style; le=None is +Inf
+            data = {
+                "name": self.name,
+                "connects_total": self.connects,
+                "checkouts_total": self.checkouts,
+                "timeouts_total": self.timeouts,
+                "invalidations_total": self.invalidations,
+                "pre_ping_failures_total": self.pre_ping_failures,
+                "wait_seconds_count": self.wait_count,
+                "wait_seconds_sum": round(self.wait_sum, 6),
+                "wait_seconds_max": round(self.wait_max, 6),
+                "wait_seconds_buckets": buckets,
+            }
+        if pool is not None:
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0), # Negative while the pool has not opened `size` connections yet
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        return data
+
+
+class _TimedCheckoutMixin:
+    '''Times how long each checkout waits for a connection (including opening a new one).'''
+    metrics: Optional[PoolMetrics] = None # Set by instrument_engine
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics # Keep the counters when the engine recreates its pool (e.g. after dispose)
+        return new_pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Metrics of every engine built by engine_pool_options, by engine name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def engine_pool_options(asyncio: bool = False) -> Dict[str, Any]:
+    '''create_engine/create_async_engine keyword arguments for a pool configured from Settings.'''
+    if settings.DB_POOL_PRE_PING not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}, got {settings.DB_POOL_PRE_PING!r}")
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if asyncio else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    '''
+    Attach metrics (and the "idle" pre-ping strategy) to an engine created with engine_pool_options.
+    For an AsyncEngine pass its `sync_engine`.
+    '''
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+    engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+        if settings.DB_POOL_PRE_PING != "idle":
+            return
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.DB_POOL_PRE_PING_IDLE_SECONDS:
+            return
+        # Idle long enough for the server, a proxy or a firewall to have dropped it: ping first
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception:
+            metrics.increment("pre_ping_failures")
+            raise exc.DisconnectionError() # The pool discards this connection and retries with a new one
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+    return metrics
+
+
+def get_pool_statistics(engines: Dict[str, Engine]) -> List[Dict[str, Any]]:
+    '''Live pool state plus counters of the named engines in this worker process.'''
+    return [
+        pool_metrics.setdefault(name, PoolMetrics(name)).snapshot(engine.pool if isinstance(engine.pool, QueuePool) else None)
+        for name, engine in engines.items()
+    ]
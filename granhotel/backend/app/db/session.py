@@ -1,8 +1,15 @@
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
+from .pool import engine_pool_options, instrument_engine
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# Pool size, overflow, timeout, recycle and pre-ping strategy come from Settings (DB_POOL_*)
+engine = create_engine(settings.DATABASE_URL, **engine_pool_options())
+instrument_engine(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -11,3 +18,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_session_factory():
+    '''
+    For endpoints whose database work outlives the handler (streaming responses): they open and
+    close their own session from this factory while the body is being sent.
+    '''
+    return SessionLocal
+
+
+def to_async_database_url(url: str) -> str:
+    '''The same database URL with the asyncpg driver, e.g. postgresql://... -> postgresql+asyncpg://...'''
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# Async stack for `async def` endpoints: queries are awaited on the event loop instead of
+# holding a threadpool worker while Postgres answers. The engine keeps its own pool,
+# sized by the same DB_POOL_* settings.
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL or to_async_database_url(settings.DATABASE_URL), **engine_pool_options(asyncio=True))
+instrument_engine(async_engine.sync_engine, "async")
+# expire_on_commit=False: attributes must stay readable after commit, as lazy loads cannot run outside the session's greenlet
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
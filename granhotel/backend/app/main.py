@@ -1,9 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Any # Added for type hint
+import logging
 
 from app.core.config import settings
+from app.core.password_hashing import password_hasher
 from app.api.v1.api import api_router
+from app.core.events import NotifyRelay
+from app.db.session import SessionLocal, engine
+from app.services.availability_index import room_availability_index
+from app.services.housekeeping_board_service import housekeeping_board
+from app.services.pricing_service import room_rate_events
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
 # from app.db.session import engine # Not needed here if using Alembic
 # from app.db.base_class import Base # Not needed here
 
@@ -23,10 +33,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Allows all methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"], # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"], # Let browser clients read the pagination cursor and catalog version
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def warm_availability_index() -> None:
+    '''Build the room availability bitmap up front so the first searches don't pay for it.'''
+    if not settings.AVAILABILITY_INDEX_WARM_ON_STARTUP:
+        return
+    db = SessionLocal()
+    try:
+        room_availability_index.rebuild(db)
+    except Exception: # The index also builds lazily on first use, so a cold start is not fatal
+        logger.exception("Could not warm the room availability index on startup")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def stop_password_hashing_pool() -> None:
+    password_hasher.shutdown()
+
+# Events published by other worker processes (one LISTEN connection for all channels)
+event_relay = NotifyRelay(engine, [])
+
+@app.on_event("startup")
+def start_event_relay() -> None:
+    '''Relay housekeeping board changes and rate changes made by other worker processes to this one.'''
+    if settings.HOUSEKEEPING_BOARD_RELAY_ENABLED:
+        event_relay.add_broadcaster(housekeeping_board)
+    if settings.PRICING_CACHE_RELAY_ENABLED:
+        event_relay.add_broadcaster(room_rate_events)
+    if event_relay.broadcasters:
+        event_relay.ensure_started()
+
+@app.on_event("shutdown")
+def stop_event_relay() -> None:
+    event_relay.stop()
+
 @app.get("/", tags=["Root"]) # Added tag for root endpoint
 async def root() -> Any: # Added type hint
     return {"message": f"Welcome to {settings.PROJECT_NAME}. Visit /docs for API documentation."}
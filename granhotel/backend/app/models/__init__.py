@@ -1,18 +1,21 @@
 from .room import Room  # noqa
 from .guest import Guest, DocumentType # noqa
 from .reservation import Reservation, ReservationStatus # noqa
+from .rate import RoomRate # noqa
+from .analytics import DailyOccupancyFact # noqa
 from .user import User, UserRole # noqa
 from .product import Product, ProductCategory # noqa
 from .inventory import ( #noqa
-    Supplier, InventoryItem, PurchaseOrder, PurchaseOrderItem, StockMovement,
+    Supplier, InventoryItem, PurchaseOrder, PurchaseOrderItem, StockMovement, StockSnapshot,
     PurchaseOrderStatus, StockMovementType
 )
 from .housekeeping import ( #noqa
-    HousekeepingLog, HousekeepingTaskType, HousekeepingStatus
+    HousekeepingLog, HousekeepingTaskType, HousekeepingStatus, HousekeepingDailyStat
 )
 from .pos import ( #noqa
     POSSale, POSSaleItem, PaymentMethod, POSSaleStatus
 )
 from .billing import ( #noqa
-    GuestFolio, FolioTransaction, FolioStatus, FolioTransactionType
+    GuestFolio, FolioTransaction, FolioStatus, FolioTransactionType,
+    NightAuditRun, NightAuditStatus
 )
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Date, DateTime, Numeric, func
+from ..db.base_class import Base
+
+class DailyOccupancyFact(Base):
+    '''
+    Pre-aggregated room-nights sold and room revenue per stay date.
+    Maintained incrementally by the reservation service (create/update/status change/cancel)
+    so occupancy, ADR and RevPAR reports never scan the reservations table.
+    '''
+    __tablename__ = "daily_occupancy_facts"
+
+    stay_date = Column(Date, primary_key=True) # The night being sold
+    room_nights_sold = Column(Integer, nullable=False, default=0, server_default="0")
+    room_revenue = Column(Numeric(12, 2), nullable=False, default=0, server_default="0.00") # Reservation total spread evenly over its nights
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
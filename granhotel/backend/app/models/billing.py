@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, DateTime, func, Enum as SAEnum, ForeignKey, Numeric, Text, Date
+from sqlalchemy import Column, Integer, String, DateTime, func, Enum as SAEnum, ForeignKey, Numeric, Text, Date, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -23,12 +23,17 @@ class FolioTransactionType(str, enum.Enum):
     DISCOUNT_ADJUSTMENT = "DISCOUNT_ADJUSTMENT"
     TAX_CHARGE = "TAX_CHARGE"
 
+class NightAuditStatus(str, enum.Enum):
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
 # --- Models ---
 class GuestFolio(Base):
     __tablename__ = "guest_folios"
 
     id = Column(Integer, primary_key=True, index=True)
-    guest_id = Column(UUID(as_uuid=True), ForeignKey("guests.id"), nullable=False, index=True)
+    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False, index=True)
     reservation_id = Column(Integer, ForeignKey("reservations.id"), nullable=True, index=True)
 
     status = Column(SAEnum(FolioStatus, name="folio_status_enum", create_constraint=True), nullable=False, default=FolioStatus.OPEN)
@@ -46,6 +51,10 @@ class GuestFolio(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_guest_folios_reservation_id_status", reservation_id, status), # Open folio of a reservation (night audit)
+    )
+
     # Relationships
     guest = relationship("Guest", backref="folios")
     reservation = relationship("Reservation", backref="folio")
@@ -70,11 +79,48 @@ class FolioTransaction(Base):
 
     created_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
 
+    # Night a ROOM_CHARGE posted by the night audit is for (NULL for manual postings)
+    business_date = Column(Date, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # At most one night-audit room charge per reservation and night: re-running an audit cannot double-post
+        Index(
+            "uq_folio_transactions_room_charge_night", related_reservation_id, business_date, unique=True,
+            postgresql_where=text("transaction_type = 'ROOM_CHARGE' AND business_date IS NOT NULL")
+        ),
+    )
+
     # Relationships
     guest_folio = relationship("GuestFolio", back_populates="transactions")
     # Ensure correct model name for relationship if needed, e.g., "POSSale"
     pos_sale = relationship("POSSale", backref="folio_transactions")
     reservation_ref = relationship("Reservation")
     created_by = relationship("User")
+
+class NightAuditRun(Base):
+    '''
+    One night audit per business date: progress (for resuming an interrupted run), counters and timings.
+    '''
+    __tablename__ = "night_audit_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    business_date = Column(Date, unique=True, nullable=False)
+    status = Column(SAEnum(NightAuditStatus, name="night_audit_status_enum", create_constraint=True), nullable=False, default=NightAuditStatus.RUNNING)
+
+    last_reservation_id = Column(Integer, nullable=False, default=0, server_default="0") # Reservations up to this id are done
+    reservations_processed = Column(Integer, nullable=False, default=0, server_default="0")
+    folios_created = Column(Integer, nullable=False, default=0, server_default="0")
+    charges_posted = Column(Integer, nullable=False, default=0, server_default="0")
+    total_charged = Column(Numeric(12, 2), nullable=False, default=0, server_default="0.00")
+    chunks_processed = Column(Integer, nullable=False, default=0, server_default="0")
+    duration_seconds = Column(Numeric(10, 3), nullable=False, default=0, server_default="0") # Summed over all attempts
+    error = Column(Text, nullable=True)
+
+    started_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    heartbeat_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False) # Last committed chunk
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    started_by = relationship("User")
@@ -1,6 +1,6 @@
 import enum
-from sqlalchemy import Column, Integer, String, DateTime, func, Enum as SAEnum, ForeignKey, Text, Date
-from sqlalchemy.dialects.postgresql import UUID # For user_id if it's UUID
+from sqlalchemy import Column, Integer, String, DateTime, func, Enum as SAEnum, ForeignKey, Text, Date, Index
+from sqlalchemy.dialects.postgresql import ARRAY, UUID # For user_id if it's UUID
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
 
@@ -52,3 +52,30 @@ class HousekeepingLog(Base):
     assigned_to = relationship("User", foreign_keys=[assigned_to_user_id], backref="assigned_housekeeping_tasks")
     creator = relationship("User", foreign_keys=[created_by_user_id], backref="created_housekeeping_logs")
     updater = relationship("User", foreign_keys=[updated_by_user_id], backref="updated_housekeeping_logs")
+
+    __table_args__ = (
+        # The daily task generator skips rooms that already have the task for the date
+        Index("ix_housekeeping_logs_scheduled_date_room_id_task_type", "scheduled_date", "room_id", "task_type"),
+        # The stats refresh finds the days to recompute from the logs changed since its last run
+        Index("ix_housekeeping_logs_updated_at", "updated_at"),
+        Index("ix_housekeeping_logs_completed_at", "completed_at"),
+    )
+
+class HousekeepingDailyStat(Base):
+    '''
+    Durations of the tasks completed on one day (hotel time zone), per task type, housekeeper and floor.
+    Rebuilt day by day by the stats refresh, so productivity statistics never scan the housekeeping logs.
+    The durations themselves are kept (not only their sum) so percentiles over any range stay exact.
+    '''
+    __tablename__ = "housekeeping_daily_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stat_date = Column(Date, nullable=False, index=True) # Day the tasks were completed
+    task_type = Column(SAEnum(HousekeepingTaskType, name="hk_task_type_enum", create_constraint=True), nullable=False)
+    housekeeper_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True) # NULL: completed unassigned
+    floor = Column(Integer, nullable=True) # The room's floor when the day was last refreshed
+
+    task_count = Column(Integer, nullable=False)
+    duration_seconds = Column(ARRAY(Integer), nullable=False) # completed_at - started_at of each task
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
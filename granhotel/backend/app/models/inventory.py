@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Numeric, Text, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Numeric, Text, Date, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ENUM as PGEnum # For PostgreSQL specific ENUM type if SAEnum is not sufficient
 from ..db.base_class import Base
@@ -104,4 +104,29 @@ class StockMovement(Base):
     product = relationship("Product")
     purchase_order_item_ref = relationship("PurchaseOrderItem", back_populates="stock_movements")
 
+    __table_args__ = (
+        # Stock at a date sums one product's movements over a date range
+        Index("ix_stock_movements_product_id_movement_date", "product_id", "movement_date"),
+    )
+
+
+class StockSnapshot(Base):
+    '''
+    A product's quantity on hand at the end of snapshot_date (UTC), written by the snapshot job.
+    Only days on which the product moved get a row: the latest snapshot on or before a date, plus the
+    movements after it, is the stock at that date.
+    '''
+    __tablename__ = "stock_snapshots"
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+    quantity_on_hand = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    product = relationship("Product")
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "snapshot_date", name="uq_stock_snapshots_product_id_snapshot_date"),
+    )
+
 # Removed EnumTable models as per decision to use SAEnum/PGEnum directly.
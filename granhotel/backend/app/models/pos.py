@@ -28,7 +28,7 @@ class POSSale(Base):
     sale_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
 
     cashier_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    guest_id = Column(UUID(as_uuid=True), ForeignKey("guests.id"), nullable=True, index=True)
+    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=True, index=True)
 
     total_amount_before_tax = Column(Numeric(10, 2), nullable=False)
     tax_amount = Column(Numeric(10, 2), nullable=False)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Numeric, func
+from ..db.base_class import Base
+
+class RoomRate(Base):
+    '''
+    A nightly rate for every room of a type, optionally limited to a season and/or a day of the week.
+    When several rates cover the same night, the highest priority wins; nights without any rate
+    fall back to the room's own base price (Room.price).
+    '''
+    __tablename__ = "room_rates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    room_type = Column(String, nullable=False, index=True) # Matches Room.type
+    name = Column(String(100), nullable=False) # e.g. "High season", "Weekend"
+
+    start_date = Column(Date, nullable=True) # First night covered; NULL = open-ended
+    end_date = Column(Date, nullable=True) # Last night covered (inclusive); NULL = open-ended
+    day_of_week = Column(Integer, nullable=True) # 0 = Monday ... 6 = Sunday; NULL = every day
+
+    price = Column(Numeric(10, 2), nullable=False) # Nightly price
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    is_active = Column(Boolean, nullable=False, default=True, server_default="true")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
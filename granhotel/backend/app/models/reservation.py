@@ -1,6 +1,7 @@
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, Enum as SAEnum, ForeignKey, Numeric, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, Enum as SAEnum, ForeignKey, Numeric, Date, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from ..db.base_class import Base
 
 class ReservationStatus(str, enum.Enum):
@@ -43,3 +44,21 @@ class Reservation(Base):
     room = relationship("Room", backref="reservations")   # Simple backref
 
     # user = relationship("User", backref="reservations") # For booked_by_user_id
+
+    __table_args__ = (
+        # Database-level guard against double booking: no two blocking reservations of the same room
+        # may share a night. daterange() is half-open [check_in, check_out), matching is_room_available.
+        ExcludeConstraint(
+            (room_id, '='),
+            (func.daterange(check_in_date, check_out_date), '&&'),
+            name="excl_reservations_room_id_stay",
+            using="gist",
+            where="status IN ('CONFIRMED', 'CHECKED_IN')"
+        ),
+        # Overlap checks: room equality, status IN (...), then the two date range predicates
+        Index("ix_reservations_room_id_status_stay", room_id, status, check_in_date, check_out_date),
+        # Listings ordered by check_in_date desc, id desc (unfiltered, per guest, per status)
+        Index("ix_reservations_check_in_date_id", check_in_date.desc(), id.desc()),
+        Index("ix_reservations_guest_id_check_in_date", guest_id, check_in_date.desc()),
+        Index("ix_reservations_status_check_in_date", status, check_in_date.desc()),
+    )
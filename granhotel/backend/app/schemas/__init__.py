@@ -1,11 +1,16 @@
 from .room import Room, RoomCreate, RoomUpdate, RoomBase  # noqa
 from .guest import Guest, GuestCreate, GuestUpdate, GuestBase as GuestBaseSchema, DocumentType as GuestDocumentType # noqa
 from .reservation import Reservation, ReservationBase as ReservationBaseSchema, ReservationCreate, ReservationUpdate, ReservationStatus as ReservationStatusSchema # noqa
+from .reservation import ReservationBatchCreate, ReservationBatchItemResult, ReservationBatchResult # noqa
+from .rate import RoomRate, RoomRateCreate, RoomRateUpdate, RoomStayQuote # noqa
+from .analytics import ReportGranularity, OccupancyReport, OccupancyReportRow, OccupancyFactsRebuildResult # noqa
+from .monitoring import HistogramBucket, DBPoolStatistics, DBPoolReport, CacheStatistics, PasswordHashingStatistics # noqa
 from .user import User, UserCreate, UserUpdate, UserInDB, UserBase as UserBaseSchema, UserRole as UserRoleSchema  # noqa
-from .token import Token, TokenPayload # noqa
+from .token import Token, TokenPayload, RefreshTokenRequest # noqa
 from .product import ( # noqa
     Product, ProductCreate, ProductUpdate, ProductBase as ProductBaseSchema,
-    ProductCategory, ProductCategoryCreate, ProductCategoryUpdate, ProductCategoryBase as ProductCategoryBaseSchema
+    ProductCategory, ProductCategoryCreate, ProductCategoryUpdate, ProductCategoryBase as ProductCategoryBaseSchema,
+    CatalogCategory, CatalogProduct, ProductCatalog
 )
 from .inventory import ( #noqa
     Supplier, SupplierCreate, SupplierUpdate, SupplierBase as SupplierBaseSchema,
@@ -15,11 +20,16 @@ from .inventory import ( #noqa
     StockMovement, StockMovementCreate, StockMovementBase as StockMovementBaseSchema,
     PurchaseOrderStatus as PurchaseOrderStatusSchema,
     StockMovementType as StockMovementTypeSchema,
-    InventoryItemLowStockThresholdUpdate
+    InventoryItemLowStockThresholdUpdate,
+    StockSnapshotRunResult, StockValuationLine, StockValuationReport
 )
 from .housekeeping import ( #noqa
     HousekeepingLog, HousekeepingLogCreate, HousekeepingLogUpdate, HousekeepingLogBase as HousekeepingLogBaseSchema,
-    HousekeepingLogStatusUpdate, HousekeepingLogAssignmentUpdate,
+    HousekeepingLogStatusUpdate, HousekeepingLogAssignmentUpdate, HousekeepingTaskGenerationResult,
+    HousekeeperWorkload, HousekeepingAutoAssignResult,
+    HousekeepingStatsGroupBy, HousekeepingStatsRow, HousekeepingStatsReport, HousekeepingStatsRefreshResult,
+    HousekeepingStatusChange, HousekeepingStatusSyncRequest, HousekeepingSyncedLog,
+    HousekeepingSyncRejectionReason, HousekeepingSyncRejection, HousekeepingStatusSyncResult,
     HousekeepingTaskType as HousekeepingTaskTypeSchema,
     HousekeepingStatus as HousekeepingStatusSchema
 )
@@ -32,6 +42,8 @@ from .pos import ( #noqa
 from .billing import ( #noqa
     GuestFolio, GuestFolioCreate, GuestFolioUpdate, GuestFolioBase as GuestFolioBaseSchema,
     FolioTransaction, FolioTransactionCreate, FolioTransactionBase as FolioTransactionBaseSchema,
+    FolioTotalsDrift, FolioReconciliationReport, NightAuditRun,
+    GuestFolioSummary, FolioTransactionLine,
     FolioStatus as FolioStatusSchema,
     FolioTransactionType as FolioTransactionTypeSchema
 )
@@ -0,0 +1,31 @@
+import enum
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+from decimal import Decimal
+
+class ReportGranularity(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week" # ISO weeks, Monday to Sunday
+    MONTH = "month"
+
+class OccupancyReportRow(BaseModel):
+    period_start: date # First day of the period inside the requested range
+    period_end: date # Last day of the period inside the requested range
+    room_nights_available: int
+    room_nights_sold: int
+    room_revenue: Decimal
+    occupancy_rate: Decimal # Percentage of available room-nights sold
+    adr: Decimal # Average Daily Rate: room revenue / room-nights sold
+    revpar: Decimal # Revenue per available room-night
+
+class OccupancyReport(BaseModel):
+    start_date: date
+    end_date: date
+    granularity: ReportGranularity
+    room_count: int
+    rows: List[OccupancyReportRow]
+    totals: OccupancyReportRow
+
+class OccupancyFactsRebuildResult(BaseModel):
+    days_written: int
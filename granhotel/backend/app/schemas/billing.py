@@ -4,9 +4,9 @@ from datetime import datetime, date
 from decimal import Decimal
 import uuid
 
-from app.models.billing import FolioStatus, FolioTransactionType
+from app.models.billing import FolioStatus, FolioTransactionType, NightAuditStatus
 from .guest import Guest as GuestSchema
-from .reservations import Reservation as ReservationSchema
+from .reservation import Reservation as ReservationSchema
 # POSSaleItemSchema is not directly used here, but POSSale might be linked.
 # For FolioTransaction, we'd link to POSSale schema if we want to show full sale details.
 # For now, keeping it simple with related_pos_sale_id.
@@ -65,7 +65,7 @@ class FolioStatusUpdate(BaseModel):
 
 # GuestFolio Schemas
 class GuestFolioBase(BaseModel):
-    guest_id: uuid.UUID
+    guest_id: int
     reservation_id: Optional[int] = None
     status: FolioStatus = FolioStatus.OPEN
     # Totals are calculated and managed by the service
@@ -93,3 +93,69 @@ class GuestFolio(GuestFolioBase): # Main response schema
 
     class Config:
         from_attributes = True
+
+
+# Lightweight projections (no nested transactions/guest/reservation objects)
+class GuestFolioSummary(BaseModel):
+    id: int
+    guest_id: int
+    reservation_id: Optional[int] = None
+    status: FolioStatus
+    total_charges: Decimal
+    total_payments: Decimal
+    balance: Decimal
+    opened_at: datetime
+    closed_at: Optional[datetime] = None
+    updated_at: datetime
+    guest_first_name: Optional[str] = None
+    guest_last_name: Optional[str] = None
+    room_number: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class FolioTransactionLine(FolioTransactionBase):
+    id: int
+    guest_folio_id: int
+    transaction_date: datetime
+    business_date: Optional[date] = None
+    created_by_user_id: Optional[uuid.UUID] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Reconciliation of the stored folio totals against the transaction ledger
+class FolioTotalsDrift(BaseModel):
+    folio_id: int
+    recorded_total_charges: Decimal
+    ledger_total_charges: Decimal
+    recorded_total_payments: Decimal
+    ledger_total_payments: Decimal
+
+class FolioReconciliationReport(BaseModel):
+    checked_folios: int
+    drifted_folios: List[FolioTotalsDrift]
+    fixed: bool # True when the drifted totals were reset from the ledger
+
+
+# Night audit runs
+class NightAuditRun(BaseModel):
+    id: int
+    business_date: date
+    status: NightAuditStatus
+    last_reservation_id: int
+    reservations_processed: int
+    folios_created: int
+    charges_posted: int
+    total_charged: Decimal
+    chunks_processed: int
+    duration_seconds: Decimal
+    error: Optional[str] = None
+    started_by_user_id: Optional[uuid.UUID] = None
+    started_at: datetime
+    heartbeat_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime, date
+import enum
 import uuid # For UUID type hint
 
 from app.models.housekeeping import HousekeepingTaskType, HousekeepingStatus
@@ -62,3 +63,93 @@ class HousekeepingLogInDBBase(HousekeepingLogBase):
 
 class HousekeepingLog(HousekeepingLogInDBBase):
     pass # Main response schema
+
+class HousekeepingTaskGenerationResult(BaseModel): # Result of the daily task generator
+    scheduled_date: date
+    full_cleans_created: int
+    stay_over_cleans_created: int
+
+class HousekeeperWorkload(BaseModel):
+    user_id: uuid.UUID
+    name: str
+    tasks_assigned: int # By this run
+    total_tasks: int # For the day, including tasks assigned before
+    workload_minutes: float # Estimated, including floor/building changes
+
+class HousekeepingAutoAssignResult(BaseModel):
+    scheduled_date: date
+    dry_run: bool
+    tasks_assigned: int
+    tasks_skipped: int
+    task_minutes: Dict[str, float] # Duration used per task type
+    staff: List[HousekeeperWorkload]
+
+class HousekeepingStatsGroupBy(str, enum.Enum):
+    TASK_TYPE = "task_type"
+    HOUSEKEEPER = "housekeeper"
+    FLOOR = "floor"
+
+class HousekeepingStatsRow(BaseModel):
+    key: Optional[str] = None # Task type, housekeeper user id or floor; None for unassigned tasks / rooms without a floor
+    label: str
+    tasks: int
+    avg_minutes: float
+    median_minutes: float
+    p90_minutes: float
+    min_minutes: float
+    max_minutes: float
+
+class HousekeepingStatsReport(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: HousekeepingStatsGroupBy
+    refreshed_at: Optional[datetime] = None # Last stats refresh; tasks completed after it are not counted yet
+    rows: List[HousekeepingStatsRow]
+    totals: Optional[HousekeepingStatsRow] = None # None when no task was completed in the range
+
+class HousekeepingStatsRefreshResult(BaseModel):
+    full: bool
+    days_refreshed: int
+    rows_written: int
+
+class HousekeepingStatusChange(BaseModel): # One status change made on a tablet, possibly offline
+    log_id: int
+    status: HousekeepingStatus
+    changed_at: datetime # Device clock; naive values are taken as UTC
+    notes_issues_reported: Optional[str] = None
+
+class HousekeepingStatusSyncRequest(BaseModel):
+    sent_at: Optional[datetime] = None # Device clock when sending: corrects changed_at for the device's clock offset
+    changes: List[HousekeepingStatusChange]
+
+class HousekeepingSyncedLog(BaseModel): # Compact state of a task, as the tablet keeps it
+    id: int
+    room_id: int
+    assigned_to_user_id: Optional[uuid.UUID] = None
+    status: HousekeepingStatus
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    notes_issues_reported: Optional[str] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class HousekeepingSyncRejectionReason(str, enum.Enum):
+    CONFLICT = "conflict" # Changed on the server after the device's last change to it
+    FORBIDDEN = "forbidden"
+    NOT_FOUND = "not_found"
+
+class HousekeepingSyncRejection(BaseModel):
+    log_id: int
+    status: HousekeepingStatus # As requested
+    changed_at: datetime
+    reason: HousekeepingSyncRejectionReason
+    detail: str
+    current: Optional[HousekeepingSyncedLog] = None # Server state, for conflicts
+
+class HousekeepingStatusSyncResult(BaseModel):
+    applied: int
+    unchanged: int # Already in the requested state, e.g. a replayed batch
+    logs: List[HousekeepingSyncedLog] # Final state of the tasks this sync changed, and only those
+    rejected: List[HousekeepingSyncRejection]
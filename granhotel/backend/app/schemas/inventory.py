@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, field_validator
 from typing import Optional, List
 from datetime import datetime, date
 from decimal import Decimal
@@ -143,3 +143,28 @@ class InventoryItemLowStockThresholdUpdate(BaseModel):
 
 class PurchaseOrderStatusUpdate(BaseModel):
     status: PurchaseOrderStatus # The new status to set
+
+# Stock snapshot and valuation Schemas
+class StockSnapshotRunResult(BaseModel):
+    start_date: date
+    end_date: date
+    snapshots_written: int
+
+class StockValuationLine(BaseModel):
+    product_id: int
+    product_name: str
+    sku: Optional[str] = None
+    snapshot_date: Optional[date] = None # Snapshot the quantity was computed from (None: from the first movement)
+    quantity_on_hand: int
+    unit_cost: Optional[Decimal] = None # Latest purchase price paid up to the date
+    stock_value: Optional[Decimal] = None
+    unit_price: Decimal # Current selling price
+    retail_value: Decimal
+
+class StockValuationReport(BaseModel):
+    as_of_date: date
+    lines: List[StockValuationLine]
+    total_quantity: int
+    total_stock_value: Decimal # Excludes products without a purchase cost
+    total_retail_value: Decimal
+    products_without_cost: int
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class HistogramBucket(BaseModel):
+    le: Optional[float] = None # Upper bound in seconds; None is +Inf
+    count: int # Cumulative: observations <= le
+
+class DBPoolStatistics(BaseModel):
+    name: str # "sync" (SessionLocal) or "async" (AsyncSessionLocal)
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    checked_out: Optional[int] = None # Connections currently lent to requests
+    checked_in: Optional[int] = None # Idle connections in the pool
+    overflow: Optional[int] = None # Connections open beyond `size`
+    connects_total: int
+    checkouts_total: int
+    timeouts_total: int # Checkouts that gave up after timeout_seconds
+    invalidations_total: int
+    pre_ping_failures_total: int
+    wait_seconds_count: int
+    wait_seconds_sum: float
+    wait_seconds_max: float
+    wait_seconds_buckets: List[HistogramBucket] # Time spent waiting for a connection on checkout
+
+class DBPoolReport(BaseModel):
+    pid: int # Pools are per worker process; compare reports across workers
+    pools: List[DBPoolStatistics]
+
+class CacheStatistics(BaseModel):
+    name: str
+    backend: str # "memory" (per worker process) or "redis" (shared)
+    entries: Optional[int] = None # Unknown for the shared backend
+    hits: int
+    misses: int
+
+class PasswordHashingStatistics(BaseModel):
+    executor: str # "thread" or "process"
+    workers: int
+    max_queue: int
+    running: int
+    queued: int # Operations waiting for a worker right now
+    peak_queued: int
+    completed_total: int
+    rejected_total: int # Refused with 503 because workers + max_queue were busy
+    latency_seconds_sum: float # Submit to completion, including queueing
+    latency_seconds_max: float
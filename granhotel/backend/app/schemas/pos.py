@@ -32,7 +32,7 @@ class POSSaleItem(POSSaleItemBase): # Response schema for an item within a sale
 
 # POSSale Schemas
 class POSSaleBase(BaseModel):
-    guest_id: Optional[uuid.UUID] = None
+    guest_id: Optional[int] = None
     payment_method: PaymentMethod # Must be provided, even if PENDING_PAYMENT
     payment_reference: Optional[str] = Field(None, max_length=100)
     # status: POSSaleStatus = POSSaleStatus.PENDING_PAYMENT # Service might set initial status
@@ -40,7 +40,7 @@ class POSSaleBase(BaseModel):
     # total_amount_before_tax, tax_amount, total_amount_after_tax are calculated by backend
 
 class POSSaleCreate(BaseModel): # Different from Base for creation flexibility
-    guest_id: Optional[uuid.UUID] = None
+    guest_id: Optional[int] = None
     payment_method: PaymentMethod
     payment_reference: Optional[str] = Field(None, max_length=100)
     notes: Optional[str] = None
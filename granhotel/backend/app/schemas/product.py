@@ -32,7 +32,7 @@ class ProductBase(BaseModel):
     description: Optional[str] = None
     price: Decimal = Field(..., gt=0, decimal_places=2) # Price must be positive
     sku: Optional[str] = Field(None, max_length=50)
-    image_url: Optional[HttpUrl] = None # Validate as URL
+    image_url: Optional[str] = None # Validate as URL
     is_active: bool = True
     taxable: bool = True
     category_id: int
@@ -45,7 +45,7 @@ class ProductUpdate(BaseModel): # Allow partial updates
     description: Optional[str] = None
     price: Optional[Decimal] = Field(None, gt=0, decimal_places=2)
     sku: Optional[str] = Field(None, max_length=50) # Allow clearing SKU by passing None
-    image_url: Optional[HttpUrl] = None # Allow clearing image_url
+    image_url: Optional[str] = None # Allow clearing image_url
     is_active: Optional[bool] = None
     taxable: Optional[bool] = None
     category_id: Optional[int] = None
@@ -62,6 +62,31 @@ class ProductInDBBase(ProductBase):
 class Product(ProductInDBBase):
     pass # For now, same as InDBBase for responses
 
+# Product catalog snapshot (POS terminals): the whole active menu with tax-inclusive unit prices
+class CatalogCategory(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+
+class CatalogProduct(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    sku: Optional[str] = None
+    image_url: Optional[str] = None
+    category_id: int
+    taxable: bool
+    price: Decimal # Before tax
+    tax_rate: Decimal
+    unit_tax_amount: Decimal
+    unit_price_with_tax: Decimal
+
+class ProductCatalog(BaseModel):
+    version: str # Also sent as the ETag; changes whenever any product or category changes
+    generated_at: datetime
+    categories: List[CatalogCategory]
+    products: List[CatalogProduct]
+
 # Schema for Product with its category for richer listings if needed without full nesting
 # This is an example, could be achieved by modifying Product schema or via a separate endpoint/service logic
 # For now, Product already nests the ProductCategory object.
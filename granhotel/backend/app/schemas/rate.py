@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from typing import Optional, List
+from datetime import datetime, date
+from decimal import Decimal
+
+class RoomRateBase(BaseModel):
+    room_type: str = Field(..., min_length=1) # Matches Room.type
+    name: str = Field(..., min_length=2, max_length=100)
+    start_date: Optional[date] = None # First night covered; None = open-ended
+    end_date: Optional[date] = None # Last night covered (inclusive); None = open-ended
+    day_of_week: Optional[int] = Field(None, ge=0, le=6) # 0 = Monday ... 6 = Sunday; None = every day
+    price: Decimal = Field(..., gt=0, decimal_places=2) # Nightly price
+    priority: int = 0 # Higher wins when several rates cover the same night
+    is_active: bool = True
+
+    @field_validator('end_date')
+    def end_date_not_before_start_date(cls, v: Optional[date], info: ValidationInfo):
+        if v is not None and info.data.get('start_date') is not None and v < info.data['start_date']:
+            raise ValueError("End date must be on or after start date")
+        return v
+
+class RoomRateCreate(RoomRateBase):
+    pass
+
+class RoomRateUpdate(BaseModel): # Allow partial updates
+    room_type: Optional[str] = Field(None, min_length=1)
+    name: Optional[str] = Field(None, min_length=2, max_length=100)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    day_of_week: Optional[int] = Field(None, ge=0, le=6)
+    price: Optional[Decimal] = Field(None, gt=0, decimal_places=2)
+    priority: Optional[int] = None
+    is_active: Optional[bool] = None
+
+class RoomRateInDBBase(RoomRateBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class RoomRate(RoomRateInDBBase):
+    pass
+
+# Availability grid quotes
+class RoomStayQuote(BaseModel):
+    room_id: int
+    room_number: str
+    room_type: str
+    check_in_date: date
+    totals: List[Decimal] # totals[n - 1] is the price of an n-night stay starting on check_in_date
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator, ValidationInfo
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from typing import List, Literal, Optional
 from datetime import datetime, date
 from decimal import Decimal # For total_price
 
@@ -71,3 +71,20 @@ class Reservation(ReservationInDBBase):
 # Properties stored in DB
 class ReservationInDB(ReservationInDBBase):
     pass
+
+
+# Batch import (group blocks, channel-manager feeds)
+class ReservationBatchCreate(BaseModel):
+    reservations: List[ReservationCreate] = Field(..., min_length=1, max_length=1000)
+
+class ReservationBatchItemResult(BaseModel):
+    index: int # Position of the row in the submitted batch
+    status: Literal["created", "conflict", "invalid"]
+    reservation_id: Optional[int] = None
+    total_price: Optional[Decimal] = None
+    detail: Optional[str] = None
+
+class ReservationBatchResult(BaseModel):
+    created_count: int
+    failed_count: int
+    results: List[ReservationBatchItemResult]
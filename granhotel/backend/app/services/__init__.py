@@ -22,18 +22,30 @@ from .reservation_service import (
     get_reservations,
     get_reservations_for_room_date_range,
     is_room_available,
+    search_available_rooms,
+    create_reservations_batch,
     calculate_reservation_price,
     update_reservation_status,
     update_reservation_details,
     cancel_reservation,
 ) # noqa
+from .pricing_service import ( #noqa
+    price_stay, price_night_of_stay, quote_stay_lengths,
+    create_room_rate, get_room_rate, get_room_rates, update_room_rate, delete_room_rate
+)
+from .analytics_service import ( #noqa
+    record_reservation_changes, rebuild_daily_occupancy_facts, get_occupancy_report
+)
 from .user_service import (
     get_user,
+    get_user_for_auth,
+    invalidate_user_cache,
     get_user_by_email,
     get_users,
     create_user,
     update_user,
     authenticate_user,
+    authenticate_user_async,
     activate_user,
     deactivate_user,
     update_user_role,
@@ -41,7 +53,8 @@ from .user_service import (
 from .product_service import ( #noqa
     create_product_category, get_product_category, get_all_product_categories, update_product_category, delete_product_category,
     create_product, get_product, get_products, update_product, delete_product,
-    calculate_product_price_with_tax, get_product_price_details, IGV_RATE
+    calculate_product_price_with_tax, get_product_price_details, IGV_RATE,
+    get_product_catalog, invalidate_product_catalog
 )
 from .supplier_service import ( #noqa
     create_supplier, get_supplier, get_all_suppliers, update_supplier, delete_supplier
@@ -54,6 +67,8 @@ from .inventory_service import ( #noqa
     set_low_stock_threshold,
     get_low_stock_items,
     get_stock_movement_history,
+    take_stock_snapshots,
+    get_stock_valuation,
 )
 from .purchase_order_service import ( #noqa
     create_purchase_order,
@@ -69,6 +84,17 @@ from .housekeeping_service import ( #noqa
     update_housekeeping_log_status,
     assign_housekeeping_task,
     update_housekeeping_log_details,
+    generate_daily_tasks,
+    get_task_durations,
+    auto_assign_tasks,
+    sync_status_changes,
+)
+from .housekeeping_board_service import ( #noqa
+    get_board_snapshot,
+)
+from .housekeeping_stats_service import ( #noqa
+    refresh_housekeeping_stats,
+    get_housekeeping_stats,
 )
 from .pos_service import ( #noqa
     create_pos_sale,
@@ -82,5 +108,20 @@ from .billing_service import ( #noqa
     get_folio_details,
     get_folios_for_guest,
     update_folio_status,
+    reconcile_folio_totals,
+    get_folio_summary,
+    get_folio_summaries,
+    get_folio_transactions,
     _recalculate_and_save_folio_totals # Exporting for potential direct use or testing, though typically internal
 )
+from .night_audit_service import ( #noqa
+    run_night_audit,
+    get_night_audit_run,
+    get_night_audit_runs,
+)
+from .export_service import ( #noqa
+    folio_transactions_export,
+    pos_sales_export,
+    stock_movements_export,
+    stream_export,
+)
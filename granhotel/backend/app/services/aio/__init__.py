@@ -0,0 +1,2 @@
+# Async variants of the hot services, for `async def` endpoints using app.db.session.get_async_db
+from . import reservation_service, pos_service, billing_service # noqa
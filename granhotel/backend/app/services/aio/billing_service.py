@@ -0,0 +1,36 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import uuid
+
+from app import models
+from app import schemas
+from app.services import billing_service
+
+# Async variants of app.services.billing_service; see app/services/aio/reservation_service.py for how they work.
+
+
+async def get_folio_details(db: AsyncSession, folio_id: int) -> Optional[models.billing.GuestFolio]:
+    return await db.run_sync(billing_service.get_folio_details, folio_id)
+
+
+async def get_folios_for_guest(
+    db: AsyncSession, guest_id: uuid.UUID, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.billing.GuestFolio]:
+    return await db.run_sync(billing_service.get_folios_for_guest, guest_id, skip=skip, limit=limit, cursor=cursor)
+
+
+def _get_or_create_and_load(db: Session, guest_id: uuid.UUID, reservation_id: Optional[int]) -> models.billing.GuestFolio:
+    folio = billing_service.get_or_create_folio_for_guest(db, guest_id, reservation_id)
+    return billing_service.get_folio_details(db, folio.id)
+
+
+async def get_or_create_folio_for_guest(db: AsyncSession, guest_id: uuid.UUID, reservation_id: Optional[int] = None) -> models.billing.GuestFolio:
+    return await db.run_sync(_get_or_create_and_load, guest_id, reservation_id)
+
+
+async def add_transaction_to_folio(
+    db: AsyncSession, folio_id: int, transaction_in: schemas.billing.FolioTransactionCreate, created_by_user_id: uuid.UUID
+) -> models.billing.GuestFolio:
+    # The sync service already returns the folio re-read with its transactions loaded
+    return await db.run_sync(billing_service.add_transaction_to_folio, folio_id, transaction_in, created_by_user_id)
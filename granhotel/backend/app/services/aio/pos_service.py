@@ -0,0 +1,46 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+import uuid
+
+from app import models
+from app import schemas
+from app.models.pos import POSSaleStatus, PaymentMethod
+from app.services import pos_service
+
+# Async variants of app.services.pos_service; see app/services/aio/reservation_service.py for how they work.
+
+
+async def get_pos_sale(db: AsyncSession, sale_id: int) -> Optional[models.pos.POSSale]:
+    return await db.run_sync(pos_service.get_pos_sale, sale_id)
+
+
+async def get_pos_sales(
+    db: AsyncSession, skip: int = 0, limit: int = 100,
+    cashier_user_id: Optional[uuid.UUID] = None,
+    guest_id: Optional[uuid.UUID] = None,
+    status: Optional[POSSaleStatus] = None,
+    payment_method: Optional[PaymentMethod] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None
+) -> List[models.pos.POSSale]:
+    return await db.run_sync(
+        pos_service.get_pos_sales, skip=skip, limit=limit, cashier_user_id=cashier_user_id, guest_id=guest_id,
+        status=status, payment_method=payment_method, date_from=date_from, date_to=date_to, cursor=cursor
+    )
+
+
+async def create_pos_sale(db: AsyncSession, sale_in: schemas.pos.POSSaleCreate, cashier_user_id: uuid.UUID) -> models.pos.POSSale:
+    # The sync service already returns the sale re-read with items, products, cashier and guest loaded
+    return await db.run_sync(pos_service.create_pos_sale, sale_in, cashier_user_id)
+
+
+def _void_and_load(db: Session, sale_id: int, reason: str, voiding_user_id: uuid.UUID) -> Optional[models.pos.POSSale]:
+    sale = pos_service.void_pos_sale(db, sale_id, reason, voiding_user_id)
+    return pos_service.get_pos_sale(db, sale.id) if sale else None
+
+
+async def void_pos_sale(db: AsyncSession, sale_id: int, reason: str, voiding_user_id: uuid.UUID) -> Optional[models.pos.POSSale]:
+    return await db.run_sync(_void_and_load, sale_id, reason, voiding_user_id)
@@ -0,0 +1,87 @@
+import asyncio
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+
+from app import models
+from app import schemas
+from app.core.config import settings
+from app.models.reservation import ReservationStatus
+from app.services import reservation_service
+
+# Each function runs the synchronous implementation through AsyncSession.run_sync: the business
+# logic stays in app.services.reservation_service, while every query it issues is awaited on
+# asyncpg, so the event loop keeps serving other requests instead of blocking a threadpool worker.
+# Results are returned with their relationships loaded (lazy loads cannot run after run_sync).
+
+
+async def get_reservation(db: AsyncSession, reservation_id: int) -> Optional[models.Reservation]:
+    return await db.run_sync(reservation_service.get_reservation, reservation_id)
+
+
+async def get_reservations(
+    db: AsyncSession, skip: int = 0, limit: int = 100,
+    guest_id: Optional[int] = None,
+    room_id: Optional[int] = None,
+    status: Optional[ReservationStatus] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None
+) -> List[models.Reservation]:
+    return await db.run_sync(
+        reservation_service.get_reservations, skip=skip, limit=limit,
+        guest_id=guest_id, room_id=room_id, status=status, date_from=date_from, date_to=date_to, cursor=cursor
+    )
+
+
+async def is_room_available(
+    db: AsyncSession, room_id: int, check_in_date: date, check_out_date: date, reservation_id_to_exclude: Optional[int] = None
+) -> bool:
+    return await db.run_sync(reservation_service.is_room_available, room_id, check_in_date, check_out_date, reservation_id_to_exclude)
+
+
+async def search_available_rooms(
+    db: AsyncSession, check_in_date: date, check_out_date: date,
+    room_type: Optional[str] = None, floor: Optional[int] = None, building: Optional[str] = None,
+    min_price: Optional[float] = None, max_price: Optional[float] = None
+) -> List[models.Room]:
+    return await db.run_sync(
+        reservation_service.search_available_rooms, check_in_date, check_out_date,
+        room_type=room_type, floor=floor, building=building, min_price=min_price, max_price=max_price
+    )
+
+
+def _create_and_load(db: Session, reservation_in: schemas.ReservationCreate) -> models.Reservation:
+    reservation = reservation_service._create_reservation_once(db, reservation_in)
+    return reservation_service.get_reservation(db, reservation.id)
+
+
+async def create_reservation(db: AsyncSession, reservation_in: schemas.ReservationCreate) -> models.Reservation:
+    '''
+    Async reservation_service.create_reservation: same room lock, availability check and exclusion
+    constraint backstop. The deadlock/serialization retry loop lives here so its backoff is an
+    asyncio.sleep rather than a blocking time.sleep.
+    '''
+    for attempt in range(settings.BOOKING_MAX_RETRIES + 1):
+        try:
+            return await db.run_sync(_create_and_load, reservation_in)
+        except DBAPIError as e:
+            await db.rollback()
+            if reservation_service._pgcode(e) not in reservation_service.PG_RETRYABLE_ERRORS or attempt == settings.BOOKING_MAX_RETRIES:
+                raise
+            await asyncio.sleep(settings.BOOKING_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def _update_status_and_load(db: Session, reservation_id: int, new_status: ReservationStatus) -> Optional[models.Reservation]:
+    reservation = reservation_service.update_reservation_status(db, reservation_id, new_status)
+    return reservation_service.get_reservation(db, reservation.id) if reservation else None
+
+
+async def update_reservation_status(db: AsyncSession, reservation_id: int, new_status: ReservationStatus) -> Optional[models.Reservation]:
+    return await db.run_sync(_update_status_and_load, reservation_id, new_status)
+
+
+async def cancel_reservation(db: AsyncSession, reservation_id: int) -> Optional[models.Reservation]:
+    return await update_reservation_status(db, reservation_id, ReservationStatus.CANCELLED)
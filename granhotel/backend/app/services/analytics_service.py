@@ -0,0 +1,196 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from app import models
+from app.models.reservation import ReservationStatus
+from app.schemas.analytics import ReportGranularity
+from fastapi import HTTPException, status
+
+# Statuses whose nights count as sold. CANCELLED/NO_SHOW/PENDING/WAITLIST contribute nothing.
+SOLD_STATUSES = (ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN, ReservationStatus.CHECKED_OUT)
+
+CENT = Decimal("0.01")
+
+# Incremental fact writers share this lock and a rebuild takes it exclusively. A rebuild therefore waits for
+# the bookings in flight, and its snapshot of reservations cannot miss a delta that lands on its rows after
+# the DELETE. Two rebuilds also queue behind each other instead of inserting the same days twice.
+_FACTS_WRITE_LOCK_SQL = text("SELECT pg_advisory_xact_lock_shared(hashtext('daily_occupancy_facts'))")
+_FACTS_REBUILD_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('daily_occupancy_facts'))")
+
+
+class StaySnapshot(NamedTuple):
+    '''The fields of a reservation that determine its contribution to the daily facts.'''
+    status: ReservationStatus
+    check_in_date: date
+    check_out_date: date
+    total_price: Optional[Decimal]
+
+
+def snapshot_reservation(reservation: Any) -> StaySnapshot:
+    return StaySnapshot(reservation.status, reservation.check_in_date, reservation.check_out_date, reservation.total_price)
+
+
+def _nightly_contribution(stay: Optional[StaySnapshot]) -> Dict[date, Tuple[int, Decimal]]:
+    '''Per night: (room-nights, revenue). The total is spread evenly; the last night takes the rounding remainder.'''
+    if stay is None or stay.status not in SOLD_STATUSES:
+        return {}
+    nights = (stay.check_out_date - stay.check_in_date).days
+    if nights <= 0:
+        return {}
+    total = Decimal(stay.total_price or 0).quantize(CENT)
+    per_night = (total / nights).quantize(CENT, rounding=ROUND_HALF_UP) # As Postgres round() in the rebuild
+    contribution = {}
+    for offset in range(nights):
+        revenue = per_night if offset < nights - 1 else total - per_night * (nights - 1)
+        contribution[stay.check_in_date + timedelta(days=offset)] = (1, revenue)
+    return contribution
+
+
+def record_reservation_changes(db: Session, changes: Iterable[Tuple[Optional[StaySnapshot], Optional[StaySnapshot]]]) -> None:
+    '''
+    Apply (before, after) reservation changes to daily_occupancy_facts as deltas, in the caller's
+    transaction (no commit). Use before=None for a new reservation. All affected dates are written
+    with one INSERT ... ON CONFLICT DO UPDATE, which is safe under concurrent bookings.
+    '''
+    deltas: Dict[date, List[Any]] = {}
+    for before, after in changes:
+        for sign, stay in ((-1, before), (1, after)):
+            for night, (room_nights, revenue) in _nightly_contribution(stay).items():
+                delta = deltas.setdefault(night, [0, Decimal("0.00")])
+                delta[0] += sign * room_nights
+                delta[1] += sign * revenue
+
+    rows = [
+        {"stay_date": night, "room_nights_sold": room_nights, "room_revenue": revenue}
+        for night, (room_nights, revenue) in sorted(deltas.items()) # Sorted so concurrent writers lock rows in the same order
+        if room_nights != 0 or revenue != 0
+    ]
+    if not rows:
+        return
+
+    db.execute(_FACTS_WRITE_LOCK_SQL)
+    facts = models.DailyOccupancyFact.__table__
+    stmt = pg_insert(facts).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[facts.c.stay_date],
+        set_={
+            "room_nights_sold": facts.c.room_nights_sold + stmt.excluded.room_nights_sold,
+            "room_revenue": facts.c.room_revenue + stmt.excluded.room_revenue,
+            "updated_at": text("now()")
+        }
+    )
+    db.execute(stmt)
+
+
+def rebuild_daily_occupancy_facts(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    '''
+    Recompute the facts from the reservations table for [start_date, end_date] (whole table if omitted),
+    e.g. after a manual data fix. Returns the number of fact rows written. Commits.
+    Runs under an exclusive advisory lock, so it neither races another rebuild nor concurrent bookings.
+    '''
+    params = {
+        "sold_statuses": [s.value for s in SOLD_STATUSES],
+        "start_date": start_date or date.min,
+        "end_date": end_date or date.max
+    }
+    db.execute(_FACTS_REBUILD_LOCK_SQL)
+    db.execute(text("DELETE FROM daily_occupancy_facts WHERE stay_date BETWEEN :start_date AND :end_date"), params)
+    result = db.execute(text("""
+        INSERT INTO daily_occupancy_facts (stay_date, room_nights_sold, room_revenue)
+        SELECT night::date,
+               count(*),
+               sum(CASE WHEN night::date = r.check_out_date - 1
+                        THEN coalesce(r.total_price, 0) - round(coalesce(r.total_price, 0) / (r.check_out_date - r.check_in_date), 2) * (r.check_out_date - r.check_in_date - 1)
+                        ELSE round(coalesce(r.total_price, 0) / (r.check_out_date - r.check_in_date), 2)
+                   END)
+        FROM reservations r
+        CROSS JOIN LATERAL generate_series(r.check_in_date, r.check_out_date - 1, interval '1 day') AS night
+        WHERE r.status::text = ANY(:sold_statuses)
+          AND r.check_out_date > r.check_in_date
+          AND r.check_out_date > :start_date
+          AND r.check_in_date <= :end_date
+          AND night::date BETWEEN :start_date AND :end_date
+        GROUP BY night::date
+    """), params)
+    db.commit()
+    return result.rowcount
+
+
+def _period_start(day: date, granularity: ReportGranularity) -> date:
+    if granularity == ReportGranularity.WEEK:
+        return day - timedelta(days=day.weekday()) # ISO weeks start on Monday
+    if granularity == ReportGranularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _ratio(numerator: Decimal, denominator: Decimal, places: Decimal = CENT) -> Decimal:
+    return (numerator / denominator).quantize(places) if denominator else Decimal("0").quantize(places)
+
+
+def get_occupancy_report(
+    db: Session, start_date: date, end_date: date, granularity: ReportGranularity = ReportGranularity.DAY
+) -> Dict[str, Any]:
+    '''
+    Occupancy %, ADR and RevPAR per day/week/month over [start_date, end_date] (inclusive),
+    read from daily_occupancy_facts (one indexed range scan, at most one row per day).
+    Capacity is the current number of rooms times the days of each period.
+    '''
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="End date must be on or after start date.")
+
+    room_count = db.query(models.Room).count()
+    facts = {
+        stay_date: (room_nights_sold, room_revenue)
+        for stay_date, room_nights_sold, room_revenue in db.query(
+            models.DailyOccupancyFact.stay_date,
+            models.DailyOccupancyFact.room_nights_sold,
+            models.DailyOccupancyFact.room_revenue
+        ).filter(models.DailyOccupancyFact.stay_date.between(start_date, end_date)).all()
+    }
+
+    periods: Dict[date, Dict[str, Any]] = {}
+    day = start_date
+    while day <= end_date:
+        period = periods.setdefault(_period_start(day, granularity), {"first_day": day, "days": 0, "room_nights_sold": 0, "room_revenue": Decimal("0.00")})
+        room_nights_sold, room_revenue = facts.get(day, (0, Decimal("0.00")))
+        period["last_day"] = day
+        period["days"] += 1
+        period["room_nights_sold"] += room_nights_sold
+        period["room_revenue"] += Decimal(room_revenue)
+        day += timedelta(days=1)
+
+    def build_row(first_day: date, last_day: date, days: int, room_nights_sold: int, room_revenue: Decimal) -> Dict[str, Any]:
+        room_nights_available = room_count * days
+        return {
+            "period_start": first_day,
+            "period_end": last_day,
+            "room_nights_available": room_nights_available,
+            "room_nights_sold": room_nights_sold,
+            "room_revenue": room_revenue.quantize(CENT),
+            "occupancy_rate": _ratio(Decimal(room_nights_sold) * 100, Decimal(room_nights_available)), # Percentage
+            "adr": _ratio(room_revenue, Decimal(room_nights_sold)), # Average Daily Rate: revenue per sold room-night
+            "revpar": _ratio(room_revenue, Decimal(room_nights_available)) # Revenue per available room-night
+        }
+
+    rows = [
+        build_row(p["first_day"], p["last_day"], p["days"], p["room_nights_sold"], p["room_revenue"])
+        for p in periods.values()
+    ]
+    totals = build_row(
+        start_date, end_date, (end_date - start_date).days + 1,
+        sum(p["room_nights_sold"] for p in periods.values()),
+        sum((p["room_revenue"] for p in periods.values()), Decimal("0.00"))
+    )
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "granularity": granularity,
+        "room_count": room_count,
+        "rows": rows,
+        "totals": totals
+    }
@@ -0,0 +1,215 @@
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import date
+import logging
+import threading
+import time
+
+from app import models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.reservation import ReservationStatus
+
+logger = logging.getLogger(__name__)
+
+# Statuses that block a room for the nights of a stay (mirrors is_room_available)
+BLOCKING_STATUSES = (ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN)
+
+# Night 0 of every bitmap. Nights before this date are clipped (history is never searched).
+INDEX_EPOCH = date(2000, 1, 1)
+
+
+def _night_offset(night: date) -> int:
+    return max((night - INDEX_EPOCH).days, 0)
+
+
+def _stay_mask(check_in_date: date, check_out_date: date) -> int:
+    '''Bitmask with one bit set per night in [check_in_date, check_out_date).'''
+    start = _night_offset(check_in_date)
+    end = _night_offset(check_out_date)
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+class RoomAvailabilityIndex:
+    '''
+    In-process per-room, per-night occupancy bitmap built from blocking reservations.
+
+    Each room maps to a Python int where bit N is set when night INDEX_EPOCH + N is taken,
+    so a stay can be checked against a room with a single AND of two masks.
+    The index is per worker process: it is built on startup (or on first use) and refreshed
+    in the background once it is older than AVAILABILITY_INDEX_TTL_SECONDS, which bounds how
+    long bookings written by other workers can go unseen. Being per process, it is a hint:
+    writes confirm its answer against the database.
+    '''
+
+    def __init__(self, ttl_seconds: int = 300, session_factory: Optional[Callable[[], Session]] = None):
+        self.ttl_seconds = ttl_seconds
+        self.session_factory = session_factory # Sessions for background refreshes; None refreshes inline
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock() # One rebuild at a time
+        self._bitmaps: Dict[int, int] = {}
+        self._stays: Dict[int, Dict[int, Tuple[date, date]]] = {} # room_id -> {reservation_id: (check_in, check_out)}
+        self._reservation_rooms: Dict[int, int] = {} # reservation_id -> room_id
+        self._built_at: Optional[float] = None
+        # Syncs received while a rebuild reads the database, replayed onto the new snapshot before it goes live
+        self._pending_syncs: Optional[List[Tuple[int, int, ReservationStatus, date, date]]] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        return self.ttl_seconds > 0 and (time.monotonic() - self._built_at) > self.ttl_seconds
+
+    def rebuild(self, db: Session) -> None:
+        '''
+        Rebuild the whole index from CONFIRMED/CHECKED_IN reservations that end after the epoch.
+        Bookings committed while the query runs may be missing from its snapshot, so the syncs
+        received meanwhile are replayed onto it before it replaces the live index.
+        '''
+        with self._rebuild_lock:
+            with self._lock:
+                self._pending_syncs = []
+            try:
+                rows = db.query(
+                    models.Reservation.id,
+                    models.Reservation.room_id,
+                    models.Reservation.check_in_date,
+                    models.Reservation.check_out_date
+                ).filter(
+                    models.Reservation.status.in_(BLOCKING_STATUSES),
+                    models.Reservation.check_out_date > INDEX_EPOCH
+                ).all()
+            except Exception:
+                with self._lock:
+                    self._pending_syncs = None
+                raise
+
+            bitmaps: Dict[int, int] = {}
+            stays: Dict[int, Dict[int, Tuple[date, date]]] = {}
+            reservation_rooms: Dict[int, int] = {}
+            for reservation_id, room_id, check_in_date, check_out_date in rows:
+                bitmaps[room_id] = bitmaps.get(room_id, 0) | _stay_mask(check_in_date, check_out_date)
+                stays.setdefault(room_id, {})[reservation_id] = (check_in_date, check_out_date)
+                reservation_rooms[reservation_id] = room_id
+
+            with self._lock:
+                self._bitmaps = bitmaps
+                self._stays = stays
+                self._reservation_rooms = reservation_rooms
+                for stay in self._pending_syncs:
+                    self._apply_stay(*stay)
+                self._pending_syncs = None
+                self._built_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        '''Build the index with db if it was never built; if it is only stale, refresh it in the background.'''
+        if not self.is_built:
+            self.rebuild(db)
+        elif self.is_stale():
+            self.refresh_in_background()
+
+    def refresh_in_background(self) -> None:
+        '''Rebuild on a daemon thread with a session of its own (no-op while a refresh is running).'''
+        if self.session_factory is None:
+            return
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh, name="availability-index-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh(self) -> None:
+        db = self.session_factory()
+        try:
+            self.rebuild(db)
+        except Exception: # The stale index keeps serving; the next consult tries again
+            logger.exception("Could not refresh the room availability index")
+        finally:
+            db.close()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._built_at = None
+
+    def _recompute_room(self, room_id: int) -> None:
+        bitmap = 0
+        for check_in_date, check_out_date in self._stays.get(room_id, {}).values():
+            bitmap |= _stay_mask(check_in_date, check_out_date)
+        if bitmap:
+            self._bitmaps[room_id] = bitmap
+        else:
+            self._bitmaps.pop(room_id, None)
+            self._stays.pop(room_id, None)
+
+    def release(self, reservation_id: int) -> None:
+        '''Remove a reservation's nights from the index (no-op if it was not indexed).'''
+        with self._lock:
+            room_id = self._reservation_rooms.pop(reservation_id, None)
+            if room_id is None:
+                return
+            self._stays.get(room_id, {}).pop(reservation_id, None)
+            # Recompute instead of clearing bits so overlapping legacy stays keep their nights
+            self._recompute_room(room_id)
+
+    def sync_reservation(self, reservation: models.Reservation) -> None:
+        '''
+        Bring the index in line with a reservation's committed state.
+        Call after commit on create, update, status change and cancellation.
+        '''
+        self.sync_stay(reservation.id, reservation.room_id, reservation.status, reservation.check_in_date, reservation.check_out_date)
+
+    def sync_stay(
+        self, reservation_id: int, room_id: int, status: ReservationStatus, check_in_date: date, check_out_date: date
+    ) -> None:
+        '''Same as sync_reservation, for callers that wrote rows without loading ORM objects (bulk inserts).'''
+        with self._lock:
+            if self._pending_syncs is not None:
+                self._pending_syncs.append((reservation_id, room_id, status, check_in_date, check_out_date))
+            if self.is_built: # Otherwise there is nothing to keep in sync; the next build reads the DB
+                self._apply_stay(reservation_id, room_id, status, check_in_date, check_out_date)
+
+    def _apply_stay(
+        self, reservation_id: int, room_id: int, status: ReservationStatus, check_in_date: date, check_out_date: date
+    ) -> None:
+        self.release(reservation_id)
+        if status in BLOCKING_STATUSES:
+            self._stays.setdefault(room_id, {})[reservation_id] = (check_in_date, check_out_date)
+            self._reservation_rooms[reservation_id] = room_id
+            self._bitmaps[room_id] = self._bitmaps.get(room_id, 0) | _stay_mask(check_in_date, check_out_date)
+
+    def is_available(
+        self, room_id: int, check_in_date: date, check_out_date: date, reservation_id_to_exclude: Optional[int] = None
+    ) -> bool:
+        mask = _stay_mask(check_in_date, check_out_date)
+        with self._lock:
+            bitmap = self._bitmaps.get(room_id, 0)
+            if reservation_id_to_exclude is not None and self._reservation_rooms.get(reservation_id_to_exclude) == room_id:
+                bitmap = 0
+                for other_id, (check_in, check_out) in self._stays[room_id].items():
+                    if other_id != reservation_id_to_exclude:
+                        bitmap |= _stay_mask(check_in, check_out)
+            return bitmap & mask == 0
+
+    def available_room_ids(self, room_ids: Iterable[int], check_in_date: date, check_out_date: date) -> List[int]:
+        '''Filter room_ids down to those with no taken night in [check_in_date, check_out_date).'''
+        mask = _stay_mask(check_in_date, check_out_date)
+        with self._lock:
+            bitmaps = self._bitmaps
+            return [room_id for room_id in room_ids if bitmaps.get(room_id, 0) & mask == 0]
+
+    def occupied_nights(self, room_id: int, start_date: date, end_date: date) -> List[bool]:
+        '''Per-night occupancy flags for a room over [start_date, end_date), e.g. for calendar grids.'''
+        start = _night_offset(start_date)
+        nights = (end_date - start_date).days
+        with self._lock:
+            bitmap = self._bitmaps.get(room_id, 0) >> start
+        return [bool((bitmap >> n) & 1) for n in range(max(nights, 0))]
+
+
+room_availability_index = RoomAvailabilityIndex(ttl_seconds=settings.AVAILABILITY_INDEX_TTL_SECONDS, session_factory=SessionLocal)
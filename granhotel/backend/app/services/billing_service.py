@@ -1,19 +1,27 @@
 from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import func as sql_func
+from sqlalchemy import func as sql_func, or_, select
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timezone, timedelta
 from decimal import Decimal
+import logging
 import uuid
 
 from app import models
 from app import schemas
 from app.models.billing import GuestFolio, FolioTransaction, FolioStatus, FolioTransactionType
 from app.models.guest import Guest
-from app.models.reservations import Reservation
+from app.models.reservation import Reservation
 from app.models.pos import POSSale
 from app.models.user import User
 from app.services import guest_service, reservation_service, pos_service # Removed user_service, not directly used
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+logger = logging.getLogger(__name__)
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+FOLIO_LIST_ORDER = (SortKey(models.billing.GuestFolio.opened_at, descending=True), SortKey(models.billing.GuestFolio.id, descending=True))
+FOLIO_TRANSACTION_LIST_ORDER = (SortKey(models.billing.FolioTransaction.transaction_date), SortKey(models.billing.FolioTransaction.id))
 
 def _recalculate_and_save_folio_totals(db: Session, folio_id: int) -> models.billing.GuestFolio:
     # Use a subquery to get the folio to avoid issues with already loaded relationships if any
@@ -42,6 +50,78 @@ def _recalculate_and_save_folio_totals(db: Session, folio_id: int) -> models.bil
     return folio
 
 
+def _apply_transaction_to_folio_totals(db: Session, folio_id: int, charge_amount: Decimal, payment_amount: Decimal) -> bool:
+    '''
+    Add one transaction's amounts to the folio's stored totals with a single
+    UPDATE ... SET total_charges = total_charges + :charge, without committing. The row lock it
+    takes serialises concurrent postings to the same folio. The new totals come back through
+    RETURNING into the folio if it is already loaded in the session. False if the folio is not OPEN.
+    '''
+    updated = db.query(models.billing.GuestFolio).filter(
+        models.billing.GuestFolio.id == folio_id,
+        models.billing.GuestFolio.status == FolioStatus.OPEN
+    ).update({
+        models.billing.GuestFolio.total_charges: models.billing.GuestFolio.total_charges + (charge_amount or Decimal("0.00")),
+        models.billing.GuestFolio.total_payments: models.billing.GuestFolio.total_payments + (payment_amount or Decimal("0.00")),
+    }, synchronize_session="fetch")
+    return updated == 1
+
+
+def reconcile_folio_totals(db: Session, folio_status: Optional[FolioStatus] = None, fix: bool = False) -> Dict[str, Any]:
+    '''
+    Verify every folio's stored totals (optionally only folios in folio_status) against the sums of its
+    transactions, in one aggregate query. Drifted folios are logged and reported; with fix=True their
+    totals are reset from the ledger in one UPDATE (recomputed inside the UPDATE, so postings that
+    land in between are not lost).
+    '''
+    ledger = select(
+        models.billing.FolioTransaction.guest_folio_id.label("folio_id"),
+        sql_func.sum(models.billing.FolioTransaction.charge_amount).label("charges"),
+        sql_func.sum(models.billing.FolioTransaction.payment_amount).label("payments")
+    ).group_by(models.billing.FolioTransaction.guest_folio_id).subquery()
+    ledger_charges = sql_func.coalesce(ledger.c.charges, Decimal("0.00"))
+    ledger_payments = sql_func.coalesce(ledger.c.payments, Decimal("0.00"))
+
+    folios = db.query(models.billing.GuestFolio.id)
+    if folio_status is not None:
+        folios = folios.filter(models.billing.GuestFolio.status == folio_status)
+    checked_folios = folios.count()
+
+    drift_rows = folios.add_columns(
+        models.billing.GuestFolio.total_charges, ledger_charges,
+        models.billing.GuestFolio.total_payments, ledger_payments
+    ).outerjoin(ledger, ledger.c.folio_id == models.billing.GuestFolio.id).filter(or_(
+        models.billing.GuestFolio.total_charges != ledger_charges,
+        models.billing.GuestFolio.total_payments != ledger_payments
+    )).order_by(models.billing.GuestFolio.id).all()
+
+    drifted = [
+        {
+            "folio_id": folio_id,
+            "recorded_total_charges": recorded_charges, "ledger_total_charges": charges,
+            "recorded_total_payments": recorded_payments, "ledger_total_payments": payments,
+        }
+        for folio_id, recorded_charges, charges, recorded_payments, payments in drift_rows
+    ]
+    for row in drifted:
+        logger.warning("Folio %s totals drifted from its ledger: %s", row["folio_id"], row)
+
+    if fix and drifted:
+        def ledger_sum(column):
+            return select(sql_func.coalesce(sql_func.sum(column), Decimal("0.00"))).where(
+                models.billing.FolioTransaction.guest_folio_id == models.billing.GuestFolio.id
+            ).scalar_subquery()
+        db.query(models.billing.GuestFolio).filter(
+            models.billing.GuestFolio.id.in_([row["folio_id"] for row in drifted])
+        ).update({
+            models.billing.GuestFolio.total_charges: ledger_sum(models.billing.FolioTransaction.charge_amount),
+            models.billing.GuestFolio.total_payments: ledger_sum(models.billing.FolioTransaction.payment_amount),
+        }, synchronize_session="fetch")
+        db.commit()
+
+    return {"checked_folios": checked_folios, "drifted_folios": drifted, "fixed": fix and bool(drifted)}
+
+
 def get_folio_details(db: Session, folio_id: int) -> Optional[models.billing.GuestFolio]:
     # This function is used by others, so it needs to be defined before them or forward declared.
     # Python handles this fine if not type hinting return of this in the functions above it.
@@ -49,14 +129,14 @@ def get_folio_details(db: Session, folio_id: int) -> Optional[models.billing.Gue
     return db.query(models.billing.GuestFolio).options(
         joinedload(models.billing.GuestFolio.guest),
         joinedload(models.billing.GuestFolio.reservation).options(
-            selectinload(models.reservations.Reservation.room)
+            selectinload(models.reservation.Reservation.room)
         ),
         selectinload(models.billing.GuestFolio.transactions).options(
             joinedload(models.billing.FolioTransaction.created_by),
             joinedload(models.billing.FolioTransaction.pos_sale),
             joinedload(models.billing.FolioTransaction.reservation_ref)
         )
-    ).filter(models.billing.GuestFolio.id == folio_id).first()
+    ).populate_existing().filter(models.billing.GuestFolio.id == folio_id).first() # Totals may have been updated in SQL since the folio was loaded
 
 
 def get_or_create_folio_for_guest(
@@ -142,20 +222,19 @@ def add_transaction_to_folio(
         created_by_user_id=created_by_user_id
     )
     db.add(new_transaction)
-    # Important: Commit the new transaction before recalculating totals.
-    # _recalculate_and_save_folio_totals itself commits.
+    # Totals move by this transaction's amounts in the same transaction (no re-aggregation of the ledger).
+    # The status condition makes a concurrent close win cleanly instead of posting to a closed folio.
+    if not _apply_transaction_to_folio_totals(db, folio_id, new_transaction.charge_amount, new_transaction.payment_amount):
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Folio ID {folio_id} is not OPEN. Cannot add new transactions.")
     db.commit()
-    # db.refresh(new_transaction) # Not strictly needed if not immediately using it before recalculate
-
-    updated_folio = _recalculate_and_save_folio_totals(db, folio_id)
-    return get_folio_details(db, updated_folio.id) # Return with all joins
+    return get_folio_details(db, folio_id) # Return with all joins
 
 
-def get_folios_for_guest(db: Session, guest_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[models.billing.GuestFolio]:
+def get_folios_for_guest(db: Session, guest_id: uuid.UUID, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.billing.GuestFolio]:
     # Guest ID is UUID in model, ensure comparison is correct
-    return db.query(models.billing.GuestFolio).filter(
-        models.billing.GuestFolio.guest_id == guest_id
-    ).order_by(models.billing.GuestFolio.opened_at.desc()).offset(skip).limit(limit).all()
+    query = db.query(models.billing.GuestFolio).filter(models.billing.GuestFolio.guest_id == guest_id)
+    return paginate(query, FOLIO_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 
 def update_folio_status(
@@ -179,3 +258,57 @@ def update_folio_status(
     db.commit()
     db.refresh(folio)
     return get_folio_details(db, folio.id)
+
+
+# --- Projections: folio headers and transaction pages without loading whole folios ---
+
+def _folio_summary_query(db: Session):
+    '''Folio header columns plus guest name and room number: one row per folio, no ORM objects, no transactions.'''
+    return db.query(
+        models.billing.GuestFolio.id,
+        models.billing.GuestFolio.guest_id,
+        models.billing.GuestFolio.reservation_id,
+        models.billing.GuestFolio.status,
+        models.billing.GuestFolio.total_charges,
+        models.billing.GuestFolio.total_payments,
+        models.billing.GuestFolio.balance.label("balance"),
+        models.billing.GuestFolio.opened_at,
+        models.billing.GuestFolio.closed_at,
+        models.billing.GuestFolio.updated_at,
+        models.Guest.first_name.label("guest_first_name"),
+        models.Guest.last_name.label("guest_last_name"),
+        models.Room.room_number.label("room_number")
+    ).outerjoin(models.Guest, models.Guest.id == models.billing.GuestFolio.guest_id).outerjoin(
+        models.Reservation, models.Reservation.id == models.billing.GuestFolio.reservation_id
+    ).outerjoin(models.Room, models.Room.id == models.Reservation.room_id)
+
+
+def get_folio_summary(db: Session, folio_id: int) -> Optional[Any]:
+    return _folio_summary_query(db).filter(models.billing.GuestFolio.id == folio_id).first()
+
+
+def get_folio_summaries(
+    db: Session,
+    folio_status: Optional[FolioStatus] = None,
+    guest_id: Optional[uuid.UUID] = None,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Any]:
+    '''Balances of many folios (e.g. every OPEN folio for the front-desk dashboard) in one query.'''
+    query = _folio_summary_query(db)
+    if folio_status is not None:
+        query = query.filter(models.billing.GuestFolio.status == folio_status)
+    if guest_id is not None:
+        query = query.filter(models.billing.GuestFolio.guest_id == guest_id)
+    return paginate(query, FOLIO_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+
+def get_folio_transactions(
+    db: Session, folio_id: int,
+    transaction_type: Optional[FolioTransactionType] = None,
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.billing.FolioTransaction]:
+    '''One page of a folio's transactions in posting order, without the user/POS sale/reservation joins.'''
+    query = db.query(models.billing.FolioTransaction).filter(models.billing.FolioTransaction.guest_folio_id == folio_id)
+    if transaction_type is not None:
+        query = query.filter(models.billing.FolioTransaction.transaction_type == transaction_type)
+    return paginate(query, FOLIO_TRANSACTION_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
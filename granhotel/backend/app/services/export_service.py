@@ -0,0 +1,239 @@
+from sqlalchemy import types as sa_types
+from sqlalchemy.orm import Query, Session
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional, Tuple
+from datetime import date, datetime, timezone, timedelta
+import csv
+import enum
+import io
+import uuid
+
+from app import models
+from app.core.config import settings
+from app.models.billing import FolioTransactionType
+from app.models.inventory import StockMovementType
+from app.models.pos import POSSaleStatus, PaymentMethod
+from fastapi import HTTPException, status
+
+try: # Optional dependency: only needed for format=parquet
+    import pyarrow
+    import pyarrow.parquet
+except ImportError: # pragma: no cover
+    pyarrow = None
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+
+class ExportQuery(NamedTuple):
+    '''A column-projection query to export: (header, column) pairs in output order.'''
+    name: str
+    columns: List[Tuple[str, Any]]
+    query: Query
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def _filter_dates(query: Query, column: Any, date_from: Optional[date], date_to: Optional[date]) -> Query:
+    # Same inclusive calendar-day semantics as the list services
+    if date_from:
+        query = query.filter(column >= _day_start(date_from))
+    if date_to:
+        query = query.filter(column < _day_start(date_to + timedelta(days=1)))
+    return query
+
+
+def _projection(db: Session, columns: List[Tuple[str, Any]]) -> Query:
+    # Plain column tuples, no ORM objects: nothing is added to the identity map while streaming
+    return db.query(*[column.label(header) for header, column in columns])
+
+
+def folio_transactions_export(
+    db: Session,
+    date_from: Optional[date] = None, date_to: Optional[date] = None,
+    transaction_type: Optional[FolioTransactionType] = None,
+    folio_id: Optional[int] = None
+) -> ExportQuery:
+    t = models.billing.FolioTransaction
+    columns = [
+        ("id", t.id), ("guest_folio_id", t.guest_folio_id), ("transaction_date", t.transaction_date),
+        ("business_date", t.business_date), ("transaction_type", t.transaction_type), ("description", t.description),
+        ("charge_amount", t.charge_amount), ("payment_amount", t.payment_amount),
+        ("related_pos_sale_id", t.related_pos_sale_id), ("related_reservation_id", t.related_reservation_id),
+        ("created_by_user_id", t.created_by_user_id), ("created_at", t.created_at),
+    ]
+    query = _projection(db, columns)
+    query = _filter_dates(query, t.transaction_date, date_from, date_to)
+    if transaction_type:
+        query = query.filter(t.transaction_type == transaction_type)
+    if folio_id:
+        query = query.filter(t.guest_folio_id == folio_id)
+    return ExportQuery("folio_transactions", columns, query.order_by(t.transaction_date, t.id))
+
+
+def pos_sales_export(
+    db: Session,
+    date_from: Optional[date] = None, date_to: Optional[date] = None,
+    sale_status: Optional[POSSaleStatus] = None,
+    payment_method: Optional[PaymentMethod] = None,
+    cashier_user_id: Optional[uuid.UUID] = None,
+    guest_id: Optional[uuid.UUID] = None
+) -> ExportQuery:
+    s = models.pos.POSSale
+    columns = [
+        ("id", s.id), ("sale_date", s.sale_date), ("status", s.status), ("payment_method", s.payment_method),
+        ("payment_reference", s.payment_reference), ("total_amount_before_tax", s.total_amount_before_tax),
+        ("tax_amount", s.tax_amount), ("total_amount_after_tax", s.total_amount_after_tax),
+        ("cashier_user_id", s.cashier_user_id), ("guest_id", s.guest_id), ("notes", s.notes),
+        ("void_reason", s.void_reason), ("voided_by_user_id", s.voided_by_user_id), ("voided_at", s.voided_at),
+    ]
+    query = _projection(db, columns)
+    query = _filter_dates(query, s.sale_date, date_from, date_to)
+    if sale_status:
+        query = query.filter(s.status == sale_status)
+    if payment_method:
+        query = query.filter(s.payment_method == payment_method)
+    if cashier_user_id:
+        query = query.filter(s.cashier_user_id == cashier_user_id)
+    if guest_id:
+        query = query.filter(s.guest_id == guest_id)
+    return ExportQuery("pos_sales", columns, query.order_by(s.sale_date, s.id))
+
+
+def stock_movements_export(
+    db: Session,
+    date_from: Optional[date] = None, date_to: Optional[date] = None,
+    movement_type: Optional[StockMovementType] = None,
+    product_id: Optional[int] = None
+) -> ExportQuery:
+    m = models.inventory.StockMovement
+    columns = [
+        ("id", m.id), ("movement_date", m.movement_date), ("product_id", m.product_id),
+        ("movement_type", m.movement_type), ("quantity_changed", m.quantity_changed), ("reason", m.reason),
+        ("purchase_order_item_id", m.purchase_order_item_id), ("created_at", m.created_at),
+    ]
+    query = _projection(db, columns)
+    query = _filter_dates(query, m.movement_date, date_from, date_to)
+    if movement_type:
+        query = query.filter(m.movement_type == movement_type)
+    if product_id:
+        query = query.filter(m.product_id == product_id)
+    return ExportQuery("stock_movements", columns, query.order_by(m.movement_date, m.id))
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _batches(export: ExportQuery, batch_size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    '''Rows of the export, batch_size at a time, read from a server-side cursor (constant memory).'''
+    result = export.query.session.execute(
+        export.query.statement.execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for partition in result.partitions(batch_size):
+        yield [tuple(_plain(value) for value in row) for row in partition]
+
+
+def _csv_chunks(export: ExportQuery, batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in export.columns])
+    for rows in _batches(export, batch_size):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _arrow_type(sa_type: Any) -> Any:
+    if isinstance(sa_type, sa_types.Numeric) and not isinstance(sa_type, sa_types.Float):
+        return pyarrow.decimal128(sa_type.precision or 38, sa_type.scale or 0)
+    if isinstance(sa_type, sa_types.Integer):
+        return pyarrow.int64()
+    if isinstance(sa_type, sa_types.DateTime):
+        return pyarrow.timestamp("us", tz="UTC")
+    if isinstance(sa_type, sa_types.Date):
+        return pyarrow.date32()
+    if isinstance(sa_type, sa_types.Boolean):
+        return pyarrow.bool_()
+    return pyarrow.string() # String, Text, Enum, UUID
+
+
+class _ChunkSink(io.RawIOBase):
+    '''Write-only file that keeps what was written until drained, so Parquet row groups can be streamed out.'''
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _parquet_chunks(export: ExportQuery, batch_size: int) -> Iterator[bytes]:
+    schema = pyarrow.schema([(header, _arrow_type(column.type)) for header, column in export.columns])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    try:
+        for rows in _batches(export, batch_size):
+            columns = list(zip(*rows))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+            )) # One row group per batch
+            yield sink.drain()
+    finally:
+        writer.close() # Writes the footer (and an empty file's schema)
+    yield sink.drain()
+
+
+def check_export_format(export_format: str) -> None:
+    '''Fail before the response starts: errors inside a streaming body cannot change its status code.'''
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Export format must be one of {', '.join(EXPORT_FORMATS)}.")
+    if export_format == "parquet" and pyarrow is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Parquet export requires the 'pyarrow' package to be installed.")
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    build_export: Callable[..., ExportQuery],
+    export_format: str = "csv",
+    batch_size: Optional[int] = None,
+    **filters: Any
+) -> Iterator[bytes]:
+    '''
+    Body of a streaming export: opens its own session (the request's session is closed by the time
+    the body is sent), streams the rows from a server-side cursor and encodes them batch by batch.
+    '''
+    check_export_format(export_format)
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    db = session_factory()
+    try:
+        export = build_export(db, **filters)
+        chunks = _parquet_chunks(export, batch_size) if export_format == "parquet" else _csv_chunks(export, batch_size)
+        for chunk in chunks:
+            if chunk:
+                yield chunk
+    finally:
+        db.close()
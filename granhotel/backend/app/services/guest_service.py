@@ -6,6 +6,10 @@ from app import models
 from app import schemas
 from app.models.guest import Guest # Explicit import for clarity
 from app.schemas.guest import GuestCreate, GuestUpdate # Explicit import
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+GUEST_LIST_ORDER = (SortKey(models.Guest.last_name), SortKey(models.Guest.first_name), SortKey(models.Guest.id))
 
 def get_guest(db: Session, guest_id: int) -> Optional[models.Guest]:
     '''
@@ -31,7 +35,8 @@ def get_guests(
     last_name: Optional[str] = None,
     document_number: Optional[str] = None,
     email: Optional[str] = None,
-    is_blacklisted: Optional[bool] = None
+    is_blacklisted: Optional[bool] = None,
+    cursor: Optional[str] = None
 ) -> List[models.Guest]:
     '''
     Retrieve a list of guests with optional filtering.
@@ -49,7 +54,7 @@ def get_guests(
     if is_blacklisted is not None:
         query = query.filter(models.Guest.is_blacklisted == is_blacklisted)
 
-    return query.order_by(models.Guest.last_name, models.Guest.first_name).offset(skip).limit(limit).all()
+    return paginate(query, GUEST_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def create_guest(db: Session, guest_in: schemas.GuestCreate) -> models.Guest:
     '''
@@ -0,0 +1,105 @@
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Set
+from datetime import date
+import json
+
+from app import models
+from app.core.config import settings
+from app.core.events import EventBroadcaster
+
+# Supervisor boards (SSE streams) of this worker process; changes made in other workers arrive through
+# the process's event relay (app.main)
+housekeeping_board = EventBroadcaster("housekeeping_board", channel="housekeeping_board", max_queue=settings.HOUSEKEEPING_BOARD_MAX_QUEUE)
+
+
+def _board_query(db: Session):
+    log = models.housekeeping.HousekeepingLog
+    room = models.room.Room
+    return db.query(
+        log.id, log.room_id, room.room_number, log.task_type, log.status, log.assigned_to_user_id, log.scheduled_date, log.updated_at
+    ).join(room, room.id == log.room_id)
+
+
+def _entry(row: Any) -> Dict[str, Any]:
+    # The compact form of a task on the board
+    return {
+        "id": row.id,
+        "room_id": row.room_id,
+        "room_number": row.room_number,
+        "task_type": row.task_type.value,
+        "status": row.status.value,
+        "assigned_to_user_id": str(row.assigned_to_user_id) if row.assigned_to_user_id else None,
+        "scheduled_date": row.scheduled_date.isoformat(),
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+def get_board_snapshot(db: Session, scheduled_date: date) -> List[Dict[str, Any]]:
+    '''Every task of the date in board form, by room number: one column query, no ORM objects.'''
+    log = models.housekeeping.HousekeepingLog
+    rows = _board_query(db).filter(log.scheduled_date == scheduled_date).order_by(models.room.Room.room_number, log.id).all()
+    return [_entry(row) for row in rows]
+
+
+def publish_log_change(db: Session, log_id: int) -> None:
+    '''Push the task's new state to every board once the caller commits. Call before db.commit().'''
+    publish_log_changes(db, [log_id])
+
+
+def publish_log_changes(db: Session, log_ids: List[int]) -> None:
+    '''publish_log_change for several tasks, read in one query.'''
+    if not log_ids:
+        return
+    db.flush()
+    log = models.housekeeping.HousekeepingLog
+    for row in _board_query(db).filter(log.id.in_(log_ids)).order_by(log.id).all():
+        housekeeping_board.publish_after_commit(db, {"type": "task", "task": _entry(row)})
+
+
+def publish_board_refresh(db: Session, scheduled_date: date) -> None:
+    '''After a bulk change of the date's tasks: boards showing that date reload their snapshot.'''
+    housekeeping_board.publish_after_commit(db, {"type": "refresh", "scheduled_date": scheduled_date.isoformat()})
+
+
+def _sse(event_name: str, data: Any) -> bytes:
+    return f"event: {event_name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+async def stream_board(
+    session_factory: Callable[[], Session],
+    scheduled_date: date,
+    is_disconnected: Callable[[], Awaitable[bool]]
+) -> AsyncIterator[bytes]:
+    '''
+    Server-Sent Events body of a supervisor board: a `snapshot` of the date's tasks, then a `task` event per
+    change to one of them, pushed from the broadcaster rather than polled. A comment line is sent every
+    HOUSEKEEPING_BOARD_HEARTBEAT_SECONDS to keep proxies from closing an idle stream.
+    '''
+    def load_snapshot() -> List[Dict[str, Any]]:
+        db = session_factory() # Closed right away: an open stream holds no database connection
+        try:
+            return get_board_snapshot(db, scheduled_date)
+        finally:
+            db.close()
+
+    subscription = housekeeping_board.subscribe() # Before the snapshot, so no change falls in between
+    day = scheduled_date.isoformat()
+    try:
+        snapshot = await run_in_threadpool(load_snapshot)
+        on_board: Set[int] = {task["id"] for task in snapshot}
+        yield _sse("snapshot", {"scheduled_date": day, "tasks": snapshot})
+        while not await is_disconnected():
+            message = await subscription.get(timeout=settings.HOUSEKEEPING_BOARD_HEARTBEAT_SECONDS)
+            if message is None:
+                yield b": keep-alive\n\n"
+            elif message["type"] == "resync" or (message["type"] == "refresh" and message["scheduled_date"] == day):
+                snapshot = await run_in_threadpool(load_snapshot)
+                on_board = {task["id"] for task in snapshot}
+                yield _sse("snapshot", {"scheduled_date": day, "tasks": snapshot})
+            elif message["type"] == "task" and (message["task"]["scheduled_date"] == day or message["task"]["id"] in on_board):
+                # Also forwarded when a task moves to another date, so the board can drop it
+                on_board.add(message["task"]["id"])
+                yield _sse("task", message["task"])
+    finally:
+        housekeeping_board.unsubscribe(subscription)
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Dict
-from datetime import date, datetime, timezone # Ensure all are imported
+from sqlalchemy import Integer, bindparam, column, func, text, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from typing import Any, List, Optional, Dict, Tuple
+from datetime import date, datetime, timezone, timedelta # Ensure all are imported
 import uuid
 
 from app import models
@@ -8,7 +10,64 @@ from app import schemas
 from app.models.housekeeping import HousekeepingLog, HousekeepingStatus, HousekeepingTaskType
 from app.models.user import User, UserRole # For role checks and fetching user details
 from app.models.room import Room # For room validation
+from app.schemas.housekeeping import HousekeepingStatusChange, HousekeepingSyncRejectionReason
+from app.core.config import settings
+from app.services import housekeeping_board_service
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+HOUSEKEEPING_LOG_LIST_ORDER = (SortKey(models.housekeeping.HousekeepingLog.scheduled_date, descending=True), SortKey(models.housekeeping.HousekeepingLog.id, descending=True))
+
+# Generators of the same date queue behind each other (transaction-scoped advisory lock on (key, date)),
+# which makes the NOT EXISTS check below race-free
+_TASK_GENERATOR_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('housekeeping_daily_tasks'), :day_number)")
+
+# One task per occupied room of the date: a FULL_CLEAN where the stay ends that day (departure) and a
+# STAY_OVER_CLEAN where it continues. Rooms that already have that task for the date are skipped.
+_GENERATE_DAILY_TASKS_SQL = text("""
+    WITH stays AS (
+        SELECT DISTINCT ON (r.room_id)
+               r.room_id,
+               r.id AS reservation_id,
+               CASE WHEN r.check_out_date = :scheduled_date THEN 'FULL_CLEAN' ELSE 'STAY_OVER_CLEAN' END AS task_type
+        FROM reservations r
+        WHERE r.check_in_date < :scheduled_date
+          AND r.check_out_date >= :scheduled_date
+          AND (r.status IN ('CONFIRMED', 'CHECKED_IN') OR (r.status = 'CHECKED_OUT' AND r.check_out_date = :scheduled_date))
+        ORDER BY r.room_id, r.check_out_date
+    )
+    INSERT INTO housekeeping_logs (
+        room_id, task_type, status, scheduled_date, notes_instructions, created_by_user_id, updated_by_user_id
+    )
+    SELECT s.room_id, CAST(s.task_type AS hk_task_type_enum), 'PENDING', :scheduled_date,
+           CASE WHEN s.task_type = 'FULL_CLEAN' THEN 'Departure' ELSE 'Stay-over' END || ' (reservation #' || s.reservation_id || ')',
+           :user_id, :user_id
+    FROM stays s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM housekeeping_logs h
+        WHERE h.scheduled_date = :scheduled_date AND h.room_id = s.room_id AND h.task_type = CAST(s.task_type AS hk_task_type_enum)
+    )
+    RETURNING task_type
+""").bindparams(bindparam("user_id", type_=UUID(as_uuid=True)))
+
+
+def generate_daily_tasks(db: Session, scheduled_date: date, creator_user_id: Optional[uuid.UUID] = None) -> Dict[str, Any]:
+    '''
+    Create the day's cleaning tasks for the whole hotel from the reservations, in one INSERT ... SELECT:
+    FULL_CLEAN for departures and STAY_OVER_CLEAN for stay-overs. Idempotent per (room, date, task type):
+    running it again, or after tasks were added by hand, only creates the missing ones.
+    '''
+    db.execute(_TASK_GENERATOR_LOCK_SQL, {"day_number": scheduled_date.toordinal()})
+    created = db.execute(_GENERATE_DAILY_TASKS_SQL, {"scheduled_date": scheduled_date, "user_id": creator_user_id}).scalars().all()
+    if created:
+        housekeeping_board_service.publish_board_refresh(db, scheduled_date)
+    db.commit()
+    return {
+        "scheduled_date": scheduled_date,
+        "full_cleans_created": sum(task_type == HousekeepingTaskType.FULL_CLEAN.value for task_type in created),
+        "stay_over_cleans_created": sum(task_type == HousekeepingTaskType.STAY_OVER_CLEAN.value for task_type in created),
+    }
 
 def create_housekeeping_log(
     db: Session, log_in: schemas.housekeeping.HousekeepingLogCreate, creator_user_id: uuid.UUID
@@ -33,6 +92,8 @@ def create_housekeeping_log(
 
     db_log = models.housekeeping.HousekeepingLog(**db_log_data)
     db.add(db_log)
+    db.flush()
+    housekeeping_board_service.publish_log_change(db, db_log.id)
     db.commit()
     db.refresh(db_log)
 
@@ -63,7 +124,8 @@ def get_housekeeping_logs(
     status: Optional[HousekeepingStatus] = None,
     task_type: Optional[HousekeepingTaskType] = None,
     scheduled_date_from: Optional[date] = None,
-    scheduled_date_to: Optional[date] = None
+    scheduled_date_to: Optional[date] = None,
+    cursor: Optional[str] = None
 ) -> List[models.housekeeping.HousekeepingLog]:
     '''Retrieve housekeeping logs with various filters and pagination.'''
     query = db.query(models.housekeeping.HousekeepingLog).options(
@@ -83,10 +145,7 @@ def get_housekeeping_logs(
     if scheduled_date_to:
         query = query.filter(models.housekeeping.HousekeepingLog.scheduled_date <= scheduled_date_to)
 
-    return query.order_by(
-        models.housekeeping.HousekeepingLog.scheduled_date.desc(),
-        models.housekeeping.HousekeepingLog.id.desc()
-    ).offset(skip).limit(limit).all()
+    return paginate(query, HOUSEKEEPING_LOG_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 
 def update_housekeeping_log_status(
@@ -121,6 +180,7 @@ def update_housekeeping_log_status(
     if notes_issues is not None: # Allow updating notes regardless of status change
         db_log.notes_issues_reported = notes_issues if notes_issues.strip() else db_log.notes_issues_reported
 
+    housekeeping_board_service.publish_log_change(db, db_log.id)
     db.commit()
     db.refresh(db_log)
     # Re-fetch with all joins for consistent response
@@ -147,6 +207,7 @@ def assign_housekeeping_task(
 
     db_log.updated_by_user_id = updater_user_id
 
+    housekeeping_board_service.publish_log_change(db, db_log.id)
     db.commit()
     db.refresh(db_log)
     return get_housekeeping_log(db, log_id) # Re-fetch for consistent response
@@ -178,6 +239,263 @@ def update_housekeeping_log_details(
         setattr(db_log, field, value)
 
     db_log.updated_by_user_id = updater_user_id
+    housekeeping_board_service.publish_log_change(db, db_log.id)
     db.commit()
     db.refresh(db_log)
     return get_housekeeping_log(db, log_id) # Re-fetch for consistent response with all joins
+
+
+# Statuses a housekeeper may set on their own tasks (besides IN_PROGRESS -> PENDING when interrupted)
+HOUSEKEEPER_SETTABLE_STATUSES = (
+    HousekeepingStatus.IN_PROGRESS, HousekeepingStatus.COMPLETED,
+    HousekeepingStatus.NEEDS_INSPECTION, HousekeepingStatus.ISSUE_REPORTED
+)
+
+
+def _status_change_forbidden(log: HousekeepingLog, new_status: HousekeepingStatus, user: User) -> Optional[str]:
+    # The rules of PATCH /logs/{id}/status, as a reason instead of a 403
+    if user.role in (UserRole.MANAGER, UserRole.ADMIN):
+        return None
+    if user.role != UserRole.HOUSEKEEPER or log.assigned_to_user_id != user.id:
+        return "Not authorized to update status of this log"
+    if log.status == HousekeepingStatus.COMPLETED and new_status != HousekeepingStatus.COMPLETED:
+        return "Task is already completed and cannot be changed by assigned staff without manager/admin rights."
+    if new_status not in HOUSEKEEPER_SETTABLE_STATUSES and not (log.status == HousekeepingStatus.IN_PROGRESS and new_status == HousekeepingStatus.PENDING):
+        return f"Housekeeper cannot set status to {new_status.value}"
+    return None
+
+
+def _rejection(change: HousekeepingStatusChange, reason: HousekeepingSyncRejectionReason, detail: str, current: Optional[HousekeepingLog] = None) -> Dict[str, Any]:
+    return {"log_id": change.log_id, "status": change.status, "changed_at": change.changed_at, "reason": reason, "detail": detail, "current": current}
+
+
+def sync_status_changes(
+    db: Session, sync_in: schemas.housekeeping.HousekeepingStatusSyncRequest, user: User
+) -> Dict[str, Any]:
+    '''
+    Apply the status changes a tablet recorded (possibly offline), in one transaction: one locking read
+    of the tasks, one flush, one commit. Each task's changes are applied in changed_at order, and started_at /
+    completed_at take the device's times (corrected by its clock offset when sent_at is given).
+    Last writer wins per task: if the task was changed on the server after the device's last change to it,
+    the device's changes are rejected as conflicts along with the server's state, unless the task is already
+    in the requested status (a replayed batch), which counts as unchanged. Changes the user may not make are
+    rejected individually, as PATCH /logs/{id}/status would refuse them.
+    '''
+    if len(sync_in.changes) > settings.HOUSEKEEPING_SYNC_MAX_CHANGES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {settings.HOUSEKEEPING_SYNC_MAX_CHANGES} changes can be synced at once.")
+    now = datetime.now(timezone.utc)
+
+    def as_utc(moment: datetime) -> datetime:
+        return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    clock_offset = now - as_utc(sync_in.sent_at) if sync_in.sent_at else timedelta(0)
+
+    def server_time(change: HousekeepingStatusChange) -> datetime:
+        return min(as_utc(change.changed_at) + clock_offset, now)
+
+    changes_by_log: Dict[int, List[HousekeepingStatusChange]] = {}
+    for change in sorted(sync_in.changes, key=server_time):
+        changes_by_log.setdefault(change.log_id, []).append(change)
+
+    # Locked in id order, so concurrent syncs touching the same tasks cannot deadlock
+    logs = {
+        log.id: log for log in db.query(HousekeepingLog).filter(HousekeepingLog.id.in_(list(changes_by_log)))
+        .order_by(HousekeepingLog.id).with_for_update().populate_existing().all()
+    }
+
+    changed_ids, conflict_ids, rejected, unchanged = [], [], [], 0
+    for log_id, changes in changes_by_log.items():
+        log = logs.get(log_id)
+        if log is None:
+            rejected.extend(_rejection(change, HousekeepingSyncRejectionReason.NOT_FOUND, "Housekeeping log not found") for change in changes)
+            continue
+        last = changes[-1]
+        if log.updated_at > server_time(last):
+            if log.status == last.status:
+                unchanged += len(changes)
+            else:
+                conflict_ids.append(log_id)
+                rejected.extend(_rejection(change, HousekeepingSyncRejectionReason.CONFLICT, "Changed on the server after this change was made") for change in changes)
+            continue
+
+        applied = False
+        for change in changes:
+            forbidden = _status_change_forbidden(log, change.status, user)
+            if forbidden:
+                rejected.append(_rejection(change, HousekeepingSyncRejectionReason.FORBIDDEN, forbidden))
+                continue
+            if log.status == change.status and change.notes_issues_reported is None:
+                unchanged += 1
+                continue
+            changed_at = server_time(change)
+            log.status = change.status
+            if change.status == HousekeepingStatus.IN_PROGRESS and not log.started_at:
+                log.started_at = changed_at
+            elif change.status in (HousekeepingStatus.COMPLETED, HousekeepingStatus.NEEDS_INSPECTION) and not log.completed_at:
+                log.completed_at = changed_at
+                log.started_at = log.started_at or changed_at
+            if change.notes_issues_reported is not None and change.notes_issues_reported.strip():
+                log.notes_issues_reported = change.notes_issues_reported
+            applied = True
+        if applied:
+            log.updated_by_user_id = user.id
+            changed_ids.append(log_id)
+
+    housekeeping_board_service.publish_log_changes(db, changed_ids)
+    db.commit()
+
+    # One read for the new versions (updated_at is set by the database) and the conflicting tasks' state
+    current = {
+        log.id: log for log in db.query(HousekeepingLog).filter(HousekeepingLog.id.in_(changed_ids + conflict_ids))
+        .populate_existing().all()
+    } if changed_ids or conflict_ids else {}
+    for rejection in rejected:
+        if rejection["reason"] == HousekeepingSyncRejectionReason.CONFLICT:
+            rejection["current"] = current[rejection["log_id"]]
+    return {
+        "applied": len(sync_in.changes) - unchanged - len(rejected),
+        "unchanged": unchanged,
+        "logs": [current[log_id] for log_id in sorted(changed_ids)],
+        "rejected": rejected,
+    }
+
+
+# Minutes per task type until enough tasks of that type have been completed to learn it
+DEFAULT_TASK_MINUTES: Dict[HousekeepingTaskType, float] = {
+    HousekeepingTaskType.FULL_CLEAN: 45.0,
+    HousekeepingTaskType.STAY_OVER_CLEAN: 20.0,
+    HousekeepingTaskType.TURNDOWN_SERVICE: 10.0,
+    HousekeepingTaskType.MAINTENANCE_CHECK: 30.0,
+    HousekeepingTaskType.LINEN_CHANGE: 15.0,
+    HousekeepingTaskType.VACANT_ROOM_CHECK: 10.0,
+}
+
+
+def get_task_durations(db: Session) -> Dict[HousekeepingTaskType, float]:
+    '''Median minutes per task type over the tasks completed in the last HOUSEKEEPING_DURATION_LOOKBACK_DAYS days.'''
+    log = models.housekeeping.HousekeepingLog
+    since = datetime.now(timezone.utc) - timedelta(days=settings.HOUSEKEEPING_DURATION_LOOKBACK_DAYS)
+    rows = db.query(
+        log.task_type, func.percentile_cont(0.5).within_group(log.completed_at - log.started_at)
+    ).filter(
+        log.status == HousekeepingStatus.COMPLETED,
+        log.started_at.isnot(None),
+        log.completed_at > log.started_at,
+        log.completed_at >= since
+    ).group_by(log.task_type).all()
+    durations = dict(DEFAULT_TASK_MINUTES)
+    durations.update({task_type: round(median.total_seconds() / 60, 1) for task_type, median in rows})
+    return durations
+
+
+def _plan_assignments(
+    tasks: List[Tuple[int, HousekeepingTaskType, Optional[str], Optional[int]]],
+    staff: Dict[uuid.UUID, Dict[str, Any]],
+    durations: Dict[HousekeepingTaskType, float]
+) -> List[Tuple[int, uuid.UUID]]:
+    '''
+    Greedy balancing of (log_id, task_type, building, floor) tasks over staff workloads, floors busiest first.
+    A floor's rooms go to whoever already works that floor as long as they stay within the fair share
+    (all the day's minutes / staff); otherwise to whoever would end up with the least work, counting
+    HOUSEKEEPING_FLOOR_CHANGE_MINUTES / HOUSEKEEPING_BUILDING_CHANGE_MINUTES for a floor or building new
+    to their round. O(tasks x staff), a few thousand steps for a full hotel.
+    '''
+    floors: Dict[Tuple[str, int], List[Tuple[int, HousekeepingTaskType]]] = {}
+    for log_id, task_type, building, floor in tasks:
+        floors.setdefault((building or "", floor if floor is not None else -1), []).append((log_id, task_type))
+    floor_order = sorted(floors, key=lambda zone: (-sum(durations[t] for _, t in floors[zone]), zone))
+    fair_share = (sum(member["minutes"] for member in staff.values()) + sum(durations[t] for _, t, _, _ in tasks)) / len(staff)
+
+    def minutes_after(member: Dict[str, Any], zone: Tuple[str, int], task_minutes: float) -> float:
+        minutes = member["minutes"] + task_minutes
+        if member["zones"] and zone not in member["zones"]:
+            minutes += settings.HOUSEKEEPING_FLOOR_CHANGE_MINUTES
+            if zone[0] not in {building for building, _ in member["zones"]}:
+                minutes += settings.HOUSEKEEPING_BUILDING_CHANGE_MINUTES
+        return minutes
+
+    plan = []
+    for zone in floor_order:
+        for log_id, task_type in floors[zone]:
+            task_minutes = durations[task_type]
+            on_floor = [user_id for user_id, member in staff.items() if zone in member["zones"] and member["minutes"] + task_minutes <= fair_share]
+            user_id = min(
+                on_floor or staff,
+                key=lambda candidate: (minutes_after(staff[candidate], zone, task_minutes), staff[candidate]["tasks"], str(candidate))
+            )
+            member = staff[user_id]
+            member["minutes"] = minutes_after(member, zone, task_minutes)
+            member["zones"].add(zone)
+            member["tasks"] += 1
+            plan.append((log_id, user_id))
+    return plan
+
+
+def auto_assign_tasks(
+    db: Session, scheduled_date: date, updater_user_id: uuid.UUID, dry_run: bool = False
+) -> Dict[str, Any]:
+    '''
+    Assign the date's unassigned PENDING tasks across the active housekeepers, balancing their workload
+    (including tasks they already have that day) by learned task durations and floor/building proximity.
+    Three reads (durations, tasks with their rooms, staff with their current load) and one bulk
+    UPDATE ... FROM (VALUES ...), which skips tasks someone assigned by hand in the meantime.
+    With dry_run the plan is returned without being applied.
+    '''
+    log = models.housekeeping.HousekeepingLog
+    room = models.room.Room
+    durations = get_task_durations(db)
+
+    tasks = db.query(log.id, log.task_type, room.building, room.floor).join(room, room.id == log.room_id).filter(
+        log.scheduled_date == scheduled_date,
+        log.status == HousekeepingStatus.PENDING,
+        log.assigned_to_user_id.is_(None)
+    ).order_by(room.building, room.floor, room.room_number, log.id).all()
+
+    housekeepers = db.query(User.id, User.first_name, User.last_name).filter(
+        User.role == UserRole.HOUSEKEEPER, User.is_active == True
+    ).order_by(User.id).all()
+    if not housekeepers:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="There are no active housekeepers to assign tasks to.")
+    staff = {
+        user_id: {"name": " ".join(part for part in (first_name, last_name) if part), "minutes": 0.0, "zones": set(), "tasks": 0, "new_tasks": 0}
+        for user_id, first_name, last_name in housekeepers
+    }
+    existing = db.query(log.assigned_to_user_id, log.task_type, room.building, room.floor).join(room, room.id == log.room_id).filter(
+        log.scheduled_date == scheduled_date,
+        log.assigned_to_user_id.in_(list(staff)),
+        log.status.in_([HousekeepingStatus.PENDING, HousekeepingStatus.IN_PROGRESS])
+    ).all()
+    for user_id, task_type, building, floor in existing:
+        staff[user_id]["minutes"] += durations[task_type]
+        staff[user_id]["zones"].add((building or "", floor if floor is not None else -1))
+        staff[user_id]["tasks"] += 1
+
+    plan = _plan_assignments(tasks, staff, durations)
+    for _, user_id in plan:
+        staff[user_id]["new_tasks"] += 1
+
+    assigned_ids = [log_id for log_id, _ in plan]
+    if plan and not dry_run:
+        assignments = values(column("log_id", Integer), column("user_id", UUID(as_uuid=True)), name="assignments").data(plan)
+        stmt = (
+            update(log)
+            .where(log.id == assignments.c.log_id, log.assigned_to_user_id.is_(None))
+            .values(assigned_to_user_id=assignments.c.user_id, updated_by_user_id=updater_user_id)
+            .returning(log.id)
+            .execution_options(synchronize_session=False)
+        )
+        assigned_ids = db.execute(stmt).scalars().all()
+        if assigned_ids:
+            housekeeping_board_service.publish_board_refresh(db, scheduled_date)
+        db.commit()
+
+    return {
+        "scheduled_date": scheduled_date,
+        "dry_run": dry_run,
+        "tasks_assigned": len(assigned_ids),
+        "tasks_skipped": len(plan) - len(assigned_ids), # Assigned by someone else while the plan was computed
+        "task_minutes": {task_type.value: minutes for task_type, minutes in durations.items()},
+        "staff": [
+            {"user_id": user_id, "name": member["name"], "tasks_assigned": member["new_tasks"], "total_tasks": member["tasks"], "workload_minutes": round(member["minutes"], 1)}
+            for user_id, member in staff.items()
+        ],
+    }
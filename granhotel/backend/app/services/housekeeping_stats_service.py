@@ -0,0 +1,175 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Integer, func, text
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, time, timezone, timedelta
+import uuid
+
+from app import models
+from app.core.config import settings
+from app.models.housekeeping import HousekeepingTaskType
+from app.models.user import User
+from app.schemas.housekeeping import HousekeepingStatsGroupBy
+from fastapi import HTTPException, status
+
+# Refreshes queue behind each other: two of them rebuilding the same day would duplicate its rows
+_STATS_REFRESH_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('housekeeping_daily_stats'))")
+
+# Days (hotel time zone) holding a completion among the logs changed since the given time (index on updated_at)
+_STATS_CHANGED_DAYS_SQL = text("""
+    SELECT DISTINCT CAST(completed_at AT TIME ZONE :tz AS date) AS stat_date
+    FROM housekeeping_logs
+    WHERE updated_at >= :since AND completed_at IS NOT NULL
+""")
+
+_STATS_DELETE_DAYS_SQL = text("DELETE FROM housekeeping_daily_stats WHERE stat_date = ANY(:days)")
+
+# The completed tasks of the days, grouped per (day, task type, housekeeper, floor) with every duration kept.
+# The completed_at window only lets the index narrow the scan; the day list is what selects the rows.
+_STATS_INSERT_DAYS_SQL = text("""
+    INSERT INTO housekeeping_daily_stats (stat_date, task_type, housekeeper_user_id, floor, task_count, duration_seconds)
+    SELECT CAST(h.completed_at AT TIME ZONE :tz AS date),
+           h.task_type,
+           h.assigned_to_user_id,
+           r.floor,
+           count(*),
+           array_agg(CAST(round(extract(epoch FROM h.completed_at - h.started_at)) AS integer))
+    FROM housekeeping_logs h
+    JOIN rooms r ON r.id = h.room_id
+    WHERE h.status = 'COMPLETED'
+      AND h.started_at IS NOT NULL
+      AND h.completed_at > h.started_at
+      AND h.completed_at >= :window_start AND h.completed_at < :window_end
+      AND CAST(h.completed_at AT TIME ZONE :tz AS date) = ANY(:days)
+    GROUP BY 1, 2, 3, 4
+""")
+
+# Changes committed by transactions still open during the last refresh carry an earlier updated_at:
+# an incremental refresh looks back this much further than the last one
+_REFRESH_OVERLAP = timedelta(minutes=10)
+
+
+def refresh_housekeeping_stats(db: Session, full: bool = False) -> Dict[str, Any]:
+    '''
+    Bring the daily stats up to date. Incremental by default: only the days with a completed task among
+    the logs changed since the last refresh are recomputed (delete + one INSERT ... SELECT), so a run after
+    a normal day touches a day or two. With full, or on the first run, every day is rebuilt; needed only
+    after a completed task's completion time was moved to another day.
+    '''
+    stat = models.housekeeping.HousekeepingDailyStat
+    db.execute(_STATS_REFRESH_LOCK_SQL)
+    last_refresh = db.query(func.max(stat.refreshed_at)).scalar()
+    full = full or last_refresh is None
+
+    if full:
+        db.query(stat).delete(synchronize_session=False)
+        since = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    else:
+        since = last_refresh - _REFRESH_OVERLAP
+    days: List[date] = db.execute(_STATS_CHANGED_DAYS_SQL, {"tz": settings.TIMEZONE, "since": since}).scalars().all()
+
+    rows_written = 0
+    if days:
+        if not full:
+            db.execute(_STATS_DELETE_DAYS_SQL, {"days": days})
+        result = db.execute(_STATS_INSERT_DAYS_SQL, {
+            "tz": settings.TIMEZONE,
+            "days": days,
+            # A day in any time zone lies within the UTC days either side of it
+            "window_start": datetime.combine(min(days) - timedelta(days=1), time.min, tzinfo=timezone.utc),
+            "window_end": datetime.combine(max(days) + timedelta(days=2), time.min, tzinfo=timezone.utc),
+        })
+        rows_written = result.rowcount
+    db.commit()
+    return {"full": full, "days_refreshed": len(days), "rows_written": rows_written}
+
+
+def _minutes(seconds: Any) -> float:
+    return round(float(seconds) / 60, 1)
+
+
+def _row(key: Optional[str], label: str, measures: Any) -> Dict[str, Any]:
+    return {
+        "key": key,
+        "label": label,
+        "tasks": measures.tasks,
+        "avg_minutes": _minutes(measures.avg_seconds),
+        "median_minutes": _minutes(measures.median_seconds),
+        "p90_minutes": _minutes(measures.p90_seconds),
+        "min_minutes": _minutes(measures.min_seconds),
+        "max_minutes": _minutes(measures.max_seconds),
+    }
+
+
+def get_housekeeping_stats(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    group_by: HousekeepingStatsGroupBy = HousekeepingStatsGroupBy.TASK_TYPE,
+    task_type: Optional[HousekeepingTaskType] = None,
+    housekeeper_user_id: Optional[uuid.UUID] = None,
+    floor: Optional[int] = None
+) -> Dict[str, Any]:
+    '''
+    Clean time statistics (count, average, median, 90th percentile, min, max) of the tasks completed
+    between two dates (inclusive), per task type, housekeeper or floor, plus the totals. Computed in SQL
+    from the daily stats (a year is a few thousand rows), percentiles with percentile_cont over the stored
+    durations. Reflects the logs as of the last refresh_housekeeping_stats.
+    '''
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be on or before date_to.")
+    stat = models.housekeeping.HousekeepingDailyStat
+    seconds = func.unnest(stat.duration_seconds, type_=Integer).column_valued("seconds")
+    measures = (
+        func.count(seconds).label("tasks"),
+        func.avg(seconds).label("avg_seconds"),
+        func.percentile_cont(0.5).within_group(seconds).label("median_seconds"),
+        func.percentile_cont(0.9).within_group(seconds).label("p90_seconds"),
+        func.min(seconds).label("min_seconds"),
+        func.max(seconds).label("max_seconds"),
+    )
+
+    def filtered(query):
+        query = query.filter(stat.stat_date >= date_from, stat.stat_date <= date_to)
+        if task_type:
+            query = query.filter(stat.task_type == task_type)
+        if housekeeper_user_id:
+            query = query.filter(stat.housekeeper_user_id == housekeeper_user_id)
+        if floor is not None:
+            query = query.filter(stat.floor == floor)
+        return query
+
+    key = {
+        HousekeepingStatsGroupBy.TASK_TYPE: stat.task_type,
+        HousekeepingStatsGroupBy.HOUSEKEEPER: stat.housekeeper_user_id,
+        HousekeepingStatsGroupBy.FLOOR: stat.floor,
+    }[group_by]
+    # The table first: the unnest in FROM reads the array of the row before it (an implicit LATERAL)
+    grouped = filtered(db.query(key.label("key"), *measures).select_from(stat)).group_by(key).order_by(key.asc().nulls_last()).all()
+    totals = filtered(db.query(*measures).select_from(stat)).one()
+
+    names: Dict[uuid.UUID, str] = {}
+    if group_by == HousekeepingStatsGroupBy.HOUSEKEEPER:
+        user_ids = [row.key for row in grouped if row.key is not None]
+        if user_ids:
+            names = {
+                user_id: " ".join(part for part in (first_name, last_name) if part)
+                for user_id, first_name, last_name in db.query(User.id, User.first_name, User.last_name).filter(User.id.in_(user_ids))
+            }
+
+    rows = []
+    for row in grouped:
+        if group_by == HousekeepingStatsGroupBy.TASK_TYPE:
+            rows.append(_row(row.key.value, row.key.value, row))
+        elif group_by == HousekeepingStatsGroupBy.HOUSEKEEPER:
+            rows.append(_row(str(row.key), names.get(row.key, str(row.key)), row) if row.key else _row(None, "Unassigned", row))
+        else:
+            rows.append(_row(str(row.key) if row.key is not None else None, f"Floor {row.key}" if row.key is not None else "No floor", row))
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "refreshed_at": db.query(func.max(stat.refreshed_at)).scalar(),
+        "rows": rows,
+        "totals": _row(None, "All", totals) if totals.tasks else None,
+    }
@@ -1,12 +1,19 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Dict
+from sqlalchemy import Integer, column, insert, text, update, values
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from typing import Any, Iterable, List, Optional, Dict, Sequence, Tuple
 from datetime import datetime, date, timezone, timedelta # Ensure all are imported
+from decimal import Decimal
 
 from app import models
 from app import schemas
 from app.models.inventory import InventoryItem, StockMovement, StockMovementType
 from app.models.product import Product # To link inventory to product
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+LOW_STOCK_LIST_ORDER = (SortKey(models.inventory.InventoryItem.product_id),) # product_id is unique per inventory item
+STOCK_MOVEMENT_LIST_ORDER = (SortKey(models.inventory.StockMovement.movement_date, descending=True), SortKey(models.inventory.StockMovement.id, descending=True))
 
 def get_inventory_item_by_product_id(db: Session, product_id: int) -> Optional[models.inventory.InventoryItem]:
     '''Retrieve an inventory item by product_id, including the product details.'''
@@ -14,6 +21,22 @@ def get_inventory_item_by_product_id(db: Session, product_id: int) -> Optional[m
         joinedload(models.inventory.InventoryItem.product)
     ).filter(models.inventory.InventoryItem.product_id == product_id).first()
 
+def lock_inventory_items_by_product_ids(db: Session, product_ids: Iterable[int]) -> Dict[int, models.inventory.InventoryItem]:
+    '''
+    Load the inventory items (with their products) of many products in one query and lock them
+    FOR UPDATE until the transaction ends. Rows are locked in product_id order so concurrent
+    callers cannot deadlock. Products without an inventory record are absent from the result.
+    '''
+    unique_ids = sorted(set(product_ids))
+    if not unique_ids:
+        return {}
+    items = db.query(InventoryItem).join(InventoryItem.product).options(
+        contains_eager(InventoryItem.product)
+    ).filter(
+        InventoryItem.product_id.in_(unique_ids)
+    ).order_by(InventoryItem.product_id).with_for_update(of=InventoryItem).all()
+    return {item.product_id: item for item in items}
+
 def _create_stock_movement_internal( # Renamed to indicate internal use and avoid export by default
     db: Session,
     product_id: int,
@@ -153,6 +176,55 @@ def update_stock(
     db.refresh(inventory_item)
     return inventory_item
 
+def deduct_stock_bulk(
+    db: Session,
+    lines: Sequence[Tuple[int, int, Optional[str]]],
+    movement_type: StockMovementType = StockMovementType.SALE,
+) -> Dict[int, int]:
+    '''
+    Deduct stock for many (product_id, quantity, reason) lines as one unit of work, without committing.
+    Quantities are summed per product and applied with a single guarded
+    UPDATE ... FROM (VALUES ...) WHERE quantity_on_hand >= quantity, and the stock movements
+    (one per line) are written with a single bulk INSERT. If any product lacks the stock (or an
+    inventory record) a 400 is raised and nothing is deducted; the caller must roll back.
+    Returns the new quantity_on_hand per product_id.
+    '''
+    totals: Dict[int, int] = {}
+    for product_id, quantity, _ in lines:
+        if quantity <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity to deduct must be positive.")
+        totals[product_id] = totals.get(product_id, 0) + quantity
+    if not totals:
+        return {}
+
+    deductions = values(column("product_id", Integer), column("quantity", Integer), name="deductions").data(sorted(totals.items()))
+    stmt = (
+        update(InventoryItem)
+        .where(InventoryItem.product_id == deductions.c.product_id, InventoryItem.quantity_on_hand >= deductions.c.quantity)
+        .values(quantity_on_hand=InventoryItem.quantity_on_hand - deductions.c.quantity)
+        .returning(InventoryItem.product_id, InventoryItem.quantity_on_hand)
+        .execution_options(synchronize_session=False)
+    )
+    new_quantities = {product_id: quantity for product_id, quantity in db.execute(stmt).all()}
+
+    short_product_ids = [product_id for product_id in totals if product_id not in new_quantities]
+    if short_product_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient stock for product ID(s) {', '.join(str(pid) for pid in sorted(short_product_ids))}."
+        )
+
+    db.execute(insert(StockMovement), [
+        {"product_id": product_id, "quantity_changed": -quantity, "movement_type": movement_type, "reason": reason}
+        for product_id, quantity, reason in lines
+    ])
+
+    # The UPDATE bypassed the identity map: keep already-loaded inventory rows in step with the database
+    for item in db.identity_map.values():
+        if isinstance(item, InventoryItem) and item.product_id in new_quantities:
+            db.expire(item, ["quantity_on_hand", "updated_at"])
+    return new_quantities
+
 def set_low_stock_threshold(db: Session, product_id: int, threshold: int) -> models.inventory.InventoryItem:
     '''Set the low stock threshold for a product's inventory item.'''
     if threshold < 0:
@@ -170,20 +242,22 @@ def set_low_stock_threshold(db: Session, product_id: int, threshold: int) -> mod
         db.refresh(inventory_item)
     return inventory_item
 
-def get_low_stock_items(db: Session, skip: int = 0, limit: int = 100) -> List[models.inventory.InventoryItem]:
+def get_low_stock_items(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.inventory.InventoryItem]:
     '''Retrieve inventory items that are at or below their low stock threshold and are active products.'''
-    return db.query(models.inventory.InventoryItem).join(models.inventory.InventoryItem.product).filter(
+    query = db.query(models.inventory.InventoryItem).join(models.inventory.InventoryItem.product).filter(
         models.product.Product.is_active == True,
         models.inventory.InventoryItem.quantity_on_hand <= models.inventory.InventoryItem.low_stock_threshold,
         models.inventory.InventoryItem.low_stock_threshold > 0 # Only if a threshold is set and > 0
     ).options(
         joinedload(models.inventory.InventoryItem.product)
-    ).order_by(models.inventory.InventoryItem.product_id).offset(skip).limit(limit).all()
+    )
+    return paginate(query, LOW_STOCK_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def get_stock_movement_history(
     db: Session, product_id: int, skip: int = 0, limit: int = 100,
     date_from: Optional[date] = None, date_to: Optional[date] = None,
-    movement_type: Optional[StockMovementType] = None
+    movement_type: Optional[StockMovementType] = None,
+    cursor: Optional[str] = None
 ) -> List[models.inventory.StockMovement]:
     '''Retrieve stock movement history for a product, with optional date and type filtering.'''
     query = db.query(models.inventory.StockMovement).filter(models.inventory.StockMovement.product_id == product_id)
@@ -194,4 +268,129 @@ def get_stock_movement_history(
     if movement_type:
         query = query.filter(models.inventory.StockMovement.movement_type == movement_type)
 
-    return query.order_by(models.inventory.StockMovement.movement_date.desc(), models.inventory.StockMovement.id.desc()).offset(skip).limit(limit).all()
+    return paginate(query, STOCK_MOVEMENT_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+
+# Stock of every inventory item at the end of :as_of_date (UTC): the product's latest snapshot on or before
+# (or strictly before, for the snapshot job) that date, plus the movements after that snapshot up to :as_of_end.
+# Both lateral lookups are index range scans, so the cost does not grow with the years of movement history.
+_STOCK_AT_DATE_SQL = """
+    SELECT i.product_id,
+           s.snapshot_date,
+           coalesce(s.quantity_on_hand, 0) + coalesce(d.quantity, 0) AS quantity_on_hand,
+           coalesce(d.movements, 0) AS movements
+    FROM inventory_items i
+    LEFT JOIN LATERAL (
+        SELECT ss.snapshot_date, ss.quantity_on_hand
+        FROM stock_snapshots ss
+        WHERE ss.product_id = i.product_id AND ss.snapshot_date {snapshot_bound} CAST(:as_of_date AS date)
+        ORDER BY ss.snapshot_date DESC
+        LIMIT 1
+    ) s ON true
+    LEFT JOIN LATERAL (
+        SELECT sum(m.quantity_changed) AS quantity, count(*) AS movements
+        FROM stock_movements m
+        WHERE m.product_id = i.product_id
+          AND (s.snapshot_date IS NULL OR m.movement_date >= CAST(s.snapshot_date + 1 AS timestamp) AT TIME ZONE 'UTC')
+          AND m.movement_date < :as_of_end
+    ) d ON true
+"""
+
+# Only products that moved since their previous snapshot get a row: for the others that snapshot still holds.
+# Re-running a date recomputes its rows.
+_TAKE_SNAPSHOTS_SQL = text("""
+    INSERT INTO stock_snapshots (product_id, snapshot_date, quantity_on_hand)
+    SELECT stock.product_id, :as_of_date, stock.quantity_on_hand
+    FROM ({stock}) stock
+    WHERE stock.movements > 0
+    ON CONFLICT (product_id, snapshot_date) DO UPDATE SET quantity_on_hand = EXCLUDED.quantity_on_hand, created_at = now()
+""".format(stock=_STOCK_AT_DATE_SQL.format(snapshot_bound="<")))
+
+# Unit cost is the price paid on the product's latest purchase receipt up to the date
+_VALUATION_SQL = text("""
+    SELECT p.id AS product_id, p.name AS product_name, p.sku, p.price AS unit_price,
+           stock.snapshot_date, stock.quantity_on_hand, c.unit_cost
+    FROM ({stock}) stock
+    JOIN products p ON p.id = stock.product_id
+    LEFT JOIN LATERAL (
+        SELECT poi.unit_price_paid AS unit_cost
+        FROM stock_movements m
+        JOIN purchase_order_items poi ON poi.id = m.purchase_order_item_id
+        WHERE m.product_id = p.id
+          AND m.movement_type = 'PURCHASE_RECEIPT'
+          AND poi.unit_price_paid IS NOT NULL
+          AND m.movement_date < :as_of_end
+        ORDER BY m.movement_date DESC, m.id DESC
+        LIMIT 1
+    ) c ON true
+    WHERE (CAST(:category_id AS integer) IS NULL OR p.category_id = :category_id)
+      AND (:include_zero OR stock.quantity_on_hand <> 0)
+    ORDER BY p.name, p.id
+""".format(stock=_STOCK_AT_DATE_SQL.format(snapshot_bound="<=")))
+
+
+def _end_of_day(day: date) -> datetime:
+    return datetime.combine(day + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+
+
+def take_stock_snapshots(db: Session, snapshot_date: Optional[date] = None, start_date: Optional[date] = None) -> Dict[str, Any]:
+    '''
+    Batch job: write the end-of-day stock of every product that moved on snapshot_date (default: yesterday, UTC),
+    computed set-based from the previous snapshot and the day's movements. With start_date, every day from
+    start_date to snapshot_date is snapshotted in order (a backfill), one transaction per day.
+    Only closed days can be snapshotted, as a snapshot must not miss movements still to come.
+    '''
+    today = datetime.now(timezone.utc).date()
+    snapshot_date = snapshot_date or today - timedelta(days=1)
+    start_date = start_date or snapshot_date
+    if snapshot_date >= today:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Stock snapshots can only be taken for days that have ended (before today, UTC).")
+    if start_date > snapshot_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date cannot be after snapshot_date.")
+
+    snapshots_written = 0
+    day = start_date
+    while day <= snapshot_date:
+        snapshots_written += db.execute(_TAKE_SNAPSHOTS_SQL, {"as_of_date": day, "as_of_end": _end_of_day(day)}).rowcount
+        db.commit()
+        day += timedelta(days=1)
+    return {"start_date": start_date, "end_date": snapshot_date, "snapshots_written": snapshots_written}
+
+
+def get_stock_valuation(
+    db: Session,
+    as_of_date: date,
+    category_id: Optional[int] = None,
+    include_zero: bool = False
+) -> Dict[str, Any]:
+    '''
+    Stock on hand of every product at the end of as_of_date (UTC), valued at its latest purchase cost
+    and at its current selling price, read from the nearest snapshot plus the movements since.
+    Products never received through a purchase order have no cost and are counted in products_without_cost.
+    '''
+    rows = db.execute(_VALUATION_SQL, {
+        "as_of_date": as_of_date, "as_of_end": _end_of_day(as_of_date),
+        "category_id": category_id, "include_zero": include_zero
+    }).mappings().all()
+
+    lines = []
+    total_quantity, total_stock_value, total_retail_value, products_without_cost = 0, Decimal("0.00"), Decimal("0.00"), 0
+    for row in rows:
+        quantity = int(row["quantity_on_hand"])
+        stock_value = (row["unit_cost"] * quantity).quantize(Decimal("0.01")) if row["unit_cost"] is not None else None
+        retail_value = (row["unit_price"] * quantity).quantize(Decimal("0.01"))
+        lines.append({**row, "quantity_on_hand": quantity, "stock_value": stock_value, "retail_value": retail_value})
+        total_quantity += quantity
+        total_retail_value += retail_value
+        if stock_value is None:
+            products_without_cost += 1
+        else:
+            total_stock_value += stock_value
+    return {
+        "as_of_date": as_of_date,
+        "lines": lines,
+        "total_quantity": total_quantity,
+        "total_stock_value": total_stock_value,
+        "total_retail_value": total_retail_value,
+        "products_without_cost": products_without_cost,
+    }
@@ -0,0 +1,172 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from datetime import date, datetime, timezone, timedelta
+from decimal import Decimal
+import time
+import uuid
+
+from app import models
+from app.core.config import settings
+from app.models.billing import NightAuditRun, NightAuditStatus
+from app.services import pricing_service
+from fastapi import HTTPException, status
+
+# In-house reservations of the business date after the last one done, in id order, with the type and
+# base price of their room so the night can be priced from the rate calendar.
+_CHUNK_SQL = text("""
+    SELECT r.id, r.check_in_date, r.check_out_date, r.total_price, rm.type, rm.price
+    FROM reservations r
+    JOIN rooms rm ON rm.id = r.room_id
+    WHERE r.status = 'CHECKED_IN'
+      AND r.check_in_date <= :business_date
+      AND r.check_out_date > :business_date
+      AND r.total_price IS NOT NULL
+      AND r.id > :after_id
+    ORDER BY r.id
+    LIMIT :chunk_size
+""")
+
+# Open a folio for every reservation of the chunk that has none
+_CREATE_FOLIOS_SQL = text("""
+    INSERT INTO guest_folios (guest_id, reservation_id, status, total_charges, total_payments)
+    SELECT r.guest_id, r.id, 'OPEN', 0, 0
+    FROM reservations r
+    WHERE r.id = ANY(:reservation_ids)
+      AND NOT EXISTS (
+          SELECT 1 FROM guest_folios f WHERE f.reservation_id = r.id AND f.status = 'OPEN'
+      )
+""")
+
+# Post the night's charge into each reservation's most recent open folio and add it to the folio totals,
+# in one statement. Charges already posted for this night are skipped by the unique index, so they are
+# not added to the totals twice either: this is what makes a run safe to resume.
+_POST_CHARGES_SQL = text("""
+    WITH stays AS (
+        SELECT * FROM unnest(CAST(:reservation_ids AS integer[]), CAST(:amounts AS numeric[])) AS s(reservation_id, amount)
+    ),
+    target_folios AS (
+        SELECT DISTINCT ON (f.reservation_id) f.id AS folio_id, f.reservation_id
+        FROM guest_folios f
+        JOIN stays s ON s.reservation_id = f.reservation_id
+        WHERE f.status = 'OPEN'
+        ORDER BY f.reservation_id, f.opened_at DESC, f.id DESC
+    ),
+    posted AS (
+        INSERT INTO folio_transactions (
+            guest_folio_id, transaction_date, description, charge_amount, payment_amount,
+            transaction_type, related_reservation_id, business_date, created_by_user_id
+        )
+        SELECT t.folio_id, now(), 'Room charge ' || CAST(:business_date AS text), s.amount, 0,
+               'ROOM_CHARGE', s.reservation_id, :business_date, :user_id
+        FROM stays s
+        JOIN target_folios t ON t.reservation_id = s.reservation_id
+        ON CONFLICT (related_reservation_id, business_date) WHERE transaction_type = 'ROOM_CHARGE' AND business_date IS NOT NULL
+        DO NOTHING
+        RETURNING guest_folio_id, charge_amount
+    ),
+    folio_totals AS (
+        UPDATE guest_folios f
+        SET total_charges = f.total_charges + p.amount, updated_at = now()
+        FROM (SELECT guest_folio_id, sum(charge_amount) AS amount FROM posted GROUP BY guest_folio_id) p
+        WHERE f.id = p.guest_folio_id
+        RETURNING p.amount
+    )
+    SELECT count(*), coalesce(sum(charge_amount), 0) FROM posted
+""").bindparams(bindparam("user_id", type_=UUID(as_uuid=True)))
+
+
+def get_night_audit_run(db: Session, business_date: date) -> Optional[models.NightAuditRun]:
+    return db.query(NightAuditRun).filter(NightAuditRun.business_date == business_date).first()
+
+
+def get_night_audit_runs(db: Session, skip: int = 0, limit: int = 30) -> List[models.NightAuditRun]:
+    return db.query(NightAuditRun).order_by(NightAuditRun.business_date.desc()).offset(skip).limit(limit).all()
+
+
+def _claim_run(db: Session, business_date: date, user_id: Optional[uuid.UUID]) -> models.NightAuditRun:
+    '''Create the run of business_date, or take over an interrupted one. Commits.'''
+    run = db.query(NightAuditRun).filter(NightAuditRun.business_date == business_date).with_for_update().first()
+    now = datetime.now(timezone.utc)
+    if run is None:
+        run = NightAuditRun(business_date=business_date, status=NightAuditStatus.RUNNING, started_by_user_id=user_id, heartbeat_at=now)
+        db.add(run)
+    elif run.status == NightAuditStatus.COMPLETED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Night audit for {business_date} has already been completed.")
+    elif run.status == NightAuditStatus.RUNNING and now - run.heartbeat_at < timedelta(seconds=settings.NIGHT_AUDIT_STALE_RUN_SECONDS):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Night audit for {business_date} is already running.")
+    else:
+        # FAILED, or RUNNING without progress for too long (its process died): resume after its last chunk
+        run.status = NightAuditStatus.RUNNING
+        run.error = None
+        run.heartbeat_at = now
+    try:
+        db.commit()
+    except IntegrityError: # Another process created the run between our SELECT and INSERT
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Night audit for {business_date} is already running.")
+    db.refresh(run)
+    return run
+
+
+def run_night_audit(
+    db: Session,
+    business_date: date,
+    started_by_user_id: Optional[uuid.UUID] = None,
+    chunk_size: Optional[int] = None
+) -> models.NightAuditRun:
+    '''
+    Post the night's ROOM_CHARGE for every CHECKED_IN reservation staying over business_date into its
+    open folio (opening one where missing) and add it to the folio totals. The charge is the night's
+    share of the booked total, weighted by the nightly rates (see pricing_service.price_night_of_stay).
+    Work is set-based and chunked by reservation id: each chunk is one transaction of three statements
+    (select the chunk, open missing folios, post charges + update totals) that also records the run's
+    progress. An interrupted or failed run is resumed from its last committed chunk by calling this again,
+    and re-posting a night is impossible thanks to the unique (reservation, business_date) charge index.
+    '''
+    chunk_size = chunk_size or settings.NIGHT_AUDIT_CHUNK_SIZE
+    run = _claim_run(db, business_date, started_by_user_id)
+    started = time.perf_counter()
+    try:
+        while True:
+            rows = db.execute(_CHUNK_SQL, {
+                "business_date": business_date, "after_id": run.last_reservation_id, "chunk_size": chunk_size
+            }).all()
+            if not rows:
+                break
+            reservation_ids = [row[0] for row in rows]
+            folios_created = db.execute(_CREATE_FOLIOS_SQL, {"reservation_ids": reservation_ids}).rowcount
+            charges_posted, total_charged = db.execute(_POST_CHARGES_SQL, {
+                "reservation_ids": reservation_ids,
+                "amounts": [
+                    pricing_service.price_night_of_stay(db, row, row.check_in_date, row.check_out_date, row.total_price, business_date)
+                    for row in rows
+                ],
+                "business_date": business_date,
+                "user_id": started_by_user_id
+            }).one()
+
+            run.last_reservation_id = reservation_ids[-1]
+            run.reservations_processed += len(rows)
+            run.folios_created += folios_created
+            run.charges_posted += charges_posted
+            run.total_charged += Decimal(total_charged)
+            run.chunks_processed += 1
+            run.heartbeat_at = datetime.now(timezone.utc)
+            db.commit() # The chunk's postings and the progress that covers them commit together
+    except Exception as e:
+        db.rollback()
+        run.status = NightAuditStatus.FAILED
+        run.error = str(e)[:2000]
+        run.duration_seconds += Decimal(str(round(time.perf_counter() - started, 3)))
+        db.commit()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Night audit for {business_date} failed and can be resumed: {e}")
+
+    run.status = NightAuditStatus.COMPLETED
+    run.finished_at = datetime.now(timezone.utc)
+    run.duration_seconds += Decimal(str(round(time.perf_counter() - started, 3)))
+    db.commit()
+    db.refresh(run)
+    return run
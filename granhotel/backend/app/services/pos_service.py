@@ -10,6 +10,10 @@ from app.models.pos import POSSale, POSSaleItem, POSSaleStatus, PaymentMethod
 from app.models.inventory import StockMovementType
 from app.services import product_service, inventory_service, guest_service, user_service
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+POS_SALE_LIST_ORDER = (SortKey(models.pos.POSSale.sale_date, descending=True), SortKey(models.pos.POSSale.id, descending=True))
 
 def create_pos_sale(
     db: Session,
@@ -18,10 +22,11 @@ def create_pos_sale(
 ) -> models.pos.POSSale:
     '''
     Create a new Point of Sale transaction.
-    - Validates cashier, guest (if provided), and all products.
+    - Validates cashier, guest (if provided), and all products (loaded with their inventory in one query).
     - Calculates total price and tax for each item using product_service.
     - Records the sale and its items.
-    - Updates inventory stock levels for each product sold.
+    - Deducts inventory for all products sold in one guarded bulk UPDATE and commits once,
+      so the sale and its stock changes are atomic.
     '''
     cashier = user_service.get_user(db, cashier_user_id)
     if not cashier or not cashier.is_active:
@@ -42,28 +47,33 @@ def create_pos_sale(
     grand_total_before_tax = Decimal("0.00")
     grand_total_tax_amount = Decimal("0.00")
 
+    # Every product and inventory row of the basket in one query, inventory locked until commit
+    requested_product_ids = {item.product_id for item in sale_in.items}
+    inventory_by_product_id = inventory_service.lock_inventory_items_by_product_ids(db, requested_product_ids)
+    products_by_id = {product_id: inv_item.product for product_id, inv_item in inventory_by_product_id.items()}
+    missing_product_ids = requested_product_ids - products_by_id.keys()
+    if missing_product_ids:
+        # No inventory record: the product may still exist (with nothing on hand). Only reached for such baskets.
+        products_by_id.update({
+            product.id: product
+            for product in db.query(models.Product).filter(models.Product.id.in_(missing_product_ids)).all()
+        })
+
     for item_in_schema in sale_in.items:
-        product = product_service.get_product(db, item_in_schema.product_id)
+        product = products_by_id.get(item_in_schema.product_id)
         if not product or not product.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Product with ID {item_in_schema.product_id} is invalid or not active."
             )
 
-        # Ensure inventory item exists for stock deduction, or handle if not.
-        # update_stock service will raise 404 if inventory item doesn't exist.
-        # We might want to check this earlier or ensure inventory_service.update_stock can create if not exists.
-        # For now, assume inventory_service.update_stock handles it or product creation ensures inv item.
-        inv_item = inventory_service.get_inventory_item_by_product_id(db, product.id)
-        if not inv_item:
-            # Auto-create inventory item if product exists but item record doesn't.
-            inv_item = inventory_service.create_inventory_item_if_not_exists(db, product_id=product.id, initial_quantity=0)
-            # This ensures that an inventory record exists before attempting to deduct stock.
-
-        if inv_item.quantity_on_hand < item_in_schema.quantity:
+        # No inventory record means nothing on hand. It is not created here: that would commit mid-sale.
+        inv_item = inventory_by_product_id.get(product.id)
+        available = inv_item.quantity_on_hand if inv_item else 0
+        if available < item_in_schema.quantity:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Insufficient stock for product ID {product.id} (Name: {product.name}). Available: {inv_item.quantity_on_hand}, Requested: {item_in_schema.quantity}."
+                detail=f"Insufficient stock for product ID {product.id} (Name: {product.name}). Available: {available}, Requested: {item_in_schema.quantity}."
             )
 
         price_details = product_service.calculate_product_price_with_tax(product, item_in_schema.quantity)
@@ -106,31 +116,22 @@ def create_pos_sale(
     db.add(db_pos_sale_model)
 
     try:
-        # First, save the sale and items to get their IDs
-        db.flush() # Assign IDs without full commit yet
-
-        # Then, update inventory for each item sold.
-        # This part needs to be transactional with the sale itself.
-        for item_model in db_pos_sale_model.items:
-            inventory_service.update_stock( # This service call currently commits internally.
-                db=db,
-                product_id=item_model.product_id,
-                quantity_changed=-item_model.quantity,
-                movement_type=StockMovementType.SALE,
-                reason=f"Sale ID: {db_pos_sale_model.id}, Item ID: {item_model.id}",
-                # Pass commit=False if update_stock is refactored to support it
-            )
-
-        db.commit() # Final commit for the sale and all stock updates (if update_stock doesn't commit)
-        db.refresh(db_pos_sale_model)
-        # Refresh items and their products as they might have been affected by stock updates or simply to ensure they are loaded
-        for item in db_pos_sale_model.items:
-            db.refresh(item)
-            if item.product: db.refresh(item.product)
+        # One unit of work: the sale, its items, the stock deductions and their movements commit together
+        db.flush() # Assign sale and item IDs for the movement reasons
+
+        inventory_service.deduct_stock_bulk(
+            db,
+            [
+                (item_model.product_id, item_model.quantity, f"Sale ID: {db_pos_sale_model.id}, Item ID: {item_model.id}")
+                for item_model in db_pos_sale_model.items
+            ],
+            movement_type=StockMovementType.SALE,
+        )
 
+        db.commit() # The only commit of the sale
         return get_pos_sale(db, db_pos_sale_model.id)
 
-    except HTTPException: # If update_stock or other logic raises HTTPException
+    except HTTPException: # e.g. insufficient stock detected by the guarded UPDATE
         db.rollback()
         raise
     except Exception as e:
@@ -154,7 +155,8 @@ def get_pos_sales(
     status: Optional[POSSaleStatus] = None,
     payment_method: Optional[PaymentMethod] = None,
     date_from: Optional[date] = None,
-    date_to: Optional[date] = None
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None
 ) -> List[models.pos.POSSale]:
     '''Retrieve POS sales with various filters and pagination.'''
     query = db.query(models.pos.POSSale).options(
@@ -176,7 +178,7 @@ def get_pos_sales(
     if date_to:
         query = query.filter(models.pos.POSSale.sale_date < datetime.combine(date_to + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc))
 
-    return query.order_by(models.pos.POSSale.sale_date.desc(), models.pos.POSSale.id.desc()).offset(skip).limit(limit).all()
+    return paginate(query, POS_SALE_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def void_pos_sale(
     db: Session, sale_id: int, reason: str, voiding_user_id: uuid.UUID
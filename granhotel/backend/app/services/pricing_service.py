@@ -0,0 +1,260 @@
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+import threading
+import time
+
+from app import models
+from app import schemas
+from app.core.config import settings
+from app.core.events import EventBroadcaster
+from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+ROOM_RATE_LIST_ORDER = (SortKey(models.RoomRate.room_type), SortKey(models.RoomRate.priority, descending=True), SortKey(models.RoomRate.id))
+
+CENT = Decimal("0.01")
+
+# (start_date, end_date, day_of_week, price) of one active rate, already sorted by precedence
+RateRule = Tuple[Optional[date], Optional[date], Optional[int], Decimal]
+
+
+def to_money(value: Any) -> Decimal:
+    '''Convert a price (including the legacy Float Room.price) to a 2-decimal Decimal without float artifacts.'''
+    return Decimal(str(value)).quantize(CENT)
+
+
+def _rule_covers(rule: RateRule, night: date) -> bool:
+    start_date, end_date, day_of_week, _ = rule
+    return (start_date is None or night >= start_date) and \
+           (end_date is None or night <= end_date) and \
+           (day_of_week is None or night.weekday() == day_of_week)
+
+
+class _TypeCalendar:
+    '''
+    Nightly rate calendar of one room type over [start, start + len(nights)), stored as prefix sums:
+    rate_sums[i] is the total of the rated nights before night i and open_nights[i] counts the
+    nights before night i with no rate (priced at each room's own base price).
+    '''
+
+    def __init__(self, start: date, rules: List[RateRule], days: int):
+        self.start = start
+        self.end = start + timedelta(days=days)
+        self.rate_sums: List[Decimal] = [Decimal("0.00")]
+        self.open_nights: List[int] = [0]
+        for offset in range(days):
+            night = start + timedelta(days=offset)
+            price = next((rule[3] for rule in rules if _rule_covers(rule, night)), None)
+            self.rate_sums.append(self.rate_sums[-1] + (price if price is not None else Decimal("0.00")))
+            self.open_nights.append(self.open_nights[-1] + (1 if price is None else 0))
+
+    def covers(self, check_in_date: date, check_out_date: date) -> bool:
+        return check_in_date >= self.start and check_out_date <= self.end
+
+    def price_stay(self, base_price: Decimal, check_in_date: date, check_out_date: date) -> Decimal:
+        first = (check_in_date - self.start).days
+        last = (check_out_date - self.start).days
+        return (self.rate_sums[last] - self.rate_sums[first]) + base_price * (self.open_nights[last] - self.open_nights[first])
+
+
+class PricingEngine:
+    '''
+    In-process cache of the active room rates and of a per-room-type nightly price calendar.
+    Rates are loaded with one query; each type's calendar is built on first use, after which
+    pricing any stay inside the calendar window is two prefix-sum lookups (no queries).
+    Rate changes made through this service invalidate the cache of every worker process once they
+    commit (see room_rate_events). PRICING_CACHE_TTL_SECONDS bounds how long a worker can miss them
+    if its relay is disabled or reconnecting, or if rates are changed outside this service.
+    '''
+
+    def __init__(self, ttl_seconds: int = 300, calendar_past_days: int = 365, calendar_future_days: int = 730):
+        self.ttl_seconds = ttl_seconds
+        self.calendar_past_days = calendar_past_days
+        self.calendar_future_days = calendar_future_days
+        self._lock = threading.RLock()
+        self._rules_by_type: Dict[str, List[RateRule]] = {}
+        self._calendars: Dict[str, _TypeCalendar] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0 # Bumped by invalidate
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return self.ttl_seconds > 0 and (time.monotonic() - self._loaded_at) > self.ttl_seconds
+
+    def load(self, db: Session) -> None:
+        '''Reload all active rates; calendars are rebuilt lazily per room type.'''
+        generation = self._generation
+        rates = db.query(models.RoomRate).filter(models.RoomRate.is_active == True).order_by( # noqa: E712
+            models.RoomRate.priority.desc(),
+            models.RoomRate.day_of_week.is_(None), # A weekday-specific rate beats an every-day one of the same priority
+            models.RoomRate.id.desc()
+        ).all()
+        rules_by_type: Dict[str, List[RateRule]] = {}
+        for rate in rates:
+            rules_by_type.setdefault(rate.room_type, []).append(
+                (rate.start_date, rate.end_date, rate.day_of_week, to_money(rate.price))
+            )
+        with self._lock:
+            self._rules_by_type = rules_by_type
+            self._calendars = {}
+            # Invalidated while loading: these rates may predate the change, so the next call reloads
+            self._loaded_at = time.monotonic() if generation == self._generation else None
+
+    def ensure_fresh(self, db: Session) -> None:
+        if self.is_stale():
+            self.load(db)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._loaded_at = None
+
+    def _calendar(self, room_type: str) -> _TypeCalendar:
+        with self._lock:
+            calendar = self._calendars.get(room_type)
+            if calendar is None:
+                start = date.today() - timedelta(days=self.calendar_past_days)
+                calendar = _TypeCalendar(start, self._rules_by_type.get(room_type, []), self.calendar_past_days + self.calendar_future_days)
+                self._calendars[room_type] = calendar
+            return calendar
+
+    def price_stay(self, room_type: str, base_price: Decimal, check_in_date: date, check_out_date: date) -> Decimal:
+        '''Total for the nights [check_in_date, check_out_date) of a room of room_type with the given base price.'''
+        calendar = self._calendar(room_type)
+        if calendar.covers(check_in_date, check_out_date):
+            return calendar.price_stay(base_price, check_in_date, check_out_date)
+        # Outside the calendar window: resolve night by night from the cached rules
+        rules = self._rules_by_type.get(room_type, [])
+        total = Decimal("0.00")
+        night = check_in_date
+        while night < check_out_date:
+            total += next((rule[3] for rule in rules if _rule_covers(rule, night)), base_price)
+            night += timedelta(days=1)
+        return total
+
+
+pricing_engine = PricingEngine(
+    ttl_seconds=settings.PRICING_CACHE_TTL_SECONDS,
+    calendar_past_days=settings.PRICING_CALENDAR_PAST_DAYS,
+    calendar_future_days=settings.PRICING_CALENDAR_FUTURE_DAYS
+)
+
+# Rate plan changes. Published after commit, they invalidate the pricing cache of this process and,
+# through the event relay (PRICING_CACHE_RELAY_ENABLED), of the other worker processes.
+room_rate_events = EventBroadcaster("room_rates", channel="room_rate_events")
+room_rate_events.add_callback(lambda event_data: pricing_engine.invalidate())
+
+
+def price_stay(db: Session, room: Any, check_in_date: date, check_out_date: date) -> Decimal:
+    '''
+    Price a stay in a room from the cached rate calendar.
+    `room` only needs `type` and `price` attributes (a Room or a query row), so callers that
+    already hold the rooms can price many stays without further queries.
+    '''
+    if check_out_date <= check_in_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Check-out date must be after check-in date.")
+    pricing_engine.ensure_fresh(db)
+    return pricing_engine.price_stay(room.type, to_money(room.price), check_in_date, check_out_date)
+
+
+def price_night_of_stay(db: Session, room: Any, check_in_date: date, check_out_date: date, total_price: Any, night: date) -> Decimal:
+    '''
+    The part of a booked stay total that falls on `night`: the total is spread over the nights in
+    proportion to their current rates (evenly when the stay prices at zero), rounding the running
+    total to the cent so the nights of a stay always add up to exactly `total_price`.
+    `room` only needs `type` and `price` attributes, as for price_stay.
+    '''
+    if not check_in_date <= night < check_out_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{night} is not a night of the stay.")
+    pricing_engine.ensure_fresh(db)
+    base_price = to_money(room.price)
+    weight = pricing_engine.price_stay(room.type, base_price, check_in_date, check_out_date)
+    before = pricing_engine.price_stay(room.type, base_price, check_in_date, night)
+    through = before + pricing_engine.price_stay(room.type, base_price, night, night + timedelta(days=1))
+    if weight <= 0:
+        weight = Decimal((check_out_date - check_in_date).days)
+        before = Decimal((night - check_in_date).days)
+        through = before + 1
+    total = to_money(total_price)
+    running_total = lambda share: (total * share / weight).quantize(CENT, rounding=ROUND_HALF_UP)
+    return running_total(through) - running_total(before)
+
+
+def quote_stay_lengths(db: Session, rooms: List[models.Room], check_in_date: date, max_nights: int) -> List[Dict[str, Any]]:
+    '''Price 1..max_nights night stays starting on check_in_date for every room (availability grid).'''
+    pricing_engine.ensure_fresh(db)
+    quotes = []
+    for room in rooms:
+        base_price = to_money(room.price)
+        totals = [
+            pricing_engine.price_stay(room.type, base_price, check_in_date, check_in_date + timedelta(days=nights))
+            for nights in range(1, max_nights + 1)
+        ]
+        quotes.append({
+            "room_id": room.id,
+            "room_number": room.room_number,
+            "room_type": room.type,
+            "check_in_date": check_in_date,
+            "totals": totals
+        })
+    return quotes
+
+
+def _publish_rates_changed(db: Session) -> None:
+    room_rate_events.publish_after_commit(db, {"type": "rates_changed"})
+
+
+# Rate plan CRUD. Every write invalidates the pricing cache of all worker processes when it commits.
+def create_room_rate(db: Session, rate_in: schemas.RoomRateCreate) -> models.RoomRate:
+    db_rate = models.RoomRate(**rate_in.model_dump())
+    db.add(db_rate)
+    _publish_rates_changed(db)
+    db.commit()
+    db.refresh(db_rate)
+    return db_rate
+
+
+def get_room_rate(db: Session, rate_id: int) -> Optional[models.RoomRate]:
+    return db.query(models.RoomRate).filter(models.RoomRate.id == rate_id).first()
+
+
+def get_room_rates(
+    db: Session, skip: int = 0, limit: int = 100,
+    room_type: Optional[str] = None, is_active: Optional[bool] = None,
+    cursor: Optional[str] = None
+) -> List[models.RoomRate]:
+    query = db.query(models.RoomRate)
+    if room_type:
+        query = query.filter(models.RoomRate.room_type == room_type)
+    if is_active is not None:
+        query = query.filter(models.RoomRate.is_active == is_active)
+    return paginate(query, ROOM_RATE_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+
+def update_room_rate(db: Session, rate_db_obj: models.RoomRate, rate_in: schemas.RoomRateUpdate) -> models.RoomRate:
+    update_data = rate_in.model_dump(exclude_unset=True)
+    new_start = update_data.get("start_date", rate_db_obj.start_date)
+    new_end = update_data.get("end_date", rate_db_obj.end_date)
+    if new_start is not None and new_end is not None and new_end < new_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="End date must be on or after start date.")
+
+    for field, value in update_data.items():
+        setattr(rate_db_obj, field, value)
+    db.add(rate_db_obj)
+    _publish_rates_changed(db)
+    db.commit()
+    db.refresh(rate_db_obj)
+    return rate_db_obj
+
+
+def delete_room_rate(db: Session, rate_id: int) -> Optional[models.RoomRate]:
+    db_rate = get_room_rate(db, rate_id)
+    if db_rate:
+        db.delete(db_rate)
+        _publish_rates_changed(db)
+        db.commit()
+    return db_rate
@@ -1,11 +1,21 @@
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Dict, Any # Added Any for return type
+from typing import List, Optional, Dict, Any, NamedTuple # Added Any for return type
 from decimal import Decimal, ROUND_HALF_UP # For precise tax calculation
+from datetime import datetime, timezone
+import hashlib
+import json
 
 from app import models
 from app import schemas
+from app.core.cache import build_cache
+from app.core.config import settings
 from app.models.product import Product, ProductCategory
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+PRODUCT_CATEGORY_LIST_ORDER = (SortKey(models.ProductCategory.name), SortKey(models.ProductCategory.id))
+PRODUCT_LIST_ORDER = (SortKey(models.Product.name), SortKey(models.Product.id))
 
 # --- ProductCategory Services ---
 
@@ -20,6 +30,7 @@ def create_product_category(db: Session, category_in: schemas.ProductCategoryCre
     db_category = models.ProductCategory(**category_in.model_dump())
     db.add(db_category)
     db.commit()
+    invalidate_product_catalog()
     db.refresh(db_category)
     return db_category
 
@@ -27,9 +38,9 @@ def get_product_category(db: Session, category_id: int) -> Optional[models.Produ
     '''Retrieve a product category by ID.'''
     return db.query(models.ProductCategory).filter(models.ProductCategory.id == category_id).first()
 
-def get_all_product_categories(db: Session, skip: int = 0, limit: int = 100) -> List[models.ProductCategory]:
+def get_all_product_categories(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.ProductCategory]:
     '''Retrieve all product categories with pagination.'''
-    return db.query(models.ProductCategory).order_by(models.ProductCategory.name).offset(skip).limit(limit).all()
+    return paginate(db.query(models.ProductCategory), PRODUCT_CATEGORY_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def update_product_category(
     db: Session, category_db_obj: models.ProductCategory, category_in: schemas.ProductCategoryUpdate
@@ -50,6 +61,7 @@ def update_product_category(
 
     db.add(category_db_obj)
     db.commit()
+    invalidate_product_catalog()
     db.refresh(category_db_obj)
     return category_db_obj
 
@@ -67,6 +79,7 @@ def delete_product_category(db: Session, category_id: int) -> Optional[models.Pr
 
     db.delete(category_to_delete)
     db.commit()
+    invalidate_product_catalog()
     return category_to_delete
 
 
@@ -94,6 +107,7 @@ def create_product(db: Session, product_in: schemas.ProductCreate) -> models.Pro
     db_product = models.Product(**db_product_data)
     db.add(db_product)
     db.commit()
+    invalidate_product_catalog()
     db.refresh(db_product)
     return db_product
 
@@ -108,7 +122,8 @@ def get_products(
     category_id: Optional[int] = None,
     name: Optional[str] = None,
     is_active: Optional[bool] = None,
-    taxable: Optional[bool] = None
+    taxable: Optional[bool] = None,
+    cursor: Optional[str] = None
 ) -> List[models.Product]:
     '''Retrieve products with filtering and pagination.'''
     query = db.query(models.Product).options(joinedload(models.Product.category))
@@ -122,7 +137,7 @@ def get_products(
     if taxable is not None:
         query = query.filter(models.Product.taxable == taxable)
 
-    return query.order_by(models.Product.name).offset(skip).limit(limit).all()
+    return paginate(query, PRODUCT_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def update_product(
     db: Session, product_db_obj: models.Product, product_in: schemas.ProductUpdate
@@ -151,6 +166,7 @@ def update_product(
 
     db.add(product_db_obj)
     db.commit()
+    invalidate_product_catalog()
     db.refresh(product_db_obj)
     return product_db_obj
 
@@ -165,6 +181,7 @@ def delete_product(db: Session, product_id: int) -> Optional[models.Product]:
 
     db.delete(product_to_delete)
     db.commit()
+    invalidate_product_catalog()
     return product_to_delete
 
 # Peruvian IGV is 18%
@@ -198,8 +215,10 @@ def calculate_product_price_with_tax(product: models.Product, quantity: int = 1)
     }
 
 def get_product_price_details(db: Session, product_id: int, quantity: int = 1) -> Optional[Dict[str, Any]]:
-    '''Helper to get a product and then calculate its price details.'''
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    '''Helper to get a product (from the catalog cache when possible) and then calculate its price details.'''
+    product = get_product_catalog(db).products.get(product_id)
+    if product is None: # Possibly created by another worker since the snapshot was built
+        product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product with ID {product_id} not found.")
 
@@ -207,3 +226,78 @@ def get_product_price_details(db: Session, product_id: int, quantity: int = 1) -
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity must be a positive integer.")
 
     return calculate_product_price_with_tax(product, quantity)
+
+
+# --- Product Catalog Cache ---
+
+class CatalogEntry(NamedTuple):
+    '''Cached copy of a product with its precomputed unit tax; usable wherever a Product's price fields are read.'''
+    id: int
+    name: str
+    description: Optional[str]
+    sku: Optional[str]
+    image_url: Optional[str]
+    category_id: int
+    is_active: bool
+    taxable: bool
+    price: Decimal
+    tax_rate: Decimal
+    unit_tax_amount: Decimal
+    unit_price_with_tax: Decimal
+
+
+class CatalogSnapshot(NamedTuple):
+    version: str # Content hash: identical on every worker that holds the same catalog
+    generated_at: datetime
+    categories: List[Dict[str, Any]]
+    products: Dict[int, CatalogEntry] # Every product, active or not, by id
+
+
+CATALOG_CACHE_KEY = "snapshot"
+product_catalog_cache = build_cache("product_catalog", settings.PRODUCT_CATALOG_CACHE_TTL_SECONDS, max_entries=1)
+
+
+def _build_product_catalog(db: Session) -> CatalogSnapshot:
+    categories = [
+        {"id": category.id, "name": category.name, "description": category.description}
+        for category in db.query(models.ProductCategory).order_by(models.ProductCategory.name, models.ProductCategory.id)
+    ]
+    products: Dict[int, CatalogEntry] = {}
+    for product in db.query(models.Product).order_by(models.Product.name, models.Product.id):
+        price_details = calculate_product_price_with_tax(product, 1)
+        products[product.id] = CatalogEntry(
+            id=product.id, name=product.name, description=product.description, sku=product.sku,
+            image_url=product.image_url, category_id=product.category_id, is_active=product.is_active,
+            taxable=product.taxable, price=product.price, tax_rate=price_details["tax_rate"],
+            unit_tax_amount=price_details["tax_amount"], unit_price_with_tax=price_details["total_with_tax"]
+        )
+    content = json.dumps([categories, [entry._asdict() for entry in products.values()]], default=str, sort_keys=True)
+    return CatalogSnapshot(
+        version=hashlib.sha256(content.encode()).hexdigest()[:20],
+        generated_at=datetime.now(timezone.utc),
+        categories=categories,
+        products=products
+    )
+
+
+def get_product_catalog(db: Session) -> CatalogSnapshot:
+    '''The cached catalog, rebuilt with two queries when a product/category write evicted it or it expired.'''
+    snapshot = product_catalog_cache.get(CATALOG_CACHE_KEY)
+    if snapshot is None:
+        snapshot = _build_product_catalog(db)
+        product_catalog_cache.set(CATALOG_CACHE_KEY, snapshot)
+    return snapshot
+
+
+def invalidate_product_catalog() -> None:
+    product_catalog_cache.delete(CATALOG_CACHE_KEY)
+
+
+def product_catalog_payload(snapshot: CatalogSnapshot) -> Dict[str, Any]:
+    '''The active menu of a snapshot, shaped as schemas.ProductCatalog.'''
+    return {
+        "version": snapshot.version,
+        "generated_at": snapshot.generated_at,
+        "categories": snapshot.categories,
+        "products": [entry._asdict() for entry in snapshot.products.values() if entry.is_active],
+    }
@@ -9,6 +9,10 @@ from app.services import inventory_service # For updating stock upon receiving i
 from app.services import supplier_service # To validate supplier
 from app.services import product_service # To validate products
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+PURCHASE_ORDER_LIST_ORDER = (SortKey(models.inventory.PurchaseOrder.order_date, descending=True), SortKey(models.inventory.PurchaseOrder.id, descending=True))
 
 def create_purchase_order(db: Session, po_in: schemas.PurchaseOrderCreate) -> models.inventory.PurchaseOrder:
     '''Create a new purchase order with its items.'''
@@ -64,7 +68,8 @@ def get_all_purchase_orders(
     supplier_id: Optional[int] = None,
     status: Optional[PurchaseOrderStatus] = None,
     order_date_from: Optional[date] = None,
-    order_date_to: Optional[date] = None
+    order_date_to: Optional[date] = None,
+    cursor: Optional[str] = None
 ) -> List[models.inventory.PurchaseOrder]:
     '''Retrieve all purchase orders with pagination and optional filters.'''
     query = db.query(models.inventory.PurchaseOrder).options(
@@ -80,7 +85,7 @@ def get_all_purchase_orders(
     if order_date_to:
         query = query.filter(models.inventory.PurchaseOrder.order_date <= order_date_to)
 
-    return query.order_by(models.inventory.PurchaseOrder.order_date.desc(), models.inventory.PurchaseOrder.id.desc()).offset(skip).limit(limit).all()
+    return paginate(query, PURCHASE_ORDER_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 
 def update_purchase_order_status(db: Session, po_id: int, new_status: PurchaseOrderStatus) -> Optional[models.inventory.PurchaseOrder]:
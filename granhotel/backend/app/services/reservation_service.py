@@ -1,40 +1,144 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_, func, exists, insert, values, column, Integer, Date
+from sqlalchemy.exc import DBAPIError
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from datetime import date, timedelta, datetime
 from decimal import Decimal
+import logging
+import time
 
 from app import models
 from app import schemas
+from app.core.config import settings
 from app.models.reservation import Reservation, ReservationStatus
 from app.models.room import Room
+from app.services.availability_index import room_availability_index
+from app.services import pricing_service, analytics_service
+from app.utils.pagination import SortKey, paginate
 from fastapi import HTTPException, status
 
-# Helper function (can be in a utils file later)
-def is_room_available(db: Session, room_id: int, check_in_date: date, check_out_date: date, reservation_id_to_exclude: Optional[int] = None) -> bool:
+logger = logging.getLogger(__name__)
+
+# PostgreSQL SQLSTATEs the booking path reacts to
+PG_EXCLUSION_VIOLATION = "23P01" # excl_reservations_room_id_stay rejected an overlapping stay
+PG_RETRYABLE_ERRORS = ("40001", "40P01") # serialization_failure, deadlock_detected
+
+# Listing order, matching ix_reservations_check_in_date_id (keyset pagination seeks along it)
+RESERVATION_LIST_ORDER = (SortKey(models.Reservation.check_in_date, descending=True), SortKey(models.Reservation.id, descending=True))
+
+def _overlapping_reservations_query(
+    db: Session, room_id: int, check_in_date: date, check_out_date: date,
+    statuses: List[ReservationStatus], reservation_id_to_exclude: Optional[int] = None
+):
     '''
-    Check if a room is available for the given date range, excluding a specific reservation if provided (for updates).
-    A room is unavailable if it has any confirmed or checked-in reservation that overlaps with the desired period.
+    Reservations of a room in one of `statuses` that overlap [check_in_date, check_out_date).
+    Served by ix_reservations_room_id_status_stay (room_id, status, check_in_date, check_out_date).
     '''
-    overlapping_reservations_query = db.query(models.Reservation).filter(
+    query = db.query(models.Reservation).filter(
         models.Reservation.room_id == room_id,
-        models.Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN]),
+        models.Reservation.status.in_(statuses),
         models.Reservation.check_in_date < check_out_date, # Existing reservation starts before new one ends
         models.Reservation.check_out_date > check_in_date    # Existing reservation ends after new one starts
     )
     if reservation_id_to_exclude:
-        overlapping_reservations_query = overlapping_reservations_query.filter(models.Reservation.id != reservation_id_to_exclude)
+        query = query.filter(models.Reservation.id != reservation_id_to_exclude)
+    return query
 
+
+# Helper function (can be in a utils file later)
+def is_room_available(db: Session, room_id: int, check_in_date: date, check_out_date: date, reservation_id_to_exclude: Optional[int] = None) -> bool:
+    '''
+    Check if a room is available for the given date range, excluding a specific reservation if provided (for updates).
+    A room is unavailable if it has any confirmed or checked-in reservation that overlaps with the desired period.
+    '''
+    overlapping_reservations_query = _overlapping_reservations_query(
+        db, room_id, check_in_date, check_out_date,
+        [ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN], reservation_id_to_exclude
+    )
     return overlapping_reservations_query.first() is None
 
 
-def calculate_reservation_price(db: Session, room_id: int, check_in_date: date, check_out_date: date) -> Decimal:
+def _room_has_overlap_clause(check_in_date: date, check_out_date: date):
+    '''EXISTS clause, correlated to rooms, for a CONFIRMED/CHECKED_IN reservation overlapping the stay.'''
+    return exists().where(
+        models.Reservation.room_id == models.Room.id,
+        models.Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN]),
+        models.Reservation.check_in_date < check_out_date,
+        models.Reservation.check_out_date > check_in_date,
+        # Same overlap as a range predicate, so each room is probed through the GiST index
+        # behind excl_reservations_room_id_stay instead of scanning reservations
+        func.daterange(models.Reservation.check_in_date, models.Reservation.check_out_date).op("&&")(
+            func.daterange(check_in_date, check_out_date)
+        )
+    )
+
+
+def search_available_rooms(
+    db: Session, check_in_date: date, check_out_date: date,
+    room_type: Optional[str] = None,
+    floor: Optional[int] = None,
+    building: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None
+) -> List[models.Room]:
     '''
-    Calculate the total price for a reservation.
-    For now: room.price * number_of_nights.
+    Return every room that is free for the whole stay, with optional room filters.
+    Runs as one set-based query: rooms anti-joined (NOT EXISTS) against the
+    CONFIRMED/CHECKED_IN reservations that overlap the requested window.
+    '''
+    if check_out_date <= check_in_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Check-out date must be after check-in date.")
+
+    query = db.query(models.Room).filter(~_room_has_overlap_clause(check_in_date, check_out_date))
+
+    if room_type:
+        query = query.filter(models.Room.type == room_type)
+    if floor is not None:
+        query = query.filter(models.Room.floor == floor)
+    if building:
+        query = query.filter(models.Room.building == building)
+    if min_price is not None:
+        query = query.filter(models.Room.price >= min_price)
+    if max_price is not None:
+        query = query.filter(models.Room.price <= max_price)
+
+    return query.order_by(models.Room.room_number).all()
+
+
+def _check_room_available_or_409(
+    db: Session, room_id: int, check_in_date: date, check_out_date: date,
+    reservation_id_to_exclude: Optional[int] = None, detail: str = ""
+) -> None:
+    '''
+    Availability guard for writes, called with the room row locked (see _lock_room). The in-memory
+    index only gives a hint: it is per process, so it can lag cancellations and bookings made by
+    other workers. Whatever it answers, the overlap query confirms it under the lock before the
+    write is accepted or refused, and excl_reservations_room_id_stay remains the final guard.
+    The index is never rebuilt here; a stale one is refreshed in the background.
+    '''
+    index_hit = False
+    if room_availability_index.is_built:
+        if room_availability_index.is_stale():
+            room_availability_index.refresh_in_background()
+        index_hit = not room_availability_index.is_available(room_id, check_in_date, check_out_date, reservation_id_to_exclude)
+    if not is_room_available(db, room_id=room_id, check_in_date=check_in_date, check_out_date=check_out_date, reservation_id_to_exclude=reservation_id_to_exclude):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+    if index_hit: # The room was freed where this process's index could not see it
+        logger.info("Availability index is behind the database for room %s; refreshing it", room_id)
+        room_availability_index.refresh_in_background()
+
+
+def calculate_reservation_price(
+    db: Session, room_id: int, check_in_date: date, check_out_date: date, room: Optional[models.Room] = None
+) -> Decimal:
+    '''
+    Calculate the total price for a reservation from the room type's rate plan (see pricing_service):
+    each night uses the winning RoomRate for that date, or the room's base price when no rate applies.
+    Pass `room` when it is already loaded to skip the room query.
     IGV (18%) should be incorporated later.
     '''
-    room = db.query(Room).filter(Room.id == room_id).first()
+    if room is None:
+        room = db.query(Room).filter(Room.id == room_id).first()
     if not room:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found for price calculation.")
 
@@ -42,48 +146,210 @@ def calculate_reservation_price(db: Session, room_id: int, check_in_date: date,
         # This check is also in Pydantic schema, but good to have in service layer for direct calls
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Check-out date must be after check-in date.")
 
-    number_of_nights = (check_out_date - check_in_date).days
-    if number_of_nights <= 0: # Should be caught by above, but defensive
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Number of nights must be positive.")
+    return pricing_service.price_stay(db, room, check_in_date, check_out_date)
 
-    total_price = Decimal(room.price) * Decimal(number_of_nights)
-    # Placeholder for IGV:
-    # igv_rate = Decimal("0.18")
-    # total_price_with_igv = total_price * (1 + igv_rate)
-    return total_price
 
+def _pgcode(exc: DBAPIError) -> Optional[str]:
+    # psycopg2 exposes the SQLSTATE as `pgcode`, the asyncpg adapter (async stack) as `sqlstate`
+    return getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
 
-def create_reservation(db: Session, reservation_in: schemas.ReservationCreate) -> models.Reservation:
+
+def _lock_room(db: Session, room_id: int) -> Optional[models.Room]:
     '''
-    Create a new reservation.
-    - Checks for guest and room existence.
-    - Checks for room availability.
-    - Calculates total price.
+    Lock the room row (SELECT ... FOR UPDATE) for the rest of the transaction.
+    Bookings for the same room queue behind each other here, so the availability check
+    that follows sees every booking committed before it; other rooms are not blocked.
     '''
+    return db.query(models.Room).filter(models.Room.id == room_id).with_for_update().first()
+
+
+def _commit_booking(db: Session, conflict_detail: str) -> None:
+    '''Commit a reservation write, turning a double booking caught by the exclusion constraint into a 409.'''
+    try:
+        db.commit()
+    except DBAPIError as e:
+        if _pgcode(e) != PG_EXCLUSION_VIOLATION:
+            raise
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=conflict_detail)
+
+
+def _run_booking_transaction(db: Session, work: Callable[[], Any]) -> Any:
+    '''Run a booking transaction, retrying it when PostgreSQL aborts it with a deadlock or serialization failure.'''
+    for attempt in range(settings.BOOKING_MAX_RETRIES + 1):
+        try:
+            return work()
+        except DBAPIError as e:
+            db.rollback()
+            if _pgcode(e) not in PG_RETRYABLE_ERRORS or attempt == settings.BOOKING_MAX_RETRIES:
+                raise
+            time.sleep(settings.BOOKING_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def _create_reservation_once(db: Session, reservation_in: schemas.ReservationCreate) -> models.Reservation:
     guest = db.query(models.Guest).filter(models.Guest.id == reservation_in.guest_id).first()
     if not guest:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Guest with ID {reservation_in.guest_id} not found.")
     if guest.is_blacklisted:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Guest with ID {reservation_in.guest_id} is blacklisted.")
 
-    room = db.query(models.Room).filter(models.Room.id == reservation_in.room_id).first()
+    room = _lock_room(db, reservation_in.room_id)
     if not room:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Room with ID {reservation_in.room_id} not found.")
 
-    if not is_room_available(db, room_id=reservation_in.room_id, check_in_date=reservation_in.check_in_date, check_out_date=reservation_in.check_out_date):
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Room {reservation_in.room_id} is not available for the selected dates.")
+    conflict_detail = f"Room {reservation_in.room_id} is not available for the selected dates."
+    _check_room_available_or_409(
+        db, room_id=reservation_in.room_id,
+        check_in_date=reservation_in.check_in_date, check_out_date=reservation_in.check_out_date,
+        detail=conflict_detail
+    )
 
-    calculated_price = calculate_reservation_price(db, room_id=reservation_in.room_id, check_in_date=reservation_in.check_in_date, check_out_date=reservation_in.check_out_date)
+    calculated_price = calculate_reservation_price(db, room_id=reservation_in.room_id, check_in_date=reservation_in.check_in_date, check_out_date=reservation_in.check_out_date, room=room)
 
     db_reservation_data = reservation_in.model_dump()
     db_reservation_data["total_price"] = calculated_price
 
     db_reservation = models.Reservation(**db_reservation_data)
     db.add(db_reservation)
-    db.commit()
+    analytics_service.record_reservation_changes(db, [(None, analytics_service.snapshot_reservation(db_reservation))])
+    _commit_booking(db, conflict_detail)
     db.refresh(db_reservation)
+    room_availability_index.sync_reservation(db_reservation)
     return db_reservation
 
+
+def create_reservation(db: Session, reservation_in: schemas.ReservationCreate) -> models.Reservation:
+    '''
+    Create a new reservation.
+    - Checks for guest and room existence.
+    - Checks for room availability under a row lock on the room, so concurrent bookings cannot both pass.
+    - Calculates total price.
+    The excl_reservations_room_id_stay constraint backs this up in the database. Transactions aborted by a
+    deadlock or serialization failure are retried up to BOOKING_MAX_RETRIES times with exponential backoff.
+    '''
+    return _run_booking_transaction(db, lambda: _create_reservation_once(db, reservation_in))
+
+def _find_batch_conflicts(db: Session, stays: List[Tuple[int, int, date, date]]) -> set:
+    '''
+    Return the batch indexes whose (room, dates) overlap an existing blocking reservation.
+    stays are (index, room_id, check_in_date, check_out_date); all are checked in one query
+    by joining a VALUES list of the requested stays against reservations.
+    '''
+    if not stays:
+        return set()
+    requested = values(
+        column("idx", Integer), column("room_id", Integer),
+        column("check_in_date", Date), column("check_out_date", Date),
+        name="requested_stays"
+    ).data(stays)
+    rows = db.query(requested.c.idx).select_from(requested).join(
+        models.Reservation,
+        and_(
+            models.Reservation.room_id == requested.c.room_id,
+            models.Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN]),
+            models.Reservation.check_in_date < requested.c.check_out_date,
+            models.Reservation.check_out_date > requested.c.check_in_date
+        )
+    ).distinct().all()
+    return {idx for (idx,) in rows}
+
+
+def _create_reservations_batch_once(db: Session, reservations_in: List[schemas.ReservationCreate]) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = [{"index": i, "status": "created"} for i in range(len(reservations_in))]
+
+    def reject(i: int, row_status: str, detail: str) -> None:
+        results[i]["status"] = row_status
+        results[i]["detail"] = detail
+
+    # One IN query per referenced table
+    guest_ids = {r.guest_id for r in reservations_in}
+    blacklisted_by_guest = dict(
+        db.query(models.Guest.id, models.Guest.is_blacklisted).filter(models.Guest.id.in_(guest_ids)).all()
+    )
+    room_ids = sorted({r.room_id for r in reservations_in})
+    # Lock the rooms in a stable order so concurrent batches sharing rooms cannot deadlock
+    rooms_by_id = {
+        room.id: room
+        for room in db.query(models.Room.id, models.Room.price, models.Room.type).filter(models.Room.id.in_(room_ids)).order_by(models.Room.id).with_for_update().all()
+    }
+
+    for i, r in enumerate(reservations_in):
+        if r.guest_id not in blacklisted_by_guest:
+            reject(i, "invalid", f"Guest with ID {r.guest_id} not found.")
+        elif blacklisted_by_guest[r.guest_id]:
+            reject(i, "invalid", f"Guest with ID {r.guest_id} is blacklisted.")
+        elif r.room_id not in rooms_by_id:
+            reject(i, "invalid", f"Room with ID {r.room_id} not found.")
+
+    # One set-based availability check for every still-valid row
+    conflicts = _find_batch_conflicts(db, [
+        (i, r.room_id, r.check_in_date, r.check_out_date)
+        for i, r in enumerate(reservations_in) if results[i]["status"] == "created"
+    ])
+
+    rows_to_insert: List[Dict[str, Any]] = []
+    row_indexes: List[int] = []
+    accepted_stays: Dict[int, List[Tuple[date, date]]] = {} # room_id -> blocking stays accepted earlier in this batch
+    for i, r in enumerate(reservations_in):
+        if results[i]["status"] != "created":
+            continue
+        conflict_detail = f"Room {r.room_id} is not available for the selected dates."
+        if i in conflicts:
+            reject(i, "conflict", conflict_detail)
+            continue
+        if any(r.check_in_date < check_out and r.check_out_date > check_in for check_in, check_out in accepted_stays.get(r.room_id, [])):
+            reject(i, "conflict", f"{conflict_detail} It overlaps an earlier row of this batch.")
+            continue
+        if r.status in [ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN]:
+            accepted_stays.setdefault(r.room_id, []).append((r.check_in_date, r.check_out_date))
+
+        # Priced from the cached rate calendar, without a room query per row
+        total_price = pricing_service.price_stay(db, rooms_by_id[r.room_id], r.check_in_date, r.check_out_date)
+        row = r.model_dump()
+        row["total_price"] = total_price
+        rows_to_insert.append(row)
+        row_indexes.append(i)
+        results[i]["total_price"] = total_price
+
+    if rows_to_insert:
+        # Single executemany; RETURNING ids come back in parameter order
+        new_ids = db.scalars(
+            insert(models.Reservation).returning(models.Reservation.id, sort_by_parameter_order=True),
+            rows_to_insert
+        ).all()
+        for i, reservation_id in zip(row_indexes, new_ids):
+            results[i]["reservation_id"] = reservation_id
+        analytics_service.record_reservation_changes(db, [
+            (None, analytics_service.StaySnapshot(row["status"], row["check_in_date"], row["check_out_date"], row["total_price"]))
+            for row in rows_to_insert
+        ])
+
+    _commit_booking(db, "The batch overlaps reservations committed concurrently; no rows were imported.")
+
+    for i, row in zip(row_indexes, rows_to_insert):
+        room_availability_index.sync_stay(
+            results[i]["reservation_id"], row["room_id"], row["status"], row["check_in_date"], row["check_out_date"]
+        )
+    return results
+
+
+def create_reservations_batch(db: Session, reservations_in: List[schemas.ReservationCreate]) -> Dict[str, Any]:
+    '''
+    Import many reservations (group blocks, channel-manager feeds) in one transaction.
+    Guests and rooms are validated with one IN query each, availability for the whole batch is
+    checked with one query, prices are computed in memory and all valid rows are inserted with a
+    single executemany. Rows are accepted or rejected individually; rejected rows do not stop the
+    rest of the batch. Rows within the batch are checked against each other in submission order.
+    '''
+    results = _run_booking_transaction(db, lambda: _create_reservations_batch_once(db, reservations_in))
+    created_count = sum(1 for result in results if result["status"] == "created")
+    return {
+        "created_count": created_count,
+        "failed_count": len(results) - created_count,
+        "results": results
+    }
+
+
 def get_reservation(db: Session, reservation_id: int) -> Optional[models.Reservation]:
     '''Retrieve a reservation by ID, including guest and room details.'''
     return db.query(models.Reservation).options(
@@ -91,16 +357,19 @@ def get_reservation(db: Session, reservation_id: int) -> Optional[models.Reserva
         joinedload(models.Reservation.room)
     ).filter(models.Reservation.id == reservation_id).first()
 
-def get_reservations(
-    db: Session, skip: int = 0, limit: int = 100,
+def _reservations_list_query(
+    db: Session,
     guest_id: Optional[int] = None,
     room_id: Optional[int] = None,
     status: Optional[ReservationStatus] = None,
-    date_from: Optional[date] = None, # Consider this as check_in_date >= date_from
-    date_to: Optional[date] = None    # Consider this as check_out_date <= date_to
-                                      # Or more practically, reservations active *within* this range
-) -> List[models.Reservation]:
-    '''Retrieve list of reservations with optional filters, including guest and room details.'''
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    '''
+    Filtered reservation listing ordered newest check-in first (id breaks ties).
+    The order matches ix_reservations_check_in_date_id; guest and status filters have their own
+    (guest_id, check_in_date) and (status, check_in_date) indexes.
+    '''
     query = db.query(models.Reservation).options(
         joinedload(models.Reservation.guest),
         joinedload(models.Reservation.room)
@@ -119,17 +388,35 @@ def get_reservations(
     if date_to:
         query = query.filter(models.Reservation.check_in_date < date_to)   # Starts before the filter period ends
 
-    return query.order_by(models.Reservation.check_in_date.desc()).offset(skip).limit(limit).all()
+    return query.order_by(*[key.column.desc() for key in RESERVATION_LIST_ORDER])
+
+
+def get_reservations(
+    db: Session, skip: int = 0, limit: int = 100,
+    guest_id: Optional[int] = None,
+    room_id: Optional[int] = None,
+    status: Optional[ReservationStatus] = None,
+    date_from: Optional[date] = None, # Consider this as check_in_date >= date_from
+    date_to: Optional[date] = None,   # Consider this as check_out_date <= date_to
+                                      # Or more practically, reservations active *within* this range
+    cursor: Optional[str] = None
+) -> List[models.Reservation]:
+    '''
+    Retrieve list of reservations with optional filters, including guest and room details.
+    Pass the `cursor` of the previous page to seek instead of using `skip` (see app.utils.pagination).
+    '''
+    query = _reservations_list_query(
+        db, guest_id=guest_id, room_id=room_id, status=status, date_from=date_from, date_to=date_to
+    )
+    return paginate(query, RESERVATION_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 
 def get_reservations_for_room_date_range(db: Session, room_id: int, start_date: date, end_date: date) -> List[models.Reservation]:
     '''Get reservations for a specific room that overlap with a given date range.'''
-    return db.query(models.Reservation).filter(
-        models.Reservation.room_id == room_id,
-        # Consider which statuses make a room "occupied" or relevant for this check
-        models.Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN, ReservationStatus.PENDING]),
-        models.Reservation.check_in_date < end_date,
-        models.Reservation.check_out_date > start_date
+    # Consider which statuses make a room "occupied" or relevant for this check
+    return _overlapping_reservations_query(
+        db, room_id, start_date, end_date,
+        [ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN, ReservationStatus.PENDING]
     ).all()
 
 
@@ -143,9 +430,13 @@ def update_reservation_status(db: Session, reservation_id: int, new_status: Rese
         # Let's stick to returning None for now for simple status updates.
         return None
 
+    before = analytics_service.snapshot_reservation(db_reservation)
     db_reservation.status = new_status
-    db.commit()
+    analytics_service.record_reservation_changes(db, [(before, analytics_service.snapshot_reservation(db_reservation))])
+    # Moving an overlapping stay into a blocking status is rejected by the exclusion constraint
+    _commit_booking(db, f"Room {db_reservation.room_id} is not available for the dates of reservation {reservation_id}.")
     db.refresh(db_reservation)
+    room_availability_index.sync_reservation(db_reservation)
     return db_reservation
 
 
@@ -172,17 +463,24 @@ def update_reservation_details(db: Session, reservation_id: int, reservation_in:
     # Check availability if room or dates are changing for reservations that block availability
     if db_reservation.status in [ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN] and \
        ("room_id" in update_data or "check_in_date" in update_data or "check_out_date" in update_data):
-        if not is_room_available(db, room_id=new_room_id, check_in_date=new_check_in, check_out_date=new_check_out, reservation_id_to_exclude=reservation_id):
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Room {new_room_id} is not available for the new dates/room.")
-
+        _lock_room(db, new_room_id)
+        _check_room_available_or_409(
+            db, room_id=new_room_id, check_in_date=new_check_in, check_out_date=new_check_out,
+            reservation_id_to_exclude=reservation_id,
+            detail=f"Room {new_room_id} is not available for the new dates/room."
+        )
+
+    before = analytics_service.snapshot_reservation(db_reservation)
     for field, value in update_data.items():
         setattr(db_reservation, field, value)
 
     if recalculate_price:
         db_reservation.total_price = calculate_reservation_price(db, room_id=new_room_id, check_in_date=new_check_in, check_out_date=new_check_out)
 
-    db.commit()
+    analytics_service.record_reservation_changes(db, [(before, analytics_service.snapshot_reservation(db_reservation))])
+    _commit_booking(db, f"Room {new_room_id} is not available for the new dates/room.")
     db.refresh(db_reservation)
+    room_availability_index.sync_reservation(db_reservation)
     return db_reservation
 
 
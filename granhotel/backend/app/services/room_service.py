@@ -3,6 +3,10 @@ from typing import List, Optional
 
 from app import models
 from app import schemas
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+ROOM_LIST_ORDER = (SortKey(models.Room.id),)
 
 def get_room(db: Session, room_id: int) -> Optional[models.Room]:
     return db.query(models.Room).filter(models.Room.id == room_id).first()
@@ -10,8 +14,8 @@ def get_room(db: Session, room_id: int) -> Optional[models.Room]:
 def get_room_by_room_number(db: Session, room_number: str) -> Optional[models.Room]:
     return db.query(models.Room).filter(models.Room.room_number == room_number).first()
 
-def get_rooms(db: Session, skip: int = 0, limit: int = 100) -> List[models.Room]:
-    return db.query(models.Room).offset(skip).limit(limit).all()
+def get_rooms(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Room]:
+    return paginate(db.query(models.Room), ROOM_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def create_room(db: Session, room_in: schemas.RoomCreate) -> models.Room:
     # Ensure created_at and updated_at are handled if they are part of the model
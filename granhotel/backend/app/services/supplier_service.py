@@ -4,6 +4,10 @@ from typing import List, Optional
 from app import models
 from app import schemas
 from fastapi import HTTPException, status
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+SUPPLIER_LIST_ORDER = (SortKey(models.inventory.Supplier.name), SortKey(models.inventory.Supplier.id))
 
 def create_supplier(db: Session, supplier_in: schemas.SupplierCreate) -> models.inventory.Supplier:
     '''Create a new supplier.'''
@@ -31,9 +35,9 @@ def get_supplier(db: Session, supplier_id: int) -> Optional[models.inventory.Sup
     '''Retrieve a supplier by ID.'''
     return db.query(models.inventory.Supplier).filter(models.inventory.Supplier.id == supplier_id).first()
 
-def get_all_suppliers(db: Session, skip: int = 0, limit: int = 100) -> List[models.inventory.Supplier]:
+def get_all_suppliers(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.inventory.Supplier]:
     '''Retrieve all suppliers with pagination.'''
-    return db.query(models.inventory.Supplier).order_by(models.inventory.Supplier.name).offset(skip).limit(limit).all()
+    return paginate(db.query(models.inventory.Supplier), SUPPLIER_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def update_supplier(
     db: Session, supplier_db_obj: models.inventory.Supplier, supplier_in: schemas.SupplierUpdate
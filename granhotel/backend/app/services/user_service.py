@@ -1,12 +1,23 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Any
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import inspect
+from typing import List, Optional, Any, Dict
 from fastapi import HTTPException, status # For potential errors
+from fastapi.concurrency import run_in_threadpool
 import uuid
 
 from app import models
 from app import schemas
-from app.core.security import hash_password, verify_password # For password operations
+from app.core.cache import build_cache
+from app.core.config import settings
+from app.core.password_hashing import password_hasher # bcrypt on a bounded pool, off the request threads
 from app.models.user import User, UserRole # Explicit imports for clarity
+from app.utils.pagination import SortKey, paginate
+
+# Sort orders of the paginated listings (the last key is unique, as keyset pagination requires)
+USER_LIST_ORDER = (SortKey(models.User.email), SortKey(models.User.id))
+
+# Column values of recently authenticated users, keyed by user id (see get_user_for_auth)
+user_principal_cache = build_cache("auth-user", settings.AUTH_USER_CACHE_TTL_SECONDS, settings.AUTH_USER_CACHE_MAX_ENTRIES)
 
 def get_user(db: Session, user_id: uuid.UUID) -> Optional[models.User]:
     '''
@@ -14,6 +25,33 @@ def get_user(db: Session, user_id: uuid.UUID) -> Optional[models.User]:
     '''
     return db.query(models.User).filter(models.User.id == user_id).first()
 
+def _user_columns(user: models.User) -> Dict[str, Any]:
+    # The password hash stays out of the cache; it is loaded on access if ever needed
+    return {attr.key: getattr(user, attr.key) for attr in inspect(models.User).column_attrs if attr.key != "hashed_password"}
+
+def get_user_for_auth(db: Session, user_id: uuid.UUID) -> Optional[models.User]:
+    '''
+    The user a valid access token refers to, for the auth dependencies.
+    A cache hit is turned back into a User attached to `db` without a query, so it behaves like
+    a loaded row (it can be updated, refreshed, compared). The writes below evict the entry after
+    they commit, and a miss does not store a row read before such an eviction.
+    '''
+    key = str(user_id)
+    columns = user_principal_cache.get(key)
+    if columns is None:
+        # Taken before the read: if a write invalidates the user meanwhile, the row read may be the old one
+        generation = user_principal_cache.generation(key)
+        user = get_user(db, user_id)
+        if user:
+            user_principal_cache.set_if_unchanged(key, _user_columns(user), generation)
+        return user
+    user = models.User(**columns)
+    make_transient_to_detached(user) # As if just loaded: no pending changes, identity = its id
+    return db.merge(user, load=False) # Reuses the session's instance if it already holds this user
+
+def invalidate_user_cache(user_id: uuid.UUID) -> None:
+    user_principal_cache.delete(str(user_id))
+
 def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     '''
     Retrieve a user by their email address.
@@ -23,7 +61,8 @@ def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
 def get_users(
     db: Session, skip: int = 0, limit: int = 100,
     is_active: Optional[bool] = None,
-    role: Optional[UserRole] = None
+    role: Optional[UserRole] = None,
+    cursor: Optional[str] = None
 ) -> List[models.User]:
     '''
     Retrieve a list of users with optional filtering.
@@ -33,7 +72,7 @@ def get_users(
         query = query.filter(models.User.is_active == is_active)
     if role:
         query = query.filter(models.User.role == role)
-    return query.order_by(models.User.email).offset(skip).limit(limit).all()
+    return paginate(query, USER_LIST_ORDER, skip=skip, limit=limit, cursor=cursor)
 
 def create_user(db: Session, user_in: schemas.UserCreate) -> models.User:
     '''
@@ -52,7 +91,7 @@ def create_user(db: Session, user_in: schemas.UserCreate) -> models.User:
             detail="User with this email already exists."
         )
 
-    hashed_pass = hash_password(user_in.password)
+    hashed_pass = password_hasher.hash(user_in.password)
 
     user_data = user_in.model_dump(exclude={"password"}) # Pydantic v2 uses model_dump
     user_data["hashed_password"] = hashed_pass
@@ -80,7 +119,7 @@ def update_user(db: Session, user_db_obj: models.User, user_in: schemas.UserUpda
             )
 
     if "password" in update_data and update_data["password"]:
-        hashed_pass = hash_password(update_data["password"])
+        hashed_pass = password_hasher.hash(update_data["password"])
         update_data["hashed_password"] = hashed_pass
         del update_data["password"]
     elif "password" in update_data:
@@ -93,6 +132,7 @@ def update_user(db: Session, user_db_obj: models.User, user_in: schemas.UserUpda
 
     db.add(user_db_obj)
     db.commit()
+    invalidate_user_cache(user_db_obj.id)
     db.refresh(user_db_obj)
     return user_db_obj
 
@@ -101,7 +141,7 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
     '''
     Authenticate a user.
     - Retrieves user by email.
-    - Verifies password.
+    - Verifies password (on the password hashing pool), rehashing it if its cost is outdated.
     - Returns user object if authentication is successful, None otherwise.
     '''
     user = get_user_by_email(db, email=email)
@@ -109,8 +149,32 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
         return None
     if not user.is_active:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        _store_rehashed_password(db, user, new_hash)
+    return user
+
+def _store_rehashed_password(db: Session, user: models.User, new_hash: str) -> None:
+    '''Replace a valid hash made with outdated parameters (e.g. after PASSWORD_BCRYPT_ROUNDS changed).'''
+    user.hashed_password = new_hash
+    db.commit()
+    db.refresh(user)
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[models.User]:
+    '''
+    authenticate_user for `async def` endpoints: the queries run on the threadpool and bcrypt is
+    awaited on the password hashing pool, so no thread is held while the hash is computed.
+    '''
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user or not user.is_active:
+        return None
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        await run_in_threadpool(_store_rehashed_password, db, user, new_hash)
     return user
 
 def activate_user(db: Session, user_id: uuid.UUID) -> Optional[models.User]:
@@ -119,6 +183,7 @@ def activate_user(db: Session, user_id: uuid.UUID) -> Optional[models.User]:
     if user and not user.is_active:
         user.is_active = True
         db.commit()
+        invalidate_user_cache(user_id)
         db.refresh(user)
     return user
 
@@ -128,6 +193,7 @@ def deactivate_user(db: Session, user_id: uuid.UUID) -> Optional[models.User]:
     if user and user.is_active:
         user.is_active = False
         db.commit()
+        invalidate_user_cache(user_id)
         db.refresh(user)
     return user
 
@@ -137,5 +203,6 @@ def update_user_role(db: Session, user_id: uuid.UUID, new_role: UserRole) -> Opt
     if user:
         user.role = new_role
         db.commit()
+        invalidate_user_cache(user_id)
         db.refresh(user)
     return user
@@ -0,0 +1,111 @@
+import base64
+import binascii
+import enum
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, tuple_
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SortKey(NamedTuple):
+    '''One column of a list's ORDER BY. The last key of every ordering must be unique (usually the id).'''
+    column: Any # InstrumentedAttribute, e.g. models.pos.POSSale.sale_date
+    descending: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    # Tag the types JSON cannot represent so they decode back to comparable Python values
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return uuid.UUID(value["u"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    '''Opaque, URL-safe cursor holding the sort key values of the last row of a page.'''
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != expected_length:
+            raise ValueError("cursor does not match this listing")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+def _after_cursor_clause(order: Sequence[SortKey], values: Sequence[Any]):
+    '''WHERE clause selecting the rows that sort strictly after `values` in `order`.'''
+    directions = {key.descending for key in order}
+    if len(directions) == 1:
+        # Uniform direction: a row-value comparison, which PostgreSQL matches to a composite index
+        row, bound = tuple_(*[key.column for key in order]), tuple_(*values)
+        return row < bound if order[0].descending else row > bound
+
+    # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+    clauses = []
+    for i, key in enumerate(order):
+        equal_prefix = [order[j].column == values[j] for j in range(i)]
+        beyond = key.column < values[i] if key.descending else key.column > values[i]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def paginate(query, order: Sequence[SortKey], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+    '''
+    Apply `order` (replacing any ORDER BY already on `query`) and return one page of it.
+    Without a cursor this is the classic offset(skip).limit(limit). With a cursor (from the
+    X-Next-Cursor header of the previous page) it seeks past the last row seen instead, so
+    every page costs the same as the first; `skip` is ignored in that mode.
+    '''
+    query = query.order_by(None).order_by(*[key.column.desc() if key.descending else key.column.asc() for key in order])
+    if cursor:
+        query = query.filter(_after_cursor_clause(order, decode_cursor(cursor, len(order))))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def next_cursor(items: Sequence[Any], order: Sequence[SortKey], limit: int) -> Optional[str]:
+    '''Cursor for the page after `items`, or None when `items` is the last (short) page.'''
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor([getattr(last, key.column.key) for key in order])
+
+
+def set_next_cursor_header(response: Response, items: Sequence[Any], order: Sequence[SortKey], limit: int) -> None:
+    cursor = next_cursor(items, order, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import UserRole
+from app.services.user_service import user_principal_cache
+from tests.utils.user import create_user_in_db
+from tests.api.v1.test_users_endpoints import get_auth_headers
+
+# Throughput of an authenticated endpoint with the auth user cache disabled and enabled.
+# Run with `pytest -m slow -s tests/api/v1/test_auth_cache_benchmark.py` to see the figures.
+
+BENCHMARK_REQUESTS = 500
+
+pytestmark = pytest.mark.slow
+
+
+def _measure(client: TestClient, db: Session, headers: dict) -> tuple:
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_REQUESTS):
+            assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).status_code == 200
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    return BENCHMARK_REQUESTS / elapsed, len(statements)
+
+
+def test_auth_cache_benchmark(client: TestClient, db: Session):
+    user = create_user_in_db(db, role=UserRole.RECEPTIONIST, suffix_for_email="auth_bench")
+    headers = get_auth_headers(user.id, user.role)
+    ttl_seconds = user_principal_cache.ttl_seconds
+    try:
+        user_principal_cache.ttl_seconds = 0 # Disabled: every request reads the user
+        user_principal_cache.clear()
+        uncached_rps, uncached_queries = _measure(client, db, headers)
+
+        user_principal_cache.ttl_seconds = 300
+        client.get(f"{settings.API_V1_STR}/users/me", headers=headers) # Warm the entry
+        db.expunge_all()
+        cached_rps, cached_queries = _measure(client, db, headers)
+    finally:
+        user_principal_cache.ttl_seconds = ttl_seconds
+
+    print(f"\n/users/me x{BENCHMARK_REQUESTS}: without cache {uncached_rps:.0f} req/s ({uncached_queries} queries), "
+          f"with cache {cached_rps:.0f} req/s ({cached_queries} queries)")
+    assert uncached_queries >= BENCHMARK_REQUESTS
+    assert cached_queries == 0
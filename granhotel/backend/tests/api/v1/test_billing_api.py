@@ -10,7 +10,7 @@ from app.models.billing import FolioStatus, FolioTransactionType
 from app.schemas.billing import FolioTransactionCreate, FolioStatusUpdate
 from tests.utils.user import create_user_in_db
 from tests.utils.guest import create_random_guest
-from tests.utils.reservations import create_random_reservation
+from tests.utils.reservation import create_random_reservation
 from tests.utils.billing import create_random_guest_folio, create_random_folio_transaction_data, add_sample_transactions_to_folio
 from app.core.security import create_access_token # Use this directly for test tokens
 from tests.utils.common import random_email, random_lower_string
@@ -144,3 +144,45 @@ def test_update_folio_status_api_settle_with_balance_fail(client: TestClient, db
     response = client.patch(f"{API_V1_BILLING_URL}/folios/{folio.id}/status", json=status_update_payload, headers=mgr_headers)
     assert response.status_code == 400, response.text
     assert "cannot set to settled until balance is zero" in response.json()["detail"].lower()
+
+
+def test_folio_summary_and_transaction_pages_api(client: TestClient, db: Session):
+    receptionist = create_user_in_db(db, role=UserRole.RECEPTIONIST, email=random_email("_rec_fsum"))
+    rec_headers = get_auth_headers(receptionist.id, receptionist.role)
+    folio = create_random_guest_folio(db)
+    for i in range(3):
+        charge_in = create_random_folio_transaction_data(db, transaction_type=FolioTransactionType.SERVICE_CHARGE, amount=Decimal("10.00"), description_suffix=f"_fsum{i}")
+        services.billing_service.add_transaction_to_folio(db, folio.id, charge_in, receptionist.id)
+
+    summary = client.get(f"{API_V1_BILLING_URL}/folios/{folio.id}/summary", headers=rec_headers)
+    assert summary.status_code == 200, summary.text
+    content = summary.json()
+    assert Decimal(str(content["balance"])) == Decimal("30.00")
+    assert "transactions" not in content
+
+    first_page = client.get(f"{API_V1_BILLING_URL}/folios/{folio.id}/transactions?limit=2", headers=rec_headers)
+    assert first_page.status_code == 200, first_page.text
+    assert len(first_page.json()) == 2
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = client.get(f"{API_V1_BILLING_URL}/folios/{folio.id}/transactions?limit=2&cursor={cursor}", headers=rec_headers)
+    assert len(second_page.json()) == 1
+    ids = [t["id"] for t in first_page.json() + second_page.json()]
+    assert len(set(ids)) == 3
+
+    dashboard = client.get(f"{API_V1_BILLING_URL}/folios/summaries?status=OPEN&limit=1000", headers=rec_headers)
+    assert dashboard.status_code == 200, dashboard.text
+    assert folio.id in [row["id"] for row in dashboard.json()]
+
+
+def test_folio_posting_api_missing_folio_and_permissions(client: TestClient, db: Session):
+    receptionist = create_user_in_db(db, role=UserRole.RECEPTIONIST, email=random_email("_rec_post_async"))
+    housekeeper = create_user_in_db(db, role=UserRole.HOUSEKEEPER, email=random_email("_hk_post_async"))
+    transaction_payload = {"description": "Minibar", "charge_amount": "5.00", "transaction_type": FolioTransactionType.POS_CHARGE.value}
+
+    response = client.post(f"{API_V1_BILLING_URL}/folios/999999/transactions", json=transaction_payload, headers=get_auth_headers(housekeeper.id, housekeeper.role))
+    assert response.status_code == 403, response.text
+    assert client.post(f"{API_V1_BILLING_URL}/folios/999999/transactions", json=transaction_payload).status_code == 401
+    response = client.post(f"{API_V1_BILLING_URL}/folios/999999/transactions", json=transaction_payload, headers=get_auth_headers(receptionist.id, receptionist.role))
+    assert response.status_code == 404, response.text
+    response = client.get(f"{API_V1_BILLING_URL}/folios/999999", headers=get_auth_headers(receptionist.id, receptionist.role))
+    assert response.status_code == 404, response.text
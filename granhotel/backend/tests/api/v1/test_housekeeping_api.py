@@ -11,6 +11,7 @@ from tests.utils.user import create_user_in_db
 from tests.utils.room import create_random_room
 from tests.utils.housekeeping import create_random_housekeeper, create_random_housekeeping_log, create_random_housekeeping_log_data
 from app.core.security import create_access_token # Use this directly for test tokens
+from app.api import deps
 from tests.utils.common import random_email, random_lower_string
 
 
@@ -181,3 +182,70 @@ def test_update_log_details_api_as_manager(client: TestClient, db: Session):
     assert content["notes_instructions"] == new_notes
     assert content["scheduled_date"] == new_scheduled_date
     assert content["task_type"] == HousekeepingTaskType.MAINTENANCE_CHECK.value
+
+
+def test_board_stream_api_requires_manager(client: TestClient, db: Session):
+    housekeeper = create_random_housekeeper(db, suffix="_hk_api_board")
+    response = client.get(f"{settings.API_V1_STR}/housekeeping/board/stream", headers=get_auth_headers(housekeeper.id, housekeeper.role))
+    assert response.status_code == 403
+    assert client.get(f"{settings.API_V1_STR}/housekeeping/board/stream").status_code == 401
+
+
+def test_board_stream_auth_session_closed_before_streaming(db: Session):
+    manager_user = create_user_in_db(db, role=UserRole.MANAGER, email=random_email("_mgr_board"))
+    token = get_auth_headers(manager_user.id, manager_user.role)["Authorization"].split()[1]
+    sessions = []
+
+    def session_factory():
+        sessions.append(Session(bind=db.connection()))
+        return sessions[-1]
+
+    user = deps.require_manager_or_admin_user_for_stream(token=token, session_factory=session_factory)
+    assert user.id == manager_user.id and user.role == UserRole.MANAGER
+    assert len(sessions) == 1 and not sessions[0].in_transaction() # Closed: no connection held for the stream
+
+def test_housekeeping_stats_api_end_to_end(client: TestClient, db: Session):
+    manager_user = create_user_in_db(db, role=UserRole.MANAGER, email=random_email("_mgr_hkstats"))
+    manager_headers = get_auth_headers(manager_user.id, manager_user.role)
+    housekeeper = create_random_housekeeper(db, suffix="_hkstats")
+    hk_headers = get_auth_headers(housekeeper.id, housekeeper.role)
+    room = create_random_room(db, room_number_suffix=f"_hkstats{random_lower_string(4)}")
+    room.floor = 87 # No other room is on this floor
+    db.commit()
+    stats_url = f"{settings.API_V1_STR}/housekeeping/stats"
+    stats_range = {"date_from": (date.today() - timedelta(days=1)).isoformat(), "date_to": (date.today() + timedelta(days=1)).isoformat()}
+
+    def complete_task_via_api(task_type: HousekeepingTaskType) -> None:
+        log = create_random_housekeeping_log(db, creator_user_id=manager_user.id, room_id=room.id, assigned_to_user_id=housekeeper.id, task_type=task_type)
+        for new_status in (HousekeepingStatus.IN_PROGRESS, HousekeepingStatus.COMPLETED):
+            response = client.patch(f"{API_V1_HK_URL}/{log.id}/status", json={"status": new_status.value}, headers=hk_headers)
+            assert response.status_code == 200, response.text
+
+    complete_task_via_api(HousekeepingTaskType.FULL_CLEAN)
+    complete_task_via_api(HousekeepingTaskType.LINEN_CHANGE)
+
+    response = client.post(f"{stats_url}/refresh", params={"full": True}, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["full"] is True and response.json()["rows_written"] >= 2
+
+    response = client.get(stats_url, params={**stats_range, "group_by": "housekeeper", "housekeeper_user_id": str(housekeeper.id)}, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    assert [(row["key"], row["tasks"]) for row in response.json()["rows"]] == [(str(housekeeper.id), 2)]
+
+    response = client.get(stats_url, params={**stats_range, "group_by": "floor", "floor": 87}, headers=manager_headers)
+    assert [(row["label"], row["tasks"]) for row in response.json()["rows"]] == [("Floor 87", 2)]
+
+    # A task completed after the refresh is counted once an incremental refresh picks up its day
+    complete_task_via_api(HousekeepingTaskType.FULL_CLEAN)
+    response = client.get(stats_url, params={**stats_range, "group_by": "floor", "floor": 87}, headers=manager_headers)
+    assert response.json()["totals"]["tasks"] == 2
+
+    response = client.post(f"{stats_url}/refresh", headers=manager_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["full"] is False and response.json()["days_refreshed"] >= 1
+    response = client.get(stats_url, params={**stats_range, "group_by": "task_type", "floor": 87}, headers=manager_headers)
+    assert [(row["key"], row["tasks"]) for row in response.json()["rows"]] == [("FULL_CLEAN", 2), ("LINEN_CHANGE", 1)]
+
+    # Housekeepers cannot read or refresh the stats
+    assert client.get(stats_url, headers=hk_headers).status_code == 403
+    assert client.post(f"{stats_url}/refresh", headers=hk_headers).status_code == 403
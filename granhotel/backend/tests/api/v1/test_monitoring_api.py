@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.pool import PoolMetrics, WAIT_TIME_BUCKETS
+from app.db.session import SessionLocal
+from app.models.user import UserRole
+from tests.utils.user import create_user_in_db
+from tests.api.v1.test_users_endpoints import get_auth_headers
+
+API_V1_MONITORING_URL = f"{settings.API_V1_STR}/monitoring"
+
+def test_pool_metrics_histogram_is_cumulative():
+    metrics = PoolMetrics("test")
+    metrics.record_wait(0.0005)
+    metrics.record_wait(0.02)
+    metrics.record_wait(60, timed_out=True)
+    snapshot = metrics.snapshot()
+    buckets = {bucket["le"]: bucket["count"] for bucket in snapshot["wait_seconds_buckets"]}
+    assert len(buckets) == len(WAIT_TIME_BUCKETS) + 1
+    assert buckets[0.001] == 1
+    assert buckets[0.025] == 2
+    assert buckets[10.0] == 2
+    assert buckets[None] == 3 # +Inf
+    assert snapshot["timeouts_total"] == 1
+    assert snapshot["wait_seconds_max"] == 60
+
+def test_read_db_pool_statistics_api(client: TestClient, db: Session):
+    admin = create_user_in_db(db, role=UserRole.ADMIN, suffix_for_email="_pool_admin")
+    headers = get_auth_headers(admin.id, admin.role)
+    # The test client's requests use the test session; check a connection out of the app pool directly
+    app_session = SessionLocal()
+    try:
+        app_session.connection()
+        response = client.get(f"{API_V1_MONITORING_URL}/db-pool", headers=headers)
+    finally:
+        app_session.close()
+    assert response.status_code == 200, response.text
+    pools = {pool["name"]: pool for pool in response.json()["pools"]}
+    assert set(pools) == {"sync", "async"}
+    assert pools["sync"]["size"] == settings.DB_POOL_SIZE
+    assert pools["sync"]["checked_out"] >= 1
+    assert pools["sync"]["checkouts_total"] >= 1
+    assert pools["sync"]["wait_seconds_buckets"][-1]["count"] == pools["sync"]["wait_seconds_count"]
+
+def test_read_db_pool_statistics_api_forbidden_for_manager(client: TestClient, db: Session):
+    manager = create_user_in_db(db, role=UserRole.MANAGER, suffix_for_email="_pool_mgr")
+    response = client.get(f"{API_V1_MONITORING_URL}/db-pool", headers=get_auth_headers(manager.id, manager.role))
+    assert response.status_code == 403
+
+def test_read_cache_statistics_api(client: TestClient, db: Session):
+    admin = create_user_in_db(db, role=UserRole.ADMIN, suffix_for_email="_cache_admin")
+    headers = get_auth_headers(admin.id, admin.role)
+    client.get(f"{API_V1_MONITORING_URL}/caches", headers=headers) # Caches the admin for the next request
+    response = client.get(f"{API_V1_MONITORING_URL}/caches", headers=headers)
+    assert response.status_code == 200, response.text
+    auth_cache = next(cache for cache in response.json() if cache["name"] == "auth-user")
+    assert auth_cache["hits"] >= 1
+
+def test_read_password_hashing_statistics_api(client: TestClient, db: Session):
+    admin = create_user_in_db(db, role=UserRole.ADMIN, suffix_for_email="_hash_admin") # Hashes on the pool
+    response = client.get(f"{API_V1_MONITORING_URL}/password-hashing", headers=get_auth_headers(admin.id, admin.role))
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert content["workers"] == settings.PASSWORD_HASH_WORKERS
+    assert content["completed_total"] >= 1
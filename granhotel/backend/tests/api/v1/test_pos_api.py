@@ -157,3 +157,16 @@ def test_void_already_voided_sale_api_fail(client: TestClient, db: Session):
     response = client.post(f"{API_V1_POS_SALES_URL}/{sale_to_void.id}/void", json=void_data, headers=mgr_headers)
     assert response.status_code == 400, response.text
     assert "already voided" in response.json()["detail"].lower()
+
+
+def test_pos_sale_api_authenticates_through_the_async_session(client: TestClient, db: Session):
+    receptionist = create_user_in_db(db, role=UserRole.RECEPTIONIST, email=random_email("_rec_pos_async"))
+    inactive = create_user_in_db(db, role=UserRole.MANAGER, email=random_email("_mgr_pos_inactive"), is_active=False)
+
+    response = client.get(f"{API_V1_POS_SALES_URL}/", headers=get_auth_headers(receptionist.id, receptionist.role))
+    assert response.status_code == 403, response.text # Listing needs Manager or Admin
+    response = client.get(f"{API_V1_POS_SALES_URL}/", headers=get_auth_headers(inactive.id, inactive.role))
+    assert response.status_code == 400, response.text
+    assert client.get(f"{API_V1_POS_SALES_URL}/").status_code == 401
+    response = client.get(f"{API_V1_POS_SALES_URL}/999999", headers=get_auth_headers(receptionist.id, receptionist.role))
+    assert response.status_code == 404, response.text
@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from decimal import Decimal # For comparing price in response
 
 from app.core.config import settings
-from app.schemas import ProductCategoryCreate, ProductCreate # UserRole for auth if needed
+from app import services
+from app.schemas import ProductCategoryCreate, ProductCreate, ProductUpdate # UserRole for auth if needed
 from app.models.user import UserRole # For creating users with specific roles
 from tests.utils.user import create_user_in_db
 from tests.utils.product import create_random_product_category, create_random_product, random_lower_string # Import random_lower_string
@@ -130,3 +131,27 @@ def test_delete_product_api(client: TestClient, db: Session):
     # Verify it's deleted
     get_response = client.get(f"{API_V1_PRODUCTS_URL}/{product.id}", headers=admin_headers)
     assert get_response.status_code == 404
+
+
+def test_product_catalog_etag_api(client: TestClient, db: Session):
+    user = create_user_in_db(db, suffix_for_email="_catalog_etag_user")
+    user_headers = get_auth_headers(user.id, user.role)
+    product = create_random_product(db, price=Decimal("20.00"), taxable=False, name_suffix="_catalog_etag")
+
+    response = client.get(f"{API_V1_PRODUCTS_URL}/catalog", headers=user_headers)
+    assert response.status_code == 200, response.text
+    etag = response.headers["etag"]
+    content = response.json()
+    assert etag == f'"{content["version"]}"'
+    listed = next(p for p in content["products"] if p["id"] == product.id)
+    assert Decimal(str(listed["unit_price_with_tax"])) == Decimal("20.00")
+
+    unchanged = client.get(f"{API_V1_PRODUCTS_URL}/catalog", headers={**user_headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    services.product_service.update_product(db, product, ProductUpdate(is_active=False))
+    changed = client.get(f"{API_V1_PRODUCTS_URL}/catalog", headers={**user_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert all(p["id"] != product.id for p in changed.json()["products"])
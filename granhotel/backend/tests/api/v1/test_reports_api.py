@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.models.reservation import ReservationStatus
+from app.models.user import UserRole
+from tests.utils.user import create_user_in_db
+from tests.utils.reservation import create_random_reservation
+from tests.api.v1.test_users_endpoints import get_auth_headers
+
+API_V1_REPORTS_URL = f"{settings.API_V1_STR}/reports"
+
+def test_read_occupancy_report_api(client: TestClient, db: Session):
+    manager = create_user_in_db(db, role=UserRole.MANAGER, suffix_for_email="_report_mgr")
+    headers = get_auth_headers(manager.id, manager.role)
+    reservation = create_random_reservation(db, days_in_future=430, duration_days=3, status=ReservationStatus.CONFIRMED)
+
+    params = {
+        "start_date": reservation.check_in_date.isoformat(),
+        "end_date": (reservation.check_in_date + timedelta(days=13)).isoformat(),
+        "granularity": "week",
+    }
+    response = client.get(f"{API_V1_REPORTS_URL}/occupancy", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert content["granularity"] == "week"
+    assert 2 <= len(content["rows"]) <= 3
+    assert content["totals"]["room_nights_sold"] >= 3
+
+def test_read_occupancy_report_api_forbidden_for_receptionist(client: TestClient, db: Session):
+    receptionist = create_user_in_db(db, role=UserRole.RECEPTIONIST, suffix_for_email="_report_rec")
+    headers = get_auth_headers(receptionist.id, receptionist.role)
+    today = date.today().isoformat()
+    response = client.get(f"{API_V1_REPORTS_URL}/occupancy", params={"start_date": today, "end_date": today}, headers=headers)
+    assert response.status_code == 403
@@ -51,6 +51,27 @@ def test_read_reservations_api(client: TestClient, db: Session) -> None:
     assert res1.id in res_ids
     assert res2.id in res_ids
 
+def test_read_reservations_api_cursor_pagination(client: TestClient, db: Session) -> None:
+    guest = create_random_guest(db, suffix="_api_cursor")
+    # Two stays share a check-in date so the id tiebreaker is exercised
+    for i, days_in_future in enumerate((20, 20, 24, 28, 32)):
+        room = create_random_room(db, room_number_suffix=f"_api_cursor{i}")
+        create_random_reservation(db, guest_id=guest.id, room_id=room.id, days_in_future=days_in_future)
+
+    offset_ids = [r["id"] for r in client.get(f"{API_V1_RESERVATIONS_URL}/", params={"guest_id": guest.id}).json()]
+    cursor_ids = []
+    params = {"guest_id": guest.id, "limit": 2}
+    while True:
+        response = client.get(f"{API_V1_RESERVATIONS_URL}/", params=params)
+        assert response.status_code == 200, response.text
+        cursor_ids.extend(r["id"] for r in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert len(offset_ids) == 5
+    assert cursor_ids == offset_ids # Same rows, same check_in_date desc, id desc order
+
 
 def test_read_single_reservation_api(client: TestClient, db: Session) -> None:
     reservation = create_random_reservation(db, days_in_future=15)
@@ -152,3 +173,74 @@ def test_update_reservation_status_api_not_found(client: TestClient) -> None:
 def test_cancel_reservation_api_not_found(client: TestClient) -> None:
     response = client.post(f"{API_V1_RESERVATIONS_URL}/999999/cancel")
     assert response.status_code == 404
+
+def test_search_room_availability_api(client: TestClient, db: Session) -> None:
+    reservation = create_random_reservation(db, days_in_future=65, duration_days=2, status=ReservationStatus.CONFIRMED)
+    free_room = create_random_room(db, room_number_suffix="_api_avail_free")
+
+    params = {
+        "check_in_date": reservation.check_in_date.isoformat(),
+        "check_out_date": reservation.check_out_date.isoformat(),
+    }
+    response = client.get(f"{API_V1_RESERVATIONS_URL}/availability", params=params)
+    assert response.status_code == 200, response.text
+    room_ids = {room["id"] for room in response.json()}
+    assert free_room.id in room_ids
+    assert reservation.room_id not in room_ids
+
+    params["room_type"] = "No Such Type"
+    response = client.get(f"{API_V1_RESERVATIONS_URL}/availability", params=params)
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_search_room_availability_api_invalid_dates(client: TestClient) -> None:
+    params = {"check_in_date": "2030-01-10", "check_out_date": "2030-01-10"}
+    response = client.get(f"{API_V1_RESERVATIONS_URL}/availability", params=params)
+    assert response.status_code == 400
+
+def test_create_reservations_batch_api(client: TestClient, db: Session) -> None:
+    guest = create_random_guest(db, suffix="_api_batch")
+    rooms = [create_random_room(db, room_number_suffix=f"_api_batch_{i}") for i in range(3)]
+
+    rows = []
+    for room in rooms:
+        row = create_random_reservation_data(db, guest_id=guest.id, room_id=room.id, days_in_future=45, duration_days=2)
+        rows.append({
+            "guest_id": row.guest_id,
+            "room_id": row.room_id,
+            "check_in_date": row.check_in_date.isoformat(),
+            "check_out_date": row.check_out_date.isoformat(),
+            "status": ReservationStatus.CONFIRMED.value,
+        })
+    rows.append(dict(rows[0], guest_id=999999))
+
+    response = client.post(f"{API_V1_RESERVATIONS_URL}/batch", json={"reservations": rows})
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert content["created_count"] == 3
+    assert content["failed_count"] == 1
+    assert content["results"][3]["status"] == "invalid"
+    assert all(row["reservation_id"] for row in content["results"][:3])
+
+def test_booking_api_returns_loaded_relations_and_blocks_the_room(client: TestClient, db: Session) -> None:
+    guest = create_random_guest(db, suffix="_api_async")
+    room = create_random_room(db, room_number_suffix="_api_async")
+    payload_schema = create_random_reservation_data(db, guest_id=guest.id, room_id=room.id, days_in_future=140, duration_days=2, status=ReservationStatus.CONFIRMED)
+    json_payload = payload_schema.model_dump(mode="json")
+    dates = {"check_in_date": json_payload["check_in_date"], "check_out_date": json_payload["check_out_date"]}
+
+    response = client.post(f"{API_V1_RESERVATIONS_URL}/", json=json_payload)
+    assert response.status_code == 201, response.text
+    content = response.json()
+    # Serialized after the async session's run_sync returned: the relationships come back loaded
+    assert content["room"]["room_number"] == room.room_number
+    assert content["guest"]["id"] == guest.id
+
+    available_ids = [r["id"] for r in client.get(f"{API_V1_RESERVATIONS_URL}/availability", params=dates).json()]
+    assert room.id not in available_ids
+
+    response = client.post(f"{API_V1_RESERVATIONS_URL}/{content['id']}/cancel")
+    assert response.status_code == 200, response.text
+    assert response.json()["room"]["id"] == room.id
+    available_ids = [r["id"] for r in client.get(f"{API_V1_RESERVATIONS_URL}/availability", params=dates).json()]
+    assert room.id in available_ids
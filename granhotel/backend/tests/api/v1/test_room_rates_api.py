@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.core.config import settings
+from app.models.user import UserRole
+from tests.utils.user import create_user_in_db
+from tests.utils.room import create_random_room
+from tests.utils.guest import random_lower_string
+from tests.api.v1.test_users_endpoints import get_auth_headers
+
+API_V1_ROOM_RATES_URL = f"{settings.API_V1_STR}/room-rates"
+
+def test_create_and_read_room_rate_api(client: TestClient, db: Session):
+    manager = create_user_in_db(db, role=UserRole.MANAGER, suffix_for_email="_rate_mgr")
+    headers = get_auth_headers(manager.id, manager.role)
+    room_type = f"RateApi_{random_lower_string(5)}"
+
+    rate_data = {"room_type": room_type, "name": "Weekend", "day_of_week": 5, "price": "210.00", "priority": 5}
+    response = client.post(f"{API_V1_ROOM_RATES_URL}/", json=rate_data, headers=headers)
+    assert response.status_code == 201, response.text
+    rate_id = response.json()["id"]
+
+    response = client.get(f"{API_V1_ROOM_RATES_URL}/", params={"room_type": room_type}, headers=headers)
+    assert response.status_code == 200
+    assert [rate["id"] for rate in response.json()] == [rate_id]
+
+def test_create_room_rate_api_forbidden_for_receptionist(client: TestClient, db: Session):
+    receptionist = create_user_in_db(db, role=UserRole.RECEPTIONIST, suffix_for_email="_rate_rec")
+    headers = get_auth_headers(receptionist.id, receptionist.role)
+    rate_data = {"room_type": "Double", "name": "Promo", "price": "50.00"}
+    response = client.post(f"{API_V1_ROOM_RATES_URL}/", json=rate_data, headers=headers)
+    assert response.status_code == 403
+
+def test_quote_room_stays_api(client: TestClient, db: Session):
+    user = create_user_in_db(db, suffix_for_email="_rate_quote")
+    headers = get_auth_headers(user.id, user.role)
+    room = create_random_room(db, room_number_suffix="_rate_quote")
+    room.type = f"RateQuote_{random_lower_string(5)}"
+    room.price = 120.00
+    db.add(room)
+    db.commit()
+
+    check_in = date.today() + timedelta(days=15)
+    response = client.get(
+        f"{API_V1_ROOM_RATES_URL}/quote",
+        params={"check_in_date": check_in.isoformat(), "max_nights": 3, "room_type": room.type},
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert len(content) == 1
+    assert content[0]["room_id"] == room.id
+    assert [Decimal(total) for total in content[0]["totals"]] == [Decimal("120.00"), Decimal("240.00"), Decimal("360.00")]
@@ -48,6 +48,26 @@ def test_read_rooms(client: TestClient, db: Session) -> None:
     assert room1.id in room_ids
     assert room2.id in room_ids
 
+def test_read_rooms_cursor_pagination(client: TestClient, db: Session) -> None:
+    created_ids = {create_random_room(db, room_number_suffix=f"CUR{i}").id for i in range(5)}
+    seen_ids = []
+    response = client.get(f"{settings.API_V1_STR}/rooms/", params={"limit": 2})
+    while True:
+        assert response.status_code == 200, response.text
+        seen_ids.extend(r["id"] for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"{settings.API_V1_STR}/rooms/", params={"limit": 2, "cursor": cursor})
+
+    assert seen_ids == sorted(set(seen_ids)) # Every room exactly once, in id order
+    assert created_ids <= set(seen_ids)
+
+def test_read_rooms_invalid_cursor(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/rooms/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid pagination cursor."
+
 
 def test_read_room(client: TestClient, db: Session) -> None:
     room = create_random_room(db, room_number_suffix="GET")
@@ -3,6 +3,7 @@ from typing import Generator, Any
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from alembic.config import Config
 from alembic import command
@@ -11,8 +12,12 @@ import os
 # Import settings and base model from the app
 from app.core.config import settings
 from app.db.base_class import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db, get_session_factory
 from app.main import app as main_app # Import the main FastAPI app
+from app.services.availability_index import room_availability_index
+from app.services.pricing_service import pricing_engine
+from app.services.user_service import user_principal_cache
+from app.services.product_service import invalidate_product_catalog
 
 # Use a separate test database
 # Ensure alembic.ini is found relative to the backend directory
@@ -23,6 +28,14 @@ ALEMBIC_INI_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ale
 # os.path.dirname(__file__) is /app/granhotel/backend/tests
 # os.path.dirname(os.path.dirname(__file__)) is /app/granhotel/backend
 
+# The app's startup hook would warm the availability index from the main database, not the test one
+settings.AVAILABILITY_INDEX_WARM_ON_STARTUP = False
+# Nor refresh it in the background from there: tests build it from their own session
+room_availability_index.session_factory = None
+# Nor should it LISTEN on the main database for housekeeping board or rate changes
+settings.HOUSEKEEPING_BOARD_RELAY_ENABLED = False
+settings.PRICING_CACHE_RELAY_ENABLED = False
+
 TEST_DATABASE_URL = settings.DATABASE_URL.replace("db/granhoteldb", "db/granhoteldb_test") if "db/granhoteldb" in settings.DATABASE_URL else settings.DATABASE_URL + "_test"
 
 
@@ -81,6 +94,11 @@ def db(db_engine) -> Generator[Session, Any, None]:
     db_session.close()
     transaction.rollback()
     connection.close()
+    # Process-wide caches may hold rows this test rolled back
+    room_availability_index.invalidate()
+    pricing_engine.invalidate()
+    user_principal_cache.clear()
+    invalidate_product_catalog()
 
 @pytest.fixture(scope="function")
 def client(db: Session) -> Generator[TestClient, Any, None]:
@@ -89,7 +107,20 @@ def client(db: Session) -> Generator[TestClient, Any, None]:
         # The db fixture already provides a session that is transaction-managed
         yield db
 
+    # Async endpoints get an AsyncSession proxying that same session (sync_session_class may be any
+    # callable returning the Session): they see the test data and their commits are rolled back with it
+    async def override_get_async_db():
+        yield AsyncSession(sync_session_class=lambda **kw: db)
+
+    # Streaming endpoints open their own sessions; share the test's connection so they see the test data
+    def override_get_session_factory():
+        return lambda: Session(bind=db.connection())
+
     main_app.dependency_overrides[get_db] = override_get_db
+    main_app.dependency_overrides[get_async_db] = override_get_async_db
+    main_app.dependency_overrides[get_session_factory] = override_get_session_factory
     with TestClient(main_app) as c:
         yield c
     del main_app.dependency_overrides[get_db] # Clean up override
+    del main_app.dependency_overrides[get_async_db]
+    del main_app.dependency_overrides[get_session_factory]
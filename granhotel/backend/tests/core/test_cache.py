@@ -0,0 +1,27 @@
+from app.core.cache import TTLCache
+
+
+def test_set_if_unchanged_refuses_values_read_before_a_delete():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=2)
+
+    generation = cache.generation("a")
+    cache.delete("a") # The value being read for "a" may predate this
+    assert cache.set_if_unchanged("a", "stale", generation) is False
+    assert cache.get("a") is None
+
+    generation = cache.generation("a")
+    cache.delete("b") # Other keys do not matter
+    assert cache.set_if_unchanged("a", "fresh", generation) is True
+    assert cache.get("a") == "fresh"
+
+
+def test_set_if_unchanged_stays_safe_once_deletes_are_forgotten():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=1)
+    generation = cache.generation("a")
+    cache.delete("a")
+    cache.delete("b") # Only the latest max_entries deletes are remembered: "a"'s is dropped
+    assert cache.set_if_unchanged("a", "stale", generation) is False
+
+    generation = cache.generation("a")
+    cache.clear()
+    assert cache.set_if_unchanged("a", "stale", generation) is False
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.core.events import EventBroadcaster, NotifyRelay
+
+
+def test_broadcaster_fans_out_from_other_threads():
+    broadcaster = EventBroadcaster("test", channel="test_events")
+
+    async def scenario():
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        publisher = threading.Thread(target=broadcaster.publish, args=({"type": "task", "id": 1},))
+        publisher.start()
+        publisher.join()
+        received = [await first.get(timeout=1), await second.get(timeout=1)]
+        broadcaster.unsubscribe(second)
+        broadcaster.publish({"type": "task", "id": 2})
+        received.append(await first.get(timeout=1))
+        assert await second.get(timeout=0.05) is None # Unsubscribed
+        return received
+
+    assert asyncio.run(scenario()) == [{"type": "task", "id": 1}, {"type": "task", "id": 1}, {"type": "task", "id": 2}]
+    assert broadcaster.stats()["subscribers"] == 1
+
+
+def test_slow_subscriber_is_asked_to_resync():
+    broadcaster = EventBroadcaster("test", channel="test_events", max_queue=2)
+
+    async def scenario():
+        subscription = broadcaster.subscribe()
+        for i in range(3):
+            broadcaster.publish({"type": "task", "id": i})
+        await asyncio.sleep(0) # Let the loop run the queued deliveries
+        return [await subscription.get(timeout=1), await subscription.get(timeout=0.05)]
+
+    assert asyncio.run(scenario()) == [{"type": "resync"}, None]
+    assert broadcaster.stats()["resyncs_total"] == 1
+
+
+def test_only_commits_with_queued_events_send_notifications(db: Session):
+    broadcaster = EventBroadcaster("test", channel="test_events")
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        db.commit()
+        assert not any("pg_notify" in statement for statement in statements)
+
+        broadcaster.publish_after_commit(db, {"type": "task", "id": 1})
+        broadcaster.publish_after_commit(db, {"type": "task", "id": 2})
+        db.commit()
+        assert len([statement for statement in statements if "pg_notify" in statement]) == 1 # Both in one statement
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+
+def test_relay_refuses_drivers_it_cannot_listen_with():
+    relay = NotifyRelay(create_engine("sqlite://"), [EventBroadcaster("test", channel="test_events")])
+    with pytest.raises(RuntimeError, match="pysqlite"):
+        relay.ensure_started()
+
+
+def test_relay_delivers_notifications_from_other_processes(db_engine):
+    broadcaster = EventBroadcaster("test", channel="test_relay_events")
+    relay = NotifyRelay(db_engine, [broadcaster], reconnect_seconds=0.1)
+
+    async def scenario():
+        subscription = broadcaster.subscribe()
+        relay.ensure_started()
+        received = None
+        for attempt in range(50): # Until the relay's LISTEN is in place
+            with db_engine.begin() as connection:
+                connection.execute(text("SELECT pg_notify('test_relay_events', :payload)"), {
+                    "payload": json.dumps({"origin": "another-process", "event": {"type": "task", "id": attempt}})
+                })
+            received = await subscription.get(timeout=0.2)
+            if received is not None:
+                return received
+        return received
+
+    try:
+        assert asyncio.run(scenario())["type"] == "task"
+    finally:
+        relay.stop()
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+from app.core.password_hashing import PasswordHashingPool
+from app.core.security import verify_and_update_password
+
+
+def test_pool_hashes_and_verifies():
+    pool = PasswordHashingPool(workers=2, max_queue=2)
+    try:
+        hashed = pool.hash("s3cret-pass")
+        assert pool.verify_and_update("s3cret-pass", hashed) == (True, None)
+        assert pool.verify_and_update("wrong-pass", hashed)[0] is False
+        assert asyncio.run(pool.verify_and_update_async("s3cret-pass", hashed)) == (True, None)
+        stats = pool.stats()
+        assert stats["completed_total"] == 4
+        assert stats["running"] == 0 and stats["queued"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_pool_rejects_work_beyond_its_bound():
+    pool = PasswordHashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = pool._submit(release.wait)
+        queued = pool._submit(release.wait)
+        assert pool.stats()["queued"] == 1
+        with pytest.raises(HTTPException) as exc_info:
+            pool.hash("one-too-many")
+        assert exc_info.value.status_code == 503
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert pool.hash("fits-again") # Slots are released as work completes
+        stats = pool.stats()
+        assert stats["rejected_total"] == 1
+        assert stats["peak_queued"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_hash_with_outdated_cost_needs_update():
+    outdated = bcrypt.using(rounds=4).hash("s3cret-pass")
+    valid, new_hash = verify_and_update_password("s3cret-pass", outdated)
+    assert valid
+    assert new_hash and bcrypt.from_string(new_hash).rounds == settings.PASSWORD_BCRYPT_ROUNDS
+    assert verify_and_update_password("s3cret-pass", new_hash) == (True, None)
@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app import models, schemas
+from app.models.reservation import ReservationStatus
+from app.schemas.analytics import ReportGranularity
+from app.services import analytics_service, reservation_service
+from tests.utils.room import create_random_room
+from tests.utils.reservation import create_random_reservation, create_random_reservation_data
+
+def _fact(db: Session, stay_date: date):
+    fact = db.query(models.DailyOccupancyFact).filter(models.DailyOccupancyFact.stay_date == stay_date).first()
+    return (fact.room_nights_sold, fact.room_revenue) if fact else (0, Decimal("0.00"))
+
+def test_facts_follow_reservation_lifecycle(db: Session):
+    room = create_random_room(db, room_number_suffix="_facts_life")
+    room.price = 100.00
+    db.add(room)
+    db.commit()
+    check_in = date.today() + timedelta(days=400)
+    nights = [check_in + timedelta(days=i) for i in range(4)]
+    baseline = {night: _fact(db, night) for night in nights}
+
+    def delta(night: date):
+        sold, revenue = _fact(db, night)
+        return sold - baseline[night][0], revenue - baseline[night][1]
+
+    # PENDING does not count as sold
+    reservation = create_random_reservation(db, room_id=room.id, days_in_future=400, duration_days=3, status=ReservationStatus.PENDING)
+    assert delta(nights[0]) == (0, Decimal("0.00"))
+
+    reservation_service.update_reservation_status(db, reservation.id, ReservationStatus.CONFIRMED)
+    assert [delta(night) for night in nights] == [(1, Decimal("100.00"))] * 3 + [(0, Decimal("0.00"))]
+
+    # Extending the stay moves the extra night in
+    reservation_service.update_reservation_details(db, reservation.id, schemas.ReservationUpdate(check_out_date=nights[3] + timedelta(days=1)))
+    assert [delta(night) for night in nights] == [(1, Decimal("100.00"))] * 4
+
+    reservation_service.cancel_reservation(db, reservation.id)
+    assert [delta(night) for night in nights] == [(0, Decimal("0.00"))] * 4
+
+def test_revenue_split_keeps_reservation_total():
+    stay = analytics_service.StaySnapshot(ReservationStatus.CONFIRMED, date(2030, 1, 1), date(2030, 1, 4), Decimal("100.00"))
+    contribution = analytics_service._nightly_contribution(stay)
+    assert [revenue for _, revenue in contribution.values()] == [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")]
+
+def test_cancelling_a_rebuilt_half_cent_stay_nets_to_zero(db: Session):
+    room = create_random_room(db, room_number_suffix="_facts_cent")
+    reservation = create_random_reservation(db, room_id=room.id, days_in_future=440, duration_days=2, status=ReservationStatus.PENDING)
+    start, end = reservation.check_in_date, reservation.check_out_date
+    analytics_service.rebuild_daily_occupancy_facts(db, start, end)
+    baseline = {night: _fact(db, night) for night in (start, start + timedelta(days=1))}
+
+    # Written behind the service's back, so only the rebuild (SQL round()) accounts for it
+    reservation.status = ReservationStatus.CONFIRMED
+    reservation.total_price = Decimal("100.05")
+    db.commit()
+    analytics_service.rebuild_daily_occupancy_facts(db, start, end)
+    assert [_fact(db, night)[1] - baseline[night][1] for night in baseline] == [Decimal("50.03"), Decimal("50.02")]
+
+    reservation_service.cancel_reservation(db, reservation.id)
+    assert {night: _fact(db, night) for night in baseline} == baseline
+
+def test_incremental_facts_equal_rebuilt_facts(db: Session):
+    rooms = [create_random_room(db, room_number_suffix=f"_facts_eq{i}") for i in range(3)]
+    rooms[0].price = 99.99 # Uneven splits exercise the rounding of both paths
+    db.commit()
+    start = date.today() + timedelta(days=460)
+    end = start + timedelta(days=8)
+    nights = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    # A mix of every write path that maintains the facts incrementally
+    lifecycle = create_random_reservation(db, room_id=rooms[0].id, days_in_future=460, duration_days=3, status=ReservationStatus.PENDING)
+    reservation_service.update_reservation_status(db, lifecycle.id, ReservationStatus.CONFIRMED)
+    reservation_service.update_reservation_details(db, lifecycle.id, schemas.ReservationUpdate(check_out_date=lifecycle.check_out_date + timedelta(days=2)))
+    cancelled = create_random_reservation(db, room_id=rooms[1].id, days_in_future=461, duration_days=2, status=ReservationStatus.CONFIRMED)
+    reservation_service.cancel_reservation(db, cancelled.id)
+    batch = reservation_service.create_reservations_batch(db, [
+        create_random_reservation_data(db, room_id=rooms[1].id, days_in_future=462, duration_days=3, status=ReservationStatus.CONFIRMED),
+        create_random_reservation_data(db, room_id=rooms[2].id, days_in_future=464, duration_days=4, status=ReservationStatus.CHECKED_IN),
+    ])
+    assert batch["created_count"] == 2
+
+    incremental = {night: _fact(db, night) for night in nights}
+    analytics_service.rebuild_daily_occupancy_facts(db, start, end)
+    assert {night: _fact(db, night) for night in nights} == incremental
+
+def test_occupancy_report_and_rebuild(db: Session):
+    room = create_random_room(db, room_number_suffix="_facts_report")
+    room.price = 80.00
+    db.add(room)
+    db.commit()
+    reservation = create_random_reservation(db, room_id=room.id, days_in_future=420, duration_days=2, status=ReservationStatus.CONFIRMED)
+    start = reservation.check_in_date
+    end = reservation.check_out_date # Inclusive: the check-out day itself is not sold
+
+    report = analytics_service.get_occupancy_report(db, start, end, ReportGranularity.DAY)
+    assert len(report["rows"]) == 3
+    assert report["totals"]["room_nights_available"] == report["room_count"] * 3
+    sold_before_rebuild = report["totals"]["room_nights_sold"]
+    assert sold_before_rebuild >= 2
+    assert report["rows"][0]["adr"] > 0
+
+    # Rebuilding from the reservations table reproduces the incrementally maintained facts
+    analytics_service.rebuild_daily_occupancy_facts(db, start, end)
+    rebuilt = analytics_service.get_occupancy_report(db, start, end, ReportGranularity.MONTH)
+    assert rebuilt["totals"]["room_nights_sold"] == sold_before_rebuild
+    assert rebuilt["totals"]["room_revenue"] == report["totals"]["room_revenue"]
+
+    with pytest.raises(HTTPException) as excinfo:
+        analytics_service.get_occupancy_report(db, end, start)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import schemas
+from app.db.session import AsyncSessionLocal, to_async_database_url
+from app.models.billing import FolioTransactionType
+from app.models.reservation import ReservationStatus
+from app.services import aio
+from app.services.availability_index import room_availability_index
+from app.services.pricing_service import pricing_engine
+from tests.utils.guest import create_random_guest
+from tests.utils.room import create_random_room
+from tests.utils.user import create_user_in_db
+from tests.utils.common import random_email
+
+
+def _run_in_async_session(db_engine, scenario):
+    '''Run `scenario(session)` on an AsyncSession over the test database; everything it commits is rolled back.'''
+    async def runner():
+        engine = create_async_engine(to_async_database_url(db_engine.url.render_as_string(hide_password=False)), poolclass=NullPool)
+        try:
+            async with engine.connect() as connection:
+                transaction = await connection.begin()
+                # The app's session settings (expire_on_commit=False); service commits become savepoint
+                # releases inside the outer transaction
+                session = AsyncSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+                try:
+                    await scenario(session)
+                finally:
+                    await session.close()
+                    await transaction.rollback()
+        finally:
+            await engine.dispose()
+            room_availability_index.invalidate()
+            pricing_engine.invalidate()
+    asyncio.run(runner())
+
+
+def test_to_async_database_url():
+    assert to_async_database_url("postgresql://user:pw@db/granhoteldb") == "postgresql+asyncpg://user:pw@db/granhoteldb"
+    assert to_async_database_url("postgresql+psycopg2://user:pw@db:5432/x") == "postgresql+asyncpg://user:pw@db:5432/x"
+
+
+def test_async_create_and_read_reservation(db_engine):
+    async def scenario(session: AsyncSession):
+        guest = await session.run_sync(create_random_guest, "_async_res")
+        room = await session.run_sync(create_random_room, "_async_res")
+        check_in = date.today() + timedelta(days=40)
+        reservation_in = schemas.ReservationCreate(
+            guest_id=guest.id, room_id=room.id,
+            check_in_date=check_in, check_out_date=check_in + timedelta(days=2),
+            status=ReservationStatus.CONFIRMED
+        )
+
+        reservation = await aio.reservation_service.create_reservation(session, reservation_in)
+        # Relationships come back loaded, so serializing outside the session's greenlet works
+        assert reservation.room.room_number == room.room_number
+        assert reservation.guest.id == guest.id
+        assert reservation.total_price > 0
+
+        with pytest.raises(HTTPException) as exc_info:
+            await aio.reservation_service.create_reservation(session, reservation_in)
+        assert exc_info.value.status_code == 409
+
+        listed = await aio.reservation_service.get_reservations(session, guest_id=guest.id)
+        assert [r.id for r in listed] == [reservation.id]
+        assert not await aio.reservation_service.is_room_available(session, room.id, check_in, check_in + timedelta(days=1))
+
+        cancelled = await aio.reservation_service.cancel_reservation(session, reservation.id)
+        assert cancelled.status == ReservationStatus.CANCELLED
+        assert cancelled.room.id == room.id
+
+    _run_in_async_session(db_engine, scenario)
+
+
+def test_async_get_missing_rows_return_none(db_engine):
+    async def scenario(session: AsyncSession):
+        assert await aio.reservation_service.get_reservation(session, 999999) is None
+        assert await aio.pos_service.get_pos_sale(session, 999999) is None
+        assert await aio.reservation_service.update_reservation_status(session, 999999, ReservationStatus.CONFIRMED) is None
+
+    _run_in_async_session(db_engine, scenario)
+
+
+def test_async_folio_posting_returns_current_totals(db_engine):
+    async def scenario(session: AsyncSession):
+        guest = await session.run_sync(create_random_guest, "_async_folio")
+        user = await session.run_sync(lambda sync_session: create_user_in_db(sync_session, email=random_email("_async_folio")))
+        folio = await aio.billing_service.get_or_create_folio_for_guest(session, guest.id)
+
+        charge_in = schemas.billing.FolioTransactionCreate(
+            description="Minibar", charge_amount=Decimal("5.00"), transaction_type=FolioTransactionType.SERVICE_CHARGE
+        )
+        folio = await aio.billing_service.add_transaction_to_folio(session, folio.id, charge_in, user.id)
+        assert (folio.total_charges, folio.balance) == (Decimal("5.00"), Decimal("5.00"))
+        assert [t.description for t in folio.transactions] == ["Minibar"]
+
+        payment_in = schemas.billing.FolioTransactionCreate(
+            description="Cash", payment_amount=Decimal("2.00"), transaction_type=FolioTransactionType.PAYMENT
+        )
+        folio = await aio.billing_service.add_transaction_to_folio(session, folio.id, payment_in, user.id)
+        assert (folio.total_charges, folio.total_payments, folio.balance) == (Decimal("5.00"), Decimal("2.00"), Decimal("3.00"))
+        assert (await aio.billing_service.get_folio_details(session, folio.id)).balance == Decimal("3.00")
+
+    _run_in_async_session(db_engine, scenario)
@@ -160,3 +160,55 @@ def test_get_folios_for_guest_service(db: Session):
     assert len(folios) >= 2
     assert any(f.id == folio1.id and f.status == FolioStatus.SETTLED for f in folios)
     assert any(f.id == folio2.id and f.status == FolioStatus.OPEN for f in folios)
+
+def test_reconcile_folio_totals_reports_and_fixes_drift(db: Session):
+    creator = create_user_in_db(db, email=random_email("_reconcile_creator"))
+    folio = create_random_guest_folio(db)
+    charge_in = create_random_folio_transaction_data(db, transaction_type=FolioTransactionType.ROOM_CHARGE, amount=Decimal("80.00"))
+    services.billing_service.add_transaction_to_folio(db, folio.id, charge_in, creator.id)
+
+    report = services.billing_service.reconcile_folio_totals(db)
+    assert folio.id not in [row["folio_id"] for row in report["drifted_folios"]] # Incremental totals match the ledger
+
+    # A ledger row written behind the service's back leaves the stored totals behind
+    db.add(models.billing.FolioTransaction(
+        guest_folio_id=folio.id, description="Manual fix", charge_amount=Decimal("20.00"),
+        transaction_type=FolioTransactionType.SERVICE_CHARGE, created_by_user_id=creator.id
+    ))
+    db.commit()
+
+    report = services.billing_service.reconcile_folio_totals(db, folio_status=FolioStatus.OPEN)
+    drift = next(row for row in report["drifted_folios"] if row["folio_id"] == folio.id)
+    assert drift["recorded_total_charges"] == Decimal("80.00")
+    assert drift["ledger_total_charges"] == Decimal("100.00")
+    assert report["fixed"] is False
+
+    report = services.billing_service.reconcile_folio_totals(db, fix=True)
+    assert report["fixed"] is True
+    db.expire_all()
+    assert services.billing_service.get_folio_details(db, folio.id).total_charges == Decimal("100.00")
+    assert folio.id not in [row["folio_id"] for row in services.billing_service.reconcile_folio_totals(db)["drifted_folios"]]
+
+def test_folio_totals_are_current_in_a_session_that_does_not_expire_on_commit(db: Session):
+    # As the async stack's sessions: the folio loaded before the SQL-side total updates must not be served stale
+    creator = create_user_in_db(db, email=random_email("_no_expire_creator"))
+    folio = create_random_guest_folio(db)
+    session = Session(bind=db.connection(), expire_on_commit=False)
+    try:
+        charge_in = create_random_folio_transaction_data(db, transaction_type=FolioTransactionType.ROOM_CHARGE, amount=Decimal("5.00"))
+        assert services.billing_service.add_transaction_to_folio(session, folio.id, charge_in, creator.id).balance == Decimal("5.00")
+        payment_in = create_random_folio_transaction_data(db, transaction_type=FolioTransactionType.PAYMENT, amount=Decimal("2.00"))
+        updated_folio = services.billing_service.add_transaction_to_folio(session, folio.id, payment_in, creator.id)
+        assert (updated_folio.total_charges, updated_folio.total_payments, updated_folio.balance) == (Decimal("5.00"), Decimal("2.00"), Decimal("3.00"))
+
+        # A ledger row written behind the service's back, then fixed by the reconciliation
+        session.add(models.billing.FolioTransaction(
+            guest_folio_id=folio.id, description="Manual fix", charge_amount=Decimal("1.00"),
+            transaction_type=FolioTransactionType.SERVICE_CHARGE, created_by_user_id=creator.id
+        ))
+        session.commit()
+        services.billing_service.reconcile_folio_totals(session, fix=True)
+        assert updated_folio.total_charges == Decimal("6.00")
+        assert services.billing_service.get_folio_details(session, folio.id).balance == Decimal("4.00")
+    finally:
+        session.close()
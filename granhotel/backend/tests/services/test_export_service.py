@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from datetime import date, timedelta
+import csv
+import io
+
+from app import services
+from app.models.billing import FolioTransactionType
+from tests.utils.user import create_user_in_db
+from tests.utils.billing import create_random_guest_folio, add_sample_transactions_to_folio
+from tests.utils.common import random_email
+
+
+def _session_factory(db: Session):
+    # The export opens (and closes) its own session; share the test's connection so it sees the test data
+    return lambda: Session(bind=db.connection())
+
+
+def _folio_with_transactions(db: Session):
+    creator = create_user_in_db(db, email=random_email("_export_creator"))
+    folio = create_random_guest_folio(db)
+    return add_sample_transactions_to_folio(db, folio.id, creator.id, num_charges=2, num_payments=1)
+
+
+def test_csv_export_streams_one_chunk_per_batch(db: Session):
+    folio = _folio_with_transactions(db)
+
+    chunks = list(services.export_service.stream_export(
+        _session_factory(db), services.export_service.folio_transactions_export,
+        export_format="csv", batch_size=1, folio_id=folio.id
+    ))
+
+    assert len(chunks) == 3 # Header + first row, then one row per batch
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert [int(row["id"]) for row in rows] == sorted(t.id for t in folio.transactions)
+    assert {row["guest_folio_id"] for row in rows} == {str(folio.id)}
+    assert sum(row["transaction_type"] == FolioTransactionType.PAYMENT.value for row in rows) == 1
+
+
+def test_export_filters_match_the_list_services(db: Session):
+    folio = _folio_with_transactions(db)
+    tomorrow = date.today() + timedelta(days=1)
+
+    def export_rows(**filters):
+        body = b"".join(services.export_service.stream_export(
+            _session_factory(db), services.export_service.folio_transactions_export, folio_id=folio.id, **filters
+        ))
+        return list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+
+    assert len(export_rows(date_from=date.today(), date_to=date.today())) == 3
+    assert export_rows(date_from=tomorrow) == []
+    assert len(export_rows(transaction_type=FolioTransactionType.PAYMENT)) == 1
+
+
+def test_parquet_export_round_trips(db: Session):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    folio = _folio_with_transactions(db)
+
+    body = b"".join(services.export_service.stream_export(
+        _session_factory(db), services.export_service.folio_transactions_export,
+        export_format="parquet", batch_size=2, folio_id=folio.id
+    ))
+
+    parquet_file = pyarrow_parquet.ParquetFile(io.BytesIO(body))
+    assert parquet_file.metadata.num_rows == 3
+    assert parquet_file.metadata.num_row_groups == 2
+    assert parquet_file.read().column("guest_folio_id").to_pylist() == [folio.id] * 3
+
+
+def test_export_rejects_unknown_format(db: Session):
+    with pytest.raises(HTTPException) as exc_info:
+        services.export_service.check_export_format("xlsx")
+    assert exc_info.value.status_code == 400
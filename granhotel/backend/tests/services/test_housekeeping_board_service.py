@@ -0,0 +1,66 @@
+import asyncio
+from sqlalchemy.orm import Session
+
+from app import services, models
+from app.models.housekeeping import HousekeepingStatus, HousekeepingTaskType
+from app.models.user import UserRole
+from app.services.housekeeping_board_service import housekeeping_board, stream_board
+from tests.utils.user import create_user_in_db
+from tests.utils.housekeeping import create_random_housekeeping_log
+from tests.utils.common import random_lower_string
+
+
+def _manager(db: Session) -> models.User:
+    return create_user_in_db(db, role=UserRole.MANAGER, email=f"manager_board{random_lower_string(3)}@example.com")
+
+
+def test_board_snapshot_is_compact(db: Session):
+    manager_user = _manager(db)
+    log = create_random_housekeeping_log(db, creator_user_id=manager_user.id, task_type=HousekeepingTaskType.FULL_CLEAN)
+
+    snapshot = services.housekeeping_board_service.get_board_snapshot(db, log.scheduled_date)
+
+    entry = next(task for task in snapshot if task["id"] == log.id)
+    assert entry["room_number"] == log.room.room_number
+    assert entry["task_type"] == "FULL_CLEAN" and entry["status"] == "PENDING"
+    assert entry["scheduled_date"] == log.scheduled_date.isoformat()
+
+
+def test_status_change_is_pushed_after_commit(db: Session):
+    manager_user = _manager(db)
+    log = create_random_housekeeping_log(db, creator_user_id=manager_user.id)
+
+    async def scenario():
+        subscription = housekeeping_board.subscribe()
+        try:
+            services.housekeeping_service.update_housekeeping_log_status(db, log.id, HousekeepingStatus.IN_PROGRESS, manager_user.id)
+            return await subscription.get(timeout=1)
+        finally:
+            housekeeping_board.unsubscribe(subscription)
+
+    message = asyncio.run(scenario())
+    assert message["type"] == "task"
+    assert message["task"]["id"] == log.id and message["task"]["status"] == "IN_PROGRESS"
+
+
+def test_stream_sends_snapshot_then_changes(db: Session):
+    manager_user = _manager(db)
+    log = create_random_housekeeping_log(db, creator_user_id=manager_user.id)
+
+    async def never_disconnected():
+        return False
+
+    async def scenario():
+        stream = stream_board(lambda: Session(bind=db.connection()), log.scheduled_date, never_disconnected)
+        try:
+            first = await stream.__anext__()
+            services.housekeeping_service.update_housekeeping_log_status(db, log.id, HousekeepingStatus.COMPLETED, manager_user.id)
+            second = await stream.__anext__()
+            return first.decode(), second.decode()
+        finally:
+            await stream.aclose()
+
+    first, second = asyncio.run(scenario())
+    assert first.startswith("event: snapshot\n") and f'"id":{log.id}' in first
+    assert second.startswith("event: task\n") and '"status":"COMPLETED"' in second
+    assert housekeeping_board.stats()["subscribers"] == 0
@@ -11,6 +11,7 @@ from tests.utils.user import create_user_in_db
 from tests.utils.room import create_random_room
 from tests.utils.housekeeping import create_random_housekeeper, create_random_housekeeping_log, create_random_housekeeping_log_data
 from tests.utils.common import random_lower_string
+from tests.utils.reservation import create_random_reservation
 
 def test_create_housekeeping_log_service(db: Session):
     manager_user = create_user_in_db(db, role=UserRole.MANAGER, email=f"manager_c_hklog{random_lower_string(3)}@example.com")
@@ -189,3 +190,141 @@ def test_update_housekeeping_log_details_service(db: Session):
     assert updated_log.scheduled_date == new_date
     assert updated_log.notes_instructions == new_notes
     assert updated_log.updated_by_user_id == manager.id
+
+
+def test_generate_daily_tasks_from_reservations(db: Session):
+    manager_user = create_user_in_db(db, role=UserRole.MANAGER, email=f"manager_hk_gen{random_lower_string(3)}@example.com")
+    scheduled_date = date.today() + timedelta(days=2)
+    rooms = [create_random_room(db, room_number_suffix=f"_hk_gen{i}{random_lower_string(3)}") for i in range(3)]
+    departure = create_random_reservation(db, room_id=rooms[0].id, days_in_future=0, duration_days=2) # Checks out on scheduled_date
+    stay_over = create_random_reservation(db, room_id=rooms[1].id, days_in_future=1, duration_days=3)
+    arrival = create_random_reservation(db, room_id=rooms[2].id, days_in_future=2, duration_days=1) # Arrives that day: nothing to clean yet
+    room_ids = [departure.room_id, stay_over.room_id, arrival.room_id]
+
+    result = services.housekeeping_service.generate_daily_tasks(db, scheduled_date=scheduled_date, creator_user_id=manager_user.id)
+
+    assert result["full_cleans_created"] >= 1 and result["stay_over_cleans_created"] >= 1
+    logs = services.housekeeping_service.get_housekeeping_logs(db, scheduled_date_from=scheduled_date, scheduled_date_to=scheduled_date)
+    tasks = sorted((log.room_id, log.task_type) for log in logs if log.room_id in room_ids)
+    assert tasks == sorted([(departure.room_id, HousekeepingTaskType.FULL_CLEAN), (stay_over.room_id, HousekeepingTaskType.STAY_OVER_CLEAN)])
+    assert all(log.status == HousekeepingStatus.PENDING and log.created_by_user_id == manager_user.id for log in logs if log.room_id in room_ids)
+
+    # Idempotent: a second run creates nothing
+    again = services.housekeeping_service.generate_daily_tasks(db, scheduled_date=scheduled_date, creator_user_id=manager_user.id)
+    assert again["full_cleans_created"] == 0 and again["stay_over_cleans_created"] == 0
+
+
+def _unassigned_task(db: Session, room: models.Room, scheduled_date: date, task_type: HousekeepingTaskType = HousekeepingTaskType.FULL_CLEAN) -> models.HousekeepingLog:
+    log = models.HousekeepingLog(room_id=room.id, task_type=task_type, status=HousekeepingStatus.PENDING, scheduled_date=scheduled_date)
+    db.add(log)
+    db.commit()
+    return log
+
+
+def test_auto_assign_balances_workload_and_keeps_floors_together(db: Session):
+    manager_user = create_user_in_db(db, role=UserRole.MANAGER, email=f"manager_hk_auto{random_lower_string(3)}@example.com")
+    housekeepers = [create_random_housekeeper(db, suffix=f"_auto{i}") for i in range(2)]
+    scheduled_date = date.today() + timedelta(days=30)
+    logs = []
+    for floor in (1, 2):
+        for i in range(4):
+            room = create_random_room(db, room_number_suffix=f"_auto_{floor}{i}{random_lower_string(3)}")
+            room.floor = floor
+            logs.append(_unassigned_task(db, room, scheduled_date))
+
+    preview = services.housekeeping_service.auto_assign_tasks(db, scheduled_date=scheduled_date, updater_user_id=manager_user.id, dry_run=True)
+    assert preview["tasks_assigned"] == 8
+    db.expire_all()
+    assert all(log.assigned_to_user_id is None for log in logs) # Nothing applied
+
+    result = services.housekeeping_service.auto_assign_tasks(db, scheduled_date=scheduled_date, updater_user_id=manager_user.id)
+
+    assert result["tasks_assigned"] == 8 and result["tasks_skipped"] == 0
+    db.expire_all()
+    floors_by_user = {}
+    for log in logs:
+        assert log.updated_by_user_id == manager_user.id
+        floors_by_user.setdefault(log.assigned_to_user_id, []).append(log.room.floor)
+    assert set(floors_by_user) == {housekeeper.id for housekeeper in housekeepers}
+    assert sorted(sorted(floors) for floors in floors_by_user.values()) == [[1, 1, 1, 1], [2, 2, 2, 2]]
+
+    # Nothing left to assign
+    assert services.housekeeping_service.auto_assign_tasks(db, scheduled_date=scheduled_date, updater_user_id=manager_user.id)["tasks_assigned"] == 0
+
+
+def test_task_durations_are_learned_from_completed_tasks(db: Session):
+    room = create_random_room(db, room_number_suffix=f"_dur{random_lower_string(3)}")
+    started = datetime.now(timezone.utc) - timedelta(days=1)
+    for minutes in (20, 30, 60):
+        log = _unassigned_task(db, room, date.today() - timedelta(days=1), HousekeepingTaskType.STAY_OVER_CLEAN)
+        log.status = HousekeepingStatus.COMPLETED
+        log.started_at = started
+        log.completed_at = started + timedelta(minutes=minutes)
+    db.commit()
+
+    durations = services.housekeeping_service.get_task_durations(db)
+
+    assert durations[HousekeepingTaskType.STAY_OVER_CLEAN] == 30.0 # Median
+    assert durations[HousekeepingTaskType.FULL_CLEAN] == services.housekeeping_service.DEFAULT_TASK_MINUTES[HousekeepingTaskType.FULL_CLEAN]
+
+
+def _assigned_task(db: Session, housekeeper: models.User, last_server_change: datetime) -> models.HousekeepingLog:
+    room = create_random_room(db, room_number_suffix=f"_sync{random_lower_string(4)}")
+    log = models.HousekeepingLog(
+        room_id=room.id, assigned_to_user_id=housekeeper.id, task_type=HousekeepingTaskType.FULL_CLEAN,
+        status=HousekeepingStatus.PENDING, scheduled_date=date.today(), updated_at=last_server_change
+    )
+    db.add(log)
+    db.commit()
+    return log
+
+
+def test_sync_status_changes_applies_device_times_and_ignores_replays(db: Session):
+    housekeeper = create_random_housekeeper(db, suffix="_sync")
+    now = datetime.now(timezone.utc)
+    log = _assigned_task(db, housekeeper, now - timedelta(hours=1))
+    sync_in = schemas.housekeeping.HousekeepingStatusSyncRequest(changes=[
+        # Out of order on purpose: applied by changed_at
+        schemas.housekeeping.HousekeepingStatusChange(log_id=log.id, status=HousekeepingStatus.COMPLETED, changed_at=now - timedelta(minutes=10)),
+        schemas.housekeeping.HousekeepingStatusChange(log_id=log.id, status=HousekeepingStatus.IN_PROGRESS, changed_at=now - timedelta(minutes=40)),
+    ])
+
+    result = services.housekeeping_service.sync_status_changes(db, sync_in, housekeeper)
+
+    assert (result["applied"], result["unchanged"], result["rejected"]) == (2, 0, [])
+    assert [synced.id for synced in result["logs"]] == [log.id]
+    db.expire_all()
+    assert log.status == HousekeepingStatus.COMPLETED and log.updated_by_user_id == housekeeper.id
+    assert log.started_at == now - timedelta(minutes=40)
+    assert log.completed_at == now - timedelta(minutes=10)
+
+    # The tablet did not get the response and sends the batch again
+    replay = services.housekeeping_service.sync_status_changes(db, sync_in, housekeeper)
+    assert (replay["applied"], replay["unchanged"], replay["logs"], replay["rejected"]) == (0, 2, [], [])
+
+
+def test_sync_status_changes_rejects_conflicts_and_foreign_tasks(db: Session):
+    housekeeper = create_random_housekeeper(db, suffix="_sync_c")
+    colleague = create_random_housekeeper(db, suffix="_sync_o")
+    now = datetime.now(timezone.utc)
+    edited_on_server = _assigned_task(db, housekeeper, now - timedelta(minutes=5))
+    colleagues_task = _assigned_task(db, colleague, now - timedelta(hours=1))
+    device_clock = now - timedelta(hours=2) # Two hours behind: corrected through sent_at
+
+    result = services.housekeeping_service.sync_status_changes(db, schemas.housekeeping.HousekeepingStatusSyncRequest(
+        sent_at=device_clock,
+        changes=[
+            schemas.housekeeping.HousekeepingStatusChange(log_id=edited_on_server.id, status=HousekeepingStatus.IN_PROGRESS, changed_at=device_clock - timedelta(minutes=30)),
+            schemas.housekeeping.HousekeepingStatusChange(log_id=colleagues_task.id, status=HousekeepingStatus.IN_PROGRESS, changed_at=device_clock - timedelta(minutes=1)),
+            schemas.housekeeping.HousekeepingStatusChange(log_id=999999, status=HousekeepingStatus.IN_PROGRESS, changed_at=device_clock),
+        ]
+    ), housekeeper)
+
+    assert result["applied"] == 0 and result["logs"] == []
+    reasons = {rejection["log_id"]: rejection for rejection in result["rejected"]}
+    assert reasons[edited_on_server.id]["reason"] == schemas.housekeeping.HousekeepingSyncRejectionReason.CONFLICT
+    assert reasons[edited_on_server.id]["current"].status == HousekeepingStatus.PENDING
+    assert reasons[colleagues_task.id]["reason"] == schemas.housekeeping.HousekeepingSyncRejectionReason.FORBIDDEN
+    assert reasons[999999]["reason"] == schemas.housekeeping.HousekeepingSyncRejectionReason.NOT_FOUND
+    db.expire_all()
+    assert edited_on_server.status == HousekeepingStatus.PENDING and colleagues_task.status == HousekeepingStatus.PENDING
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+import uuid
+
+from app import services, models
+from app.models.housekeeping import HousekeepingStatus, HousekeepingTaskType
+from app.schemas.housekeeping import HousekeepingStatsGroupBy
+from tests.utils.room import create_random_room
+from tests.utils.housekeeping import create_random_housekeeper
+from tests.utils.common import random_lower_string
+
+STAT_DAY = date(2001, 3, 15) # Far from any other test's tasks
+
+
+def _completed_task(
+    db: Session, room: models.Room, task_type: HousekeepingTaskType, minutes: int, housekeeper_id: Optional[uuid.UUID] = None
+) -> models.HousekeepingLog:
+    started = datetime(STAT_DAY.year, STAT_DAY.month, STAT_DAY.day, 15, 0, tzinfo=timezone.utc) # Morning in the hotel's time zone
+    log = models.HousekeepingLog(
+        room_id=room.id, task_type=task_type, status=HousekeepingStatus.COMPLETED, scheduled_date=STAT_DAY,
+        assigned_to_user_id=housekeeper_id, started_at=started, completed_at=started + timedelta(minutes=minutes)
+    )
+    db.add(log)
+    db.commit()
+    return log
+
+
+def _room(db: Session, floor: int) -> models.Room:
+    room = create_random_room(db, room_number_suffix=f"_stats{floor}{random_lower_string(4)}")
+    room.floor = floor
+    db.commit()
+    return room
+
+
+def test_stats_per_task_type_housekeeper_and_floor(db: Session):
+    housekeeper = create_random_housekeeper(db, suffix="_stats")
+    third_floor, fourth_floor = _room(db, 3), _room(db, 4)
+    for minutes in (20, 30, 60):
+        _completed_task(db, third_floor, HousekeepingTaskType.FULL_CLEAN, minutes, housekeeper.id)
+    _completed_task(db, fourth_floor, HousekeepingTaskType.STAY_OVER_CLEAN, 10)
+
+    refresh = services.housekeeping_stats_service.refresh_housekeeping_stats(db, full=True)
+    assert refresh["full"] is True and refresh["rows_written"] >= 2
+
+    by_type = services.housekeeping_stats_service.get_housekeeping_stats(db, STAT_DAY, STAT_DAY)
+    full_clean, stay_over = by_type["rows"]
+    assert (full_clean["key"], full_clean["tasks"]) == ("FULL_CLEAN", 3)
+    assert full_clean["avg_minutes"] == 36.7
+    assert full_clean["median_minutes"] == 30.0
+    assert full_clean["p90_minutes"] == 54.0 # percentile_cont interpolates between 30 and 60
+    assert (full_clean["min_minutes"], full_clean["max_minutes"]) == (20.0, 60.0)
+    assert (stay_over["key"], stay_over["tasks"], stay_over["median_minutes"]) == ("STAY_OVER_CLEAN", 1, 10.0)
+    assert by_type["totals"]["tasks"] == 4 and by_type["refreshed_at"] is not None
+
+    by_housekeeper = services.housekeeping_stats_service.get_housekeeping_stats(db, STAT_DAY, STAT_DAY, HousekeepingStatsGroupBy.HOUSEKEEPER)
+    assert [(row["key"], row["tasks"]) for row in by_housekeeper["rows"]] == [(str(housekeeper.id), 3), (None, 1)]
+    assert by_housekeeper["rows"][1]["label"] == "Unassigned"
+
+    by_floor = services.housekeeping_stats_service.get_housekeeping_stats(
+        db, STAT_DAY, STAT_DAY, HousekeepingStatsGroupBy.FLOOR, task_type=HousekeepingTaskType.FULL_CLEAN
+    )
+    assert [(row["label"], row["tasks"]) for row in by_floor["rows"]] == [("Floor 3", 3)]
+
+
+def test_incremental_refresh_recomputes_changed_days(db: Session):
+    room = _room(db, 2)
+    _completed_task(db, room, HousekeepingTaskType.LINEN_CHANGE, 12)
+    services.housekeeping_stats_service.refresh_housekeeping_stats(db, full=True)
+
+    _completed_task(db, room, HousekeepingTaskType.LINEN_CHANGE, 18) # Completed after the refresh: not counted yet
+    report = services.housekeeping_stats_service.get_housekeeping_stats(db, STAT_DAY, STAT_DAY, task_type=HousekeepingTaskType.LINEN_CHANGE)
+    assert report["totals"]["tasks"] == 1
+
+    refresh = services.housekeeping_stats_service.refresh_housekeeping_stats(db)
+
+    assert refresh["full"] is False and refresh["days_refreshed"] >= 1
+    report = services.housekeeping_stats_service.get_housekeeping_stats(db, STAT_DAY, STAT_DAY, task_type=HousekeepingTaskType.LINEN_CHANGE)
+    assert report["totals"]["tasks"] == 2 and report["totals"]["avg_minutes"] == 15.0
+
+
+def test_stats_reject_inverted_range(db: Session):
+    with pytest.raises(HTTPException) as exc_info:
+        services.housekeeping_stats_service.get_housekeeping_stats(db, STAT_DAY, STAT_DAY - timedelta(days=1))
+    assert exc_info.value.status_code == 400
@@ -205,3 +205,61 @@ def test_get_stock_movement_history(db: Session):
 
     history_after_specific_date = services.inventory_service.get_stock_movement_history(db, prod_for_date_filter.id, date_from=past_date + timedelta(days=1))
     assert not any(h.id == past_movement.id for h in history_after_specific_date)
+
+
+def _stock_with_backdated_movements(db: Session) -> models.Product:
+    # +10 ten days ago, +5 six days ago, -3 two days ago
+    product = create_random_product(db, name_suffix="_valuation")
+    ensure_inventory_item_exists(db, product_id=product.id, initial_quantity=10)
+    services.inventory_service.update_stock(db, product_id=product.id, quantity_changed=5, movement_type=StockMovementType.ADJUSTMENT_INCREASE)
+    services.inventory_service.update_stock(db, product_id=product.id, quantity_changed=-3, movement_type=StockMovementType.ADJUSTMENT_DECREASE)
+    movements = db.query(models.StockMovement).filter(models.StockMovement.product_id == product.id).order_by(models.StockMovement.id).all()
+    now = datetime.now(timezone.utc)
+    for movement, days_ago in zip(movements, [10, 6, 2]):
+        movement.movement_date = now - timedelta(days=days_ago)
+    db.commit()
+    return product
+
+
+def _valued_quantities(db: Session, product: models.Product, days_ago_list):
+    today = datetime.now(timezone.utc).date()
+    quantities = []
+    for days_ago in days_ago_list:
+        report = services.inventory_service.get_stock_valuation(db, as_of_date=today - timedelta(days=days_ago), category_id=product.category_id)
+        quantities.append([line["quantity_on_hand"] for line in report["lines"]])
+    return quantities
+
+
+def test_stock_snapshots_are_written_only_for_days_with_movements(db: Session):
+    product = _stock_with_backdated_movements(db)
+    today = datetime.now(timezone.utc).date()
+
+    result = services.inventory_service.take_stock_snapshots(db, snapshot_date=today - timedelta(days=1), start_date=today - timedelta(days=12))
+
+    assert result["snapshots_written"] >= 3
+    snapshots = db.query(models.StockSnapshot).filter(models.StockSnapshot.product_id == product.id).order_by(models.StockSnapshot.snapshot_date).all()
+    assert [(s.snapshot_date, s.quantity_on_hand) for s in snapshots] == [
+        (today - timedelta(days=10), 10), (today - timedelta(days=6), 15), (today - timedelta(days=2), 12)
+    ]
+
+    with pytest.raises(HTTPException) as exc_info:
+        services.inventory_service.take_stock_snapshots(db, snapshot_date=today)
+    assert exc_info.value.status_code == 400
+
+
+def test_stock_valuation_matches_with_and_without_snapshots(db: Session):
+    product = _stock_with_backdated_movements(db)
+    today = datetime.now(timezone.utc).date()
+    days_ago_list = [11, 8, 4, 1, 0]
+
+    from_movements = _valued_quantities(db, product, days_ago_list)
+    services.inventory_service.take_stock_snapshots(db, snapshot_date=today - timedelta(days=3), start_date=today - timedelta(days=12))
+    from_snapshots = _valued_quantities(db, product, days_ago_list)
+
+    assert from_movements == from_snapshots == [[], [10], [15], [12], [12]] # No stock yet eleven days ago
+
+    report = services.inventory_service.get_stock_valuation(db, as_of_date=today, category_id=product.category_id)
+    line = report["lines"][0]
+    assert line["unit_cost"] is None and line["stock_value"] is None # Never received through a purchase order
+    assert line["retail_value"] == product.price * 12
+    assert report["products_without_cost"] == 1
@@ -0,0 +1,48 @@
+import os
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models.billing import NightAuditStatus
+from app.services import night_audit_service
+
+# Night audit of a full hotel: seed BENCHMARK_ROOMS in-house reservations inside the test transaction
+# (rolled back afterwards) and check the whole run posts every room in a few seconds.
+# Run with `pytest -m slow -s tests/services/test_night_audit_benchmark.py` to see the figures.
+
+BENCHMARK_ROOMS = int(os.getenv("NIGHT_AUDIT_BENCHMARK_ROOMS", "2000"))
+BENCHMARK_MAX_SECONDS = 5.0
+
+pytestmark = pytest.mark.slow
+
+
+def test_night_audit_benchmark(db: Session):
+    db.execute(text("""
+        INSERT INTO rooms (room_number, name, price, type, floor)
+        SELECT 'AUDIT-' || n, 'Audit room ' || n, 100, 'AuditBench', 1 + n % 10
+        FROM generate_series(1, :rooms) AS n
+    """), {"rooms": BENCHMARK_ROOMS})
+    guest_id = db.execute(text("INSERT INTO guests (first_name, last_name) VALUES ('Audit', 'Guest') RETURNING id")).scalar()
+    db.execute(text("""
+        INSERT INTO reservations (guest_id, room_id, check_in_date, check_out_date, status, total_price)
+        SELECT :guest_id, id, CAST(:today AS date) - 1, CAST(:today AS date) + 2, 'CHECKED_IN', 300
+        FROM rooms WHERE type = 'AuditBench'
+    """), {"guest_id": guest_id, "today": date.today()})
+    db.commit()
+
+    start = time.perf_counter()
+    run = night_audit_service.run_night_audit(db, business_date=date.today())
+    elapsed = time.perf_counter() - start
+
+    print(f"\nNight audit of {BENCHMARK_ROOMS} rooms: {elapsed:.2f}s in {run.chunks_processed} chunks")
+    assert run.status == NightAuditStatus.COMPLETED
+    assert run.charges_posted >= BENCHMARK_ROOMS
+    assert db.query(models.FolioTransaction).filter(
+        models.FolioTransaction.business_date == date.today(),
+        models.FolioTransaction.charge_amount == 100
+    ).count() >= BENCHMARK_ROOMS
+    assert elapsed < BENCHMARK_MAX_SECONDS
@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from datetime import date
+from decimal import Decimal
+
+from app import services, models, schemas
+from app.models.billing import FolioStatus, FolioTransactionType, NightAuditStatus
+from app.models.reservation import ReservationStatus
+from tests.utils.reservation import create_random_reservation
+from tests.utils.room import create_random_room
+from tests.utils.common import random_lower_string
+
+
+def _room_id(db: Session) -> int:
+    return create_random_room(db, room_number_suffix=f"_audit{random_lower_string(4)}").id
+
+
+def _in_house_reservation(db: Session, total_price: Decimal, nights: int = 3) -> models.Reservation:
+    reservation = create_random_reservation(db, room_id=_room_id(db), days_in_future=0, duration_days=nights, status=ReservationStatus.CHECKED_IN)
+    reservation.total_price = total_price
+    db.commit()
+    return reservation
+
+
+def _room_charges(db: Session, reservation_id: int):
+    return db.query(models.FolioTransaction).filter(
+        models.FolioTransaction.related_reservation_id == reservation_id,
+        models.FolioTransaction.transaction_type == FolioTransactionType.ROOM_CHARGE
+    ).all()
+
+
+def test_night_audit_posts_room_charges_in_chunks(db: Session):
+    first = _in_house_reservation(db, Decimal("300.00"))
+    second = _in_house_reservation(db, Decimal("100.00")) # 33.33 per night, the last night takes 33.34
+    # An existing open folio is reused; the second reservation gets one opened by the audit
+    existing_folio = services.billing_service.get_or_create_folio_for_guest(db, guest_id=first.guest_id, reservation_id=first.id)
+
+    run = services.night_audit_service.run_night_audit(db, business_date=date.today(), chunk_size=1)
+
+    assert run.status == NightAuditStatus.COMPLETED
+    assert run.chunks_processed >= 2
+    assert run.finished_at is not None
+    db.expire_all()
+    charge = _room_charges(db, first.id)
+    assert [(t.guest_folio_id, t.charge_amount, t.business_date) for t in charge] == [(existing_folio.id, Decimal("100.00"), date.today())]
+    assert services.billing_service.get_folio_details(db, existing_folio.id).total_charges == Decimal("100.00")
+
+    second_charge = _room_charges(db, second.id)
+    assert [t.charge_amount for t in second_charge] == [Decimal("33.33")]
+    second_folio = services.billing_service.get_folio_details(db, second_charge[0].guest_folio_id)
+    assert second_folio.status == FolioStatus.OPEN
+    assert second_folio.total_charges == Decimal("33.33")
+
+
+def test_night_audit_posts_the_nightly_rate(db: Session):
+    reservation = _in_house_reservation(db, Decimal("350.00"), nights=2)
+    room = db.query(models.Room).filter(models.Room.id == reservation.room_id).one()
+    room.type = f"AuditRate_{random_lower_string(6)}"
+    db.commit()
+    # Tonight is a 200.00 night, tomorrow is charged at the room's 150.00 base price
+    services.pricing_service.create_room_rate(db, schemas.RoomRateCreate(
+        room_type=room.type, name="Tonight", day_of_week=date.today().weekday(), price=Decimal("200.00")
+    ))
+
+    services.night_audit_service.run_night_audit(db, business_date=date.today())
+
+    assert [t.charge_amount for t in _room_charges(db, reservation.id)] == [Decimal("200.00")]
+
+
+def test_night_audit_resume_does_not_double_post(db: Session):
+    reservation = _in_house_reservation(db, Decimal("200.00"), nights=2)
+    run = services.night_audit_service.run_night_audit(db, business_date=date.today())
+
+    with pytest.raises(HTTPException) as exc_info:
+        services.night_audit_service.run_night_audit(db, business_date=date.today())
+    assert exc_info.value.status_code == 409
+
+    # Simulate a crash after the charges committed but before the progress did: the run restarts from scratch
+    run.status = NightAuditStatus.FAILED
+    run.last_reservation_id = 0
+    db.commit()
+    resumed = services.night_audit_service.run_night_audit(db, business_date=date.today())
+    assert resumed.status == NightAuditStatus.COMPLETED
+
+    db.expire_all()
+    charges = _room_charges(db, reservation.id)
+    assert len(charges) == 1
+    assert services.billing_service.get_folio_details(db, charges[0].guest_folio_id).total_charges == Decimal("100.00")
+
+
+def test_night_audit_skips_reservations_not_in_house(db: Session):
+    departed_yesterday = create_random_reservation(db, room_id=_room_id(db), days_in_future=-2, duration_days=2, status=ReservationStatus.CHECKED_IN)
+    arriving = create_random_reservation(db, room_id=_room_id(db), days_in_future=0, duration_days=2, status=ReservationStatus.CONFIRMED)
+
+    services.night_audit_service.run_night_audit(db, business_date=date.today())
+
+    assert _room_charges(db, departed_yesterday.id) == []
+    assert _room_charges(db, arriving.id) == []
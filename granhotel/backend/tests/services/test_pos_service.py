@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 from datetime import date, timedelta, datetime
@@ -196,3 +197,93 @@ def test_void_pending_payment_sale(db: Session):
     assert voided_sale is not None
     assert voided_sale.status == POSSaleStatus.VOIDED
     assert voided_sale.void_reason == void_reason
+
+
+def test_create_pos_sale_commits_once(db: Session):
+    cashier = create_user_in_db(db, role=UserRole.RECEPTIONIST, email=random_email("_cashier_cps_uow"))
+    products = [create_random_product(db, name_suffix=f"_cps_uow_{i}", price=Decimal("2.00")) for i in range(5)]
+    for product in products:
+        ensure_inventory_item_exists(db, product.id, initial_quantity=10)
+    sale_in_schema = schemas.pos.POSSaleCreate(
+        payment_method=PaymentMethod.CASH,
+        items=[schemas.pos.POSSaleItemCreate(product_id=p.id, quantity=2) for p in products]
+    )
+
+    commits = []
+    original_commit = db.commit
+    db.commit = lambda: (commits.append(1), original_commit())[1]
+    try:
+        pos_sale = services.pos_service.create_pos_sale(db, sale_in=sale_in_schema, cashier_user_id=cashier.id)
+    finally:
+        db.commit = original_commit
+
+    assert len(commits) == 1
+    assert len(pos_sale.items) == 5
+    for product in products:
+        assert services.inventory_service.get_inventory_item_by_product_id(db, product.id).quantity_on_hand == 8
+
+
+def test_create_pos_sale_is_atomic_when_lines_exceed_stock(db: Session):
+    cashier = create_user_in_db(db, role=UserRole.RECEPTIONIST, email=random_email("_cashier_cps_atomic"))
+    product_ok = create_random_product(db, name_suffix="_cps_atomic_ok")
+    product_short = create_random_product(db, name_suffix="_cps_atomic_short")
+    ensure_inventory_item_exists(db, product_ok.id, initial_quantity=5)
+    ensure_inventory_item_exists(db, product_short.id, initial_quantity=3)
+
+    # Each line fits on its own; together the two lines of product_short need 4 of 3
+    sale_in_schema = schemas.pos.POSSaleCreate(payment_method=PaymentMethod.CASH, items=[
+        schemas.pos.POSSaleItemCreate(product_id=product_ok.id, quantity=1),
+        schemas.pos.POSSaleItemCreate(product_id=product_short.id, quantity=2),
+        schemas.pos.POSSaleItemCreate(product_id=product_short.id, quantity=2),
+    ])
+    # The service rolls back on failure: run it in a savepoint so the fixture data above survives
+    sale_session = Session(bind=db.connection(), join_transaction_mode="create_savepoint")
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            services.pos_service.create_pos_sale(sale_session, sale_in=sale_in_schema, cashier_user_id=cashier.id)
+    finally:
+        sale_session.close()
+    assert exc_info.value.status_code == 400
+    assert "insufficient stock" in exc_info.value.detail.lower()
+
+    db.expire_all()
+    assert services.inventory_service.get_inventory_item_by_product_id(db, product_ok.id).quantity_on_hand == 5
+    assert services.inventory_service.get_inventory_item_by_product_id(db, product_short.id).quantity_on_hand == 3
+    assert services.inventory_service.get_stock_movement_history(db, product_ok.id, movement_type=StockMovementType.SALE) == []
+
+
+def test_create_pos_sale_select_count_does_not_grow_with_basket(db: Session):
+    cashier = create_user_in_db(db, role=UserRole.RECEPTIONIST, email=random_email("_cashier_cps_batch"))
+    products = [create_random_product(db, name_suffix=f"_cps_batch_{i}", price=Decimal("1.00")) for i in range(8)]
+    for product in products:
+        ensure_inventory_item_exists(db, product.id, initial_quantity=10)
+    # Read up front: refreshing these expired instances inside the listener would be counted too
+    cashier_id = cashier.id
+    product_ids = [product.id for product in products]
+
+    def count_selects(basket_product_ids):
+        sale_in_schema = schemas.pos.POSSaleCreate(
+            payment_method=PaymentMethod.CASH,
+            items=[schemas.pos.POSSaleItemCreate(product_id=product_id, quantity=1) for product_id in basket_product_ids]
+        )
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            services.pos_service.create_pos_sale(db, sale_in=sale_in_schema, cashier_user_id=cashier_id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+        return len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+
+    assert count_selects(product_ids[:1]) == count_selects(product_ids)
+
+
+def test_lock_inventory_items_by_product_ids(db: Session):
+    stocked = create_random_product(db, name_suffix="_lock_inv_stocked")
+    unstocked = create_random_product(db, name_suffix="_lock_inv_unstocked")
+    ensure_inventory_item_exists(db, stocked.id, initial_quantity=4)
+
+    locked = services.inventory_service.lock_inventory_items_by_product_ids(db, [stocked.id, unstocked.id, stocked.id])
+    assert list(locked) == [stocked.id]
+    assert locked[stocked.id].quantity_on_hand == 4
+    assert locked[stocked.id].product.id == stocked.id
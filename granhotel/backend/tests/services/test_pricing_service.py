@@ -0,0 +1,140 @@
+import json
+import time
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app import schemas
+from app.services import pricing_service, reservation_service
+from app.core.events import NotifyRelay
+from app.services.pricing_service import pricing_engine, room_rate_events
+from tests.utils.room import create_random_room
+from tests.utils.guest import random_lower_string
+
+def _room_of_new_type(db: Session, suffix: str, price: float):
+    room = create_random_room(db, room_number_suffix=suffix)
+    room.type = f"PriceTest_{random_lower_string(6)}"
+    room.price = price
+    db.add(room)
+    db.commit()
+    db.refresh(room)
+    return room
+
+def _next_weekday(start: date, weekday: int) -> date:
+    return start + timedelta(days=(weekday - start.weekday()) % 7)
+
+def test_price_stay_uses_base_price_without_rates(db: Session):
+    room = _room_of_new_type(db, "_price_base", 99.99)
+    check_in = date.today() + timedelta(days=10)
+    assert reservation_service.calculate_reservation_price(db, room.id, check_in, check_in + timedelta(days=3)) == Decimal("299.97")
+
+def test_price_stay_applies_season_and_weekday_rates(db: Session):
+    room = _room_of_new_type(db, "_price_rates", 100.00)
+    friday = _next_weekday(date.today() + timedelta(days=30), 4)
+    season_start = friday - timedelta(days=2) # Wednesday
+
+    pricing_service.create_room_rate(db, schemas.RoomRateCreate(
+        room_type=room.type, name="High season", start_date=season_start, end_date=friday + timedelta(days=1), price=Decimal("150.00")
+    ))
+    pricing_service.create_room_rate(db, schemas.RoomRateCreate(
+        room_type=room.type, name="Weekend", day_of_week=5, price=Decimal("180.00"), priority=10 # Saturdays
+    ))
+
+    # Tue (base) + Wed, Thu, Fri (season) + Sat (weekend beats season) + Sun (base)
+    check_in = season_start - timedelta(days=1)
+    total = pricing_service.price_stay(db, room, check_in, check_in + timedelta(days=6))
+    assert total == Decimal("100.00") + Decimal("150.00") * 3 + Decimal("180.00") + Decimal("100.00")
+
+    # Quotes come from the same calendar
+    quote = pricing_service.quote_stay_lengths(db, [room], check_in, max_nights=6)[0]
+    assert quote["totals"][0] == Decimal("100.00")
+    assert quote["totals"][5] == total
+
+def test_price_stay_outside_calendar_window(db: Session):
+    room = _room_of_new_type(db, "_price_far", 80.00)
+    pricing_service.create_room_rate(db, schemas.RoomRateCreate(room_type=room.type, name="Flat", price=Decimal("90.00")))
+    far_check_in = date.today() + timedelta(days=pricing_engine.calendar_future_days + 10)
+    assert pricing_service.price_stay(db, room, far_check_in, far_check_in + timedelta(days=2)) == Decimal("180.00")
+
+def test_rate_changes_invalidate_cache(db: Session):
+    room = _room_of_new_type(db, "_price_inval", 100.00)
+    check_in = date.today() + timedelta(days=5)
+    check_out = check_in + timedelta(days=2)
+    assert pricing_service.price_stay(db, room, check_in, check_out) == Decimal("200.00")
+
+    rate = pricing_service.create_room_rate(db, schemas.RoomRateCreate(room_type=room.type, name="Promo", price=Decimal("75.50")))
+    assert pricing_service.price_stay(db, room, check_in, check_out) == Decimal("151.00")
+
+    pricing_service.update_room_rate(db, rate, schemas.RoomRateUpdate(is_active=False))
+    assert pricing_service.price_stay(db, room, check_in, check_out) == Decimal("200.00")
+
+def test_rate_changes_invalidate_cache_only_once_committed(db: Session):
+    room = _room_of_new_type(db, "_price_commit", 100.00)
+    pricing_service.price_stay(db, room, date.today(), date.today() + timedelta(days=1))
+
+    room_rate_events.publish_after_commit(db, {"type": "rates_changed"})
+    db.rollback()
+    assert not pricing_engine.is_stale()
+
+    room_rate_events.publish_after_commit(db, {"type": "rates_changed"})
+    db.commit()
+    assert pricing_engine.is_stale()
+
+def test_invalidation_during_a_load_is_not_lost(db: Session, monkeypatch):
+    pricing_engine.invalidate()
+    real_query = db.query
+
+    def query_then_invalidate(*entities):
+        pricing_engine.invalidate() # A rate change commits while the rates are being read
+        return real_query(*entities)
+
+    monkeypatch.setattr(db, "query", query_then_invalidate)
+    pricing_engine.ensure_fresh(db)
+    assert pricing_engine.is_stale()
+
+def test_rate_changes_of_other_workers_invalidate_cache(db: Session, db_engine):
+    room = _room_of_new_type(db, "_price_relay", 100.00)
+    relay = NotifyRelay(db_engine, [room_rate_events], reconnect_seconds=0.1)
+    relay.ensure_started()
+    try:
+        for attempt in range(50): # Until the relay's LISTEN is in place
+            pricing_service.price_stay(db, room, date.today(), date.today() + timedelta(days=1))
+            with db_engine.begin() as connection:
+                connection.execute(text("SELECT pg_notify('room_rate_events', :payload)"), {
+                    "payload": json.dumps({"origin": "another-process", "event": {"type": "rates_changed"}})
+                })
+            time.sleep(0.1)
+            if pricing_engine.is_stale():
+                break
+        assert pricing_engine.is_stale()
+    finally:
+        relay.stop()
+
+def test_price_stay_invalid_dates(db: Session):
+    room = _room_of_new_type(db, "_price_invalid", 100.00)
+    with pytest.raises(HTTPException) as excinfo:
+        pricing_service.price_stay(db, room, date.today(), date.today())
+    assert excinfo.value.status_code == 400
+
+def test_price_night_of_stay_weights_the_booked_total_by_nightly_rates(db: Session):
+    room = _room_of_new_type(db, "_price_night", 100.00)
+    check_in = date.today() + timedelta(days=40)
+    check_out = check_in + timedelta(days=3)
+    pricing_service.create_room_rate(db, schemas.RoomRateCreate(
+        room_type=room.type, name="Midweek peak", day_of_week=(check_in + timedelta(days=1)).weekday(), price=Decimal("200.00"), priority=10
+    ))
+    nights = [check_in + timedelta(days=offset) for offset in range(3)]
+
+    assert [pricing_service.price_night_of_stay(db, room, check_in, check_out, Decimal("400.00"), night) for night in nights] == \
+        [Decimal("100.00"), Decimal("200.00"), Decimal("100.00")]
+    # A discounted booking keeps the proportions and the nights add up to the booked total
+    shares = [pricing_service.price_night_of_stay(db, room, check_in, check_out, Decimal("99.99"), night) for night in nights]
+    assert shares == [Decimal("25.00"), Decimal("49.99"), Decimal("25.00")]
+    assert sum(shares) == Decimal("99.99")
+
+    with pytest.raises(HTTPException) as excinfo:
+        pricing_service.price_night_of_stay(db, room, check_in, check_out, Decimal("400.00"), check_out)
+    assert excinfo.value.status_code == 400
@@ -167,3 +167,17 @@ def test_get_product_price_details_service(db: Session):
     with pytest.raises(HTTPException) as exc_info_qty: # Test invalid quantity
         services.product_service.get_product_price_details(db, product.id, 0)
     assert exc_info_qty.value.status_code == 400
+
+def test_product_catalog_is_cached_until_a_product_changes(db: Session):
+    product = create_random_product(db, name_suffix="_catalog_cache", price=Decimal("10.00"), taxable=True)
+
+    snapshot = services.product_service.get_product_catalog(db)
+    entry = snapshot.products[product.id]
+    assert entry.unit_tax_amount == Decimal("1.80")
+    assert entry.unit_price_with_tax == Decimal("11.80")
+    assert services.product_service.get_product_catalog(db) is snapshot # Served from the cache
+
+    services.product_service.update_product(db, product, schemas.ProductUpdate(price=Decimal("12.00")))
+    refreshed = services.product_service.get_product_catalog(db)
+    assert refreshed.version != snapshot.version
+    assert refreshed.products[product.id].unit_price_with_tax == Decimal("14.16")
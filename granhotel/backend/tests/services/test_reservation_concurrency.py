@@ -0,0 +1,139 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models, schemas
+from app.models.reservation import ReservationStatus
+from app.services import reservation_service, analytics_service
+from app.services.availability_index import room_availability_index
+from tests.utils.guest import create_random_guest, random_lower_string
+from tests.utils.room import create_random_room
+
+# These tests need real commits from many connections at once, so they cannot use the
+# rolled-back `db` fixture; they create their own data and delete it afterwards.
+
+PARALLEL_BOOKINGS = 200
+
+
+@pytest.fixture(scope="module")
+def committing_session_factory(db_engine):
+    engine = create_engine(db_engine.url, pool_size=20, max_overflow=20, pool_timeout=60) # Stay well below the server max_connections (100 by default)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def booking_fixtures(committing_session_factory):
+    session: Session = committing_session_factory()
+    suffix = random_lower_string(6)
+    guest = create_random_guest(session, suffix=f"_conc_{suffix}")
+    rooms = [create_random_room(session, room_number_suffix=f"_conc_{suffix}_{i}") for i in range(21)]
+    yield guest.id, [room.id for room in rooms]
+
+    room_ids = [room.id for room in rooms]
+    session.query(models.Reservation).filter(models.Reservation.room_id.in_(room_ids)).delete(synchronize_session=False)
+    session.query(models.Room).filter(models.Room.id.in_(room_ids)).delete(synchronize_session=False)
+    session.query(models.Guest).filter(models.Guest.id == guest.id).delete(synchronize_session=False)
+    session.commit()
+    # The bookings above also wrote occupancy facts; recompute them without the deleted rows
+    analytics_service.rebuild_daily_occupancy_facts(session, date.today() + timedelta(days=290), date.today() + timedelta(days=340))
+    session.close()
+    room_availability_index.invalidate()
+
+
+def _book(session_factory, guest_id: int, room_id: int, check_in: date, check_out: date, start: threading.Barrier) -> str:
+    reservation_in = schemas.ReservationCreate(
+        guest_id=guest_id, room_id=room_id,
+        check_in_date=check_in, check_out_date=check_out,
+        status=ReservationStatus.CONFIRMED
+    )
+    session = session_factory()
+    try:
+        start.wait()
+        reservation_service.create_reservation(session, reservation_in)
+        return "created"
+    except HTTPException as e:
+        return "conflict" if e.status_code == 409 else f"error {e.status_code}"
+    finally:
+        session.close()
+
+
+def test_parallel_bookings_for_one_room_have_a_single_winner(committing_session_factory, booking_fixtures):
+    guest_id, room_ids = booking_fixtures
+    contested_room_id, other_room_ids = room_ids[0], room_ids[1:]
+    check_in = date.today() + timedelta(days=300)
+    check_out = check_in + timedelta(days=2)
+
+    # 200 bookings race for one room while each unrelated room gets exactly one booking
+    targets = [contested_room_id] * PARALLEL_BOOKINGS + other_room_ids
+    start = threading.Barrier(len(targets))
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = [
+            executor.submit(_book, committing_session_factory, guest_id, room_id, check_in, check_out, start)
+            for room_id in targets
+        ]
+        results = [future.result(timeout=120) for future in futures]
+
+    contested_results = results[:PARALLEL_BOOKINGS]
+    assert contested_results.count("created") == 1
+    assert contested_results.count("conflict") == PARALLEL_BOOKINGS - 1
+    assert results[PARALLEL_BOOKINGS:] == ["created"] * len(other_room_ids)
+
+    session = committing_session_factory()
+    try:
+        blocking = session.query(models.Reservation).filter(
+            models.Reservation.room_id == contested_room_id,
+            models.Reservation.status == ReservationStatus.CONFIRMED
+        ).count()
+        assert blocking == 1
+    finally:
+        session.close()
+
+
+def test_room_lock_does_not_block_other_rooms(committing_session_factory, booking_fixtures):
+    guest_id, room_ids = booking_fixtures
+    locked_room_id, free_room_id = room_ids[0], room_ids[1]
+    check_in = date.today() + timedelta(days=310)
+    check_out = check_in + timedelta(days=1)
+
+    holder = committing_session_factory()
+    try:
+        # Hold the booking lock on one room for the duration of the check
+        reservation_service._lock_room(holder, locked_room_id)
+
+        start = threading.Barrier(1)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(_book, committing_session_factory, guest_id, free_room_id, check_in, check_out, start)
+            assert future.result(timeout=10) == "created"
+    finally:
+        holder.rollback()
+        holder.close()
+
+
+def test_exclusion_constraint_rejects_overlap_written_without_the_service(committing_session_factory, booking_fixtures):
+    guest_id, room_ids = booking_fixtures
+    room_id = room_ids[0]
+    check_in = date.today() + timedelta(days=320)
+
+    session = committing_session_factory()
+    try:
+        session.add(models.Reservation(guest_id=guest_id, room_id=room_id, check_in_date=check_in, check_out_date=check_in + timedelta(days=3), status=ReservationStatus.CONFIRMED))
+        session.commit()
+
+        # Bypasses lock and availability check; the database still refuses the overlapping stay
+        session.add(models.Reservation(guest_id=guest_id, room_id=room_id, check_in_date=check_in + timedelta(days=2), check_out_date=check_in + timedelta(days=4), status=ReservationStatus.CHECKED_IN))
+        with pytest.raises(HTTPException) as excinfo:
+            reservation_service._commit_booking(session, "overlap")
+        assert excinfo.value.status_code == 409
+
+        # Back-to-back stays and non-blocking statuses are allowed
+        session.add(models.Reservation(guest_id=guest_id, room_id=room_id, check_in_date=check_in + timedelta(days=3), check_out_date=check_in + timedelta(days=5), status=ReservationStatus.CONFIRMED))
+        session.add(models.Reservation(guest_id=guest_id, room_id=room_id, check_in_date=check_in, check_out_date=check_in + timedelta(days=3), status=ReservationStatus.CANCELLED))
+        session.commit()
+    finally:
+        session.close()
@@ -0,0 +1,117 @@
+import os
+from datetime import date
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models.reservation import ReservationStatus
+from app.services import reservation_service
+
+# Query-plan regression tests: seed a large reservations table inside the test transaction
+# (rolled back afterwards) and assert the hot reservation queries are answered from indexes.
+# Override the size with PLAN_TEST_RESERVATION_ROWS for a quicker local run.
+
+PLAN_TEST_RESERVATION_ROWS = int(os.getenv("PLAN_TEST_RESERVATION_ROWS", "1000000"))
+PLAN_TEST_ROOMS = 1000
+PLAN_TEST_GUESTS = 100
+SEED_START = date(2001, 1, 1)
+
+pytestmark = pytest.mark.slow
+
+
+@pytest.fixture(scope="function")
+def seeded_db(db: Session) -> Session:
+    per_room = max(PLAN_TEST_RESERVATION_ROWS // PLAN_TEST_ROOMS, 1)
+    db.execute(text("""
+        INSERT INTO rooms (room_number, name, price, type, floor)
+        SELECT 'PLAN-' || n, 'Plan room ' || n, 100, 'PlanTest', 1 + n % 10
+        FROM generate_series(1, :rooms) AS n
+    """), {"rooms": PLAN_TEST_ROOMS})
+    db.execute(text("""
+        INSERT INTO guests (first_name, last_name)
+        SELECT 'Plan', 'Guest ' || n FROM generate_series(1, :guests) AS n
+    """), {"guests": PLAN_TEST_GUESTS})
+    # Back-to-back 2-night stays every 3 days per room, cycling through every status, so the
+    # exclusion constraint is satisfied and each room has `per_room` reservations.
+    db.execute(text("""
+        INSERT INTO reservations (guest_id, room_id, check_in_date, check_out_date, status, total_price)
+        SELECT g.ids[1 + (s.n + r.id) % array_length(g.ids, 1)],
+               r.id,
+               CAST(:seed_start AS date) + s.n * 3,
+               CAST(:seed_start AS date) + s.n * 3 + 2,
+               CAST((ARRAY['PENDING', 'CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT', 'CANCELLED'])[1 + (s.n + r.id) % 5] AS reservation_status_enum),
+               200
+        FROM (SELECT id FROM rooms WHERE type = 'PlanTest') AS r
+        CROSS JOIN generate_series(0, :per_room - 1) AS s(n)
+        CROSS JOIN (SELECT array_agg(id) AS ids FROM guests WHERE first_name = 'Plan') AS g
+    """), {"seed_start": SEED_START, "per_room": per_room})
+    db.execute(text("ANALYZE rooms"))
+    db.execute(text("ANALYZE guests"))
+    db.execute(text("ANALYZE reservations"))
+    return db
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain(db: Session, query) -> List[Dict[str, Any]]:
+    compiled = query.statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text("EXPLAIN (FORMAT JSON) " + str(compiled).replace(":", r"\:"))).scalar()
+    return list(_plan_nodes(plan[0]["Plan"]))
+
+
+def _assert_reservations_read_via_index(nodes: List[Dict[str, Any]], expected_indexes: List[str]) -> None:
+    reservation_scans = [node for node in nodes if node.get("Relation Name") == "reservations" or "reservations" in node.get("Index Name", "")]
+    assert reservation_scans, "plan does not touch reservations"
+    assert all(node["Node Type"] != "Seq Scan" for node in reservation_scans), reservation_scans
+    used_indexes = {node.get("Index Name") for node in nodes}
+    assert used_indexes & set(expected_indexes), f"expected one of {expected_indexes}, plan used {used_indexes}"
+
+
+def _a_plan_room_id(db: Session) -> int:
+    return db.execute(text("SELECT id FROM rooms WHERE type = 'PlanTest' ORDER BY id OFFSET 500 LIMIT 1")).scalar()
+
+
+def test_is_room_available_uses_composite_index(seeded_db: Session):
+    query = reservation_service._overlapping_reservations_query(
+        seeded_db, _a_plan_room_id(seeded_db), date(2005, 6, 1), date(2005, 6, 4),
+        [ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN]
+    ).limit(1)
+    _assert_reservations_read_via_index(_explain(seeded_db, query), ["ix_reservations_room_id_status_stay", "excl_reservations_room_id_stay"])
+
+
+def test_room_date_range_lookup_uses_composite_index(seeded_db: Session):
+    query = reservation_service._overlapping_reservations_query(
+        seeded_db, _a_plan_room_id(seeded_db), date(2005, 6, 1), date(2005, 7, 1),
+        [ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN, ReservationStatus.PENDING]
+    )
+    _assert_reservations_read_via_index(_explain(seeded_db, query), ["ix_reservations_room_id_status_stay"])
+
+
+def test_reservation_listing_uses_ordered_indexes(seeded_db: Session):
+    newest_first = reservation_service._reservations_list_query(seeded_db).limit(100)
+    _assert_reservations_read_via_index(_explain(seeded_db, newest_first), ["ix_reservations_check_in_date_id"])
+
+    guest_id = seeded_db.execute(text("SELECT min(id) FROM guests WHERE first_name = 'Plan'")).scalar()
+    per_guest = reservation_service._reservations_list_query(seeded_db, guest_id=guest_id).limit(100)
+    _assert_reservations_read_via_index(_explain(seeded_db, per_guest), ["ix_reservations_guest_id_check_in_date", "ix_reservations_check_in_date_id"])
+
+    in_period = reservation_service._reservations_list_query(
+        seeded_db, status=ReservationStatus.CHECKED_IN, date_from=date(2004, 1, 1), date_to=date(2004, 2, 1)
+    ).limit(100)
+    _assert_reservations_read_via_index(_explain(seeded_db, in_period), [
+        "ix_reservations_status_check_in_date", "ix_reservations_check_in_date_id", "ix_reservations_room_id_status_stay"
+    ])
+
+
+def test_availability_search_probes_gist_index(seeded_db: Session):
+    query = seeded_db.query(models.Room).filter(
+        ~reservation_service._room_has_overlap_clause(date(2005, 6, 1), date(2005, 6, 4))
+    )
+    _assert_reservations_read_via_index(_explain(seeded_db, query), ["excl_reservations_room_id_stay", "ix_reservations_room_id_status_stay"])
@@ -173,3 +173,120 @@ def test_update_reservation_details_room_becomes_unavailable(db: Session):
         reservation_service.update_reservation_details(db, reservation1.id, update_payload_conflict)
     assert excinfo.value.status_code == 409 # Conflict
     assert "not available for the new dates/room" in excinfo.value.detail
+
+def test_availability_index_stays_in_sync_with_bookings(db: Session):
+    from app.services.availability_index import room_availability_index
+
+    guest = create_random_guest(db, suffix="_index_sync")
+    room_booked = create_random_room(db, room_number_suffix="_index_sync_b")
+    room_free = create_random_room(db, room_number_suffix="_index_sync_f")
+    room_availability_index.ensure_fresh(db)
+
+    reservation = create_random_reservation(db, guest_id=guest.id, room_id=room_booked.id, days_in_future=80, duration_days=3, status=ReservationStatus.CONFIRMED)
+    check_in = reservation.check_in_date
+    check_out = reservation.check_out_date
+
+    assert room_availability_index.available_room_ids([room_booked.id, room_free.id], check_in, check_out) == [room_free.id]
+    # Overlapping the last night only still conflicts; starting on check-out day does not
+    assert room_availability_index.available_room_ids([room_booked.id], check_out - timedelta(days=1), check_out + timedelta(days=2)) == []
+    assert room_availability_index.available_room_ids([room_booked.id], check_out, check_out + timedelta(days=2)) == [room_booked.id]
+
+    # Cancelling releases the nights from the index
+    reservation_service.cancel_reservation(db, reservation.id)
+    assert room_availability_index.available_room_ids([room_booked.id, room_free.id], check_in, check_out) == [room_booked.id, room_free.id]
+
+def test_availability_index_hit_is_confirmed_against_the_db(db: Session):
+    from app.services.availability_index import room_availability_index
+
+    reservation = create_random_reservation(db, days_in_future=85, duration_days=2, status=ReservationStatus.CONFIRMED)
+    room_availability_index.rebuild(db)
+    # Another worker cancels the stay; this process's index still has the nights taken
+    db.query(models.Reservation).filter(models.Reservation.id == reservation.id).update({"status": ReservationStatus.CANCELLED})
+    db.commit()
+    assert not room_availability_index.is_available(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+
+    rebooked = reservation_service.create_reservation(db, create_random_reservation_data(
+        db, guest_id=reservation.guest_id, room_id=reservation.room_id, days_in_future=85, duration_days=2, status=ReservationStatus.CONFIRMED
+    ))
+    assert rebooked.room_id == reservation.room_id
+
+def test_availability_index_rebuild_replays_syncs_made_during_it(db: Session):
+    from sqlalchemy import event
+    from app.services.availability_index import room_availability_index
+
+    reservation = create_random_reservation(db, days_in_future=95, duration_days=2, status=ReservationStatus.CONFIRMED)
+    room_availability_index.rebuild(db)
+
+    # The reservation is cancelled (and synced) after the rebuild's query read it as CONFIRMED
+    def cancel_during_rebuild(conn, cursor, statement, *args):
+        room_availability_index.sync_stay(reservation.id, reservation.room_id, ReservationStatus.CANCELLED, reservation.check_in_date, reservation.check_out_date)
+    event.listen(db.get_bind(), "after_cursor_execute", cancel_during_rebuild)
+    try:
+        room_availability_index.rebuild(db)
+    finally:
+        event.remove(db.get_bind(), "after_cursor_execute", cancel_during_rebuild)
+
+    assert room_availability_index.is_available(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+
+def test_availability_index_rebuild_from_db(db: Session):
+    from app.services.availability_index import room_availability_index
+
+    reservation = create_random_reservation(db, days_in_future=90, duration_days=2, status=ReservationStatus.CONFIRMED)
+
+    room_availability_index.invalidate()
+    room_availability_index.rebuild(db)
+    assert not room_availability_index.is_available(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+    # Excluding the reservation itself (as update_reservation_details does) frees the nights
+    assert room_availability_index.is_available(reservation.room_id, reservation.check_in_date, reservation.check_out_date, reservation_id_to_exclude=reservation.id)
+
+def test_search_available_rooms(db: Session):
+    guest = create_random_guest(db, suffix="_search_avail")
+    room_booked = create_random_room(db, room_number_suffix="_search_avail_b")
+    room_free = create_random_room(db, room_number_suffix="_search_avail_f")
+    room_pricey = create_random_room(db, room_number_suffix="_search_avail_p")
+    for room, price in ((room_booked, 150.0), (room_free, 150.0), (room_pricey, 900.0)):
+        room.building = "Search Wing"
+        room.price = price
+        db.add(room)
+    db.commit()
+
+    reservation = create_random_reservation(db, guest_id=guest.id, room_id=room_booked.id, days_in_future=70, duration_days=3, status=ReservationStatus.CONFIRMED)
+
+    rooms = reservation_service.search_available_rooms(
+        db, reservation.check_in_date, reservation.check_out_date, building="Search Wing", max_price=500
+    )
+    assert [r.id for r in rooms] == [room_free.id]
+
+    rooms_from_checkout = reservation_service.search_available_rooms(
+        db, reservation.check_out_date, reservation.check_out_date + timedelta(days=1), building="Search Wing"
+    )
+    assert {r.id for r in rooms_from_checkout} == {room_booked.id, room_free.id, room_pricey.id}
+
+    with pytest.raises(HTTPException) as excinfo:
+        reservation_service.search_available_rooms(db, reservation.check_out_date, reservation.check_in_date)
+    assert excinfo.value.status_code == 400
+
+def test_create_reservations_batch(db: Session):
+    guest = create_random_guest(db, suffix="_batch")
+    room_a = create_random_room(db, room_number_suffix="_batch_a")
+    room_b = create_random_room(db, room_number_suffix="_batch_b")
+    existing = create_random_reservation(db, guest_id=guest.id, room_id=room_b.id, days_in_future=60, duration_days=2, status=ReservationStatus.CONFIRMED)
+
+    batch = [
+        create_random_reservation_data(db, guest_id=guest.id, room_id=room_a.id, days_in_future=60, duration_days=3, status=ReservationStatus.CONFIRMED),
+        create_random_reservation_data(db, guest_id=guest.id, room_id=room_a.id, days_in_future=61, duration_days=1, status=ReservationStatus.CONFIRMED), # Overlaps row 0
+        create_random_reservation_data(db, guest_id=guest.id, room_id=room_b.id, days_in_future=60, duration_days=2, status=ReservationStatus.CONFIRMED), # Overlaps existing
+        create_random_reservation_data(db, guest_id=guest.id, room_id=999999, days_in_future=60),
+        create_random_reservation_data(db, guest_id=guest.id, room_id=room_b.id, days_in_future=62, duration_days=2, status=ReservationStatus.CONFIRMED), # Starts on existing check-out
+    ]
+    result = reservation_service.create_reservations_batch(db, batch)
+
+    assert [row["status"] for row in result["results"]] == ["created", "conflict", "conflict", "invalid", "created"]
+    assert result["created_count"] == 2
+    assert result["failed_count"] == 3
+
+    first = reservation_service.get_reservation(db, result["results"][0]["reservation_id"])
+    assert first.room_id == room_a.id
+    assert first.total_price == Decimal(str(room_a.price)) * 3
+    last = reservation_service.get_reservation(db, result["results"][4]["reservation_id"])
+    assert last.check_in_date == existing.check_out_date
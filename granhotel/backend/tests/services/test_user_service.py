@@ -1,9 +1,12 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from passlib.hash import bcrypt
 import uuid
 
 from app import schemas, services, models
+from app.core.config import settings
 from app.models.user import UserRole
 from tests.utils.user import create_user_in_db, random_email
 
@@ -106,3 +109,60 @@ def test_get_users_service_with_filters(db: Session):
     inactive_receptionists = services.user_service.get_users(db, is_active=False, role=UserRole.RECEPTIONIST)
     assert len(inactive_receptionists) >= 1
     assert all(not u.is_active and u.role == UserRole.RECEPTIONIST for u in inactive_receptionists)
+
+def test_get_user_for_auth_serves_repeat_lookups_from_cache(db: Session):
+    user = create_user_in_db(db, role=UserRole.MANAGER, suffix_for_email="auth_cache")
+    assert services.user_service.get_user_for_auth(db, user.id).id == user.id # Miss: loaded and cached
+    db.expunge_all() # Forget the instance so a DB read would be needed without the cache
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        cached = services.user_service.get_user_for_auth(db, user.id)
+        assert cached.role == UserRole.MANAGER
+        assert cached.is_active
+        assert cached in db # Attached to the session like a loaded row
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    assert statements == []
+
+def test_user_writes_invalidate_auth_cache(db: Session):
+    user = create_user_in_db(db, role=UserRole.RECEPTIONIST, suffix_for_email="auth_cache_inv")
+    services.user_service.get_user_for_auth(db, user.id)
+
+    services.user_service.update_user_role(db, user.id, UserRole.MANAGER)
+    db.expunge_all()
+    assert services.user_service.get_user_for_auth(db, user.id).role == UserRole.MANAGER
+
+    services.user_service.deactivate_user(db, user.id)
+    db.expunge_all()
+    assert services.user_service.get_user_for_auth(db, user.id).is_active is False
+
+def test_auth_cache_does_not_store_a_row_read_before_an_invalidation(db: Session, monkeypatch):
+    user = create_user_in_db(db, role=UserRole.RECEPTIONIST, suffix_for_email="auth_cache_race")
+    user_id = user.id
+    read_user = services.user_service.get_user
+
+    def read_then_role_changes(db: Session, user_id: uuid.UUID):
+        stale = read_user(db, user_id)
+        # Another request changes the role and evicts the entry before this one stores what it read
+        services.user_service.invalidate_user_cache(user_id)
+        return stale
+    monkeypatch.setattr(services.user_service, "get_user", read_then_role_changes)
+    services.user_service.get_user_for_auth(db, user_id)
+    monkeypatch.undo()
+
+    assert services.user_service.user_principal_cache.get(str(user_id)) is None
+    services.user_service.get_user_for_auth(db, user_id) # A clean miss stores again
+    assert services.user_service.user_principal_cache.get(str(user_id)) is not None
+
+def test_authenticate_user_rehashes_outdated_password_hash(db: Session):
+    user = create_user_in_db(db, password="rehash-me-123", suffix_for_email="rehash")
+    user.hashed_password = bcrypt.using(rounds=4).hash("rehash-me-123") # As if hashed under an older cost setting
+    db.commit()
+
+    assert services.user_service.authenticate_user(db, email=user.email, password="rehash-me-123").id == user.id
+    db.refresh(user)
+    assert bcrypt.from_string(user.hashed_password).rounds == settings.PASSWORD_BCRYPT_ROUNDS
+    assert services.user_service.authenticate_user(db, email=user.email, password="rehash-me-123") is not None